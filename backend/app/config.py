@@ -15,18 +15,70 @@ class Settings(BaseSettings):
     Attributes:
         DATABASE_URL: Database connection string (defaults to SQLite)
         SQLALCHEMY_ECHO: Enable SQL query logging
+        SQLITE_JOURNAL_MODE: SQLite journal mode applied to every connection
+        SQLITE_SYNCHRONOUS: SQLite synchronous level (NORMAL is safe with WAL)
+        SQLITE_CACHE_SIZE_KIB: SQLite page cache per connection in KiB
+        SQLITE_MMAP_SIZE: Bytes of the database file SQLite may memory-map
+        SQLITE_TEMP_STORE: Where SQLite keeps temporary tables and indexes
+        SQLITE_BUSY_TIMEOUT_MS: How long SQLite waits for a lock before failing
+        DB_POOL_SIZE: Pooled connections per process (unset: per-backend default)
+        DB_MAX_OVERFLOW: Extra connections beyond the pool (unset: per-backend default)
+        DB_POOL_TIMEOUT_SECONDS: How long a request waits for a free connection
+        DB_POOL_RECYCLE_SECONDS: Age after which server connections are replaced
         API_TITLE: API title for documentation
         API_VERSION: API version string
         API_PREFIX: API route prefix
         DEBUG: Enable debug mode
         CORS_ORIGINS: Allowed CORS origins
         SECRET_KEY: Secret key for JWT and encryption
+        SEARCH_ENGINE: In-process search engine ("inverted_index", "columnar" or "sql")
+        SEARCH_FTS_ENABLED: Use the SQLite FTS5 index for relevance search
+        CACHE_MAX_ENTRIES: Maximum number of cached results
+        CACHE_MAX_BYTES: Maximum approximate size of cached results in bytes
+        CACHE_SWEEP_INTERVAL_SECONDS: Interval of the expired-entry sweep
+        CACHE_STALE_WHILE_REVALIDATE: Serve expired results while refreshing them
+        CACHE_BACKEND: Result cache store ("memory" or "resp" for a shared Redis-compatible server)
+        CACHE_URL: Server URL for the "resp" backend (redis://[:password@]host:port/db)
+        CACHE_KEY_PREFIX: Prefix of keys written to the shared cache
+        CACHE_SERIALIZER: Encoding of cached values ("orjson" or "msgpack")
+        DATA_VERSION_FILE: File rewritten on every data change, read for ETags by every process
+        ETAG_ENABLED: Answer conditional GETs of course data with 304 Not Modified
+        SNAPSHOT_DIR: Directory of the precomputed per-semester course list snapshots
+        SOLVER_WORKERS: Worker processes for the timetable generator (0 runs it in a thread)
+        SOLVER_TIME_BUDGET_MS: Maximum search time of one timetable generation
+        QUERY_STATS_ENABLED: Measure SQL statements per request (Server-Timing, slow query log)
+        SLOW_QUERY_THRESHOLD_MS: Statements slower than this enter the slow query log
+        SLOW_QUERY_LOG_SIZE: Number of slowest statements kept
+        METRICS_ENABLED: Record request metrics and serve them at /metrics
+        RATE_LIMIT_ENABLED: Limit the request rate per client IP
+        RATE_LIMIT_REQUESTS: Request budget (total cost) per client per window
+        RATE_LIMIT_WINDOW_SECONDS: Length of the sliding rate limit window
+        RATE_LIMIT_MAX_CLIENTS: Maximum number of clients tracked in memory
+        RATE_LIMIT_BACKEND: Rate limit store ("memory" per process or "resp" shared)
+        RATE_LIMIT_URL: Server URL for the "resp" store (defaults to CACHE_URL)
+        RATE_LIMIT_ROUTE_COSTS: Request cost per path prefix (others cost 1)
+        COMPRESSION_CACHE_MAX_BYTES: Maximum size of the cached compressed response bodies
+        COMPRESSION_THREAD_MIN_BYTES: Smallest response body compressed in a worker thread
+        ADMIN_API_TOKEN: Token required by /api/admin endpoints (unset disables them)
     """
 
     # Database Configuration
     DATABASE_URL: str = "sqlite+aiosqlite:///./nycu_course_platform.db"
     SQLALCHEMY_ECHO: bool = False
 
+    # Database Engine Configuration
+    # Pragmas applied to every new SQLite connection (see app.database.engine)
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_CACHE_SIZE_KIB: int = 64 * 1024
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024
+    SQLITE_TEMP_STORE: str = "MEMORY"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    DB_POOL_SIZE: Optional[int] = None
+    DB_MAX_OVERFLOW: Optional[int] = None
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+
     # API Configuration
     API_TITLE: str = "NYCU Course Platform API"
     API_VERSION: str = "0.1.0"
@@ -56,6 +108,73 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # Search Configuration
+    # "inverted_index" builds an in-memory index at startup, "columnar" a NumPy
+    # column store (needs numpy); "sql" disables in-process search
+    SEARCH_ENGINE: str = "inverted_index"
+    # Relevance queries use the courses_fts table when it exists
+    SEARCH_FTS_ENABLED: bool = True
+
+    # Cache Configuration
+    CACHE_MAX_ENTRIES: int = 10000
+    CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    CACHE_SWEEP_INTERVAL_SECONDS: int = 60
+    CACHE_STALE_WHILE_REVALIDATE: bool = True
+    # "resp" shares results and invalidations across replicas via CACHE_URL
+    CACHE_BACKEND: str = "memory"
+    CACHE_URL: Optional[str] = None
+    CACHE_KEY_PREFIX: str = "nycu:cache:"
+    CACHE_SERIALIZER: str = "orjson"
+
+    # Conditional GET Configuration
+    # Weak ETags of /api/courses, /api/semesters and /api/advanced follow
+    # the data version, bumped on writes and by the import scripts
+    DATA_VERSION_FILE: str = "./data_version"
+    ETAG_ENABLED: bool = True
+
+    # Snapshot Configuration
+    # Written by scripts/build_snapshots.py (run by the import scripts)
+    SNAPSHOT_DIR: str = "./snapshots"
+
+    # Timetable Generator Configuration
+    # The search runs in worker processes so it never blocks the event loop
+    SOLVER_WORKERS: int = 2
+    SOLVER_TIME_BUDGET_MS: int = 2000
+
+    # Query Instrumentation Configuration
+    # Reported per request in Server-Timing and via /api/admin/queries
+    QUERY_STATS_ENABLED: bool = True
+    SLOW_QUERY_THRESHOLD_MS: float = 100.0
+    SLOW_QUERY_LOG_SIZE: int = 20
+
+    # Metrics Configuration
+    # Prometheus text format at /metrics (scraped by infrastructure/monitoring)
+    METRICS_ENABLED: bool = True
+
+    # Rate Limiting Configuration
+    # Sliding window budget per client IP (20 per 10s ~ 120/min with bursts of 20);
+    # "resp" keeps the counters on a shared server so the limit holds across
+    # workers and replicas
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_REQUESTS: int = 20
+    RATE_LIMIT_WINDOW_SECONDS: float = 10.0
+    RATE_LIMIT_MAX_CLIENTS: int = 100000
+    RATE_LIMIT_BACKEND: str = "memory"
+    RATE_LIMIT_URL: Optional[str] = None
+    RATE_LIMIT_ROUTE_COSTS: dict[str, int] = {
+        "/api/courses/search": 2,
+        "/api/advanced": 2,
+        "/api/schedules/generate": 5,
+    }
+
+    # Response Compression Configuration
+    # Compressed bodies are cached per ETag/content and encoding (br, zstd, gzip)
+    COMPRESSION_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    COMPRESSION_THREAD_MIN_BYTES: int = 64 * 1024
+
+    # Admin Configuration
+    ADMIN_API_TOKEN: Optional[str] = None
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
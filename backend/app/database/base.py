@@ -71,7 +71,7 @@ async def get_or_404(
             else:
                 raise ValueError(f"Record with ID {record_id} not found")
 
-        logger.debug(f"Fetched {model_name} record with ID {record_id}")
+        logger.debug(f"Fetched {model.__name__} record with ID {record_id}")
         return record
 
     except (CourseNotFound, SemesterNotFound):
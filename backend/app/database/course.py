@@ -6,9 +6,9 @@ in the database. It includes complex filtering, search, and pagination capabilit
 """
 
 import logging
-from typing import Optional
+from typing import AsyncIterator, Optional
 
-from sqlalchemy import and_, or_
+from sqlalchemy import Select, and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import joinedload
@@ -22,11 +22,70 @@ from app.database.base import (
 from app.models.course import Course
 from app.models.semester import Semester
 from app.utils.exceptions import CourseNotFound, DatabaseError
+from app.utils.pagination import keyset_predicate
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
 
+def apply_course_filters(
+    statement: Select,
+    acy: Optional[int] = None,
+    sem: Optional[int] = None,
+    dept: Optional[str] = None,
+    teacher: Optional[str] = None,
+    q: Optional[str] = None,
+) -> tuple[Select, list]:
+    """
+    Add the semester join and build the filter conditions of a course query.
+
+    The conditions are returned rather than applied so that callers can add
+    their own (e.g. keyset predicates) before a single ``where``.
+
+    Args:
+        statement: Query selecting from the courses table
+        acy: Filter by academic year (exact match)
+        sem: Filter by semester number (exact match)
+        dept: Filter by department code (case-insensitive partial match)
+        teacher: Filter by teacher name (case-insensitive partial match)
+        q: Search query for course name or number (case-insensitive partial match)
+
+    Returns:
+        Tuple of (statement with the semester join if needed, filter conditions)
+    """
+    filters = []
+
+    # Exact match filters - join with Semester table
+    if acy is not None or sem is not None:
+        statement = statement.join(Semester)
+    if acy is not None:
+        filters.append(Semester.acy == acy)
+        logger.debug(f"Filtering by acy={acy}")
+    if sem is not None:
+        filters.append(Semester.sem == sem)
+        logger.debug(f"Filtering by sem={sem}")
+
+    # Case-insensitive LIKE filters
+    if dept is not None:
+        filters.append(build_like_filter(Course.dept, dept))
+        logger.debug(f"Filtering by dept LIKE '%{dept}%'")
+
+    if teacher is not None:
+        filters.append(build_like_filter(Course.teacher, teacher))
+        logger.debug(f"Filtering by teacher LIKE '%{teacher}%'")
+
+    # Search query (searches in both name and course number)
+    if q is not None:
+        search_filters = [
+            build_like_filter(Course.name, q),
+            build_like_filter(Course.crs_no, q),
+        ]
+        filters.append(or_(*search_filters))
+        logger.debug(f"Searching for q='{q}' in name and crs_no")
+
+    return statement, filters
+
+
 async def get_all_courses(
     session: AsyncSession,
     acy: Optional[int] = None,
@@ -36,6 +95,7 @@ async def get_all_courses(
     q: Optional[str] = None,
     limit: int = 200,
     offset: int = 0,
+    after: Optional[tuple[str, int]] = None,
 ) -> list[Course]:
     """
     Retrieve courses with optional filtering and pagination.
@@ -55,6 +115,7 @@ async def get_all_courses(
         q: Search query for course name or number (case-insensitive partial match)
         limit: Maximum number of results to return (default: 200)
         offset: Number of results to skip for pagination (default: 0)
+        after: Keyset position (crs_no, id) of the last course already returned
 
     Returns:
         List of course records matching the filters
@@ -73,45 +134,20 @@ async def get_all_courses(
         # Start building the query with joinedload for semester relationship
         statement = select(Course).options(joinedload(Course.semester))
 
-        # Build list of filter conditions
-        filters = []
-
-        # Exact match filters - join with Semester table
-        if acy is not None:
-            statement = statement.join(Semester)
-            filters.append(Semester.acy == acy)
-            logger.debug(f"Filtering by acy={acy}")
-
-        if sem is not None:
-            if acy is None:  # Join only if not already joined
-                statement = statement.join(Semester)
-            filters.append(Semester.sem == sem)
-            logger.debug(f"Filtering by sem={sem}")
-
-        # Case-insensitive LIKE filters
-        if dept is not None:
-            filters.append(build_like_filter(Course.dept, dept))
-            logger.debug(f"Filtering by dept LIKE '%{dept}%'")
+        statement, filters = apply_course_filters(
+            statement, acy=acy, sem=sem, dept=dept, teacher=teacher, q=q
+        )
 
-        if teacher is not None:
-            filters.append(build_like_filter(Course.teacher, teacher))
-            logger.debug(f"Filtering by teacher LIKE '%{teacher}%'")
-
-        # Search query (searches in both name and course number)
-        if q is not None:
-            search_filters = [
-                build_like_filter(Course.name, q),
-                build_like_filter(Course.crs_no, q),
-            ]
-            filters.append(or_(*search_filters))
-            logger.debug(f"Searching for q='{q}' in name and crs_no")
+        # Seek past the last course of the previous page
+        if after is not None:
+            filters.append(keyset_predicate(Course.crs_no, Course.id, after))
 
         # Apply all filters
         if filters:
             statement = statement.where(and_(*filters))
 
-        # Add ordering (by course number for consistent results)
-        statement = statement.order_by(Course.crs_no)
+        # Add ordering (by course number, id breaks ties for stable pages)
+        statement = statement.order_by(Course.crs_no, Course.id)
 
         # Add pagination
         statement = statement.limit(limit).offset(offset)
@@ -134,6 +170,62 @@ async def get_all_courses(
         )
 
 
+async def stream_courses(
+    session: AsyncSession,
+    acy: Optional[int] = None,
+    sem: Optional[int] = None,
+    dept: Optional[str] = None,
+    teacher: Optional[str] = None,
+    q: Optional[str] = None,
+    batch_size: int = 500,
+) -> AsyncIterator[list[Course]]:
+    """
+    Iterate over every course matching the filters in batches.
+
+    Rows are fetched from a server-side cursor ``batch_size`` at a time, so
+    memory use does not grow with the size of the result. The semester
+    relationship is not loaded; use a semester map for acy/sem.
+
+    Args:
+        session: Database session (must stay open while iterating)
+        acy: Filter by academic year (exact match)
+        sem: Filter by semester number (exact match)
+        dept: Filter by department code (case-insensitive partial match)
+        teacher: Filter by teacher name (case-insensitive partial match)
+        q: Search query for course name or number (case-insensitive partial match)
+        batch_size: Number of rows fetched per round trip
+
+    Yields:
+        list[Course]: Next batch of courses, ordered by course number and id
+
+    Raises:
+        DatabaseError: If the query fails
+
+    Example:
+        >>> async for batch in stream_courses(session, acy=113, sem=1):
+        ...     print(len(batch))
+    """
+    statement, filters = apply_course_filters(
+        select(Course), acy=acy, sem=sem, dept=dept, teacher=teacher, q=q
+    )
+    if filters:
+        statement = statement.where(and_(*filters))
+    statement = statement.order_by(Course.crs_no, Course.id).execution_options(
+        yield_per=batch_size
+    )
+
+    try:
+        result = await session.stream_scalars(statement)
+        async for batch in result.partitions():
+            yield batch
+    except Exception as e:
+        logger.error(f"Failed to stream courses: {e}")
+        raise DatabaseError(
+            message="Failed to stream courses",
+            original_error=e,
+        )
+
+
 async def get_course(session: AsyncSession, course_id: int) -> Course:
     """
     Retrieve a single course by its ID.
@@ -307,7 +399,7 @@ async def create_course(
         required: Required/elective status
         dept: Department code
         day_codes: Day codes
-        time_codes: Time codes
+        time_codes: Time codes (the time-slot bitmask is derived from them)
         classroom_codes: Classroom codes
         url: Course URL
         syllabus: Course syllabus/outline
@@ -344,13 +436,13 @@ async def create_course(
             required=required,
             dept=dept,
             day_codes=day_codes,
-            time_codes=time_codes,
             classroom_codes=classroom_codes,
             url=url,
             syllabus=syllabus,
             syllabus_zh=syllabus_zh,
             details=details,
         )
+        course.set_time_codes(time_codes)
         session.add(course)
 
         # Commit and refresh to get the ID
@@ -403,7 +495,7 @@ async def update_course(
         teacher: New instructor name(s)
         credits: New number of credits
         dept: New department code
-        time: New time/schedule code
+        time: New time codes (updates the time-slot bitmask)
         classroom: New classroom location
         details: New JSON string with metadata
 
@@ -437,9 +529,9 @@ async def update_course(
         if dept is not None:
             course.dept = dept
         if time is not None:
-            course.time = time
+            course.set_time_codes(time)
         if classroom is not None:
-            course.classroom = classroom
+            course.classroom_codes = classroom
         if details is not None:
             course.details = details
 
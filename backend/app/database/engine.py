@@ -0,0 +1,189 @@
+"""
+Database engine construction.
+
+``create_database_engine`` builds the async engine with pool sizing chosen
+per backend and, for SQLite, a ``connect`` event hook that applies the
+pragma profile from the settings to every new connection. Pragmas such as
+``cache_size``, ``mmap_size``, ``temp_store`` and ``busy_timeout`` only
+last as long as the connection, so setting them once by hand (as
+scripts/optimize_database.py does) does not reach pooled connections.
+
+Pool defaults per backend:
+
+- SQLite: a few connections, since WAL allows concurrent readers but a
+  single writer
+- PostgreSQL: sized for the k8s deployment (3 replicas x 4 uvicorn
+  workers x (5 + 3) = 96 connections, under the server's default
+  ``max_connections`` of 100)
+
+``DB_POOL_SIZE`` and ``DB_MAX_OVERFLOW`` override them.
+"""
+
+import logging
+from typing import Any, Callable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.config import settings
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Pool sizing per backend (overridden by DB_POOL_SIZE / DB_MAX_OVERFLOW)
+POOL_DEFAULTS = {
+    "sqlite": {"pool_size": 5, "max_overflow": 5},
+    "postgresql": {"pool_size": 5, "max_overflow": 3},
+}
+
+
+def sqlite_pragmas() -> dict[str, Any]:
+    """
+    Get the pragma profile applied to every SQLite connection.
+
+    ``busy_timeout`` comes first, so that switching the journal mode waits
+    for a lock held by another process instead of failing.
+
+    Returns:
+        Dict of pragma name -> value, in the order they are applied
+
+    Raises:
+        ValueError: If a configured value is not a plain word or number
+
+    Example:
+        >>> sqlite_pragmas()["journal_mode"]
+        'WAL'
+    """
+    pragmas = {
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "cache_size": -settings.SQLITE_CACHE_SIZE_KIB,  # negative: KiB, not pages
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "temp_store": settings.SQLITE_TEMP_STORE,
+    }
+    for name, value in pragmas.items():
+        if isinstance(value, str) and not value.isalnum():
+            raise ValueError(f"Invalid value for PRAGMA {name}: {value!r}")
+    return pragmas
+
+
+def _is_memory_database(url: URL) -> bool:
+    """Whether a SQLite URL names an in-memory database."""
+    database = url.database or ""
+    return database in ("", ":memory:") or "mode=memory" in str(url)
+
+
+def pool_options(url: URL | str) -> dict[str, Any]:
+    """
+    Get the connection pool arguments for a database URL.
+
+    In-memory SQLite databases keep SQLAlchemy's single-connection pool,
+    which does not accept sizing arguments.
+
+    Args:
+        url: Database URL
+
+    Returns:
+        Keyword arguments for create_async_engine
+    """
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend == "sqlite" and _is_memory_database(url):
+        return {}
+
+    defaults = POOL_DEFAULTS.get(backend, POOL_DEFAULTS["postgresql"])
+    options = {
+        "pool_size": defaults["pool_size"] if settings.DB_POOL_SIZE is None else settings.DB_POOL_SIZE,
+        "max_overflow": (
+            defaults["max_overflow"] if settings.DB_MAX_OVERFLOW is None else settings.DB_MAX_OVERFLOW
+        ),
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+    }
+    if backend != "sqlite":
+        # Server connections can be closed under us (restarts, idle timeouts)
+        options["pool_recycle"] = settings.DB_POOL_RECYCLE_SECONDS
+        options["pool_pre_ping"] = True
+    return options
+
+
+def _pragma_hook(pragmas: dict[str, Any]) -> Callable:
+    """Build a connect event listener that applies pragmas."""
+    statements = [(name, f"PRAGMA {name}={value}") for name, value in pragmas.items()]
+
+    def apply_pragmas(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, statement in statements:
+                try:
+                    cursor.execute(statement)
+                except Exception as e:
+                    # e.g. WAL on a read-only volume; the connection still works
+                    logger.warning(f"Could not apply PRAGMA {name}: {e}")
+        finally:
+            cursor.close()
+
+    return apply_pragmas
+
+
+def create_database_engine(url: Optional[str] = None, echo: Optional[bool] = None) -> AsyncEngine:
+    """
+    Create the async engine with pool sizing and SQLite pragmas.
+
+    Args:
+        url: Database URL (defaults to DATABASE_URL)
+        echo: Log SQL statements (defaults to SQLALCHEMY_ECHO)
+
+    Returns:
+        AsyncEngine: Configured engine
+
+    Example:
+        >>> engine = create_database_engine("sqlite+aiosqlite:///./courses.db")
+    """
+    url = make_url(url or settings.database_url)
+    engine = create_async_engine(
+        url,
+        echo=settings.sqlalchemy_echo if echo is None else echo,
+        future=True,
+        **pool_options(url),
+    )
+    if url.get_backend_name() == "sqlite":
+        event.listen(engine.sync_engine, "connect", _pragma_hook(sqlite_pragmas()))
+    return engine
+
+
+async def log_engine_settings(engine: AsyncEngine) -> dict[str, Any]:
+    """
+    Log the pool configuration and the pragmas a connection actually has.
+
+    Reading the pragmas back shows values SQLite adjusted or refused, e.g.
+    ``journal_mode`` stays "memory" for an in-memory database.
+
+    Args:
+        engine: Engine created by create_database_engine
+
+    Returns:
+        Dict with backend, pool class, pool options and effective pragmas
+    """
+    url = engine.url
+    effective: dict[str, Any] = {
+        "backend": url.get_backend_name(),
+        "pool": type(engine.pool).__name__,
+        **pool_options(url),
+    }
+    if effective["backend"] == "sqlite":
+        pragmas = {}
+        async with engine.connect() as conn:
+            for name in sqlite_pragmas():
+                pragmas[name] = (await conn.exec_driver_sql(f"PRAGMA {name}")).scalar()
+        effective["pragmas"] = pragmas
+
+    described = ", ".join(
+        f"{name}={value}" for name, value in effective.items() if name != "pragmas"
+    )
+    logger.info(f"Database engine: {described}")
+    if "pragmas" in effective:
+        pragma_list = ", ".join(f"{name}={value}" for name, value in effective["pragmas"].items())
+        logger.info(f"SQLite pragmas: {pragma_list}")
+    return effective
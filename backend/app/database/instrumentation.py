@@ -0,0 +1,401 @@
+"""
+SQL statement instrumentation.
+
+Hooks SQLAlchemy's cursor events on the engine to measure every statement:
+
+- Per request: number of statements, total database time and the slowest
+  statement with its parameters, collected in a ``QueryStats`` object that
+  ``PerformanceMiddleware`` opens for each request (held in a context
+  variable, so concurrent requests never mix) and reports in the
+  ``Server-Timing`` header.
+- Per route: histograms of request time, database time and statement count.
+- Globally: the N slowest statements above ``SLOW_QUERY_THRESHOLD_MS``. Their
+  query plans are captured with ``EXPLAIN QUERY PLAN`` on a separate
+  connection when the log is read, so slow requests pay nothing extra.
+
+Bound parameters hold user input (search terms, user IDs), so they are kept
+in memory only to capture plans; reports and logs show them through
+``redact_parameters``, which keeps their types but not their values.
+"""
+
+import heapq
+import itertools
+import logging
+import time
+from bisect import bisect_left
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.config import settings
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds (the last bucket is unbounded)
+TIME_BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Longest statement / parameter text kept in the slow query log
+MAX_STATEMENT_CHARS = 2000
+MAX_PARAMETER_CHARS = 500
+
+# Key of the start-time stack in Connection.info
+_START_TIMES_KEY = "query_start_times"
+
+
+def redact_parameters(parameters: Any) -> str:
+    """
+    Describe bound parameters without their values.
+
+    Args:
+        parameters: Parameters as passed to the DBAPI cursor (a sequence, a
+            mapping, or a list of either for executemany)
+
+    Returns:
+        str: Parameter types, truncated to MAX_PARAMETER_CHARS
+
+    Example:
+        >>> redact_parameters((113, "資料"))
+        '(int, str)'
+        >>> redact_parameters({"id": 1})
+        '{id: int}'
+    """
+    if isinstance(parameters, list) and parameters and isinstance(parameters[0], (tuple, list, dict)):
+        described = f"{len(parameters)} x {redact_parameters(parameters[0])}"
+    elif isinstance(parameters, dict):
+        described = "{" + ", ".join(f"{key}: {type(value).__name__}" for key, value in parameters.items()) + "}"
+    elif isinstance(parameters, (tuple, list)):
+        described = "(" + ", ".join(type(value).__name__ for value in parameters) + ")"
+    else:
+        described = type(parameters).__name__
+    return described[:MAX_PARAMETER_CHARS]
+
+
+@dataclass
+class QueryStats:
+    """
+    Statements executed while handling one request.
+
+    Attributes:
+        label: Request description used in the slow query log ("GET /path")
+        statements: Number of statements executed
+        db_time: Total statement execution time in seconds
+        slowest_time: Execution time of the slowest statement in seconds
+        slowest_statement: SQL of the slowest statement
+        slowest_parameters: Parameters of the slowest statement
+    """
+
+    label: str = ""
+    statements: int = 0
+    db_time: float = 0.0
+    slowest_time: float = 0.0
+    slowest_statement: Optional[str] = None
+    slowest_parameters: Any = None
+
+    def record(self, elapsed: float, statement: str, parameters: Any) -> None:
+        """
+        Add one executed statement.
+
+        Args:
+            elapsed: Execution time in seconds
+            statement: SQL statement
+            parameters: Bound parameters
+        """
+        self.statements += 1
+        self.db_time += elapsed
+        if elapsed >= self.slowest_time:
+            self.slowest_time = elapsed
+            self.slowest_statement = statement
+            self.slowest_parameters = parameters
+
+    def server_timing(self, total_ms: float) -> str:
+        """
+        Format the stats as a ``Server-Timing`` header value.
+
+        Args:
+            total_ms: Total request time in milliseconds
+
+        Returns:
+            str: e.g. ``db;dur=3.21;desc="4 statements", db-slowest;dur=1.90, total;dur=10.50``
+        """
+        noun = "statement" if self.statements == 1 else "statements"
+        metrics = [f'db;dur={self.db_time * 1000:.2f};desc="{self.statements} {noun}"']
+        if self.statements:
+            metrics.append(f"db-slowest;dur={self.slowest_time * 1000:.2f}")
+        metrics.append(f"total;dur={total_ms:.2f}")
+        return ", ".join(metrics)
+
+
+@dataclass
+class Histogram:
+    """
+    Fixed-bucket histogram (per-bucket counts, not cumulative).
+
+    Attributes:
+        bounds: Bucket upper bounds; values above the last go to an extra bucket
+        counts: Observations per bucket (len(bounds) + 1)
+        count: Number of observations
+        total: Sum of observed values
+    """
+
+    bounds: tuple[float, ...]
+    counts: list[int] = field(default_factory=list)
+    count: int = 0
+    total: float = 0.0
+
+    def __post_init__(self) -> None:
+        """Create the bucket counters."""
+        if not self.counts:
+            self.counts = [0] * (len(self.bounds) + 1)
+
+    def observe(self, value: float) -> None:
+        """
+        Add an observation.
+
+        Args:
+            value: Observed value
+        """
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def to_dict(self) -> dict[str, Any]:
+        """Get the bucket counts keyed by upper bound ("+Inf" for the last)."""
+        labels = [str(bound) for bound in self.bounds] + ["+Inf"]
+        return {
+            "count": self.count,
+            "sum": round(self.total, 3),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+@dataclass
+class RouteStats:
+    """Request, database time and statement count histograms of one route."""
+
+    request_ms: Histogram = field(default_factory=lambda: Histogram(TIME_BUCKETS_MS))
+    db_ms: Histogram = field(default_factory=lambda: Histogram(TIME_BUCKETS_MS))
+    statements: Histogram = field(default_factory=lambda: Histogram(STATEMENT_BUCKETS))
+
+
+@dataclass
+class SlowQuery:
+    """
+    A statement in the slow query log.
+
+    Attributes:
+        duration_ms: Execution time in milliseconds
+        statement: SQL statement (truncated)
+        parameters: Bound parameters (used to capture the plan; reported redacted)
+        request: Request that executed it ("GET /path"), if any
+        executemany: Whether it was executed for many parameter sets
+        recorded_at: Unix time it was executed
+        plan: Query plan lines, captured when the log is read
+    """
+
+    duration_ms: float
+    statement: str
+    parameters: Any
+    request: Optional[str]
+    executemany: bool
+    recorded_at: float
+    plan: Optional[list[str]] = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize the entry for the admin API."""
+        return {
+            "duration_ms": round(self.duration_ms, 3),
+            "statement": self.statement,
+            "parameters": redact_parameters(self.parameters),
+            "request": self.request,
+            "executemany": self.executemany,
+            "recorded_at": self.recorded_at,
+            "plan": self.plan,
+        }
+
+
+_request_stats: ContextVar[Optional[QueryStats]] = ContextVar("request_query_stats", default=None)
+_route_stats: dict[str, RouteStats] = {}
+
+# Min-heap of (duration_ms, sequence, SlowQuery): the root is the fastest kept
+_slow_queries: list[tuple[float, int, SlowQuery]] = []
+_slow_sequence = itertools.count()
+
+_instrumented: set[int] = set()
+
+
+def begin_request_stats(label: str) -> tuple[QueryStats, Token]:
+    """
+    Start collecting the statements of the current request.
+
+    Args:
+        label: Request description ("GET /path")
+
+    Returns:
+        Tuple of (stats object, token for end_request_stats)
+    """
+    stats = QueryStats(label=label)
+    return stats, _request_stats.set(stats)
+
+
+def end_request_stats(token: Token) -> None:
+    """
+    Stop collecting statements for the current request.
+
+    Args:
+        token: Token returned by begin_request_stats
+    """
+    _request_stats.reset(token)
+
+
+def record_route(route: str, duration_ms: float, stats: QueryStats) -> None:
+    """
+    Add a finished request to its route's histograms.
+
+    Args:
+        route: Route key, e.g. "GET /api/courses/{course_id}"
+        duration_ms: Request time in milliseconds
+        stats: Statements of the request
+    """
+    route_stats = _route_stats.get(route)
+    if route_stats is None:
+        route_stats = _route_stats[route] = RouteStats()
+    route_stats.request_ms.observe(duration_ms)
+    route_stats.db_ms.observe(stats.db_time * 1000)
+    route_stats.statements.observe(stats.statements)
+
+
+def _record_slow_query(
+    duration_ms: float, statement: str, parameters: Any, executemany: bool
+) -> None:
+    """Keep a statement if it is among the slowest seen."""
+    size = settings.SLOW_QUERY_LOG_SIZE
+    if size <= 0 or (len(_slow_queries) >= size and duration_ms <= _slow_queries[0][0]):
+        return
+
+    stats = _request_stats.get()
+    entry = SlowQuery(
+        duration_ms=duration_ms,
+        statement=statement[:MAX_STATEMENT_CHARS],
+        parameters=parameters,
+        request=stats.label if stats else None,
+        executemany=executemany,
+        recorded_at=time.time(),
+    )
+    item = (duration_ms, next(_slow_sequence), entry)
+    if len(_slow_queries) < size:
+        heapq.heappush(_slow_queries, item)
+    else:
+        heapq.heapreplace(_slow_queries, item)
+    logger.warning(f"Slow query ({duration_ms:.1f}ms) in {entry.request or 'background'}: {statement[:200]}")
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    """Remember when a statement started."""
+    conn.info.setdefault(_START_TIMES_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    """Record a finished statement."""
+    starts = conn.info.get(_START_TIMES_KEY)
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.record(elapsed, statement, parameters)
+
+    if elapsed * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS:
+        _record_slow_query(elapsed * 1000, statement, parameters, executemany)
+
+
+def _handle_error(exception_context) -> None:
+    """Drop the start time of a statement that failed."""
+    conn = exception_context.connection
+    if conn is not None:
+        starts = conn.info.get(_START_TIMES_KEY)
+        if starts:
+            starts.pop()
+
+
+def instrument_engine(engine: AsyncEngine | Engine) -> None:
+    """
+    Attach the statement hooks to an engine (idempotent).
+
+    Args:
+        engine: Async or sync SQLAlchemy engine
+    """
+    sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+    if id(sync_engine) in _instrumented:
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+    _instrumented.add(id(sync_engine))
+
+
+async def _capture_plans(engine: AsyncEngine, entries: list[SlowQuery]) -> None:
+    """Run EXPLAIN for slow SELECT statements whose plan is not known yet."""
+    pending = [
+        entry for entry in entries
+        if entry.plan is None and not entry.executemany
+        and entry.statement.lstrip().upper().startswith(("SELECT", "WITH"))
+        and len(entry.statement) < MAX_STATEMENT_CHARS
+    ]
+    if not pending:
+        return
+
+    prefix = "EXPLAIN QUERY PLAN " if engine.dialect.name == "sqlite" else "EXPLAIN "
+    async with engine.connect() as conn:
+        for entry in pending:
+            try:
+                result = await conn.exec_driver_sql(prefix + entry.statement, entry.parameters)
+                rows = result.all()
+                # SQLite rows are (id, parent, notused, detail)
+                entry.plan = [
+                    str(row[-1]) if engine.dialect.name == "sqlite" else " ".join(map(str, row))
+                    for row in rows
+                ]
+            except Exception as e:
+                entry.plan = [f"unavailable: {e}"]
+
+
+async def get_query_report(engine: Optional[AsyncEngine] = None) -> dict[str, Any]:
+    """
+    Get the per-route histograms and the slow query log.
+
+    Args:
+        engine: Engine used to capture missing query plans (skipped when None)
+
+    Returns:
+        Dict with the slow query threshold, per-route histograms and the
+        slowest statements first
+    """
+    entries = [entry for _, _, entry in sorted(_slow_queries, reverse=True)]
+    if engine is not None:
+        await _capture_plans(engine, entries)
+
+    return {
+        "slow_query_threshold_ms": settings.SLOW_QUERY_THRESHOLD_MS,
+        "routes": {
+            route: {
+                "request_ms": stats.request_ms.to_dict(),
+                "db_ms": stats.db_ms.to_dict(),
+                "statements": stats.statements.to_dict(),
+            }
+            for route, stats in sorted(_route_stats.items())
+        },
+        "slow_queries": [entry.to_dict() for entry in entries],
+    }
+
+
+def reset_query_stats() -> None:
+    """Clear the per-route histograms and the slow query log."""
+    _route_stats.clear()
+    _slow_queries.clear()
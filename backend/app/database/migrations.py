@@ -0,0 +1,148 @@
+"""
+In-place schema upgrades for existing databases.
+
+``SQLModel.metadata.create_all`` creates missing tables but never adds
+columns to a table that already exists. ``upgrade_schema`` adds the columns
+introduced since a database was created, using only DDL that SQLite and
+PostgreSQL both accept, and ``init_db`` runs it on every startup. It is
+idempotent and safe when several workers start at once: a worker that
+loses the race to add a column finds it present and moves on.
+
+When the time-slot columns are added, the worker that added them fills
+them with ``backfill_time_slots`` (also available as
+scripts/backfill_time_slots.py).
+"""
+
+import json
+import logging
+from typing import Optional
+
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.utils.time_slots import parse_time_codes, slot_days, split_slots
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Columns added after the first release: (table, column, column definition)
+ADDED_COLUMNS = [
+    ("courses", "time_slots_lo", "BIGINT NOT NULL DEFAULT 0"),
+    ("courses", "time_slots_hi", "BIGINT NOT NULL DEFAULT 0"),
+]
+
+# Indexes over added columns (create_all only indexes tables it creates)
+ADDED_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS ix_courses_semester_time_slots "
+    "ON courses (semester_id, time_slots_lo, time_slots_hi)",
+]
+
+# Rows updated per statement by the backfill
+BACKFILL_BATCH_SIZE = 2000
+
+
+def _column_names(sync_conn, table: str) -> set[str]:
+    """Get the column names of a table."""
+    return {column["name"] for column in inspect(sync_conn).get_columns(table)}
+
+
+async def upgrade_schema(engine: AsyncEngine) -> list[str]:
+    """
+    Add missing columns and indexes to existing tables.
+
+    Args:
+        engine: Engine of a database whose tables already exist
+
+    Returns:
+        List of "table.column" names this call added
+
+    Raises:
+        DBAPIError: If a column cannot be added
+    """
+    added = []
+    for table, column, definition in ADDED_COLUMNS:
+        try:
+            async with engine.begin() as conn:
+                if column in await conn.run_sync(_column_names, table):
+                    continue
+                await conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+            added.append(f"{table}.{column}")
+            logger.info(f"Added column {table}.{column}")
+        except DBAPIError:
+            # Another worker may have added it first
+            async with engine.connect() as conn:
+                if column not in await conn.run_sync(_column_names, table):
+                    raise
+
+    async with engine.begin() as conn:
+        for statement in ADDED_INDEXES:
+            await conn.execute(text(statement))
+    return added
+
+
+def raw_time_codes(time_codes: Optional[str], details: Optional[str]) -> Optional[str]:
+    """
+    Pick the undecoded NYCU time codes of a course.
+
+    The scraped ``details`` (``cos_time`` or ``time_classroom``) win, since
+    ``migrate_time_classroom.py`` replaces ``time_codes`` with display text.
+
+    Args:
+        time_codes: The ``time_codes`` column
+        details: The ``details`` column (scraped JSON, possibly double-encoded)
+
+    Returns:
+        Time codes to decode, or None
+    """
+    if details:
+        try:
+            data = json.loads(details)
+            if isinstance(data, str):
+                data = json.loads(data)
+        except (TypeError, ValueError):
+            data = None
+        if isinstance(data, dict):
+            codes = data.get("cos_time") or data.get("time_classroom")
+            if codes and codes != "-":
+                return codes
+    return time_codes
+
+
+async def backfill_time_slots(engine: AsyncEngine) -> tuple[int, int]:
+    """
+    Fill the time-slot columns (and missing day codes) of every course.
+
+    Args:
+        engine: Engine of an upgraded database
+
+    Returns:
+        Tuple of (courses updated, courses with a schedule)
+    """
+    async with engine.begin() as conn:
+        rows = (await conn.execute(
+            text("SELECT id, time_codes, day_codes, details FROM courses")
+        )).all()
+
+        updates = []
+        for course_id, time_codes, day_codes, details in rows:
+            mask = parse_time_codes(raw_time_codes(time_codes, details))
+            low, high = split_slots(mask)
+            updates.append({
+                "id": course_id,
+                "low": low,
+                "high": high,
+                "days": day_codes or slot_days(mask) or None,
+            })
+
+        for offset in range(0, len(updates), BACKFILL_BATCH_SIZE):
+            await conn.execute(
+                text(
+                    "UPDATE courses SET time_slots_lo = :low, time_slots_hi = :high, "
+                    "day_codes = :days WHERE id = :id"
+                ),
+                updates[offset:offset + BACKFILL_BATCH_SIZE],
+            )
+
+    with_slots = sum(1 for update in updates if update["low"] or update["high"])
+    return len(updates), with_slots
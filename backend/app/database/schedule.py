@@ -6,18 +6,22 @@ This module provides CRUD operations for Schedule and ScheduleCourse models.
 
 import logging
 from datetime import datetime
-from typing import Optional
+from typing import Any, Optional
 
-from sqlalchemy import select
+from sqlalchemy import delete, func, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload, selectinload
 
 from app.models.course import Course
 from app.models.schedule import Schedule, ScheduleCourse
 from app.utils.exceptions import DatabaseError, ScheduleNotFound
+from app.utils.time_slots import format_slots, join_slots
 
 logger = logging.getLogger(__name__)
 
+# Course IDs per query when reading time slots
+SLOT_QUERY_CHUNK = 900
+
 
 async def create_schedule(
     session: AsyncSession,
@@ -148,6 +152,93 @@ async def get_user_schedules(
         raise DatabaseError(f"Failed to retrieve schedules: {str(e)}")
 
 
+def _schedule_totals_columns() -> tuple[Any, Any]:
+    """Get the aggregated credit sum and course count of a schedule query."""
+    return (
+        func.coalesce(func.sum(Course.credits), 0.0).label("total_credits"),
+        func.count(ScheduleCourse.id).label("total_courses"),
+    )
+
+
+async def get_user_schedule_summaries(
+    session: AsyncSession,
+    user_id: str,
+    acy: Optional[int] = None,
+    sem: Optional[int] = None,
+) -> list[tuple[Schedule, float, int]]:
+    """
+    Get all schedules for a user with their credit and course totals.
+
+    The totals are aggregated in the same query (one grouped join), so no
+    course rows are loaded.
+
+    Args:
+        session: Database session
+        user_id: User identifier
+        acy: Optional filter by academic year
+        sem: Optional filter by semester
+
+    Returns:
+        List of (Schedule, total credits, total courses), most recently updated first
+
+    Raises:
+        DatabaseError: If database operation fails
+    """
+    try:
+        statement = (
+            select(Schedule, *_schedule_totals_columns())
+            .outerjoin(ScheduleCourse, ScheduleCourse.schedule_id == Schedule.id)
+            .outerjoin(Course, Course.id == ScheduleCourse.course_id)
+            .where(Schedule.user_id == user_id)
+        )
+
+        if acy is not None:
+            statement = statement.where(Schedule.acy == acy)
+        if sem is not None:
+            statement = statement.where(Schedule.sem == sem)
+
+        statement = statement.group_by(Schedule.id).order_by(Schedule.updated_at.desc())
+
+        result = await session.execute(statement)
+        summaries = [(schedule, float(credits), courses) for schedule, credits, courses in result.all()]
+
+        logger.info(f"Retrieved {len(summaries)} schedules for user {user_id}")
+        return summaries
+
+    except Exception as e:
+        logger.error(f"Failed to get schedules for user {user_id}: {e}")
+        raise DatabaseError(f"Failed to retrieve schedules: {str(e)}")
+
+
+async def get_schedule_totals(session: AsyncSession, schedule_id: int) -> tuple[float, int]:
+    """
+    Get the credit and course totals of a schedule, aggregated in SQL.
+
+    Args:
+        session: Database session
+        schedule_id: Schedule ID
+
+    Returns:
+        Tuple of (total credits, total courses)
+
+    Raises:
+        DatabaseError: If database operation fails
+    """
+    try:
+        result = await session.execute(
+            select(*_schedule_totals_columns())
+            .select_from(ScheduleCourse)
+            .join(Course, Course.id == ScheduleCourse.course_id)
+            .where(ScheduleCourse.schedule_id == schedule_id)
+        )
+        credits, courses = result.one()
+        return float(credits), courses
+
+    except Exception as e:
+        logger.error(f"Failed to get totals of schedule {schedule_id}: {e}")
+        raise DatabaseError(f"Failed to retrieve schedule totals: {str(e)}")
+
+
 async def update_schedule(
     session: AsyncSession, schedule_id: int, name: Optional[str] = None
 ) -> Schedule:
@@ -243,7 +334,7 @@ async def add_course_to_schedule(
     """
     try:
         # Verify schedule exists
-        await get_schedule(session, schedule_id)
+        schedule = await get_schedule(session, schedule_id)
 
         # Verify course exists
         course_result = await session.execute(select(Course).where(Course.id == course_id))
@@ -271,7 +362,6 @@ async def add_course_to_schedule(
         session.add(schedule_course)
 
         # Update schedule timestamp
-        schedule = await get_schedule(session, schedule_id)
         schedule.updated_at = datetime.utcnow()
         session.add(schedule)
 
@@ -289,6 +379,159 @@ async def add_course_to_schedule(
         raise DatabaseError(f"Failed to add course to schedule: {str(e)}")
 
 
+async def batch_update_schedule_courses(
+    session: AsyncSession,
+    schedule_id: int,
+    add: list[dict[str, Any]],
+    remove: list[int],
+    reject_on_conflict: bool = False,
+) -> list[dict[str, Any]]:
+    """
+    Add and remove many courses of a schedule in one transaction.
+
+    Removals are applied first, so a section can be swapped for another in
+    one call. The added courses are validated with one ``IN`` query, the
+    schedule's current courses are read with one query, removals are one
+    ``DELETE`` and additions one executemany ``INSERT``; everything is
+    committed once. Items that cannot be applied are reported and skipped.
+
+    Args:
+        session: Database session
+        schedule_id: Schedule ID
+        add: Courses to add, each a dict with course_id and optional color/notes
+        remove: Course IDs to remove
+        reject_on_conflict: Skip added courses clashing with the schedule
+            (after removals) or with earlier added courses
+
+    Returns:
+        Per-item results in request order (removals first), each a dict with
+        course_id, action ("add"/"remove"), status and an optional detail.
+        Statuses: added, removed, not_found, duplicate, conflict, not_in_schedule
+
+    Raises:
+        ScheduleNotFound: If schedule doesn't exist
+        DatabaseError: If database operation fails
+    """
+    try:
+        schedule = await get_schedule(session, schedule_id)
+
+        # Current courses of the schedule with their time slots
+        current_result = await session.execute(
+            select(ScheduleCourse.course_id, Course.time_slots_lo, Course.time_slots_hi)
+            .join(Course, Course.id == ScheduleCourse.course_id)
+            .where(ScheduleCourse.schedule_id == schedule_id)
+        )
+        current = {
+            course_id: join_slots(low, high) for course_id, low, high in current_result.all()
+        }
+
+        # Courses to add that exist, with their time slots
+        add_ids = list(dict.fromkeys(item["course_id"] for item in add))
+        existing: dict[int, int] = {}
+        if add_ids:
+            existing_result = await session.execute(
+                select(Course.id, Course.time_slots_lo, Course.time_slots_hi)
+                .where(Course.id.in_(add_ids))
+            )
+            existing = {
+                course_id: join_slots(low, high) for course_id, low, high in existing_result.all()
+            }
+
+        results: list[dict[str, Any]] = []
+
+        removed_ids: list[int] = []
+        for course_id in remove:
+            if course_id in current and course_id not in removed_ids:
+                removed_ids.append(course_id)
+                results.append({"course_id": course_id, "action": "remove", "status": "removed"})
+            else:
+                results.append({
+                    "course_id": course_id,
+                    "action": "remove",
+                    "status": "not_in_schedule",
+                    "detail": f"Course {course_id} not found in schedule {schedule_id}",
+                })
+        for course_id in removed_ids:
+            del current[course_id]
+
+        now = datetime.utcnow()
+        rows: list[dict[str, Any]] = []
+        for item in add:
+            course_id = item["course_id"]
+            if course_id not in existing:
+                results.append({
+                    "course_id": course_id,
+                    "action": "add",
+                    "status": "not_found",
+                    "detail": f"Course with ID {course_id} not found",
+                })
+                continue
+            if course_id in current:
+                results.append({
+                    "course_id": course_id,
+                    "action": "add",
+                    "status": "duplicate",
+                    "detail": f"Course {course_id} is already in schedule {schedule_id}",
+                })
+                continue
+
+            slots = existing[course_id]
+            if reject_on_conflict and slots:
+                clashing = [other_id for other_id, other_slots in current.items() if other_slots & slots]
+                if clashing:
+                    shared = 0
+                    for other_id in clashing:
+                        shared |= current[other_id] & slots
+                    results.append({
+                        "course_id": course_id,
+                        "action": "add",
+                        "status": "conflict",
+                        "detail": f"Clashes with courses {clashing} at {format_slots(shared)}",
+                    })
+                    continue
+
+            current[course_id] = slots
+            rows.append({
+                "schedule_id": schedule_id,
+                "course_id": course_id,
+                "color": item.get("color"),
+                "notes": item.get("notes"),
+                "added_at": now,
+            })
+            results.append({"course_id": course_id, "action": "add", "status": "added"})
+
+        if not rows and not removed_ids:
+            return results
+
+        if removed_ids:
+            await session.execute(
+                delete(ScheduleCourse).where(
+                    ScheduleCourse.schedule_id == schedule_id,
+                    ScheduleCourse.course_id.in_(removed_ids),
+                )
+            )
+        if rows:
+            await session.execute(insert(ScheduleCourse.__table__), rows)
+
+        # Update schedule timestamp
+        schedule.updated_at = now
+        session.add(schedule)
+
+        await session.commit()
+
+        logger.info(
+            f"Batch updated schedule {schedule_id}: {len(rows)} added, {len(removed_ids)} removed"
+        )
+        return results
+
+    except ScheduleNotFound:
+        raise
+    except Exception as e:
+        await session.rollback()
+        logger.error(f"Failed to batch update courses of schedule {schedule_id}: {e}")
+        raise DatabaseError(f"Failed to batch update schedule courses: {str(e)}")
+
+
 async def remove_course_from_schedule(
     session: AsyncSession, schedule_id: int, course_id: int
 ) -> None:
@@ -306,7 +549,7 @@ async def remove_course_from_schedule(
     """
     try:
         # Verify schedule exists
-        await get_schedule(session, schedule_id)
+        schedule = await get_schedule(session, schedule_id)
 
         # Find schedule course
         result = await session.execute(
@@ -324,7 +567,6 @@ async def remove_course_from_schedule(
         await session.delete(schedule_course)
 
         # Update schedule timestamp
-        schedule = await get_schedule(session, schedule_id)
         schedule.updated_at = datetime.utcnow()
         session.add(schedule)
 
@@ -366,7 +608,7 @@ async def update_schedule_course(
     """
     try:
         # Verify schedule exists
-        await get_schedule(session, schedule_id)
+        schedule = await get_schedule(session, schedule_id)
 
         # Find schedule course
         result = await session.execute(
@@ -389,7 +631,6 @@ async def update_schedule_course(
         session.add(schedule_course)
 
         # Update schedule timestamp
-        schedule = await get_schedule(session, schedule_id)
         schedule.updated_at = datetime.utcnow()
         session.add(schedule)
 
@@ -405,3 +646,145 @@ async def update_schedule_course(
         await session.rollback()
         logger.error(f"Failed to update course {course_id} in schedule {schedule_id}: {e}")
         raise DatabaseError(f"Failed to update course in schedule: {str(e)}")
+
+
+async def get_schedule_course(session: AsyncSession, schedule_course_id: int) -> ScheduleCourse:
+    """
+    Get one schedule course with its course and semester loaded.
+
+    Args:
+        session: Database session
+        schedule_course_id: ScheduleCourse ID
+
+    Returns:
+        ScheduleCourse object
+
+    Raises:
+        DatabaseError: If it doesn't exist or database operation fails
+    """
+    try:
+        result = await session.execute(
+            select(ScheduleCourse)
+            .where(ScheduleCourse.id == schedule_course_id)
+            .options(joinedload(ScheduleCourse.course).joinedload(Course.semester))
+        )
+        schedule_course = result.scalars().first()
+
+    except Exception as e:
+        logger.error(f"Failed to get schedule course {schedule_course_id}: {e}")
+        raise DatabaseError(f"Failed to retrieve schedule course: {str(e)}")
+
+    if not schedule_course:
+        raise DatabaseError(f"Schedule course {schedule_course_id} not found")
+    return schedule_course
+
+
+async def get_schedule_course_slots(session: AsyncSession, schedule_id: int) -> dict[int, int]:
+    """
+    Get the time-slot bitmask of every course in a schedule.
+
+    Args:
+        session: Database session
+        schedule_id: Schedule ID
+
+    Returns:
+        Dict of course ID -> time-slot bitmask, in the order courses were added
+
+    Raises:
+        ScheduleNotFound: If schedule doesn't exist
+        DatabaseError: If database operation fails
+    """
+    try:
+        await get_schedule(session, schedule_id)
+
+        result = await session.execute(
+            select(Course.id, Course.time_slots_lo, Course.time_slots_hi)
+            .join(ScheduleCourse, ScheduleCourse.course_id == Course.id)
+            .where(ScheduleCourse.schedule_id == schedule_id)
+            .order_by(ScheduleCourse.id)
+        )
+        return {course_id: join_slots(low, high) for course_id, low, high in result.all()}
+
+    except ScheduleNotFound:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to get time slots of schedule {schedule_id}: {e}")
+        raise DatabaseError(f"Failed to retrieve schedule time slots: {str(e)}")
+
+
+async def get_course_slots(session: AsyncSession, course_ids: list[int]) -> dict[int, int]:
+    """
+    Get the time-slot bitmasks of many courses.
+
+    Only the two bitmask columns are read, in chunks that stay below
+    SQLite's bound-parameter limit.
+
+    Args:
+        session: Database session
+        course_ids: Course IDs
+
+    Returns:
+        Dict of course ID -> time-slot bitmask (unknown IDs are absent)
+
+    Raises:
+        DatabaseError: If database operation fails
+    """
+    slots: dict[int, int] = {}
+    unique_ids = list(dict.fromkeys(course_ids))
+    try:
+        for start in range(0, len(unique_ids), SLOT_QUERY_CHUNK):
+            result = await session.execute(
+                select(Course.id, Course.time_slots_lo, Course.time_slots_hi)
+                .where(Course.id.in_(unique_ids[start:start + SLOT_QUERY_CHUNK]))
+            )
+            for course_id, low, high in result.all():
+                slots[course_id] = join_slots(low, high)
+        return slots
+
+    except Exception as e:
+        logger.error(f"Failed to get time slots of {len(unique_ids)} courses: {e}")
+        raise DatabaseError(f"Failed to retrieve course time slots: {str(e)}")
+
+
+async def get_course_sections(
+    session: AsyncSession, semester_id: int, crs_nos: list[str]
+) -> dict[str, list[tuple[int, int, float]]]:
+    """
+    Get the sections of courses by course number, for the timetable generator.
+
+    Every course row of the semester sharing a course number is a section;
+    only the columns the search needs are read.
+
+    Args:
+        session: Database session
+        semester_id: Semester ID
+        crs_nos: Course numbers
+
+    Returns:
+        Dict of course number -> list of (course ID, time-slot bitmask, credits)
+        ordered by course ID (unknown numbers are absent)
+
+    Raises:
+        DatabaseError: If database operation fails
+    """
+    sections: dict[str, list[tuple[int, int, float]]] = {}
+    unique_nos = list(dict.fromkeys(crs_nos))
+    try:
+        for start in range(0, len(unique_nos), SLOT_QUERY_CHUNK):
+            result = await session.execute(
+                select(
+                    Course.crs_no, Course.id, Course.time_slots_lo, Course.time_slots_hi, Course.credits
+                )
+                .where(
+                    Course.semester_id == semester_id,
+                    Course.crs_no.in_(unique_nos[start:start + SLOT_QUERY_CHUNK]),
+                )
+                .order_by(Course.id)
+            )
+            for crs_no, course_id, low, high, credits in result.all():
+                sections.setdefault(crs_no, []).append((course_id, join_slots(low, high), credits or 0.0))
+        return sections
+
+    except Exception as e:
+        logger.error(f"Failed to get sections of {len(unique_nos)} course numbers: {e}")
+        raise DatabaseError(f"Failed to retrieve course sections: {str(e)}")
@@ -4,18 +4,31 @@ Database session management module.
 This module handles SQLAlchemy session creation and lifecycle management.
 """
 
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import sessionmaker
 from sqlmodel import SQLModel
 
 from app.config import settings
+from app.database.engine import create_database_engine, log_engine_settings
+from app.database.instrumentation import instrument_engine
+from app.database.migrations import backfill_time_slots, upgrade_schema
+from app.utils.metrics import instrument_pool
 
-# Create async engine
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.sqlalchemy_echo,
-    future=True,
-)
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Create async engine (pool sizing and SQLite pragmas, see app.database.engine)
+engine = create_database_engine(settings.database_url)
+
+# Count and time statements per request (see app.database.instrumentation)
+if settings.QUERY_STATS_ENABLED:
+    instrument_engine(engine)
+
+# Count pool checkouts for /metrics
+if settings.METRICS_ENABLED:
+    instrument_pool(engine)
 
 # Create async session factory
 async_session = sessionmaker(
@@ -27,10 +40,17 @@ async_session = sessionmaker(
 
 
 async def init_db() -> None:
-    """Initialize database tables."""
+    """Initialize database tables, upgrade older schemas and log the engine settings."""
     async with engine.begin() as conn:
         await conn.run_sync(SQLModel.metadata.create_all)
 
+    # create_all does not add columns to existing tables
+    added = await upgrade_schema(engine)
+    if any(column.startswith("courses.time_slots") for column in added):
+        updated, with_slots = await backfill_time_slots(engine)
+        logger.info(f"Backfilled time slots of {updated} courses ({with_slots} with a schedule)")
+    await log_engine_settings(engine)
+
 
 async def get_session() -> AsyncSession:
     """
@@ -9,12 +9,23 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import ORJSONResponse
+from fastapi.responses import ORJSONResponse, Response
 
 from app.config import settings
-from app.database.session import init_db, close_db
-from app.routes import courses, semesters, advanced_search, search, schedules
+from app.database.session import async_session, init_db, close_db
+from app.routes import admin, courses, semesters, advanced_search, search, schedules
 from app.middleware.performance import setup_performance_middleware
+from app.search.autocomplete import build_autocomplete_index
+from app.search.engine import build_search_engine
+from app.utils.cache import (
+    close_cache_backend,
+    configure_cache_backend,
+    start_cache_sweeper,
+    stop_cache_sweeper,
+)
+from app.utils.metrics import CONTENT_TYPE, render_metrics
+from app.utils.rate_limit import close_rate_limiter, configure_rate_limiter
+from app.utils.workers import start_worker_pool, stop_worker_pool
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -37,10 +48,31 @@ async def lifespan(app: FastAPI):
         logger.error(f"Failed to initialize database: {e}")
         raise
 
+    # Build the in-memory search engine and autocomplete index; both fall
+    # back to SQL without them
+    async with async_session() as session:
+        await build_search_engine(session)
+        await build_autocomplete_index(session)
+
+    # Connect the shared cache (falls back to memory) and expire cached
+    # results that are never read again
+    await configure_cache_backend()
+    start_cache_sweeper()
+
+    # Rate limit store (falls back to per-process limits)
+    await configure_rate_limiter()
+
+    # Worker processes for CPU-bound work (timetable generation)
+    start_worker_pool()
+
     yield
 
     # Shutdown
     logger.info("Shutting down NYCU Course Platform API...")
+    await stop_worker_pool()
+    await stop_cache_sweeper()
+    await close_cache_backend()
+    await close_rate_limiter()
     try:
         await close_db()
         logger.info("Database connection closed")
@@ -67,6 +99,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Setup performance middleware (compression, rate limiting, monitoring)
@@ -74,10 +107,13 @@ setup_performance_middleware(app)
 
 # Include routers
 app.include_router(semesters.router, prefix="/api/semesters", tags=["semesters"])
-app.include_router(courses.router, prefix="/api/courses", tags=["courses"])
+# Search routes first so fixed paths (/search, /autocomplete, ...) are not
+# captured by GET /api/courses/{course_id}
 app.include_router(search.router, prefix="/api/courses", tags=["search"])
+app.include_router(courses.router, prefix="/api/courses", tags=["courses"])
 app.include_router(advanced_search.router, prefix="/api/advanced", tags=["advanced"])
 app.include_router(schedules.router, prefix="/api/schedules", tags=["schedules"])
+app.include_router(admin.router, prefix="/api/admin", tags=["admin"])
 
 
 @app.get("/", tags=["root"])
@@ -111,6 +147,18 @@ async def health_check() -> dict:
     }
 
 
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics() -> Response:
+        """
+        Prometheus metrics endpoint.
+
+        Returns:
+            Response: Metrics in the text exposition format
+        """
+        return Response(content=render_metrics(), media_type=CONTENT_TYPE)
+
+
 # Error handlers (can be extended)
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc):
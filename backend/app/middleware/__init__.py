@@ -2,16 +2,20 @@
 Middleware module for performance and security enhancements.
 """
 
+from app.middleware.metrics import MetricsMiddleware
 from app.middleware.performance import (
     CacheControlMiddleware,
+    PerformanceMiddleware,
     PerformanceMonitoringMiddleware,
     RateLimitMiddleware,
     setup_performance_middleware,
 )
 
 __all__ = [
+    "PerformanceMiddleware",
     "RateLimitMiddleware",
     "PerformanceMonitoringMiddleware",
     "CacheControlMiddleware",
+    "MetricsMiddleware",
     "setup_performance_middleware",
 ]
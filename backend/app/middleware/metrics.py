@@ -0,0 +1,101 @@
+"""
+Request metrics middleware.
+
+A pure ASGI middleware (no ``BaseHTTPMiddleware`` task or stream per
+request) that feeds the HTTP metrics of ``app.utils.metrics``: requests by
+route and status, latency and response size histograms and the number of
+requests in flight.
+"""
+
+import time
+from typing import Any
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.metrics import (
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUESTS,
+    HTTP_REQUESTS_IN_PROGRESS,
+    HTTP_RESPONSE_SIZE,
+)
+
+
+def route_template(scope: Scope) -> str:
+    """
+    Get the path template of the route that handled a request.
+
+    Routers included with a prefix may report their path relative to it;
+    the prefix is then the leading part of the URL the template does not
+    cover. Using the template keeps /api/courses/1 and /2 in one series.
+
+    Args:
+        scope: ASGI scope after the request was routed
+
+    Returns:
+        str: Template such as "/api/courses/{course_id}", or "unmatched"
+    """
+    template = getattr(scope.get("route"), "path", None)
+    if template is None:
+        return "unmatched"
+    path_segments = scope["path"].rstrip("/").split("/")
+    template_depth = sum(1 for segment in template.split("/") if segment)
+    return "/".join(path_segments[:len(path_segments) - template_depth]) + template
+
+
+class MetricsMiddleware:
+    """
+    Record request metrics.
+
+    Should be the outermost middleware so that rejected requests (rate
+    limit) are counted too and response sizes are the bytes actually sent.
+    """
+
+    def __init__(self, app: ASGIApp):
+        """
+        Initialize the middleware.
+
+        Args:
+            app: ASGI application to wrap
+        """
+        self.app = app
+        # (method, route, status) -> metric children, to skip label lookups
+        self._series: dict[tuple[str, str, int], tuple[Any, Any, Any]] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle one ASGI connection."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        body_size = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, body_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                body_size += len(message.get("body", b""))
+            await send(message)
+
+        HTTP_REQUESTS_IN_PROGRESS.inc()
+        start_time = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start_time
+            HTTP_REQUESTS_IN_PROGRESS.dec()
+
+            key = (scope["method"], route_template(scope), status_code)
+            series = self._series.get(key)
+            if series is None:
+                method, route, status = key
+                series = self._series[key] = (
+                    HTTP_REQUESTS.labels(method, route, str(status)),
+                    HTTP_REQUEST_DURATION.labels(method, route),
+                    HTTP_RESPONSE_SIZE.labels(method, route),
+                )
+            requests, durations, sizes = series
+            requests.inc()
+            durations.observe(duration)
+            sizes.observe(body_size)
@@ -2,57 +2,139 @@
 Performance Middleware for FastAPI.
 
 Provides:
-- Response compression (gzip)
+- Response compression (br, zstd, gzip; see app.utils.compression)
+- Conditional GET (weak ETags from the data version, 304 Not Modified)
 - Request rate limiting
 - Query timeout handling
 - Performance monitoring
+- Request metrics (see app.middleware.metrics)
+
+``setup_performance_middleware`` installs ``PerformanceMiddleware``, which
+does rate limiting, monitoring, cache headers and compression in a single
+pure ASGI layer. The separate ``BaseHTTPMiddleware`` classes remain for
+apps that compose them individually (and for scripts/benchmark_middleware.py).
 """
 
 import logging
+import math
 import time
-from collections import defaultdict
-from typing import Callable
+import zlib
+from typing import Callable, Optional
 
 from fastapi import Request, Response, status
 from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers, MutableHeaders
 from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.middleware.gzip import GZipMiddleware
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.database.instrumentation import (
+    QueryStats,
+    begin_request_stats,
+    end_request_stats,
+    record_route,
+    redact_parameters,
+)
+from app.middleware.metrics import MetricsMiddleware, route_template
+from app.utils.cache import get_data_etag
+from app.utils.compression import CompressedBodyCache, choose_encoding, get_compressed_body_cache
+from app.utils.metrics import RATE_LIMIT_REJECTIONS
+from app.utils.rate_limit import RateLimiter, get_rate_limiter, route_cost
+from app.utils.snapshots import parse_accept_encoding
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Paths that are never rate limited
+RATE_LIMIT_EXEMPT_PATHS = frozenset({"/health", "/metrics", "/", "/docs", "/openapi.json", "/redoc"})
+
+# Cache max-age in seconds per path prefix (first match wins)
+DEFAULT_CACHE_POLICIES = {
+    "/api/semesters": 3600,  # 1 hour - semesters rarely change
+    "/api/courses": 300,  # 5 minutes
+    "/api/advanced": 300,  # 5 minutes
+}
+
+# Path prefixes whose GET responses follow the data version (see get_data_etag)
+CONDITIONAL_GET_PATHS = ("/api/courses", "/api/semesters", "/api/advanced")
+
+# Media types that are already compressed or must not be buffered
+UNCOMPRESSED_MEDIA_TYPES = (
+    "image/", "video/", "audio/", "font/woff",
+    "application/zip", "application/gzip", "text/event-stream",
+)
+
+
+async def check_rate_limit(
+    scope: Scope,
+    rate_limiter: Optional[RateLimiter] = None,
+    route_costs: Optional[dict[str, int]] = None,
+) -> tuple[list[tuple[str, str]], Optional[JSONResponse]]:
+    """
+    Count a request against its client's rate limit.
+
+    Args:
+        scope: ASGI scope of the request
+        rate_limiter: Limiter to use (defaults to the process-wide one)
+        route_costs: Request cost per path prefix (defaults to RATE_LIMIT_ROUTE_COSTS)
+
+    Returns:
+        Tuple of (rate limit headers for an allowed request, 429 response or None)
+    """
+    client = scope.get("client")
+    client_ip = client[0] if client else "unknown"
+    path = scope["path"]
+    limiter = get_rate_limiter() if rate_limiter is None else rate_limiter
+
+    result = await limiter.hit(client_ip, route_cost(path, route_costs))
+    reset_at = str(int(time.time() + result.reset_after))
+    if result.allowed:
+        return [
+            ("X-RateLimit-Limit", str(result.limit)),
+            ("X-RateLimit-Remaining", str(result.remaining)),
+            ("X-RateLimit-Reset", reset_at),
+        ], None
+
+    retry_after = max(math.ceil(result.retry_after), 1)
+    RATE_LIMIT_REJECTIONS.inc()
+    logger.warning(f"Rate limit exceeded for {client_ip} on {path}")
+    return [], JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={"detail": "Rate limit exceeded", "retry_after": retry_after},
+        headers={
+            "Retry-After": str(retry_after),
+            "X-RateLimit-Limit": str(result.limit),
+            "X-RateLimit-Remaining": "0",
+            "X-RateLimit-Reset": reset_at,
+        },
+    )
+
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
     """
     Rate limiting middleware.
 
-    Implements token bucket algorithm for request rate limiting.
+    Applies the sliding window limits of app.utils.rate_limit per client IP.
     """
 
     def __init__(
         self,
         app,
-        requests_per_minute: int = 60,
-        burst_size: int = 10,
+        rate_limiter: Optional[RateLimiter] = None,
+        route_costs: Optional[dict[str, int]] = None,
     ):
         """
         Initialize rate limiter.
 
         Args:
             app: FastAPI application
-            requests_per_minute: Maximum requests per minute per IP
-            burst_size: Maximum burst requests allowed
+            rate_limiter: Limiter to use (defaults to the process-wide one)
+            route_costs: Request cost per path prefix (defaults to RATE_LIMIT_ROUTE_COSTS)
         """
         super().__init__(app)
-        self.requests_per_minute = requests_per_minute
-        self.burst_size = burst_size
-
-        # Storage for rate limit data per IP
-        # Format: {ip: {"tokens": float, "last_update": float}}
-        self.rate_data = defaultdict(lambda: {
-            "tokens": burst_size,
-            "last_update": time.time()
-        })
+        self.rate_limiter = rate_limiter
+        self.route_costs = route_costs
 
     async def dispatch(
         self,
@@ -69,71 +151,32 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         Returns:
             Response object
         """
-        # Get client IP
-        client_ip = request.client.host if request.client else "unknown"
-
         # Skip rate limiting for health check endpoints
-        if request.url.path in ["/health", "/", "/docs", "/openapi.json", "/redoc"]:
+        if request.url.path in RATE_LIMIT_EXEMPT_PATHS:
             return await call_next(request)
 
-        # Update token bucket
-        current_time = time.time()
-        data = self.rate_data[client_ip]
-
-        # Calculate tokens to add based on time elapsed
-        time_elapsed = current_time - data["last_update"]
-        tokens_to_add = time_elapsed * (self.requests_per_minute / 60.0)
-
-        # Update tokens (capped at burst_size)
-        data["tokens"] = min(
-            self.burst_size,
-            data["tokens"] + tokens_to_add
+        headers, rejection = await check_rate_limit(
+            request.scope, self.rate_limiter, self.route_costs
         )
-        data["last_update"] = current_time
-
-        # Check if request is allowed
-        if data["tokens"] >= 1:
-            # Consume one token
-            data["tokens"] -= 1
+        if rejection is not None:
+            return rejection
 
-            # Process request
-            response = await call_next(request)
-
-            # Add rate limit headers
-            response.headers["X-RateLimit-Limit"] = str(self.requests_per_minute)
-            response.headers["X-RateLimit-Remaining"] = str(int(data["tokens"]))
-            response.headers["X-RateLimit-Reset"] = str(
-                int(current_time + (60 - (data["tokens"] / self.requests_per_minute * 60)))
-            )
-
-            return response
-        else:
-            # Rate limit exceeded
-            retry_after = int((1 - data["tokens"]) / (self.requests_per_minute / 60.0))
-
-            logger.warning(
-                f"Rate limit exceeded for {client_ip} on {request.url.path}"
-            )
+        response = await call_next(request)
 
-            return JSONResponse(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                content={
-                    "detail": "Rate limit exceeded",
-                    "retry_after": retry_after
-                },
-                headers={
-                    "Retry-After": str(retry_after),
-                    "X-RateLimit-Limit": str(self.requests_per_minute),
-                    "X-RateLimit-Remaining": "0",
-                }
-            )
+        # Add rate limit headers
+        for name, value in headers:
+            response.headers[name] = value
+        return response
 
 
 class PerformanceMonitoringMiddleware(BaseHTTPMiddleware):
     """
     Performance monitoring middleware.
 
-    Tracks request duration and logs slow queries.
+    Tracks request duration and the SQL statements of each request (see
+    app.database.instrumentation), reports both in the ``Server-Timing``
+    header, adds them to per-route histograms and logs slow requests.
+    Statements run while a streaming body is sent are not included.
     """
 
     def __init__(
@@ -167,9 +210,13 @@ class PerformanceMonitoringMiddleware(BaseHTTPMiddleware):
             Response object with performance headers
         """
         start_time = time.time()
+        stats, token = begin_request_stats(f"{request.method} {request.url.path}")
 
         # Process request
-        response = await call_next(request)
+        try:
+            response = await call_next(request)
+        finally:
+            end_request_stats(token)
 
         # Calculate duration
         duration = time.time() - start_time
@@ -177,13 +224,23 @@ class PerformanceMonitoringMiddleware(BaseHTTPMiddleware):
 
         # Add performance headers
         response.headers["X-Process-Time"] = f"{duration_ms:.2f}ms"
+        response.headers["Server-Timing"] = stats.server_timing(duration_ms)
+
+        # Aggregate per route template, so /api/courses/1 and /2 share one entry
+        record_route(f"{request.method} {route_template(request.scope)}", duration_ms, stats)
 
         # Log slow requests
         if duration > self.slow_request_threshold:
             logger.warning(
                 f"Slow request: {request.method} {request.url.path} "
-                f"took {duration_ms:.2f}ms"
+                f"took {duration_ms:.2f}ms ({stats.statements} statements, "
+                f"{stats.db_time * 1000:.2f}ms in database)"
             )
+            if stats.slowest_statement:
+                logger.warning(
+                    f"Slowest statement ({stats.slowest_time * 1000:.2f}ms): "
+                    f"{stats.slowest_statement[:500]} with {redact_parameters(stats.slowest_parameters)}"
+                )
 
         # Log all requests
         logger.info(
@@ -257,6 +314,302 @@ class CacheControlMiddleware(BaseHTTPMiddleware):
         return response
 
 
+class PerformanceMiddleware:
+    """
+    Rate limiting, timing, cache headers and compression in one pure ASGI middleware.
+
+    Replaces the stack of RateLimitMiddleware, PerformanceMonitoringMiddleware,
+    CacheControlMiddleware and GZipMiddleware. Each ``BaseHTTPMiddleware``
+    runs the rest of the app in another task and passes the response
+    through a memory stream; here the response messages are rewritten in a
+    single pass as the app sends them, so streamed responses stay streamed.
+
+    Complete bodies are compressed with the best encoding the client
+    accepts (br, zstd or gzip, see app.utils.compression) through a cache of
+    compressed bodies, so an unchanged course list is compressed once per
+    encoding rather than on every request. Streamed bodies are gzipped
+    chunk by chunk.
+
+    GET responses under ``conditional_paths`` carry a weak ETag derived from
+    the data version (``app.utils.cache.get_data_etag``). A request whose
+    If-None-Match still names the current version is answered with 304
+    before it reaches the routes, so it costs no database query at all.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        rate_limiter: Optional[RateLimiter] = None,
+        route_costs: Optional[dict[str, int]] = None,
+        rate_limit_enabled: bool = True,
+        slow_request_threshold_ms: float = 1000.0,
+        default_max_age: int = 300,
+        cache_policies: Optional[dict[str, int]] = None,
+        minimum_size: int = 1000,
+        compresslevel: int = 6,
+        body_cache: Optional[CompressedBodyCache] = None,
+        conditional_paths: Optional[tuple[str, ...]] = None,
+    ):
+        """
+        Initialize the middleware.
+
+        Args:
+            app: ASGI application to wrap
+            rate_limiter: Limiter to use (defaults to the process-wide one)
+            route_costs: Request cost per path prefix (defaults to RATE_LIMIT_ROUTE_COSTS)
+            rate_limit_enabled: Whether to limit request rates at all
+            slow_request_threshold_ms: Threshold for logging slow requests (ms)
+            default_max_age: Cache max-age of GET responses without a policy
+            cache_policies: Cache max-age per path prefix
+            minimum_size: Smallest response body compressed (bytes)
+            compresslevel: Gzip compression level (1-9)
+            body_cache: Cache of compressed bodies (defaults to the process-wide one)
+            conditional_paths: Path prefixes answered with data version ETags
+                (defaults to CONDITIONAL_GET_PATHS, () disables conditional GET)
+        """
+        self.app = app
+        self.rate_limiter = rate_limiter
+        self.route_costs = route_costs
+        self.rate_limit_enabled = rate_limit_enabled
+        self.slow_request_threshold = slow_request_threshold_ms / 1000.0
+        self.default_max_age = default_max_age
+        self.cache_policies = DEFAULT_CACHE_POLICIES if cache_policies is None else cache_policies
+        self.minimum_size = minimum_size
+        self.compresslevel = compresslevel
+        self.body_cache = get_compressed_body_cache() if body_cache is None else body_cache
+        self.conditional_paths = CONDITIONAL_GET_PATHS if conditional_paths is None else conditional_paths
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handle one ASGI connection."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        path = scope["path"]
+
+        # Rate limiting
+        extra_headers: list[tuple[str, str]] = []
+        if self.rate_limit_enabled and path not in RATE_LIMIT_EXEMPT_PATHS:
+            extra_headers, rejection = await check_rate_limit(scope, self.rate_limiter, self.route_costs)
+            if rejection is not None:
+                await rejection(scope, receive, send)
+                return
+
+        # Cache headers for GET requests
+        if method == "GET":
+            extra_headers.append(("Cache-Control", f"public, max-age={self._max_age(path)}"))
+
+        request_headers = Headers(scope=scope)
+        start_time = time.perf_counter()
+
+        # Conditional GET: the data version decides, before any query runs
+        etag = None
+        if method in ("GET", "HEAD") and self.conditional_paths and path.startswith(self.conditional_paths):
+            etag = get_data_etag()
+            if _etag_matches(request_headers.get("if-none-match"), etag) and _matches_route(scope):
+                await _send_not_modified(send, etag, extra_headers)
+                duration_ms = (time.perf_counter() - start_time) * 1000
+                logger.info(f"{method} {path} - 304 - {duration_ms:.2f}ms")
+                return
+
+        stats, token = begin_request_stats(f"{method} {path}")
+        responder = _Responder(
+            self, scope, send, start_time, stats, extra_headers,
+            request_headers.get("accept-encoding"), etag,
+        )
+        try:
+            await self.app(scope, receive, responder.send)
+        finally:
+            end_request_stats(token)
+
+        duration = time.perf_counter() - start_time
+        duration_ms = duration * 1000
+
+        # Aggregate per route template, so /api/courses/1 and /2 share one entry
+        record_route(f"{method} {route_template(scope)}", duration_ms, stats)
+
+        # Log slow requests
+        if duration > self.slow_request_threshold:
+            logger.warning(
+                f"Slow request: {method} {path} "
+                f"took {duration_ms:.2f}ms ({stats.statements} statements, "
+                f"{stats.db_time * 1000:.2f}ms in database)"
+            )
+            if stats.slowest_statement:
+                logger.warning(
+                    f"Slowest statement ({stats.slowest_time * 1000:.2f}ms): "
+                    f"{stats.slowest_statement[:500]} with {redact_parameters(stats.slowest_parameters)}"
+                )
+
+        # Log all requests
+        logger.info(f"{method} {path} - {responder.status_code} - {duration_ms:.2f}ms")
+
+    def _max_age(self, path: str) -> int:
+        """Get the cache max-age of a path."""
+        for path_prefix, age in self.cache_policies.items():
+            if path.startswith(path_prefix):
+                return age
+        return self.default_max_age
+
+
+class _Responder:
+    """
+    Rewrites the response messages of one request.
+
+    Adds the timing, rate limit and cache headers to the response start and
+    compresses the body. The start message is held back until the first
+    body chunk shows whether the response is worth compressing.
+    """
+
+    __slots__ = (
+        "middleware", "scope", "downstream", "start_time", "stats", "extra_headers",
+        "accept_encoding", "etag", "status_code", "pending_start", "compressor",
+    )
+
+    def __init__(
+        self,
+        middleware: PerformanceMiddleware,
+        scope: Scope,
+        downstream: Send,
+        start_time: float,
+        stats: QueryStats,
+        extra_headers: list[tuple[str, str]],
+        accept_encoding: Optional[str],
+        etag: Optional[str] = None,
+    ):
+        self.middleware = middleware
+        self.scope = scope
+        self.downstream = downstream
+        self.start_time = start_time
+        self.stats = stats
+        self.extra_headers = extra_headers
+        self.accept_encoding = accept_encoding
+        self.etag = etag
+        self.status_code = 500
+        self.pending_start: Optional[Message] = None
+        self.compressor = None
+
+    async def send(self, message: Message) -> None:
+        """Send one response message, rewritten."""
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            self.status_code = message["status"]
+            duration_ms = (time.perf_counter() - self.start_time) * 1000
+            headers = MutableHeaders(scope=message)
+            headers["X-Process-Time"] = f"{duration_ms:.2f}ms"
+            headers["Server-Timing"] = self.stats.server_timing(duration_ms)
+            for name, value in self.extra_headers:
+                headers[name] = value
+            # Routes with their own validators (the snapshots) keep them
+            if self.etag is not None and self.status_code == 200 and "etag" not in headers:
+                headers["ETag"] = self.etag
+            _add_vary(headers)
+
+            if self.accept_encoding and self._compressible(headers):
+                self.pending_start = message
+                return
+            await self.downstream(message)
+            return
+
+        if message_type == "http.response.body" and self.compressor is not None:
+            body = self.compressor.compress(message.get("body", b""))
+            if not message.get("more_body", False):
+                body += self.compressor.flush()
+            message["body"] = body
+            await self.downstream(message)
+            return
+
+        start = self.pending_start
+        if message_type != "http.response.body" or start is None:
+            if start is not None:
+                self.pending_start = None
+                await self.downstream(start)
+            await self.downstream(message)
+            return
+
+        # First body chunk of a compressible response
+        self.pending_start = None
+        body = message.get("body", b"")
+        headers = MutableHeaders(scope=start)
+        if message.get("more_body", False):
+            # Streamed: gzip chunk by chunk, the length is not known in advance
+            if "gzip" in parse_accept_encoding(self.accept_encoding):
+                self.compressor = zlib.compressobj(self.middleware.compresslevel, zlib.DEFLATED, 31)
+                headers["Content-Encoding"] = "gzip"
+                if "content-length" in headers:
+                    del headers["Content-Length"]
+                _weaken_etag(headers)
+                message["body"] = self.compressor.compress(body)
+        elif len(body) >= self.middleware.minimum_size:
+            encoding = choose_encoding(self.accept_encoding)
+            if encoding is not None:
+                message["body"] = await self.middleware.body_cache.get(
+                    body, encoding, self.middleware.compresslevel
+                )
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(message["body"]))
+                _weaken_etag(headers)
+        await self.downstream(start)
+        await self.downstream(message)
+
+    def _compressible(self, headers: MutableHeaders) -> bool:
+        """Whether the response may be compressed."""
+        if "content-encoding" in headers or self.status_code in (204, 206, 304):
+            return False
+        media_type = headers.get("content-type", "").lower()
+        return not media_type.startswith(UNCOMPRESSED_MEDIA_TYPES)
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check If-None-Match against a weak ETag (weak comparison, RFC 9110 13.1.2).
+
+    "*" is not honoured, since without running the route it is unknown
+    whether the resource exists.
+    """
+    if not if_none_match:
+        return False
+    opaque_tag = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque_tag for tag in if_none_match.split(","))
+
+
+def _matches_route(scope: Scope) -> bool:
+    """Whether a route of the application fully matches the request (e.g. not a 404 or 405)."""
+    router = getattr(scope.get("app"), "router", None)
+    if router is None:
+        return False
+    return any(route.matches(scope)[0] == Match.FULL for route in router.routes)
+
+
+async def _send_not_modified(send: Send, etag: str, extra_headers: list[tuple[str, str]]) -> None:
+    """Send a bodiless 304 with the headers the full response would carry."""
+    headers = MutableHeaders()
+    for name, value in extra_headers:
+        headers[name] = value
+    headers["ETag"] = etag
+    headers["Vary"] = "Accept-Encoding"
+    await send({"type": "http.response.start", "status": 304, "headers": headers.raw})
+    await send({"type": "http.response.body", "body": b""})
+
+
+def _weaken_etag(headers: MutableHeaders) -> None:
+    """Mark a strong ETag weak, since the compressed bytes differ from the original."""
+    etag = headers.get("etag")
+    if etag is not None and not etag.startswith("W/"):
+        headers["ETag"] = f"W/{etag}"
+
+
+def _add_vary(headers: MutableHeaders) -> None:
+    """Make caches key responses by Accept-Encoding."""
+    vary = headers.get("vary")
+    if vary is None:
+        headers["Vary"] = "Accept-Encoding"
+    elif "accept-encoding" not in vary.lower():
+        headers["Vary"] = f"{vary}, Accept-Encoding"
+
+
 def setup_performance_middleware(app):
     """
     Setup all performance middleware on the FastAPI app.
@@ -264,30 +617,19 @@ def setup_performance_middleware(app):
     Args:
         app: FastAPI application instance
     """
-    # Add gzip compression (should be first to compress other middleware responses)
+    # Rate limiting, timing, cache headers and gzip compression in one pass
     app.add_middleware(
-        GZipMiddleware,
+        PerformanceMiddleware,
+        rate_limit_enabled=settings.RATE_LIMIT_ENABLED,  # see app.utils.rate_limit
+        slow_request_threshold_ms=1000.0,
+        default_max_age=300,
         minimum_size=1000,  # Only compress responses > 1KB
         compresslevel=6,  # Compression level (1-9)
+        conditional_paths=CONDITIONAL_GET_PATHS if settings.ETAG_ENABLED else (),
     )
 
-    # Add cache control
-    app.add_middleware(
-        CacheControlMiddleware,
-        default_max_age=300,
-    )
-
-    # Add performance monitoring
-    app.add_middleware(
-        PerformanceMonitoringMiddleware,
-        slow_request_threshold_ms=1000.0,
-    )
-
-    # Add rate limiting
-    app.add_middleware(
-        RateLimitMiddleware,
-        requests_per_minute=120,  # Increased for search-heavy workload
-        burst_size=20,
-    )
+    # Add request metrics (outermost, so rate-limited requests are counted)
+    if settings.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
 
     logger.info("Performance middleware configured")
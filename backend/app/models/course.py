@@ -7,11 +7,35 @@ Defines the structure of course records in the database.
 from typing import TYPE_CHECKING, Any, Optional
 
 from pydantic import model_serializer
+from sqlalchemy import BigInteger, Index, text
 from sqlmodel import Field, Relationship, SQLModel
 
+from app.utils.time_slots import join_slots, parse_time_codes, slot_days, split_slots
+
 if TYPE_CHECKING:
     from .semester import Semester
 
+# Official syllabus page, with {acy}, {sem} and {crs_no} filled in per course
+SYLLABUS_URL = "https://timetable.nycu.edu.tw/?r=main/crsoutline&Acy={acy}&Sem={sem}&CrsNo={crs_no}"
+
+
+def syllabus_urls(acy: Optional[int], sem: Optional[int], crs_no: Optional[str]) -> tuple[Optional[str], Optional[str]]:
+    """
+    Build the Chinese and English syllabus URLs of a course.
+
+    Args:
+        acy: Academic year of the course's semester
+        sem: Semester number
+        crs_no: Course number
+
+    Returns:
+        Tuple of (zh-tw URL, English URL), or (None, None) if any part is missing
+    """
+    if not acy or not sem or not crs_no:
+        return None, None
+    base_url = SYLLABUS_URL.format(acy=acy, sem=sem, crs_no=crs_no)
+    return f"{base_url}&lang=zh-tw", f"{base_url}&lang=en"
+
 
 class Course(SQLModel, table=True):
     """
@@ -29,11 +53,17 @@ class Course(SQLModel, table=True):
         dept: Department code
         day_codes: Day codes (M, T, W, R, F)
         time_codes: Time codes
+        time_slots_lo: Low 56 bits of the time-slot bitmask (see app.utils.time_slots)
+        time_slots_hi: High 56 bits of the time-slot bitmask
         classroom_codes: Classroom codes
         url: Course URL
         details: JSON string with additional metadata
     """
     __tablename__ = "courses"
+    __table_args__ = (
+        # Slot filters read the masks from the index instead of the wide rows
+        Index("ix_courses_semester_time_slots", "semester_id", "time_slots_lo", "time_slots_hi"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     semester_id: int = Field(foreign_key="semester.id", index=True, description="Semester ID")
@@ -46,6 +76,20 @@ class Course(SQLModel, table=True):
     dept: Optional[str] = Field(default=None, index=True, description="Department code")
     day_codes: Optional[str] = Field(default=None, index=True, description="Day codes")
     time_codes: Optional[str] = Field(default=None, description="Time codes")
+    time_slots_lo: int = Field(
+        default=0,
+        exclude=True,
+        sa_type=BigInteger,  # 56-bit values; PostgreSQL INTEGER is 32-bit
+        sa_column_kwargs={"server_default": text("0")},
+        description="Time-slot bitmask, low 56 bits",
+    )
+    time_slots_hi: int = Field(
+        default=0,
+        exclude=True,
+        sa_type=BigInteger,
+        sa_column_kwargs={"server_default": text("0")},
+        description="Time-slot bitmask, high 56 bits",
+    )
     classroom_codes: Optional[str] = Field(default=None, description="Classroom codes")
     url: Optional[str] = Field(default=None, description="Course URL")
     syllabus: Optional[str] = Field(default=None, description="Course syllabus/outline")
@@ -60,6 +104,26 @@ class Course(SQLModel, table=True):
         """Get time codes (alias for compatibility)."""
         return self.time_codes
 
+    @property
+    def time_slots(self) -> int:
+        """Get the full time-slot bitmask."""
+        return join_slots(self.time_slots_lo, self.time_slots_hi)
+
+    def set_time_codes(self, time_codes: Optional[str]) -> None:
+        """
+        Set the time codes and derive the slot bitmask from them.
+
+        Day codes are derived as well when the codes contain any slot.
+
+        Args:
+            time_codes: NYCU time codes, e.g. "W56R8-ED203"
+        """
+        self.time_codes = time_codes
+        mask = parse_time_codes(time_codes)
+        self.time_slots_lo, self.time_slots_hi = split_slots(mask)
+        if mask:
+            self.day_codes = slot_days(mask)
+
     @property
     def classroom(self) -> Optional[str]:
         """Get classroom codes (alias for compatibility)."""
@@ -78,47 +142,33 @@ class Course(SQLModel, table=True):
     @property
     def syllabus_url_zh(self) -> Optional[str]:
         """Generate Chinese syllabus URL."""
-        if self.semester and self.crs_no:
-            acy = self.semester.acy
-            sem = self.semester.sem
-            return f"https://timetable.nycu.edu.tw/?r=main/crsoutline&Acy={acy}&Sem={sem}&CrsNo={self.crs_no}&lang=zh-tw"
-        return None
+        return syllabus_urls(self.acy, self.sem, self.crs_no)[0]
 
     @property
     def syllabus_url_en(self) -> Optional[str]:
         """Generate English syllabus URL."""
-        if self.semester and self.crs_no:
-            acy = self.semester.acy
-            sem = self.semester.sem
-            return f"https://timetable.nycu.edu.tw/?r=main/crsoutline&Acy={acy}&Sem={sem}&CrsNo={self.crs_no}&lang=en"
-        return None
+        return syllabus_urls(self.acy, self.sem, self.crs_no)[1]
 
     @model_serializer(mode='wrap')
     def _serialize_model(self, serializer: Any) -> dict[str, Any]:
-        """Custom serializer to include computed properties."""
-        import logging
-        logger = logging.getLogger(__name__)
-
+        """
+        Custom serializer to include computed properties.
+
+        The semester relationship is read once per course and nothing is
+        logged, since this runs for every row of a serialized list. Bulk
+        responses should use ``app.schemas.course.serialize_courses``, which
+        does not touch the relationship at all.
+        """
         data = serializer(self)
-        # Add computed properties
-        data['acy'] = self.acy
-        data['sem'] = self.sem
-        data['time'] = self.time
-        data['classroom'] = self.classroom
-
-        # Generate syllabus URLs directly (using the acy/sem from above to avoid semester access issues)
-        logger.info(f"Serializing course {self.crs_no}: acy={data['acy']}, sem={data['sem']}, semester={self.semester}")
-        if data['acy'] is not None and data['sem'] is not None and self.crs_no:
-            acy_val = data['acy']
-            sem_val = data['sem']
-            data['syllabus_url_zh'] = f"https://timetable.nycu.edu.tw/?r=main/crsoutline&Acy={acy_val}&Sem={sem_val}&CrsNo={self.crs_no}&lang=zh-tw"
-            data['syllabus_url_en'] = f"https://timetable.nycu.edu.tw/?r=main/crsoutline&Acy={acy_val}&Sem={sem_val}&CrsNo={self.crs_no}&lang=en"
-            logger.info(f"Generated syllabus URLs for {self.crs_no}")
-        else:
-            data['syllabus_url_zh'] = None
-            data['syllabus_url_en'] = None
-            logger.warning(f"Failed to generate syllabus URLs for {self.crs_no}: acy={data['acy']}, sem={data['sem']}, crs_no={self.crs_no}")
-
+        semester = self.semester
+        acy = semester.acy if semester else None
+        sem = semester.sem if semester else None
+
+        data['acy'] = acy
+        data['sem'] = sem
+        data['time'] = self.time_codes
+        data['classroom'] = self.classroom_codes
+        data['syllabus_url_zh'], data['syllabus_url_en'] = syllabus_urls(acy, sem, self.crs_no)
         return data
 
     class Config:
@@ -0,0 +1,211 @@
+"""
+Admin API routes.
+
+Operational endpoints for inspecting and managing state such as the result
+cache, the autocomplete index, the semester snapshots and the SQL statement
+statistics. Every request must send ``ADMIN_API_TOKEN`` in the
+``X-Admin-Token`` header; without a configured token the endpoints are
+disabled.
+"""
+
+import hmac
+import logging
+from typing import Annotated, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database.instrumentation import get_query_report, reset_query_stats
+from app.database.session import engine, get_session
+from app.search.autocomplete import refresh_autocomplete_index
+from app.utils.cache import clear_cache, get_cache_stats
+from app.utils.snapshots import build_snapshots
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+
+async def require_admin_token(
+    x_admin_token: Annotated[Optional[str], Header()] = None,
+) -> None:
+    """
+    Verify the admin token.
+
+    Args:
+        x_admin_token: Value of the X-Admin-Token header
+
+    Raises:
+        HTTPException: 403 if no token is configured, 401 if the token is
+            missing or wrong
+    """
+    expected = settings.ADMIN_API_TOKEN
+    if not expected:
+        logger.warning("Rejected admin request: ADMIN_API_TOKEN is not configured")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin API is disabled (ADMIN_API_TOKEN is not configured)",
+        )
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, expected):
+        logger.warning("Rejected admin request with missing or invalid token")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or missing admin token",
+        )
+
+
+# Create router
+router = APIRouter(dependencies=[Depends(require_admin_token)])
+
+
+@router.get("/cache/stats", response_model=dict, status_code=status.HTTP_200_OK)
+async def cache_stats() -> dict:
+    """
+    Get result cache statistics.
+
+    Returns:
+        Dict with limits, totals and per-namespace hit/miss/eviction counters
+
+    Example:
+        GET /api/admin/cache/stats
+
+        Response:
+        {
+            "backend": "memory",
+            "max_entries": 10000,
+            "max_bytes": 67108864,
+            "totals": {"hits": 120, "misses": 30, "evictions": 0, ...},
+            "namespaces": {
+                "SearchService.advanced_search": {"hits": 100, ...}
+            }
+        }
+    """
+    return get_cache_stats()
+
+
+@router.post("/cache/clear", response_model=dict, status_code=status.HTTP_200_OK)
+async def cache_clear() -> dict:
+    """
+    Remove all cached results.
+
+    Returns:
+        Dict with the number of entries removed
+    """
+    return {"cleared": await clear_cache()}
+
+
+@router.post("/autocomplete/refresh", response_model=dict, status_code=status.HTTP_200_OK)
+async def autocomplete_refresh(
+    session: Annotated[AsyncSession, Depends(get_session)],
+    full: Annotated[bool, Query(description="Rebuild instead of adding new courses only")] = False,
+) -> dict:
+    """
+    Update the autocomplete index of the worker handling the request.
+
+    Imports that publish a data change are picked up by every worker on
+    its own; this forces a refresh now, or with ``full`` a rebuild after
+    edits or deletions made outside the API.
+
+    Args:
+        session: Database session (injected)
+        full: Rebuild the whole index (also reflects edits and deletions)
+
+    Returns:
+        Dict with the refresh mode and number of courses or entries processed
+
+    Example:
+        POST /api/admin/autocomplete/refresh
+
+        Response:
+        {"mode": "incremental", "courses": 1520}
+    """
+    return await refresh_autocomplete_index(session, full=full)
+
+
+@router.post("/snapshots/rebuild", response_model=dict, status_code=status.HTTP_200_OK)
+async def snapshots_rebuild(
+    session: Annotated[AsyncSession, Depends(get_session)],
+) -> dict:
+    """
+    Rebuild the per-semester course list snapshots.
+
+    Needed after courses are edited through the API (listings fall back to
+    the database until then); imports rebuild them automatically.
+
+    Args:
+        session: Database session (injected)
+
+    Returns:
+        Dict of semester -> content hash and course count
+
+    Example:
+        POST /api/admin/snapshots/rebuild
+
+        Response:
+        {"semesters": {"113-1": {"hash": "3f2a9c...", "courses": 8123}}}
+    """
+    manifest = await build_snapshots(session)
+    return {
+        "semesters": {
+            key: {"hash": entry["hash"], "courses": entry["courses"]}
+            for key, entry in manifest["semesters"].items()
+        }
+    }
+
+
+@router.get("/queries", response_model=dict, status_code=status.HTTP_200_OK)
+async def query_stats(
+    explain: Annotated[bool, Query(description="Capture missing query plans")] = False,
+) -> dict:
+    """
+    Get SQL statement statistics.
+
+    Per-route histograms of request time, database time and statement
+    count, and the slowest statements with their query plans. Parameter
+    values are redacted to their types.
+
+    Args:
+        explain: Run EXPLAIN QUERY PLAN for slow statements without a plan
+            (off by default: it opens a database connection and runs EXPLAIN
+            for every slow statement not explained yet)
+
+    Returns:
+        Dict with the slow query threshold, routes and slow queries
+
+    Example:
+        GET /api/admin/queries?explain=true
+
+        Response:
+        {
+            "slow_query_threshold_ms": 100.0,
+            "routes": {
+                "GET /api/courses/{course_id}": {
+                    "request_ms": {"count": 12, "sum": 40.2, "buckets": {"1": 0, "2.5": 3, ...}},
+                    "db_ms": {...},
+                    "statements": {...}
+                }
+            },
+            "slow_queries": [
+                {
+                    "duration_ms": 245.1,
+                    "statement": "SELECT ... FROM courses WHERE ...",
+                    "parameters": "(int, int)",
+                    "request": "GET /api/courses/",
+                    "plan": ["SCAN courses"]
+                }
+            ]
+        }
+    """
+    return await get_query_report(engine if explain else None)
+
+
+@router.post("/queries/reset", response_model=dict, status_code=status.HTTP_200_OK)
+async def query_stats_reset() -> dict:
+    """
+    Clear the per-route histograms and the slow query log.
+
+    Returns:
+        Dict confirming the reset
+    """
+    reset_query_stats()
+    return {"reset": True}
@@ -70,17 +70,17 @@ async def advanced_filter(
         return {
             "courses": [
                 CourseResponse(
-                    id=c.id,
-                    acy=c.semester.acy if c.semester else None,
-                    sem=c.semester.sem if c.semester else None,
-                    crs_no=c.crs_no,
-                    name=c.name,
-                    teacher=c.teacher,
-                    credits=c.credits,
-                    dept=c.dept,
-                    time=c.time,
-                    classroom=c.classroom,
-                    details=c.details,
+                    id=c["id"],
+                    acy=c["acy"],
+                    sem=c["sem"],
+                    crs_no=c["crs_no"],
+                    name=c["name"],
+                    teacher=c["teacher"],
+                    credits=c["credits"],
+                    dept=c["dept"],
+                    time=c["time"],
+                    classroom=c["classroom"],
+                    details=c["details"],
                 )
                 for c in courses
             ],
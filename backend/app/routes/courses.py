@@ -7,19 +7,23 @@ listing courses with filtering, searching, and retrieving individual course deta
 
 import json
 import logging
-from typing import Annotated, Optional
+from typing import Annotated, AsyncIterator, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response, status
+from fastapi.responses import FileResponse, ORJSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database.session import get_session
-from app.schemas.course import CourseResponse
+from app.database.session import async_session, get_session
+from app.schemas.course import CourseResponse, serialize_courses
 from app.services.course_service import CourseService
+from app.services.export_service import ExportFormat, ExportService
+from app.services.semester_service import SemesterService
 from app.utils.exceptions import (
     CourseNotFound,
     DatabaseError,
     InvalidQueryParameter,
 )
+from app.utils.snapshots import get_snapshot_store
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -100,6 +104,13 @@ async def list_courses(
             example=0,
         ),
     ] = 0,
+    cursor: Annotated[
+        Optional[str],
+        Query(
+            description="Opaque cursor from the X-Next-Cursor header of the previous page",
+            max_length=512,
+        ),
+    ] = None,
 ) -> list[CourseResponse]:
     """
     List courses with optional filtering and pagination.
@@ -107,7 +118,10 @@ async def list_courses(
     Retrieves courses from the database with support for:
     - Filtering by academic year, semester, department, and teacher
     - Full-text search in course name and number
-    - Pagination with limit and offset
+    - Pagination with limit and offset, or keyset cursors for deep pages
+
+    When a further page may exist, its cursor is returned in the
+    ``X-Next-Cursor`` response header.
 
     Args:
         session: Database session (injected)
@@ -116,8 +130,9 @@ async def list_courses(
         dept: Filter by department code (partial match)
         teacher: Filter by teacher name (partial match)
         q: Search query for course name or number
-        limit: Maximum number of results (default: 200, max: 1000)
+        limit: Maximum number of results (default: 200, max: 10000)
         offset: Number of results to skip (default: 0)
+        cursor: Cursor returned by the previous page
 
     Returns:
         list[CourseResponse]: List of course records matching the filters
@@ -156,48 +171,26 @@ async def list_courses(
             q=q,
             limit=limit,
             offset=offset,
+            cursor=cursor,
         )
 
+        next_cursor = service.next_cursor(courses, limit)
+
         logger.info(
             f"Successfully listed {len(courses)} courses "
             f"(filters: acy={acy}, sem={sem}, dept={dept}, "
             f"teacher={teacher}, q={q}, limit={limit}, offset={offset})"
         )
 
-        # Build response with semester info from relationship
-        result = []
-        for course in courses:
-            acy_val = course.semester.acy if course.semester else 0
-            sem_val = course.semester.sem if course.semester else 0
-
-            # Generate syllabus URLs
-            syllabus_url_zh = None
-            syllabus_url_en = None
-            if acy_val and sem_val and course.crs_no:
-                syllabus_url_zh = f"https://timetable.nycu.edu.tw/?r=main/crsoutline&Acy={acy_val}&Sem={sem_val}&CrsNo={course.crs_no}&lang=zh-tw"
-                syllabus_url_en = f"https://timetable.nycu.edu.tw/?r=main/crsoutline&Acy={acy_val}&Sem={sem_val}&CrsNo={course.crs_no}&lang=en"
-
-            # Parse details JSON string to dict
-            details_parsed = parse_details_json(course.details)
-
-            result.append(CourseResponse(
-                id=course.id,
-                acy=acy_val,
-                sem=sem_val,
-                crs_no=course.crs_no,
-                name=course.name,
-                teacher=course.teacher,
-                credits=course.credits,
-                dept=course.dept,
-                time=course.time,
-                classroom=course.classroom,
-                syllabus=course.syllabus,
-                syllabus_zh=course.syllabus_zh,
-                syllabus_url_zh=syllabus_url_zh,
-                syllabus_url_en=syllabus_url_en,
-                details=details_parsed,
-            ))
-        return result
+        # Bulk path: acy/sem from the cached semester table, no per-row
+        # relationship access, and no second validation pass over the rows
+        semester_map = await SemesterService(session).get_semester_map(
+            {course.semester_id for course in courses}
+        )
+        return ORJSONResponse(
+            content=serialize_courses(courses, semester_map),
+            headers={"X-Next-Cursor": next_cursor} if next_cursor else None,
+        )
 
     except InvalidQueryParameter as e:
         logger.warning(f"Invalid query parameter: {e}")
@@ -219,6 +212,120 @@ async def list_courses(
         )
 
 
+@router.get(
+    "/export",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "Streamed course rows",
+            "content": {"application/x-ndjson": {}, "text/csv": {}},
+        }
+    },
+)
+async def export_courses(
+    export_format: Annotated[
+        ExportFormat,
+        Query(alias="format", description="Export format: ndjson (one JSON object per line) or csv"),
+    ] = ExportFormat.NDJSON,
+    acy: Annotated[Optional[int], Query(description="Filter by academic year", gt=0)] = None,
+    sem: Annotated[Optional[int], Query(description="Filter by semester (1=Fall, 2=Spring)", ge=1, le=2)] = None,
+    dept: Annotated[Optional[str], Query(description="Filter by department code (partial match)", max_length=50)] = None,
+    teacher: Annotated[Optional[str], Query(description="Filter by teacher name (partial match)", max_length=100)] = None,
+    q: Annotated[Optional[str], Query(description="Search query for course name or number", max_length=200)] = None,
+) -> StreamingResponse:
+    """
+    Stream every course matching the filters as NDJSON or CSV.
+
+    Unlike ``GET /api/courses/``, the export has no row limit: rows are read
+    from the database in batches and written as they arrive, so a
+    full-semester dump uses constant memory. The stream has its own database
+    session, which stays open until the last row is sent.
+
+    Args:
+        export_format: ``ndjson`` (default) or ``csv``
+        acy: Filter by academic year (exact match)
+        sem: Filter by semester number (exact match)
+        dept: Filter by department code (partial match)
+        teacher: Filter by teacher name (partial match)
+        q: Search query for course name or number
+
+    Returns:
+        StreamingResponse: Course rows, offered as a file download
+
+    Example:
+        GET /api/courses/export?acy=113&sem=1&format=csv
+    """
+    async def body() -> AsyncIterator[bytes]:
+        async with async_session() as session:
+            async for chunk in ExportService(session).stream_courses(
+                export_format, acy=acy, sem=sem, dept=dept, teacher=teacher, q=q,
+            ):
+                yield chunk
+
+    name_parts = ["courses"] + [str(part) for part in (acy, sem) if part is not None]
+    filename = f"{'-'.join(name_parts)}.{export_format.value}"
+    return StreamingResponse(
+        body(),
+        media_type=export_format.media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get(
+    "/semester/{acy}/{sem}",
+    response_model=list[CourseResponse],
+    status_code=status.HTTP_200_OK,
+    responses={304: {"description": "The client's copy (If-None-Match) is current"}},
+)
+async def list_semester_courses(
+    session: Annotated[AsyncSession, Depends(get_session)],
+    request: Request,
+    acy: Annotated[int, Path(description="Academic year", gt=0)],
+    sem: Annotated[int, Path(description="Semester (1=Fall, 2=Spring)", ge=1, le=2)],
+) -> Response:
+    """
+    List every course of a semester from its precomputed snapshot.
+
+    Serves the files written by ``scripts/build_snapshots.py``: the
+    br/gzip/plain variant the client accepts is sent straight from disk
+    with a content-hash ``ETag``, and a matching ``If-None-Match`` gets an
+    empty 304. Neither touches the database. Without a current snapshot
+    (not built yet, or courses changed since) the list is read from the
+    database instead.
+
+    Args:
+        session: Database session (injected, used only without a snapshot)
+        request: Incoming request (for the conditional and encoding headers)
+        acy: Academic year
+        sem: Semester number
+
+    Returns:
+        Response: JSON array of courses ordered by course number, as from
+        ``GET /api/courses/?acy=...&sem=...`` without a limit
+
+    Example:
+        GET /api/courses/semester/113/1
+        If-None-Match: "3f2a9c..."
+
+        Response: 304 Not Modified
+    """
+    snapshot = get_snapshot_store().get(acy, sem)
+    if snapshot is None:
+        logger.info(f"No current snapshot for {acy}-{sem}, reading courses from the database")
+        rows = await ExportService(session).list_courses(acy=acy, sem=sem)
+        return ORJSONResponse(content=rows)
+
+    encoding = snapshot.choose_encoding(request.headers.get("accept-encoding"))
+    headers = {"ETag": snapshot.etag(encoding), "Vary": "Accept-Encoding"}
+    if snapshot.matches(request.headers.get("if-none-match")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return FileResponse(snapshot.files[encoding], media_type="application/json", headers=headers)
+
+
 @router.get(
     "/{course_id}",
     response_model=CourseResponse,
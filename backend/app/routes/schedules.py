@@ -14,14 +14,28 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.database.session import get_session
 from app.schemas.schedule import (
     AddCourseRequest,
+    BatchCourseRequest,
+    BatchCourseResponse,
+    FitCheckRequest,
+    FitCheckResponse,
+    GenerateScheduleRequest,
+    GenerateScheduleResponse,
     RemoveCourseRequest,
+    ScheduleConflictsResponse,
     ScheduleCreate,
     ScheduleDetailResponse,
     ScheduleResponse,
     ScheduleUpdate,
 )
 from app.services.schedule_service import ScheduleService
-from app.utils.exceptions import DatabaseError, ScheduleNotFound
+from app.utils.exceptions import (
+    DatabaseError,
+    InvalidQueryParameter,
+    ScheduleConflict,
+    ScheduleNotFound,
+    SemesterNotFound,
+)
+from app.utils.time_slots import parse_slot_filter
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -86,6 +100,85 @@ async def create_schedule(
         )
 
 
+@router.post("/generate", response_model=GenerateScheduleResponse, status_code=status.HTTP_200_OK)
+async def generate_schedules(
+    request: GenerateScheduleRequest,
+    session: Annotated[AsyncSession, Depends(get_session)],
+) -> GenerateScheduleResponse:
+    """
+    Generate conflict-free timetables.
+
+    Searches combinations of the given course numbers (taking one section
+    of each) that include every required course, respect the credit bounds
+    and keep the blocked slots free. The search runs in a worker process
+    and stops after a time budget, returning the best timetables found.
+
+    Args:
+        request: Courses and constraints
+        session: Database session (injected)
+
+    Returns:
+        GenerateScheduleResponse: Timetables by most credits, then fewest days
+
+    Raises:
+        HTTPException: 400 if a required course number is unknown,
+                      404 if semester not found, 500 if the search fails
+
+    Example:
+        POST /api/schedules/generate
+        {
+            "acy": 113,
+            "sem": 1,
+            "required": ["515001", "515002"],
+            "candidates": ["515101", "515102", "515103"],
+            "min_credits": 12,
+            "max_credits": 20,
+            "blocked_slots": ["F", "M12"],
+            "limit": 5
+        }
+    """
+    try:
+        service = ScheduleService(session)
+        result = await service.generate_schedules(
+            acy=request.acy,
+            sem=request.sem,
+            required=request.required,
+            candidates=request.candidates,
+            min_credits=request.min_credits,
+            max_credits=request.max_credits,
+            blocked_slots=parse_slot_filter(request.blocked_slots) or 0,
+            limit=request.limit,
+            time_budget_ms=request.time_budget_ms,
+        )
+
+        return GenerateScheduleResponse(**result)
+
+    except InvalidQueryParameter as e:
+        logger.warning(f"Invalid timetable request: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    except SemesterNotFound as e:
+        logger.warning(f"Semester not found: {request.acy}-{request.sem}")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e),
+        )
+    except DatabaseError as e:
+        logger.error(f"Database error while generating timetables: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to generate timetables: {str(e)}",
+        )
+    except Exception as e:
+        logger.error(f"Unexpected error while generating timetables: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected error occurred while generating timetables",
+        )
+
+
 @router.get("/{schedule_id}", response_model=ScheduleDetailResponse, status_code=status.HTTP_200_OK)
 async def get_schedule(
     schedule_id: int,
@@ -307,6 +400,8 @@ async def add_course_to_schedule(
     Add a course to a schedule.
 
     Adds a course to the schedule with optional display color and notes.
+    With ``reject_on_conflict`` the course is refused if it shares a time
+    slot with a course already in the schedule.
 
     Args:
         schedule_id: Schedule ID
@@ -318,6 +413,7 @@ async def add_course_to_schedule(
 
     Raises:
         HTTPException: 404 if schedule/course not found, 400 if course already in schedule,
+                      409 if rejecting conflicts and the course clashes,
                       500 if database operation fails
 
     Example:
@@ -325,13 +421,18 @@ async def add_course_to_schedule(
         {
             "course_id": 123,
             "color": "#3B82F6",
-            "notes": "重要課程"
+            "notes": "重要課程",
+            "reject_on_conflict": true
         }
     """
     try:
         service = ScheduleService(session)
         schedule_course = await service.add_course(
-            schedule_id, request.course_id, color=request.color, notes=request.notes
+            schedule_id,
+            request.course_id,
+            color=request.color,
+            notes=request.notes,
+            reject_on_conflict=request.reject_on_conflict,
         )
 
         logger.info(f"Added course {request.course_id} to schedule {schedule_id}")
@@ -344,6 +445,17 @@ async def add_course_to_schedule(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e),
         )
+    except ScheduleConflict as e:
+        logger.info(f"Rejected course {request.course_id} for schedule {schedule_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={
+                "message": e.message,
+                "course_id": e.course_id,
+                "conflicting_course_ids": e.conflicting_course_ids,
+                "slots": e.slots,
+            },
+        )
     except DatabaseError as e:
         # Check if it's a "already exists" error
         if "already in schedule" in str(e):
@@ -423,3 +535,216 @@ async def remove_course_from_schedule(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An unexpected error occurred while removing course",
         )
+
+
+@router.post(
+    "/{schedule_id}/courses:batch",
+    response_model=BatchCourseResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def batch_update_schedule_courses(
+    schedule_id: int,
+    request: BatchCourseRequest,
+    session: Annotated[AsyncSession, Depends(get_session)],
+) -> BatchCourseResponse:
+    """
+    Add and remove many courses of a schedule at once.
+
+    Applies the whole batch in one transaction (e.g. when importing a shared
+    timetable). Items that cannot be applied (unknown course, already in the
+    schedule, clashing when rejecting conflicts) are skipped and reported;
+    the rest are committed together.
+
+    Args:
+        schedule_id: Schedule ID
+        request: Courses to add and remove
+        session: Database session (injected)
+
+    Returns:
+        BatchCourseResponse: Counts and per-item results
+
+    Raises:
+        HTTPException: 404 if schedule not found, 500 if database operation fails
+
+    Example:
+        POST /api/schedules/1/courses:batch
+        {
+            "add": [{"course_id": 123, "color": "#3B82F6"}, {"course_id": 456}],
+            "remove": [789],
+            "reject_on_conflict": true
+        }
+
+    Example Response:
+        {
+            "schedule_id": 1,
+            "added": 1,
+            "removed": 1,
+            "results": [
+                {"course_id": 789, "action": "remove", "status": "removed"},
+                {"course_id": 123, "action": "add", "status": "added"},
+                {"course_id": 456, "action": "add", "status": "conflict",
+                 "detail": "Clashes with courses [123] at M4"}
+            ]
+        }
+    """
+    try:
+        service = ScheduleService(session)
+        result = await service.batch_update_courses(
+            schedule_id,
+            add=[item.model_dump() for item in request.add],
+            remove=request.remove,
+            reject_on_conflict=request.reject_on_conflict,
+        )
+
+        return BatchCourseResponse(**result)
+
+    except ScheduleNotFound as e:
+        logger.warning(f"Schedule not found: {schedule_id}")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e),
+        )
+    except DatabaseError as e:
+        logger.error(f"Database error while batch updating schedule {schedule_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to update schedule courses: {str(e)}",
+        )
+    except Exception as e:
+        logger.error(f"Unexpected error while batch updating schedule {schedule_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected error occurred while updating schedule courses",
+        )
+
+
+@router.get(
+    "/{schedule_id}/conflicts",
+    response_model=ScheduleConflictsResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_schedule_conflicts(
+    schedule_id: int,
+    session: Annotated[AsyncSession, Depends(get_session)],
+) -> ScheduleConflictsResponse:
+    """
+    Get time clashes between the courses of a schedule.
+
+    Compares the courses' time-slot bitmasks on the server, so clients do
+    not need to fetch every course to check for clashes.
+
+    Args:
+        schedule_id: Schedule ID
+        session: Database session (injected)
+
+    Returns:
+        ScheduleConflictsResponse: Occupied slots and clashing course pairs
+
+    Raises:
+        HTTPException: 404 if schedule not found, 500 if database operation fails
+
+    Example:
+        GET /api/schedules/1/conflicts
+
+    Example Response:
+        {
+            "schedule_id": 1,
+            "has_conflicts": true,
+            "occupied_slots": "M34T56",
+            "conflicts": [{"course_ids": [123, 456], "slots": "M4"}]
+        }
+    """
+    try:
+        service = ScheduleService(session)
+        conflicts = await service.get_conflicts(schedule_id)
+
+        logger.info(f"Found {len(conflicts['conflicts'])} conflicts in schedule {schedule_id}")
+
+        return ScheduleConflictsResponse(**conflicts)
+
+    except ScheduleNotFound as e:
+        logger.warning(f"Schedule not found: {schedule_id}")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e),
+        )
+    except DatabaseError as e:
+        logger.error(f"Database error while checking conflicts of schedule {schedule_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to check schedule conflicts: {str(e)}",
+        )
+    except Exception as e:
+        logger.error(f"Unexpected error while checking conflicts of schedule {schedule_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected error occurred while checking conflicts",
+        )
+
+
+@router.post(
+    "/{schedule_id}/fits",
+    response_model=FitCheckResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def check_courses_fit(
+    schedule_id: int,
+    request: FitCheckRequest,
+    session: Annotated[AsyncSession, Depends(get_session)],
+) -> FitCheckResponse:
+    """
+    Check which candidate courses fit a schedule.
+
+    Each candidate is tested with one AND against the combined time slots
+    of the schedule, so thousands of candidates (e.g. a whole search result)
+    can be checked in one request.
+
+    Args:
+        schedule_id: Schedule ID
+        request: Candidate course IDs
+        session: Database session (injected)
+
+    Returns:
+        FitCheckResponse: Fitting, conflicting and unknown candidate IDs
+
+    Raises:
+        HTTPException: 404 if schedule not found, 500 if database operation fails
+
+    Example:
+        POST /api/schedules/1/fits
+        {
+            "course_ids": [123, 456, 789]
+        }
+
+    Example Response:
+        {
+            "schedule_id": 1,
+            "fits": [123, 789],
+            "conflicts": [{"course_id": 456, "slots": "M4", "conflicting_course_ids": [42]}],
+            "not_found": []
+        }
+    """
+    try:
+        service = ScheduleService(session)
+        result = await service.check_fit(schedule_id, request.course_ids)
+
+        return FitCheckResponse(**result)
+
+    except ScheduleNotFound as e:
+        logger.warning(f"Schedule not found: {schedule_id}")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e),
+        )
+    except DatabaseError as e:
+        logger.error(f"Database error while checking candidates for schedule {schedule_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to check candidate courses: {str(e)}",
+        )
+    except Exception as e:
+        logger.error(f"Unexpected error while checking candidates for schedule {schedule_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected error occurred while checking candidate courses",
+        )
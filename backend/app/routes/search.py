@@ -7,7 +7,7 @@ Optimized for 70,239+ course records with comprehensive filtering options.
 
 import logging
 from enum import Enum
-from typing import Annotated, Optional
+from typing import Annotated, Optional, Union
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel, Field, field_validator
@@ -15,8 +15,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.session import get_session
 from app.schemas.course import CourseResponse
+from app.search.facets import FACET_FIELDS
+from app.services.schedule_service import ScheduleService
 from app.services.search_service import SearchService
-from app.utils.exceptions import DatabaseError, InvalidQueryParameter
+from app.utils.exceptions import DatabaseError, InvalidQueryParameter, ScheduleNotFound
+from app.utils.time_slots import parse_slot_filter
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -35,6 +38,24 @@ class SortOption(str, Enum):
     BY_SEMESTER = "by_semester"
 
 
+class FacetField(str, Enum):
+    """Fields that can be counted as facets (named after their filters)."""
+
+    DEPT = "dept"
+    CREDITS = "credits"
+    DAY_CODES = "day_codes"
+    ACY = "acy"
+    SEM = "sem"
+    TEACHER = "teacher"
+
+
+class FacetBucket(BaseModel):
+    """Number of matching courses with one facet value."""
+
+    value: Union[str, int, float] = Field(description="Facet value (usable as a filter value)")
+    count: int = Field(description="Number of matching courses with this value")
+
+
 class CourseSearchRequest(BaseModel):
     """
     Request model for advanced course search.
@@ -118,6 +139,23 @@ class CourseSearchRequest(BaseModel):
         description="Filter by day codes (e.g., ['M', 'T', 'W'])"
     )
 
+    slots_within: Optional[list[str]] = Field(
+        None,
+        description="Only courses meeting entirely within these time slots, as NYCU time codes "
+                    "(e.g., ['M1234', 'W56']; a bare day letter means the whole day)"
+    )
+
+    slots_avoid: Optional[list[str]] = Field(
+        None,
+        description="Exclude courses meeting in any of these time slots (e.g., ['F', 'M12'])"
+    )
+
+    free_in_schedule: Optional[int] = Field(
+        None,
+        ge=1,
+        description="Only courses that fit the free periods of this schedule (no time conflict)"
+    )
+
     # Pagination
     limit: int = Field(
         50,
@@ -132,6 +170,12 @@ class CourseSearchRequest(BaseModel):
         description="Number of results to skip"
     )
 
+    cursor: Optional[str] = Field(
+        None,
+        max_length=512,
+        description="Opaque cursor from next_cursor of the previous page (faster than offset for deep pages)"
+    )
+
     # Sorting
     sort_by: SortOption = Field(
         SortOption.BY_RELEVANCE,
@@ -143,7 +187,20 @@ class CourseSearchRequest(BaseModel):
         description="Sort in descending order"
     )
 
-    @field_validator("semester_ids", "acy", "sem", "dept", "day_codes")
+    # Facets
+    facets: Optional[list[FacetField]] = Field(
+        None,
+        description="Facet fields to count over all matching courses (returned in facets)"
+    )
+
+    facet_limit: int = Field(
+        20,
+        ge=1,
+        le=500,
+        description="Maximum number of values returned per facet"
+    )
+
+    @field_validator("semester_ids", "acy", "sem", "dept", "day_codes", "slots_within", "slots_avoid")
     @classmethod
     def validate_list_not_empty(cls, v):
         """Ensure lists are not empty if provided."""
@@ -151,6 +208,13 @@ class CourseSearchRequest(BaseModel):
             raise ValueError("List cannot be empty")
         return v
 
+    @field_validator("slots_within", "slots_avoid")
+    @classmethod
+    def validate_time_codes(cls, v):
+        """Ensure every time code selects at least one slot."""
+        parse_slot_filter(v)
+        return v
+
     @field_validator("credits_min", "credits_max", "exact_credits")
     @classmethod
     def validate_credits(cls, v):
@@ -171,7 +235,8 @@ class CourseSearchRequest(BaseModel):
                 "semester_ids": [1, 2],
                 "limit": 50,
                 "offset": 0,
-                "sort_by": "by_relevance"
+                "sort_by": "by_relevance",
+                "facets": ["dept", "credits"]
             }
         }
 
@@ -199,6 +264,11 @@ class CourseSearchResponse(BaseModel):
         description="Offset used"
     )
 
+    next_cursor: Optional[str] = Field(
+        None,
+        description="Cursor for the next page (absent on the last page and for relevance-ranked queries)"
+    )
+
     page: int = Field(
         description="Current page number (1-indexed)"
     )
@@ -223,6 +293,11 @@ class CourseSearchResponse(BaseModel):
         description="Summary of filters applied"
     )
 
+    facets: Optional[dict[str, list[FacetBucket]]] = Field(
+        None,
+        description="Facet counts over all matching courses (only when requested)"
+    )
+
 
 @router.post(
     "/search",
@@ -237,6 +312,8 @@ class CourseSearchResponse(BaseModel):
     - Optimized for 70,000+ course records
     - Result caching with TTL
     - Pagination support
+    - Time-slot filters (within / avoid slots, free periods of a schedule)
+    - Optional facet counts (dept, credits, day_codes, acy, sem, teacher)
     """,
     response_description="Paginated search results with metadata",
 )
@@ -272,7 +349,8 @@ async def search_courses(
             "credits_min": 3,
             "acy": [113, 114],
             "limit": 20,
-            "sort_by": "by_name"
+            "sort_by": "by_name",
+            "facets": ["dept", "credits"]
         }
 
     Example Response:
@@ -281,6 +359,7 @@ async def search_courses(
             "total": 127,
             "limit": 20,
             "offset": 0,
+            "next_cursor": "WyJieV9uYW1lOmFzYyIsIkFsZ29yaXRobXMiLDQyXQ",
             "page": 1,
             "total_pages": 7,
             "has_next": true,
@@ -291,6 +370,10 @@ async def search_courses(
                 "dept": ["CS"],
                 "credits_range": [3, null],
                 "acy": [113, 114]
+            },
+            "facets": {
+                "dept": [{"value": "CS", "count": 98}, {"value": "EE", "count": 29}],
+                "credits": [{"value": 3.0, "count": 112}, {"value": 2.0, "count": 15}]
             }
         }
     """
@@ -306,6 +389,13 @@ async def search_courses(
                     parameter_name="credits_min"
                 )
 
+        # Time-slot filters as bitmasks; a schedule's courses are slots to avoid
+        slots_within = parse_slot_filter(request.slots_within)
+        slots_avoid = parse_slot_filter(request.slots_avoid)
+        if request.free_in_schedule is not None:
+            occupied = await ScheduleService(session).get_occupied_slots(request.free_in_schedule)
+            slots_avoid = (slots_avoid or 0) | occupied
+
         # Initialize search service
         service = SearchService(session)
 
@@ -323,11 +413,44 @@ async def search_courses(
             credits_max=request.credits_max,
             exact_credits=request.exact_credits,
             day_codes=request.day_codes,
+            slots_within=slots_within,
+            slots_avoid=slots_avoid,
             limit=request.limit,
             offset=request.offset,
             sort_by=request.sort_by.value,
             sort_desc=request.sort_desc,
+            cursor=request.cursor,
         )
+        next_cursor = service.next_cursor(
+            courses,
+            request.limit,
+            request.sort_by.value,
+            request.sort_desc,
+            request.query,
+        )
+
+        # Facet counts for the same filters, in the same response
+        facets = None
+        if request.facets:
+            requested = {facet.value for facet in request.facets}
+            facets = await service.facet_counts(
+                facets=[field for field in FACET_FIELDS if field in requested],
+                facet_limit=request.facet_limit,
+                query=request.query,
+                crs_no=request.crs_no,
+                semester_ids=request.semester_ids,
+                acy=request.acy,
+                sem=request.sem,
+                name=request.name,
+                teacher=request.teacher,
+                dept=request.dept,
+                credits_min=request.credits_min,
+                credits_max=request.credits_max,
+                exact_credits=request.exact_credits,
+                day_codes=request.day_codes,
+                slots_within=slots_within,
+                slots_avoid=slots_avoid,
+            )
 
         # Calculate query time
         query_time_ms = (time.time() - start_time) * 1000
@@ -335,8 +458,13 @@ async def search_courses(
         # Calculate pagination metadata
         page = (request.offset // request.limit) + 1
         total_pages = (total + request.limit - 1) // request.limit if total > 0 else 0
-        has_next = request.offset + request.limit < total
-        has_previous = request.offset > 0
+        if request.cursor:
+            # Position is unknown with cursors; rely on the page itself
+            has_next = next_cursor is not None
+            has_previous = True
+        else:
+            has_next = request.offset + request.limit < total
+            has_previous = request.offset > 0
 
         # Build filters summary
         filters_applied = {}
@@ -362,6 +490,12 @@ async def search_courses(
             filters_applied["exact_credits"] = request.exact_credits
         if request.day_codes:
             filters_applied["day_codes"] = request.day_codes
+        if request.slots_within:
+            filters_applied["slots_within"] = request.slots_within
+        if request.slots_avoid:
+            filters_applied["slots_avoid"] = request.slots_avoid
+        if request.free_in_schedule is not None:
+            filters_applied["free_in_schedule"] = request.free_in_schedule
 
         logger.info(
             f"Search completed: {len(courses)} results (total: {total}), "
@@ -371,29 +505,31 @@ async def search_courses(
         return CourseSearchResponse(
             courses=[
                 CourseResponse(
-                    id=course.id,
-                    acy=course.acy,
-                    sem=course.sem,
-                    crs_no=course.crs_no,
-                    name=course.name,
-                    teacher=course.teacher,
-                    credits=course.credits,
-                    dept=course.dept,
-                    time=course.time,
-                    classroom=course.classroom,
-                    details=course.details,
+                    id=course["id"],
+                    acy=course["acy"],
+                    sem=course["sem"],
+                    crs_no=course["crs_no"],
+                    name=course["name"],
+                    teacher=course["teacher"],
+                    credits=course["credits"],
+                    dept=course["dept"],
+                    time=course["time"],
+                    classroom=course["classroom"],
+                    details=course["details"],
                 )
                 for course in courses
             ],
             total=total,
             limit=request.limit,
             offset=request.offset,
+            next_cursor=next_cursor,
             page=page,
             total_pages=total_pages,
             has_next=has_next,
             has_previous=has_previous,
             query_time_ms=query_time_ms,
             filters_applied=filters_applied,
+            facets=facets,
         )
 
     except InvalidQueryParameter as e:
@@ -402,6 +538,12 @@ async def search_courses(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e),
         )
+    except ScheduleNotFound as e:
+        logger.warning(f"Schedule not found: {request.free_in_schedule}")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e),
+        )
     except DatabaseError as e:
         logger.error(f"Database error during search: {e}")
         raise HTTPException(
@@ -6,10 +6,13 @@ Defines request and response schemas for course endpoints.
 
 import json
 import logging
-from typing import Any, Optional, Union
+from typing import Any, Iterable, Mapping, Optional, Union
 
+import orjson
 from pydantic import BaseModel, Field, field_validator, model_serializer, computed_field
 
+from app.models.course import syllabus_urls
+
 logger = logging.getLogger(__name__)
 
 
@@ -104,3 +107,114 @@ class CourseFilterParams(BaseModel):
                 "offset": 0,
             }
         }
+
+
+def course_to_dict(course: Any) -> dict[str, Any]:
+    """
+    Convert a Course ORM record into a plain, JSON-serializable dict.
+
+    The keys match ``CourseResponse`` (``details`` stays a JSON string) plus
+    ``semester_id``. Service methods whose results are cached return these
+    dicts so no ORM object outlives its session.
+
+    Args:
+        course: Course record with its semester loaded
+
+    Returns:
+        dict: Course fields and computed semester/syllabus fields
+    """
+    semester = course.semester
+    acy = semester.acy if semester else None
+    sem = semester.sem if semester else None
+    syllabus_url_zh, syllabus_url_en = syllabus_urls(acy, sem, course.crs_no)
+
+    return {
+        "id": course.id,
+        "semester_id": course.semester_id,
+        "acy": acy,
+        "sem": sem,
+        "crs_no": course.crs_no,
+        "name": course.name,
+        "teacher": course.teacher,
+        "credits": course.credits,
+        "dept": course.dept,
+        "time": course.time_codes,
+        "classroom": course.classroom_codes,
+        "syllabus": course.syllabus,
+        "syllabus_zh": course.syllabus_zh,
+        "syllabus_url_zh": syllabus_url_zh,
+        "syllabus_url_en": syllabus_url_en,
+        "details": course.details,
+    }
+
+
+def parse_details(details: Optional[str]) -> Optional[Any]:
+    """
+    Parse a course's details JSON string.
+
+    Args:
+        details: Stored details string
+
+    Returns:
+        Parsed value, or None if the string is empty or not valid JSON
+    """
+    if not details or not isinstance(details, str):
+        return None
+    try:
+        return orjson.loads(details)
+    except orjson.JSONDecodeError:
+        return None
+
+
+def serialize_courses(
+    courses: Iterable[Any],
+    semester_map: Mapping[int, tuple[int, int]],
+) -> list[dict[str, Any]]:
+    """
+    Convert many Course records into ``CourseResponse``-shaped dicts.
+
+    This is the bulk path for list endpoints: academic year and semester
+    come from ``semester_map`` instead of each course's ``semester``
+    relationship, nothing is logged per row, and no Pydantic model is built,
+    so the dicts can be rendered directly with orjson.
+
+    Args:
+        courses: Course records (their semester need not be loaded)
+        semester_map: Semester ID -> (acy, sem), see
+            ``SemesterService.get_semester_map``
+
+    Returns:
+        List of dicts with the ``CourseResponse`` fields; ``details`` is parsed,
+        and acy/sem are None for a course whose semester is unknown (as in
+        ``course_to_dict``)
+
+    Example:
+        >>> semester_map = await SemesterService(session).get_semester_map()
+        >>> serialize_courses(courses, semester_map)[0]["acy"]
+        113
+    """
+    result = []
+    append = result.append
+    missing = (None, None)
+    for course in courses:
+        crs_no = course.crs_no
+        acy, sem = semester_map.get(course.semester_id, missing)
+        syllabus_url_zh, syllabus_url_en = syllabus_urls(acy, sem, crs_no)
+        append({
+            "id": course.id,
+            "acy": acy,
+            "sem": sem,
+            "crs_no": crs_no,
+            "name": course.name,
+            "teacher": course.teacher,
+            "credits": course.credits,
+            "dept": course.dept,
+            "time": course.time_codes,
+            "classroom": course.classroom_codes,
+            "syllabus": course.syllabus,
+            "syllabus_zh": course.syllabus_zh,
+            "syllabus_url_zh": syllabus_url_zh,
+            "syllabus_url_en": syllabus_url_en,
+            "details": parse_details(course.details),
+        })
+    return result
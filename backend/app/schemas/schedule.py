@@ -7,9 +7,10 @@ Defines request and response schemas for schedule (timetable) endpoints.
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 from app.schemas.course import CourseResponse
+from app.utils.time_slots import parse_slot_filter
 
 
 class ScheduleCourseBase(BaseModel):
@@ -108,9 +109,165 @@ class AddCourseRequest(BaseModel):
     course_id: int = Field(..., description="Course ID to add")
     color: Optional[str] = Field(None, description="Display color", pattern=r"^#[0-9A-Fa-f]{6}$")
     notes: Optional[str] = Field(None, description="Notes", max_length=500)
+    reject_on_conflict: bool = Field(
+        False, description="Reject the course (409) if it clashes with a scheduled course"
+    )
 
 
 class RemoveCourseRequest(BaseModel):
     """Request to remove a course from schedule."""
 
     course_id: int = Field(..., description="Course ID to remove")
+
+
+class BatchCourseRequest(BaseModel):
+    """Courses to add to and remove from a schedule in one transaction."""
+
+    add: list[ScheduleCourseCreate] = Field(
+        default_factory=list, max_length=500, description="Courses to add"
+    )
+    remove: list[int] = Field(
+        default_factory=list, max_length=500, description="Course IDs to remove (applied first)"
+    )
+    reject_on_conflict: bool = Field(
+        False, description="Skip added courses that clash with the schedule or each other"
+    )
+
+    @model_validator(mode="after")
+    def validate_not_empty(self):
+        """Ensure the batch contains at least one item."""
+        if not self.add and not self.remove:
+            raise ValueError("add and remove cannot both be empty")
+        return self
+
+
+class BatchCourseResult(BaseModel):
+    """Outcome of one item of a batch."""
+
+    course_id: int = Field(..., description="Course ID")
+    action: str = Field(..., description="'add' or 'remove'")
+    status: str = Field(
+        ...,
+        description="added, removed, not_found, duplicate, conflict or not_in_schedule",
+    )
+    detail: Optional[str] = Field(None, description="Why the item was skipped")
+
+
+class BatchCourseResponse(BaseModel):
+    """Per-item results of a batch update."""
+
+    schedule_id: int = Field(..., description="Schedule ID")
+    added: int = Field(..., description="Number of courses added")
+    removed: int = Field(..., description="Number of courses removed")
+    results: list[BatchCourseResult] = Field(
+        default_factory=list, description="Per-item results, removals first"
+    )
+
+
+class CourseConflict(BaseModel):
+    """Two scheduled courses sharing time slots."""
+
+    course_ids: list[int] = Field(..., description="IDs of the two clashing courses")
+    slots: str = Field(..., description="Shared time slots as NYCU time codes, e.g. 'M34'")
+
+
+class ScheduleConflictsResponse(BaseModel):
+    """Time clashes within a schedule."""
+
+    schedule_id: int = Field(..., description="Schedule ID")
+    has_conflicts: bool = Field(..., description="Whether any two courses clash")
+    occupied_slots: str = Field(..., description="All slots taken by the schedule's courses")
+    conflicts: list[CourseConflict] = Field(default_factory=list, description="Clashing course pairs")
+
+
+class FitCheckRequest(BaseModel):
+    """Candidate courses to check against a schedule."""
+
+    course_ids: list[int] = Field(
+        ..., min_length=1, max_length=5000, description="Candidate course IDs"
+    )
+
+
+class CandidateConflict(BaseModel):
+    """A candidate course that clashes with the schedule."""
+
+    course_id: int = Field(..., description="Candidate course ID")
+    slots: str = Field(..., description="Clashing time slots as NYCU time codes")
+    conflicting_course_ids: list[int] = Field(..., description="Scheduled courses it clashes with")
+
+
+class FitCheckResponse(BaseModel):
+    """Which candidate courses fit a schedule."""
+
+    schedule_id: int = Field(..., description="Schedule ID")
+    fits: list[int] = Field(default_factory=list, description="Candidates without a time clash")
+    conflicts: list[CandidateConflict] = Field(
+        default_factory=list, description="Candidates that clash with the schedule"
+    )
+    not_found: list[int] = Field(default_factory=list, description="Candidate IDs that do not exist")
+
+
+class GenerateScheduleRequest(BaseModel):
+    """Constraints for generating timetables."""
+
+    acy: int = Field(..., gt=0, description="Academic year")
+    sem: int = Field(..., ge=1, le=2, description="Semester (1=Fall, 2=Spring)")
+    required: list[str] = Field(
+        default_factory=list, max_length=30, description="Course numbers every timetable must include"
+    )
+    candidates: list[str] = Field(
+        default_factory=list, max_length=300, description="Course numbers that may be added"
+    )
+    min_credits: Optional[float] = Field(None, ge=0, description="Minimum total credits")
+    max_credits: Optional[float] = Field(None, ge=0, description="Maximum total credits")
+    blocked_slots: Optional[list[str]] = Field(
+        None, description="Time slots to keep free as NYCU time codes (e.g., ['F', 'M12'])"
+    )
+    limit: int = Field(10, ge=1, le=50, description="Maximum number of timetables")
+    time_budget_ms: Optional[int] = Field(
+        None, ge=10, description="Search time limit in milliseconds (capped by the server)"
+    )
+
+    @field_validator("blocked_slots")
+    @classmethod
+    def validate_time_codes(cls, v):
+        """Ensure every time code selects at least one slot."""
+        parse_slot_filter(v)
+        return v
+
+    @model_validator(mode="after")
+    def validate_constraints(self):
+        """Ensure there is something to schedule and the credit bounds are ordered."""
+        if not self.required and not self.candidates:
+            raise ValueError("required and candidates cannot both be empty")
+        if (
+            self.min_credits is not None
+            and self.max_credits is not None
+            and self.min_credits > self.max_credits
+        ):
+            raise ValueError("min_credits cannot be greater than max_credits")
+        return self
+
+
+class GeneratedSchedule(BaseModel):
+    """A conflict-free timetable."""
+
+    course_ids: list[int] = Field(..., description="Course IDs (one section per course number)")
+    crs_nos: list[str] = Field(..., description="Course numbers, in course_ids order")
+    total_credits: float = Field(..., description="Total credits")
+    days: str = Field(..., description="Days with classes, e.g. 'MTR'")
+    slots: str = Field(..., description="Occupied time slots as NYCU time codes")
+
+
+class GenerateScheduleResponse(BaseModel):
+    """Generated timetables, best first."""
+
+    schedules: list[GeneratedSchedule] = Field(
+        default_factory=list, description="Timetables by most credits, then fewest days"
+    )
+    not_found: list[str] = Field(default_factory=list, description="Unknown candidate course numbers")
+    unschedulable: list[str] = Field(
+        default_factory=list, description="Required course numbers meeting only in blocked slots"
+    )
+    explored: int = Field(..., description="Search nodes visited")
+    timed_out: bool = Field(..., description="Whether the time budget ended the search early")
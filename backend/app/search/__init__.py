@@ -0,0 +1,20 @@
+"""
+Search Engines Package
+
+Contains in-process search engines that answer course search requests
+without scanning the database.
+"""
+
+from app.search.engine import (
+    SearchEngine,
+    build_search_engine,
+    get_search_engine,
+    invalidate_search_engine,
+)
+
+__all__ = [
+    "SearchEngine",
+    "build_search_engine",
+    "get_search_engine",
+    "invalidate_search_engine",
+]
@@ -0,0 +1,487 @@
+"""
+In-memory completion index for search-box autocomplete.
+
+Built from the distinct course names, teachers and departments, each
+weighted by the number of courses carrying it. Every entry is stored under
+several lookup keys in one sorted array:
+
+- the whole normalized value
+- the suffix starting at each word (so "struct" finds "Data Structures")
+- the suffix starting at each CJK character (so "結構" finds "資料結構")
+- with ``pypinyin`` installed: toneless pinyin, pinyin initials and
+  toneless Zhuyin of the CJK characters (so "ziliao", "zljg" and "ㄗㄌㄧㄠ"
+  find "資料結構")
+
+A prefix lookup is a ``bisect`` range over the sorted keys. The top entries
+for every one- and two-character prefix, where ranges are large, are
+precomputed at build time, so lookups take microseconds.
+
+Course writes adjust weights and add new entries to a small pending array
+instead of rebuilding; once too many changes accumulate the index is
+rebuilt in the background. The index remembers the data version (see
+``app.utils.cache``) it reflects: when the version moves on because of a
+change made elsewhere (an import script, another worker or replica),
+``get_autocomplete_index`` falls back to SQL while a background
+``refresh_autocomplete_index`` adds the new courses. Edits and deletions
+made outside the API need a full refresh
+(``POST /api/admin/autocomplete/refresh?full=true``).
+"""
+
+import asyncio
+import heapq
+import logging
+import time
+from array import array
+from bisect import bisect_left, insort
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.course import Course
+from app.search.tokenizer import CJK, WORD, char_class, is_cjk, normalize
+from app.utils.cache import sync_data_version
+
+try:
+    from pypinyin import Style, lazy_pinyin
+except ImportError:  # optional, enables pinyin/Zhuyin lookups
+    lazy_pinyin = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Suggestion type per indexed column, in tie-break order
+SUGGESTION_TYPES = {"name": "course", "teacher": "teacher", "dept": "department"}
+
+# Longest stored key (longer suffixes add memory but no useful prefixes)
+MAX_KEY_LENGTH = 48
+
+# Zhuyin tone marks, ignored on both sides of a lookup
+ZHUYIN_TONES = str.maketrans("", "", "ˊˇˋ˙")
+
+# Entry identity: (suggestion type, original value)
+Entry = tuple[str, str]
+
+
+def completion_keys(value: str) -> set[str]:
+    """
+    Build the lookup keys of a value.
+
+    Args:
+        value: Course name, teacher or department
+
+    Returns:
+        set[str]: Normalized keys the value can be completed from
+    """
+    lowered = normalize(value).strip()
+    keys: set[str] = set()
+    if not lowered:
+        return keys
+
+    previous = None
+    for index, char in enumerate(lowered):
+        current = char_class(char)
+        if current == CJK or (current == WORD and previous != WORD):
+            keys.add(lowered[index:index + MAX_KEY_LENGTH])
+        previous = current
+    keys.add(lowered[:MAX_KEY_LENGTH])
+
+    if lazy_pinyin is not None:
+        keys.update(_phonetic_keys("".join(char for char in value if is_cjk(char))))
+
+    return keys
+
+
+def _phonetic_keys(cjk: str) -> set[str]:
+    """Build pinyin, pinyin-initial and Zhuyin keys for CJK characters."""
+    if not cjk:
+        return set()
+
+    syllables = lazy_pinyin(cjk, style=Style.NORMAL, errors="ignore")
+    zhuyin = [
+        syllable.translate(ZHUYIN_TONES)
+        for syllable in lazy_pinyin(cjk, style=Style.BOPOMOFO, errors="ignore")
+    ]
+
+    keys: set[str] = set()
+    for start in range(len(syllables)):
+        keys.add("".join(syllables[start:])[:MAX_KEY_LENGTH])
+        keys.add("".join(syllable[0] for syllable in syllables[start:] if syllable))
+    for start in range(len(zhuyin)):
+        keys.add("".join(zhuyin[start:])[:MAX_KEY_LENGTH])
+    keys.discard("")
+    return keys
+
+
+class AutocompleteIndex:
+    """
+    Sorted-array completion index with precomputed short-prefix results.
+
+    Example:
+        >>> index = AutocompleteIndex.from_counts({("course", "資料結構"): 12})
+        >>> index.complete("結構", limit=5)
+        [("course", "資料結構", 12)]
+    """
+
+    # Prefixes up to this length have precomputed top entries
+    PRECOMPUTED_PREFIX_LENGTH = 2
+
+    # Maximum number of suggestions per lookup
+    MAX_RESULTS = 50
+
+    # Pending keys tolerated before a rebuild is requested
+    REBUILD_THRESHOLD = 2000
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self.entries: list[Entry] = []
+        self.weights: list[int] = []
+        self.max_course_id = 0
+        self._entry_ids: dict[Entry, int] = {}
+        self._keys: list[str] = []
+        self._key_entries = array("i")
+        self._pending: list[tuple[str, int]] = []
+        self._top: dict[str, list[int]] = {}
+
+    @classmethod
+    def from_counts(cls, counts: dict[Entry, int], max_course_id: int = 0) -> "AutocompleteIndex":
+        """
+        Build an index from entry weights.
+
+        Args:
+            counts: (suggestion type, value) -> number of courses
+            max_course_id: Highest course id covered by the counts
+
+        Returns:
+            AutocompleteIndex: Built index
+        """
+        index = cls()
+        index.max_course_id = max_course_id
+
+        pairs: list[tuple[str, int]] = []
+        for entry, weight in counts.items():
+            if weight <= 0:
+                continue
+            entry_id = index._register(entry, weight)
+            pairs.extend((key, entry_id) for key in completion_keys(entry[1]))
+
+        pairs.sort()
+        index._keys = [key for key, _ in pairs]
+        index._key_entries = array("i", (entry_id for _, entry_id in pairs))
+
+        # Best entries for every short prefix
+        candidates: dict[str, set[int]] = {}
+        for key, entry_id in pairs:
+            for length in range(1, min(len(key), cls.PRECOMPUTED_PREFIX_LENGTH) + 1):
+                candidates.setdefault(key[:length], set()).add(entry_id)
+        index._top = {
+            prefix: heapq.nsmallest(cls.MAX_RESULTS, entry_ids, key=index._rank)
+            for prefix, entry_ids in candidates.items()
+        }
+
+        return index
+
+    def __len__(self) -> int:
+        """Number of entries with a positive weight."""
+        return sum(1 for weight in self.weights if weight > 0)
+
+    @property
+    def pending(self) -> int:
+        """Number of keys added since the last build."""
+        return len(self._pending)
+
+    def _register(self, entry: Entry, weight: int) -> int:
+        """Add a new entry and return its id."""
+        entry_id = len(self.entries)
+        self.entries.append(entry)
+        self.weights.append(weight)
+        self._entry_ids[entry] = entry_id
+        return entry_id
+
+    def _rank(self, entry_id: int) -> tuple[int, str, str]:
+        """Sort key: heaviest first, then by value and type."""
+        suggestion_type, value = self.entries[entry_id]
+        return -self.weights[entry_id], value, suggestion_type
+
+    def _prefix_range(self, keys: list[str], prefix: str) -> tuple[int, int]:
+        """Index range of sorted keys starting with a prefix."""
+        return bisect_left(keys, prefix), bisect_left(keys, prefix + "\U0010ffff")
+
+    def _candidates(self, prefix: str) -> set[int]:
+        """Entry ids with a key starting with the prefix."""
+        if len(prefix) <= self.PRECOMPUTED_PREFIX_LENGTH:
+            found = set(self._top.get(prefix, ()))
+        else:
+            low, high = self._prefix_range(self._keys, prefix)
+            found = set(self._key_entries[low:high])
+
+        if self._pending:
+            position = bisect_left(self._pending, (prefix, -1))
+            while position < len(self._pending) and self._pending[position][0].startswith(prefix):
+                found.add(self._pending[position][1])
+                position += 1
+
+        return found
+
+    def complete(self, query: str, limit: int = 10) -> list[tuple[str, str, int]]:
+        """
+        Find the heaviest entries completing a query.
+
+        Args:
+            query: Text typed so far
+            limit: Maximum suggestions (capped at MAX_RESULTS)
+
+        Returns:
+            List of (suggestion type, value, course count)
+        """
+        prefix = normalize(query).strip()
+        if not prefix:
+            return []
+
+        found = self._candidates(prefix[:MAX_KEY_LENGTH])
+        if lazy_pinyin is not None:
+            # Phonetic keys have no spaces or tone marks
+            compact = prefix.replace(" ", "").translate(ZHUYIN_TONES)
+            if compact != prefix:
+                found |= self._candidates(compact[:MAX_KEY_LENGTH])
+
+        live = (entry_id for entry_id in found if self.weights[entry_id] > 0)
+        best = heapq.nsmallest(min(limit, self.MAX_RESULTS), live, key=self._rank)
+        return [(*self.entries[entry_id], self.weights[entry_id]) for entry_id in best]
+
+    def apply(
+        self,
+        added: Iterable[Entry] = (),
+        removed: Iterable[Entry] = (),
+    ) -> bool:
+        """
+        Adjust weights for courses added or removed since the build.
+
+        New entries are stored in the pending array. Precomputed short-prefix
+        results keep their build-time membership until the next rebuild.
+
+        Args:
+            added: Entries of added courses (one per course)
+            removed: Entries of removed courses (one per course)
+
+        Returns:
+            bool: True if enough changes accumulated that a rebuild is due
+        """
+        for entry in removed:
+            entry_id = self._entry_ids.get(entry)
+            if entry_id is not None and self.weights[entry_id] > 0:
+                self.weights[entry_id] -= 1
+
+        for entry in added:
+            entry_id = self._entry_ids.get(entry)
+            if entry_id is not None:
+                self.weights[entry_id] += 1
+                continue
+            entry_id = self._register(entry, 1)
+            for key in completion_keys(entry[1]):
+                insort(self._pending, (key, entry_id))
+
+        return len(self._pending) > self.REBUILD_THRESHOLD
+
+
+def course_entries(name: Optional[str], teacher: Optional[str], dept: Optional[str]) -> list[Entry]:
+    """
+    List the completion entries of one course.
+
+    Args:
+        name: Course name
+        teacher: Teacher name(s)
+        dept: Department
+
+    Returns:
+        list[Entry]: (suggestion type, value) for every non-empty field
+    """
+    values = {"name": name, "teacher": teacher, "dept": dept}
+    return [
+        (SUGGESTION_TYPES[column], value)
+        for column, value in values.items()
+        if value and value.strip()
+    ]
+
+
+# Active index for this process
+_index: Optional[AutocompleteIndex] = None
+
+# Data version the active index reflects
+_index_version: Optional[int] = None
+
+# Pending background rebuild or refresh
+_rebuild_task: Optional[asyncio.Task] = None
+
+
+def get_autocomplete_index() -> Optional[AutocompleteIndex]:
+    """
+    Get the active completion index if it reflects the current data.
+
+    An index behind the data version schedules a background refresh.
+
+    Returns:
+        The index, or None if it has not been built or is being refreshed
+    """
+    if _index is None:
+        return None
+    if _index_version != sync_data_version():
+        _schedule_rebuild(full=False)
+        return None
+    return _index
+
+
+def set_autocomplete_index(index: Optional[AutocompleteIndex], data_version: Optional[int] = None) -> None:
+    """
+    Replace the active completion index.
+
+    Args:
+        index: Index to activate, or None to use SQL autocomplete
+        data_version: Data version the index reflects (default: the current one)
+    """
+    global _index, _index_version
+    _index = index
+    _index_version = sync_data_version() if data_version is None else data_version
+
+
+async def _load_counts(session: AsyncSession) -> tuple[dict[Entry, int], int]:
+    """Read entry weights and the highest course id from the database."""
+    counts: dict[Entry, int] = {}
+    for column, suggestion_type in SUGGESTION_TYPES.items():
+        field = getattr(Course, column)
+        result = await session.execute(
+            select(field, func.count()).where(field.is_not(None)).group_by(field)
+        )
+        for value, count in result.all():
+            if value.strip():
+                counts[(suggestion_type, value)] = count
+
+    max_course_id = await session.scalar(select(func.max(Course.id))) or 0
+    return counts, max_course_id
+
+
+async def build_autocomplete_index(session: AsyncSession) -> Optional[AutocompleteIndex]:
+    """
+    Build the completion index from the database and activate it.
+
+    Failures are logged and leave the SQL autocomplete in place.
+
+    Args:
+        session: Database session used for the build
+
+    Returns:
+        The built index, or None if the build failed
+    """
+    start = time.perf_counter()
+    version = sync_data_version()
+    try:
+        counts, max_course_id = await _load_counts(session)
+        index = await asyncio.to_thread(AutocompleteIndex.from_counts, counts, max_course_id)
+    except Exception as e:
+        logger.warning(f"Failed to build autocomplete index, using SQL autocomplete: {e}")
+        return None
+
+    set_autocomplete_index(index, version)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    logger.info(
+        f"Autocomplete index built: {len(index.entries)} entries, "
+        f"{len(index._keys)} keys, pinyin: {lazy_pinyin is not None} ({elapsed_ms:.0f}ms)"
+    )
+    return index
+
+
+async def refresh_autocomplete_index(session: AsyncSession, full: bool = False) -> dict[str, Any]:
+    """
+    Bring the completion index up to date with the database.
+
+    Without ``full``, only courses with an id above the highest one seen
+    (rows appended by an import) are added; if courses were deleted past
+    that id, or too many were added, the index is rebuilt instead. A full
+    refresh rebuilds the index, which also reflects edits and deletions
+    made outside the API.
+
+    Args:
+        session: Database session
+        full: Rebuild from scratch
+
+    Returns:
+        Dict with the refresh mode and number of courses or entries processed
+    """
+    global _index_version
+    index = _index
+    if full or index is None:
+        index = await build_autocomplete_index(session)
+        return {"mode": "full", "entries": len(index.entries) if index else 0}
+
+    version = sync_data_version()
+    max_course_id = await session.scalar(select(func.max(Course.id))) or 0
+    result = await session.execute(
+        select(Course.id, Course.name, Course.teacher, Course.dept)
+        .where(Course.id > index.max_course_id)
+        .order_by(Course.id)
+    )
+    rows = result.all()
+    if max_course_id < index.max_course_id or len(rows) > AutocompleteIndex.REBUILD_THRESHOLD:
+        index = await build_autocomplete_index(session)
+        return {"mode": "full", "entries": len(index.entries) if index else 0}
+
+    added = [entry for row in rows for entry in course_entries(row.name, row.teacher, row.dept)]
+    if index.apply(added=added):
+        index = await build_autocomplete_index(session)
+        return {"mode": "full", "entries": len(index.entries) if index else 0}
+    if rows:
+        index.max_course_id = rows[-1].id
+    if index is _index:
+        _index_version = version
+    logger.info(f"Autocomplete index refreshed with {len(rows)} new courses")
+    return {"mode": "incremental", "courses": len(rows)}
+
+
+def record_course_change(
+    added: Optional[tuple[Optional[str], Optional[str], Optional[str]]] = None,
+    removed: Optional[tuple[Optional[str], Optional[str], Optional[str]]] = None,
+    course_id: Optional[int] = None,
+) -> None:
+    """
+    Update the completion index after a course write.
+
+    Args:
+        added: (name, teacher, dept) of the course after the write
+        removed: (name, teacher, dept) of the course before the write
+        course_id: Id of a created course
+    """
+    index = _index
+    if index is None:
+        return
+
+    rebuild = index.apply(
+        added=course_entries(*added) if added else (),
+        removed=course_entries(*removed) if removed else (),
+    )
+    if course_id is not None:
+        index.max_course_id = max(index.max_course_id, course_id)
+    if rebuild:
+        _schedule_rebuild()
+
+
+def _schedule_rebuild(full: bool = True) -> None:
+    """Start one background rebuild (or incremental refresh) of the completion index."""
+    global _rebuild_task
+    if _rebuild_task is not None and not _rebuild_task.done():
+        return
+    try:
+        _rebuild_task = asyncio.get_running_loop().create_task(_rebuild_index(full))
+    except RuntimeError:
+        # No running loop (e.g. scripts); the next startup rebuilds the index
+        _rebuild_task = None
+
+
+async def _rebuild_index(full: bool = True) -> None:
+    """Rebuild or refresh the completion index using its own database session."""
+    from app.database.session import async_session
+
+    try:
+        async with async_session() as session:
+            await refresh_autocomplete_index(session, full=full)
+    except Exception as e:
+        logger.warning(f"Background refresh of the autocomplete index failed: {e}")
@@ -0,0 +1,645 @@
+"""
+Columnar in-memory search engine backed by NumPy.
+
+Built once from the ``courses`` table at startup, with one array per column
+in course id order:
+
+- text columns are dictionary-encoded: distinct values live in a
+  ``FieldIndex`` (shared with the inverted index, so substring matching over
+  distinct values uses the same gram postings) and rows hold int32 value ids
+- credits are a float32 array with NaN for NULL
+- day codes additionally get a bitmask per row (one bit per distinct
+  character), so single-day filters are one bitwise AND
+- the stored time-slot bitmask halves are int64 arrays, so slot filters
+  are bitwise ANDs as well
+
+A filter resolves its matching distinct values in Python, turns them into a
+lookup table and evaluates it for every row at once as a boolean mask.
+Filters combine with ``&``; the total is the mask's popcount. Sorting uses
+precomputed per-row sort ranks, so a page is an ``argpartition`` plus a
+small sort, and pagination is index slicing. Results match the SQL
+``ILIKE`` path exactly (see ``tests/test_services/test_search_index.py``).
+
+Requires ``numpy``; ``create_search_engine`` falls back to the inverted
+index when it is not installed.
+"""
+
+import asyncio
+import logging
+import time
+from bisect import bisect_left
+from collections import Counter
+from typing import Any, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.course import Course
+from app.models.semester import Semester
+from app.search.engine import SearchEngine
+from app.search.facets import day_letters, top_buckets
+from app.search.inverted_index import FieldIndex
+from app.search.tokenizer import normalize
+from app.utils.time_slots import ALL_SLOTS, split_slots
+
+try:
+    import numpy as np
+except ImportError:  # optional, required only by this engine
+    np = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Most distinct day-code characters that fit the per-row bitmask
+MAX_DAY_BITS = 32
+
+
+class TextColumn:
+    """
+    Dictionary-encoded text column.
+
+    Attributes:
+        field: Distinct values with gram postings
+        codes: Value id per row (-1 for NULL)
+        ranks: Sort rank per row (-1 for NULL), by value
+        sorted_values: Distinct values in sort order
+    """
+
+    __slots__ = ("field", "codes", "ranks", "sorted_values")
+
+    def __init__(self, field: FieldIndex, codes: list[int]):
+        """
+        Encode a column.
+
+        Args:
+            field: Distinct values the codes refer to
+            codes: Value id per row
+        """
+        self.field = field
+        self.codes = np.asarray(codes, dtype=np.int32)
+
+        order = sorted(range(len(field.values)), key=field.values.__getitem__)
+        self.sorted_values = [field.values[value_id] for value_id in order]
+        rank_of = np.empty(len(order) + 1, dtype=np.int32)
+        rank_of[0] = -1
+        rank_of[np.asarray(order, dtype=np.int64) + 1] = np.arange(len(order), dtype=np.int32)
+        self.ranks = rank_of[self.codes + 1]
+
+    def mask_for(self, value_ids: list[int]) -> "np.ndarray":
+        """
+        Get the rows holding any of the given values.
+
+        Args:
+            value_ids: Distinct value ids
+
+        Returns:
+            Boolean mask over rows
+        """
+        table = np.zeros(len(self.field.values) + 1, dtype=bool)
+        if value_ids:
+            table[np.asarray(value_ids, dtype=np.int64) + 1] = True
+        return table[self.codes + 1]
+
+    def contains(self, needle: str) -> "np.ndarray":
+        """
+        Get the rows whose value contains a normalized needle (``ILIKE '%needle%'``).
+
+        Args:
+            needle: Normalized search text
+
+        Returns:
+            Boolean mask over rows
+        """
+        return self.mask_for(self.field.matching_values(needle))
+
+    def rank_bound(self, value: Optional[str]) -> float:
+        """
+        Convert a cursor value to a bound comparable with ``ranks``.
+
+        Args:
+            value: Sort value of the last row already returned
+
+        Returns:
+            float: Its rank, or a half rank when the value no longer exists
+        """
+        if value is None:
+            return -1
+        position = bisect_left(self.sorted_values, value)
+        if position < len(self.sorted_values) and self.sorted_values[position] == value:
+            return position
+        return position - 0.5
+
+    def value_counts(self, mask: "np.ndarray") -> Counter:
+        """
+        Count rows per distinct value within a mask.
+
+        Args:
+            mask: Boolean mask over rows
+
+        Returns:
+            Counter of value -> count (NULLs are not counted)
+        """
+        counts = np.bincount(self.codes[mask] + 1, minlength=len(self.field.values) + 1)[1:]
+        values = self.field.values
+        return Counter({values[value_id]: int(counts[value_id]) for value_id in np.flatnonzero(counts)})
+
+
+class ColumnarData:
+    """
+    Immutable snapshot of the column arrays.
+
+    Searches read one snapshot; rebuilds swap in a new one atomically.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty columns."""
+        self.size = 0
+        self.ids: Any = None
+        self.semester_ids: Any = None
+        self.credits: Any = None
+        self.credit_ranks: Any = None
+        self.credit_values: list[float] = []
+
+        self.name: Optional[TextColumn] = None
+        self.crs_no: Optional[TextColumn] = None
+        self.teacher: Optional[TextColumn] = None
+        self.dept: Optional[TextColumn] = None
+        self.day_codes: Optional[TextColumn] = None
+        self.day_bits: Any = None
+        self.day_chars: dict[str, int] = {}
+        self.slots_lo: Any = None
+        self.slots_hi: Any = None
+
+        self.semesters: dict[int, tuple[int, int]] = {}
+
+    @classmethod
+    def from_rows(
+        cls,
+        course_rows: list[Any],
+        semester_rows: list[Any],
+    ) -> "ColumnarData":
+        """
+        Build column arrays from database rows.
+
+        Args:
+            course_rows: Rows of (id, semester_id, crs_no, name, teacher, dept,
+                credits, day_codes, time_slots_lo, time_slots_hi) in id order
+            semester_rows: Rows of (id, acy, sem)
+
+        Returns:
+            ColumnarData: Built snapshot
+        """
+        data = cls()
+        data.size = len(course_rows)
+        data.semesters = {semester_id: (acy, sem) for semester_id, acy, sem in semester_rows}
+
+        (course_ids, semester_ids, crs_nos, names, teachers, depts, credits,
+         day_codes, slots_lo, slots_hi) = zip(*course_rows) if course_rows else ((),) * 10
+
+        data.ids = np.asarray(course_ids, dtype=np.int64)
+        data.semester_ids = np.asarray(semester_ids, dtype=np.int64)
+        data.slots_lo = np.asarray(slots_lo, dtype=np.int64)
+        data.slots_hi = np.asarray(slots_hi, dtype=np.int64)
+
+        data.credits = np.asarray(
+            [np.nan if value is None else value for value in credits], dtype=np.float32
+        )
+        data.credit_values = sorted({value for value in credits if value is not None})
+        rank_of = {value: rank for rank, value in enumerate(data.credit_values)}
+        data.credit_ranks = np.asarray(
+            [-1 if value is None else rank_of[value] for value in credits], dtype=np.int32
+        )
+
+        def encode(values: tuple, use_grams: bool = True) -> TextColumn:
+            field = FieldIndex(use_grams=use_grams)
+            return TextColumn(field, [field.add(value, row) for row, value in enumerate(values)])
+
+        data.name = encode(names)
+        data.crs_no = encode(crs_nos)
+        data.teacher = encode(teachers)
+        data.dept = encode(depts, use_grams=False)
+        data.day_codes = encode(day_codes, use_grams=False)
+
+        # One bit per distinct (normalized) day-code character
+        chars = sorted({char for value in data.day_codes.field.lowered for char in value})
+        if len(chars) <= MAX_DAY_BITS:
+            data.day_chars = {char: 1 << bit for bit, char in enumerate(chars)}
+            value_bits = np.zeros(len(data.day_codes.field.values) + 1, dtype=np.uint32)
+            for value_id, lowered in enumerate(data.day_codes.field.lowered):
+                for char in set(lowered):
+                    value_bits[value_id + 1] |= data.day_chars[char]
+            data.day_bits = value_bits[data.day_codes.codes + 1]
+
+        return data
+
+    def __len__(self) -> int:
+        """Number of loaded courses."""
+        return self.size
+
+
+class ColumnarEngine(SearchEngine):
+    """
+    Search engine evaluating filters as vectorized masks over NumPy columns.
+
+    Example:
+        >>> engine = ColumnarEngine()
+        >>> await engine.build(session)
+        >>> ids, total = engine.search(dept=["CS"], credits_min=3, limit=20)
+    """
+
+    name = "columnar"
+
+    def __init__(self) -> None:
+        """Initialize an unbuilt engine."""
+        if np is None:
+            raise RuntimeError("The columnar search engine requires numpy")
+        self._data: Optional[ColumnarData] = None
+        self._generation = 0
+        self._built_generation = -1
+
+    @property
+    def ready(self) -> bool:
+        """Whether a current (non-invalidated) snapshot is available."""
+        return self._data is not None and self._built_generation == self._generation
+
+    def invalidate(self) -> None:
+        """Mark the current snapshot as stale."""
+        self._generation += 1
+
+    async def build(self, session: AsyncSession) -> None:
+        """
+        Load the columns from the database.
+
+        Only the filtered and sorted columns are selected; the CPU-bound
+        encoding runs in a worker thread so the event loop keeps serving
+        requests.
+
+        Args:
+            session: Database session
+        """
+        generation = self._generation
+        start = time.perf_counter()
+
+        course_result = await session.execute(
+            select(
+                Course.id,
+                Course.semester_id,
+                Course.crs_no,
+                Course.name,
+                Course.teacher,
+                Course.dept,
+                Course.credits,
+                Course.day_codes,
+                Course.time_slots_lo,
+                Course.time_slots_hi,
+            ).order_by(Course.id)
+        )
+        semester_result = await session.execute(
+            select(Semester.id, Semester.acy, Semester.sem)
+        )
+        course_rows = course_result.all()
+        semester_rows = semester_result.all()
+
+        data = await asyncio.to_thread(ColumnarData.from_rows, course_rows, semester_rows)
+
+        self._data = data
+        self._built_generation = generation
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        logger.info(
+            f"Columnar store built: {len(data)} courses, "
+            f"{len(data.name.field.values)} names, {len(data.teacher.field.values)} teachers, "
+            f"{len(data.dept.field.values)} departments ({elapsed_ms:.0f}ms)"
+        )
+
+    def search(
+        self,
+        query: Optional[str] = None,
+        crs_no: Optional[str] = None,
+        semester_ids: Optional[list[int]] = None,
+        acy: Optional[list[int]] = None,
+        sem: Optional[list[int]] = None,
+        name: Optional[str] = None,
+        teacher: Optional[str] = None,
+        dept: Optional[list[str]] = None,
+        credits_min: Optional[float] = None,
+        credits_max: Optional[float] = None,
+        exact_credits: Optional[float] = None,
+        day_codes: Optional[list[str]] = None,
+        slots_within: Optional[int] = None,
+        slots_avoid: Optional[int] = None,
+        limit: int = 50,
+        offset: int = 0,
+        sort_by: str = "by_relevance",
+        sort_desc: bool = False,
+        after: Optional[tuple[Any, int]] = None,
+    ) -> tuple[list[int], int]:
+        """
+        Search courses with vectorized masks.
+
+        Returns:
+            Tuple of (course ids for the requested page, total_count)
+
+        Raises:
+            RuntimeError: If the columns have not been loaded
+        """
+        data = self._snapshot()
+        mask = self._match(
+            data,
+            query=query,
+            crs_no=crs_no,
+            semester_ids=semester_ids,
+            acy=acy,
+            sem=sem,
+            name=name,
+            teacher=teacher,
+            dept=dept,
+            credits_min=credits_min,
+            credits_max=credits_max,
+            exact_credits=exact_credits,
+            day_codes=day_codes,
+            slots_within=slots_within,
+            slots_avoid=slots_avoid,
+        )
+
+        positions = np.arange(len(data)) if mask is None else np.flatnonzero(mask)
+        total = len(positions)
+        if total == 0 or offset >= total:
+            return [], total
+
+        # Relevance ordering applies to any non-empty query, as in SQL
+        needle = normalize(query) if query else None
+        primary, reverse = self._sort_rank(data, sort_by, sort_desc, needle)
+
+        if after is not None:
+            positions = positions[self._seek(data, positions, primary, reverse, sort_by, after)]
+
+        page = self._top(positions, primary, reverse, offset + limit, len(data))[offset:offset + limit]
+        return data.ids[page].tolist(), total
+
+    def facet_counts(
+        self,
+        fields: list[str],
+        limit: int = 20,
+        **filters: Any,
+    ) -> dict[str, list[dict[str, Any]]]:
+        """
+        Count facet values over the courses matching the filters.
+
+        Each field is one ``bincount`` over the matching rows' value codes.
+
+        Returns:
+            Dict of field -> buckets ordered by count
+
+        Raises:
+            RuntimeError: If the columns have not been loaded
+        """
+        data = self._snapshot()
+        mask = self._match(data, **filters)
+        if mask is None:
+            mask = np.ones(len(data), dtype=bool)
+
+        result: dict[str, list[dict[str, Any]]] = {}
+        for field in fields:
+            if field in ("dept", "teacher"):
+                counts = getattr(data, field).value_counts(mask)
+            elif field == "day_codes":
+                counts = Counter()
+                for value, count in data.day_codes.value_counts(mask).items():
+                    for letter in day_letters(value):
+                        counts[letter] += count
+            elif field == "credits":
+                ranks = data.credit_ranks[mask]
+                per_rank = np.bincount(ranks[ranks >= 0], minlength=len(data.credit_values))
+                counts = Counter({
+                    data.credit_values[rank]: int(per_rank[rank]) for rank in np.flatnonzero(per_rank)
+                })
+            else:
+                part = 0 if field == "acy" else 1
+                counts = Counter()
+                semester_ids, per_semester = np.unique(data.semester_ids[mask], return_counts=True)
+                for semester_id, count in zip(semester_ids.tolist(), per_semester.tolist()):
+                    if semester_id in data.semesters:
+                        counts[data.semesters[semester_id][part]] += count
+            result[field] = top_buckets(counts, limit)
+
+        return result
+
+    def _snapshot(self) -> ColumnarData:
+        """Get the current column snapshot."""
+        data = self._data
+        if data is None:
+            raise RuntimeError("Columnar store has not been built")
+        return data
+
+    @staticmethod
+    def _match(
+        data: ColumnarData,
+        query: Optional[str] = None,
+        crs_no: Optional[str] = None,
+        semester_ids: Optional[list[int]] = None,
+        acy: Optional[list[int]] = None,
+        sem: Optional[list[int]] = None,
+        name: Optional[str] = None,
+        teacher: Optional[str] = None,
+        dept: Optional[list[str]] = None,
+        credits_min: Optional[float] = None,
+        credits_max: Optional[float] = None,
+        exact_credits: Optional[float] = None,
+        day_codes: Optional[list[str]] = None,
+        slots_within: Optional[int] = None,
+        slots_avoid: Optional[int] = None,
+    ) -> Optional["np.ndarray"]:
+        """
+        Evaluate the filters as one boolean mask.
+
+        Semantics mirror ``InvertedIndexEngine._match`` and the SQL path.
+
+        Returns:
+            Boolean mask over rows, or None when there are no filters
+        """
+        masks = []
+
+        # Full-text query: name, course number, teacher or department
+        if query and query.strip():
+            needle = normalize(query)
+            masks.append(
+                data.name.contains(needle)
+                | data.crs_no.contains(needle)
+                | data.teacher.contains(needle)
+                | data.dept.contains(needle)
+            )
+
+        if crs_no:
+            masks.append(data.crs_no.contains(normalize(crs_no)))
+
+        # Semester filters only apply when they match known semesters,
+        # mirroring the SQL path
+        if semester_ids:
+            if any(semester_id in data.semesters for semester_id in semester_ids):
+                masks.append(np.isin(data.semester_ids, semester_ids))
+
+        if acy or sem:
+            matching = [
+                semester_id
+                for semester_id, (semester_acy, semester_sem) in data.semesters.items()
+                if (not acy or semester_acy in acy) and (not sem or semester_sem in sem)
+            ]
+            if matching:
+                masks.append(np.isin(data.semester_ids, matching))
+
+        if name:
+            masks.append(data.name.contains(normalize(name)))
+
+        if teacher:
+            masks.append(data.teacher.contains(normalize(teacher)))
+
+        if dept:
+            value_ids = {value_id for d in dept for value_id in data.dept.field.matching_values(normalize(d))}
+            masks.append(data.dept.mask_for(list(value_ids)))
+
+        # NaN (NULL) compares false, like SQL
+        if exact_credits is not None:
+            masks.append(data.credits == np.float32(exact_credits))
+        else:
+            if credits_min is not None:
+                masks.append(data.credits >= np.float32(credits_min))
+            if credits_max is not None:
+                masks.append(data.credits <= np.float32(credits_max))
+
+        if day_codes:
+            masks.append(ColumnarEngine._day_mask(data, [normalize(day) for day in day_codes]))
+
+        if slots_within is not None:
+            blocked_lo, blocked_hi = split_slots(ALL_SLOTS & ~slots_within)
+            masks.append(
+                ((data.slots_lo & blocked_lo) == 0)
+                & ((data.slots_hi & blocked_hi) == 0)
+                & ((data.slots_lo | data.slots_hi) != 0)
+            )
+
+        if slots_avoid is not None:
+            avoid_lo, avoid_hi = split_slots(slots_avoid)
+            masks.append(((data.slots_lo & avoid_lo) == 0) & ((data.slots_hi & avoid_hi) == 0))
+
+        if not masks:
+            return None
+        mask = masks[0]
+        for other in masks[1:]:
+            mask &= other
+        return mask
+
+    @staticmethod
+    def _day_mask(data: ColumnarData, needles: list[str]) -> "np.ndarray":
+        """Match day codes, using the bitmask for single characters."""
+        if data.day_bits is not None and all(len(needle) == 1 for needle in needles):
+            bits = 0
+            for needle in needles:
+                bits |= data.day_chars.get(needle, 0)
+            return (data.day_bits & np.uint32(bits)) != 0
+
+        value_ids = {
+            value_id for needle in needles for value_id in data.day_codes.field.matching_values(needle)
+        }
+        return data.day_codes.mask_for(list(value_ids))
+
+    @staticmethod
+    def _sort_rank(
+        data: ColumnarData,
+        sort_by: str,
+        sort_desc: bool,
+        needle: Optional[str],
+    ) -> tuple[Optional["np.ndarray"], bool]:
+        """
+        Get the primary sort rank per row, matching ``SearchService._apply_sorting``.
+
+        NULL values rank first (-1) in ascending order, as in SQLite. Ties
+        are broken by course id, i.e. by row position.
+
+        Returns:
+            Tuple of (rank per row, or None for id order; reverse)
+        """
+        if sort_by == "by_name":
+            return data.name.ranks, sort_desc
+        if sort_by == "by_credits":
+            return data.credit_ranks, sort_desc
+        if sort_by == "by_teacher":
+            return data.teacher.ranks, sort_desc
+        if sort_by == "by_semester":
+            return data.semester_ids, sort_desc
+
+        if sort_by == "by_relevance" and needle is not None:
+            # Name matches first, then course-number matches, then by name
+            name_miss = (~data.name.contains(needle)).astype(np.int64)
+            crs_miss = (~data.crs_no.contains(needle)).astype(np.int64)
+            span = len(data.name.field.values) + 1
+            return (name_miss * 2 + crs_miss) * span + data.name.ranks + 1, False
+
+        # Default: course id order (rows are loaded in id order)
+        return None, sort_desc
+
+    @staticmethod
+    def _seek(
+        data: ColumnarData,
+        positions: "np.ndarray",
+        primary: Optional["np.ndarray"],
+        reverse: bool,
+        sort_by: str,
+        after: tuple[Any, int],
+    ) -> "np.ndarray":
+        """
+        Mask the positions that sort after a keyset cursor.
+
+        Returns:
+            Boolean mask over ``positions``
+        """
+        value, row_id = after
+        ids = data.ids[positions]
+
+        if primary is None:
+            return ids < row_id if reverse else ids > row_id
+
+        if sort_by in ("by_name", "by_teacher"):
+            bound = getattr(data, sort_by[3:]).rank_bound(value)
+        elif sort_by == "by_credits":
+            if value is None:
+                bound = -1
+            else:
+                rank = bisect_left(data.credit_values, value)
+                exact = rank < len(data.credit_values) and data.credit_values[rank] == value
+                bound = rank if exact else rank - 0.5
+        else:
+            bound = value
+
+        ranks = primary[positions]
+        if reverse:
+            return (ranks < bound) | ((ranks == bound) & (ids < row_id))
+        return (ranks > bound) | ((ranks == bound) & (ids > row_id))
+
+    @staticmethod
+    def _top(
+        positions: "np.ndarray",
+        primary: Optional["np.ndarray"],
+        reverse: bool,
+        count: int,
+        size: int,
+    ) -> "np.ndarray":
+        """
+        Return the first ``count`` positions in sort order.
+
+        Rank and position are combined into one int64 key, so a partial
+        selection followed by a sort of only the selected keys suffices.
+        """
+        if primary is None:
+            ordered = positions[::-1] if reverse else positions
+            return ordered[:count]
+
+        keys = primary[positions].astype(np.int64) * size + positions
+        if reverse:
+            keys = -keys
+        if count < len(keys):
+            keys = keys[np.argpartition(keys, count)[:count]]
+        keys.sort()
+        if reverse:
+            keys = -keys
+        return keys % size
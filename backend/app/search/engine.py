@@ -0,0 +1,250 @@
+"""
+Pluggable search engine interface.
+
+A search engine answers the same filter set as
+``SearchService.advanced_search`` from an in-process structure and returns
+the ids of the requested page together with the exact total. The service
+then loads only those rows from the database, and it falls back to the SQL
+path whenever no engine is ready.
+
+The active engine remembers the data version (see ``app.utils.cache``) it
+was built from. Writes through the services invalidate it directly; a
+change made elsewhere (an import script, another worker, another replica)
+moves the data version on, and ``get_search_engine`` then stops using the
+engine and rebuilds it in the background.
+"""
+
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.utils.cache import sync_data_version
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class SearchEngine(ABC):
+    """
+    Base class for in-process course search engines.
+
+    Subclasses build their structures from the ``courses`` table and answer
+    filter requests without touching the database.
+    """
+
+    name: str = "base"
+
+    @property
+    @abstractmethod
+    def ready(self) -> bool:
+        """Whether the engine has been built and can answer queries."""
+
+    @abstractmethod
+    async def build(self, session: AsyncSession) -> None:
+        """
+        Build (or rebuild) the engine from the database.
+
+        Args:
+            session: Database session used to read courses and semesters
+        """
+
+    @abstractmethod
+    def search(
+        self,
+        query: Optional[str] = None,
+        crs_no: Optional[str] = None,
+        semester_ids: Optional[list[int]] = None,
+        acy: Optional[list[int]] = None,
+        sem: Optional[list[int]] = None,
+        name: Optional[str] = None,
+        teacher: Optional[str] = None,
+        dept: Optional[list[str]] = None,
+        credits_min: Optional[float] = None,
+        credits_max: Optional[float] = None,
+        exact_credits: Optional[float] = None,
+        day_codes: Optional[list[str]] = None,
+        slots_within: Optional[int] = None,
+        slots_avoid: Optional[int] = None,
+        limit: int = 50,
+        offset: int = 0,
+        sort_by: str = "by_relevance",
+        sort_desc: bool = False,
+        after: Optional[tuple[Any, int]] = None,
+    ) -> tuple[list[int], int]:
+        """
+        Search courses.
+
+        Filter semantics match ``SearchService.advanced_search`` (slot
+        filters are bitmasks, see ``app.utils.time_slots``); ``after`` is a
+        decoded keyset cursor of (sort value, course id).
+
+        Returns:
+            Tuple of (course ids for the requested page, total_count)
+        """
+
+    @abstractmethod
+    def facet_counts(
+        self,
+        fields: list[str],
+        limit: int = 20,
+        **filters: Any,
+    ) -> dict[str, list[dict[str, Any]]]:
+        """
+        Count facet values over the courses matching the filters.
+
+        Args:
+            fields: Facet fields (see ``app.search.facets.FACET_FIELDS``)
+            limit: Maximum number of buckets per field
+            **filters: Filter criteria as accepted by ``search``
+
+        Returns:
+            Dict of field -> [{"value": ..., "count": ...}] ordered by count
+        """
+
+    def invalidate(self) -> None:
+        """Mark the engine as stale so callers fall back to SQL."""
+
+
+# Active engine for this process
+_engine: Optional[SearchEngine] = None
+
+# Data version the active engine was built from
+_engine_version: Optional[int] = None
+
+# Pending background rebuild after invalidation
+_rebuild_task: Optional[asyncio.Task] = None
+
+
+def create_search_engine(name: str) -> Optional[SearchEngine]:
+    """
+    Create a search engine by its configured name.
+
+    Args:
+        name: Engine name from settings (``"sql"`` disables in-process engines)
+
+    Returns:
+        SearchEngine instance, or None when the SQL path should be used
+    """
+    if name == "inverted_index":
+        from app.search.inverted_index import InvertedIndexEngine
+        return InvertedIndexEngine()
+    if name == "columnar":
+        from app.search.columnar import ColumnarEngine, np
+        if np is not None:
+            return ColumnarEngine()
+        logger.warning("Columnar search engine requires numpy, using the inverted index")
+        from app.search.inverted_index import InvertedIndexEngine
+        return InvertedIndexEngine()
+    if name != "sql":
+        logger.warning(f"Unknown search engine '{name}', using SQL search")
+    return None
+
+
+def get_search_engine() -> Optional[SearchEngine]:
+    """
+    Get the active search engine if it is ready and current.
+
+    An engine built from an older data version is invalidated, which
+    schedules a rebuild, unless a rebuild is already running.
+
+    Returns:
+        Ready SearchEngine, or None when the SQL path must be used
+    """
+    if _engine is None:
+        return None
+    if _engine_version != sync_data_version():
+        if _rebuild_task is None or _rebuild_task.done():
+            logger.info(f"Course data changed, rebuilding {_engine.name} search engine")
+            invalidate_search_engine()
+        return None
+    if _engine.ready:
+        return _engine
+    return None
+
+
+def set_search_engine(engine: Optional[SearchEngine], data_version: Optional[int] = None) -> None:
+    """
+    Replace the active search engine.
+
+    Args:
+        engine: Engine to activate, or None to disable in-process search
+        data_version: Data version the engine was built from (default: the
+            current one)
+    """
+    global _engine, _engine_version
+    _engine = engine
+    _engine_version = sync_data_version() if data_version is None else data_version
+
+
+async def build_search_engine(session: AsyncSession) -> Optional[SearchEngine]:
+    """
+    Create and build the configured search engine.
+
+    Failures are logged and leave the SQL path in place.
+
+    Args:
+        session: Database session used for the build
+
+    Returns:
+        The built engine, or None if disabled or the build failed
+    """
+    engine = create_search_engine(settings.SEARCH_ENGINE)
+    if engine is None:
+        set_search_engine(None)
+        return None
+
+    version = sync_data_version()
+    try:
+        await engine.build(session)
+    except Exception as e:
+        logger.warning(f"Failed to build {engine.name} search engine, using SQL search: {e}")
+        set_search_engine(None)
+        return None
+
+    set_search_engine(engine, version)
+    return engine
+
+
+def invalidate_search_engine() -> None:
+    """
+    Mark the active engine as stale after course data changes.
+
+    Searches use the SQL path until a background rebuild finishes.
+    """
+    global _rebuild_task
+    if _engine is None:
+        return
+
+    _engine.invalidate()
+
+    if _rebuild_task is not None and not _rebuild_task.done():
+        return
+    try:
+        _rebuild_task = asyncio.get_running_loop().create_task(_rebuild_engine(_engine))
+    except RuntimeError:
+        # No running loop (e.g. scripts); the next startup rebuilds the engine
+        _rebuild_task = None
+
+
+async def _rebuild_engine(engine: SearchEngine) -> None:
+    """Rebuild an engine using its own database session."""
+    global _engine_version
+    from app.database.session import async_session
+
+    # Data may change again while a rebuild runs; retry until current
+    for _ in range(3):
+        version = sync_data_version()
+        try:
+            async with async_session() as session:
+                await engine.build(session)
+        except Exception as e:
+            logger.warning(f"Background rebuild of {engine.name} search engine failed: {e}")
+            return
+        if engine.ready and version == sync_data_version():
+            if _engine is engine:
+                _engine_version = version
+            return
@@ -0,0 +1,185 @@
+"""
+Facet counts for search results.
+
+A facet counts how many courses of the current result set have each value
+of a field, so the filter sidebar can be rendered from the search response
+itself. Supported fields match the search filters: ``dept``, ``credits``,
+``day_codes`` (counted per day letter), ``acy``, ``sem`` and ``teacher``.
+
+The in-memory index keeps one bitmap per value of every low-cardinality
+field: a Python int with bit ``p`` set when the course at index position
+``p`` has that value. A result set is converted to a bitmap once; each
+value's count is then a single AND plus ``int.bit_count()`` in C. Teachers
+have too many distinct values for bitmaps and are counted from the
+per-position value-id column instead.
+"""
+
+from collections import Counter
+from typing import TYPE_CHECKING, Any, Iterable, Optional
+
+if TYPE_CHECKING:
+    from app.search.inverted_index import IndexData
+
+# Fields that can be requested as facets, in response order
+FACET_FIELDS = ("dept", "credits", "day_codes", "acy", "sem", "teacher")
+
+
+def day_letters(day_codes: str) -> set[str]:
+    """
+    Split a day codes value into its day letters.
+
+    Args:
+        day_codes: Stored value such as "MW"
+
+    Returns:
+        set[str]: Upper-case day letters (e.g. {"M", "W"})
+    """
+    return {char for char in day_codes.upper() if char.isalnum()}
+
+
+def top_buckets(counts: Counter, limit: int) -> list[dict[str, Any]]:
+    """
+    Order facet counts by count, then value, and keep the first ``limit``.
+
+    Args:
+        counts: Value -> count (zero counts are dropped)
+        limit: Maximum number of buckets
+
+    Returns:
+        List of {"value": ..., "count": ...} dicts
+    """
+    buckets = sorted(
+        ((value, count) for value, count in counts.items() if count > 0),
+        key=lambda item: (-item[1], item[0]),
+    )
+    return [{"value": value, "count": count} for value, count in buckets[:limit]]
+
+
+def to_bitmap(positions: Iterable[int], size: int) -> int:
+    """
+    Convert document positions into a bitmap.
+
+    Args:
+        positions: Document positions
+        size: Number of documents in the index
+
+    Returns:
+        int: Bitmap with bit ``p`` set for every position ``p``
+    """
+    buffer = bytearray((size + 7) >> 3)
+    for position in positions:
+        buffer[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(buffer, "little")
+
+
+class FacetIndex:
+    """
+    Per-value bitmaps of the low-cardinality facet fields.
+
+    Example:
+        >>> facets = FacetIndex.build(data)
+        >>> facets.counts(data, ["dept", "teacher"], matched_positions, limit=10)
+        {"dept": [{"value": "CS", "count": 42}, ...], "teacher": [...]}
+    """
+
+    def __init__(self, size: int):
+        """
+        Initialize empty bitmaps.
+
+        Args:
+            size: Number of documents in the index
+        """
+        self.size = size
+        self.bitmaps: dict[str, dict[Any, int]] = {field: {} for field in FACET_FIELDS}
+
+    @classmethod
+    def build(cls, data: "IndexData") -> "FacetIndex":
+        """
+        Build bitmaps from a built index snapshot.
+
+        Args:
+            data: Index snapshot
+
+        Returns:
+            FacetIndex: Built bitmaps
+        """
+        size = len(data)
+        index = cls(size)
+
+        index.bitmaps["dept"] = {
+            value: to_bitmap(docs, size)
+            for value, docs in zip(data.dept.values, data.dept.docs)
+        }
+        index.bitmaps["credits"] = {
+            value: to_bitmap(docs, size) for value, docs in data.credit_docs.items()
+        }
+
+        days: dict[str, int] = {}
+        for value, docs in zip(data.day_codes.values, data.day_codes.docs):
+            bitmap = to_bitmap(docs, size)
+            for letter in day_letters(value):
+                days[letter] = days.get(letter, 0) | bitmap
+        index.bitmaps["day_codes"] = days
+
+        semesters = {
+            semester_id: to_bitmap(docs, size)
+            for semester_id, docs in data.semester_docs.items()
+        }
+        for field, part in (("acy", 0), ("sem", 1)):
+            bitmaps: dict[int, int] = {}
+            for semester_id, bitmap in semesters.items():
+                value = data.semesters[semester_id][part]
+                bitmaps[value] = bitmaps.get(value, 0) | bitmap
+            index.bitmaps[field] = bitmaps
+
+        return index
+
+    def counts(
+        self,
+        data: "IndexData",
+        fields: Iterable[str],
+        matched: Optional[Iterable[int]],
+        limit: int,
+    ) -> dict[str, list[dict[str, Any]]]:
+        """
+        Count facet values within a result set.
+
+        Args:
+            data: Index snapshot the bitmaps were built from
+            fields: Facet fields to count (see ``FACET_FIELDS``)
+            matched: Matching document positions, or None for every document
+            limit: Maximum number of buckets per field
+
+        Returns:
+            Dict of field -> buckets ordered by count
+        """
+        result: dict[str, list[dict[str, Any]]] = {}
+        matched_bitmap: Optional[int] = None
+
+        for field in fields:
+            if field == "teacher":
+                if matched is None:
+                    counts = Counter({
+                        value: len(docs)
+                        for value, docs in zip(data.teacher.values, data.teacher.docs)
+                    })
+                else:
+                    values = data.teacher.values
+                    counts = Counter()
+                    for value_id, count in Counter(map(data.teacher_ids.__getitem__, matched)).items():
+                        if value_id >= 0:
+                            counts[values[value_id]] = count
+            elif matched is None:
+                counts = Counter({
+                    value: bitmap.bit_count() for value, bitmap in self.bitmaps[field].items()
+                })
+            else:
+                if matched_bitmap is None:
+                    matched_bitmap = to_bitmap(matched, self.size)
+                counts = Counter({
+                    value: (bitmap & matched_bitmap).bit_count()
+                    for value, bitmap in self.bitmaps[field].items()
+                })
+            result[field] = top_buckets(counts, limit)
+
+        return result
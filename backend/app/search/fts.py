@@ -0,0 +1,137 @@
+"""
+SQLite FTS5 full-text search support.
+
+The ``courses_fts`` virtual table is an external-content FTS5 index over the
+``courses`` table, created by ``scripts/optimize_database.py`` and kept in
+sync by triggers. It uses the ``trigram`` tokenizer so that Chinese
+substrings match without word segmentation, which gives the same substring
+semantics as ``ILIKE '%q%'`` for queries of at least three characters.
+
+Relevance is scored with ``bm25()`` using per-column weights, so the best
+matches are read from the index instead of sorting the whole table.
+"""
+
+import logging
+from typing import Optional, Sequence
+
+from sqlalchemy import column, func, literal_column, table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Virtual table name and indexed columns (in declaration order)
+FTS_TABLE = "courses_fts"
+FTS_COLUMNS = ("name", "crs_no", "teacher", "dept", "syllabus", "syllabus_zh")
+
+# bm25() weights per column, in FTS_COLUMNS order
+BM25_WEIGHTS = (10.0, 8.0, 5.0, 2.0, 1.0, 1.0)
+
+# The trigram tokenizer cannot match queries shorter than one trigram
+MIN_QUERY_LENGTH = 3
+
+# Columns matched by the course search ``query`` parameter
+QUERY_COLUMNS = ("name", "crs_no", "teacher", "dept")
+
+courses_fts = table(FTS_TABLE, column("rowid"))
+
+# Cached result of the schema check (None until first checked)
+_fts_available: Optional[bool] = None
+
+
+async def fts_available(session: AsyncSession) -> bool:
+    """
+    Check whether the FTS index can be used.
+
+    The result is cached per process; restart the application after
+    running the migration script to enable the FTS path.
+
+    Args:
+        session: Database session
+
+    Returns:
+        bool: True if FTS search is enabled and the virtual table exists
+    """
+    global _fts_available
+    if _fts_available is not None:
+        return _fts_available
+
+    if not settings.SEARCH_FTS_ENABLED or session.bind.dialect.name != "sqlite":
+        _fts_available = False
+        return False
+
+    try:
+        result = await session.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": FTS_TABLE},
+        )
+        _fts_available = result.scalar() is not None
+    except Exception as e:
+        logger.warning(f"FTS availability check failed: {e}")
+        _fts_available = False
+
+    logger.info(f"FTS search {'enabled' if _fts_available else 'unavailable'}")
+    return _fts_available
+
+
+def reset_fts_cache() -> None:
+    """Forget the cached availability check (e.g. after a migration)."""
+    global _fts_available
+    _fts_available = None
+
+
+def is_fts_query(query: Optional[str]) -> bool:
+    """
+    Check whether a query is long enough for trigram matching.
+
+    Args:
+        query: Search query
+
+    Returns:
+        bool: True if the FTS index can answer the query
+    """
+    return bool(query and query.strip()) and len(query) >= MIN_QUERY_LENGTH
+
+
+def match_expression(query: str, columns: Sequence[str] = QUERY_COLUMNS) -> str:
+    """
+    Build an FTS5 MATCH expression for a substring query.
+
+    The query is quoted as a single phrase so FTS5 operators in user input
+    are treated as literal text.
+
+    Args:
+        query: Search query (at least MIN_QUERY_LENGTH characters)
+        columns: Columns to restrict the match to
+
+    Returns:
+        str: MATCH expression, e.g. ``{name teacher} : "資料結構"``
+    """
+    phrase = '"' + query.replace('"', '""') + '"'
+    return "{" + " ".join(columns) + "} : " + phrase
+
+
+def fts_match(query: str, columns: Sequence[str] = QUERY_COLUMNS):
+    """
+    Build a ``courses_fts MATCH`` clause.
+
+    Args:
+        query: Search query
+        columns: Columns to restrict the match to
+
+    Returns:
+        SQLAlchemy boolean clause
+    """
+    return literal_column(FTS_TABLE).op("MATCH")(match_expression(query, columns))
+
+
+def fts_rank():
+    """
+    Build the ``bm25()`` relevance expression (lower is better).
+
+    Returns:
+        SQLAlchemy expression usable in ORDER BY
+    """
+    return func.bm25(literal_column(FTS_TABLE), *BM25_WEIGHTS)
@@ -0,0 +1,617 @@
+"""
+In-memory inverted index search engine.
+
+Built once from the ``courses`` table at startup. Each searchable column is
+stored as a dictionary of distinct values with:
+
+- gram posting lists over those distinct values (see ``app.search.tokenizer``)
+- a posting list of document positions per distinct value
+
+Course names, teachers and departments repeat heavily across semesters, so
+indexing distinct values keeps the index small. Filters become posting-list
+intersections, candidates are verified with a substring check so results
+match the SQL ``ILIKE`` path exactly, and the total is simply the size of the
+final set. Facet counts for the same set come from per-value bitmaps (see
+``app.search.facets``).
+"""
+
+import asyncio
+import heapq
+import logging
+import time
+from array import array
+from typing import Any, Callable, Iterable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.course import Course
+from app.models.semester import Semester
+from app.search.engine import SearchEngine
+from app.search.facets import FacetIndex
+from app.search.tokenizer import normalize, query_grams, text_grams
+from app.utils.time_slots import join_slots
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class FieldIndex:
+    """
+    Distinct values of one column with their posting lists.
+
+    Attributes:
+        values: Distinct original values, indexed by value id
+        lowered: Normalized form of each distinct value
+        docs: Document positions per value id
+        grams: Gram -> value ids containing that gram (when gram indexing is on)
+    """
+
+    __slots__ = ("values", "lowered", "docs", "grams", "use_grams", "_lookup")
+
+    def __init__(self, use_grams: bool = True):
+        """
+        Initialize an empty field index.
+
+        Args:
+            use_grams: Build gram postings (skip for low-cardinality columns)
+        """
+        self.values: list[str] = []
+        self.lowered: list[str] = []
+        self.docs: list[list[int]] = []
+        self.grams: dict[str, set[int]] = {}
+        self.use_grams = use_grams
+        self._lookup: dict[str, int] = {}
+
+    def add(self, value: Optional[str], position: int) -> int:
+        """
+        Register a document value.
+
+        Args:
+            value: Column value (None is not indexed)
+            position: Document position
+
+        Returns:
+            int: Value id, or -1 for None
+        """
+        if value is None:
+            return -1
+
+        value_id = self._lookup.get(value)
+        if value_id is None:
+            value_id = len(self.values)
+            lowered = normalize(value)
+            self._lookup[value] = value_id
+            self.values.append(value)
+            self.lowered.append(lowered)
+            self.docs.append([])
+            if self.use_grams:
+                for gram in text_grams(lowered):
+                    self.grams.setdefault(gram, set()).add(value_id)
+
+        self.docs[value_id].append(position)
+        return value_id
+
+    def matching_values(self, needle: str) -> list[int]:
+        """
+        Find distinct values containing a normalized needle.
+
+        Args:
+            needle: Normalized search text
+
+        Returns:
+            list[int]: Matching value ids
+        """
+        candidates: Iterable[int] = range(len(self.values))
+
+        if self.use_grams:
+            grams = query_grams(needle)
+            if grams:
+                postings = [self.grams.get(gram) for gram in grams]
+                if not all(postings):
+                    return []
+                postings.sort(key=len)
+                intersection = set(postings[0])
+                for posting in postings[1:]:
+                    intersection &= posting
+                    if not intersection:
+                        return []
+                candidates = intersection
+
+        lowered = self.lowered
+        return [value_id for value_id in candidates if needle in lowered[value_id]]
+
+    def match(self, needle: str) -> set[int]:
+        """
+        Find document positions whose value contains a normalized needle.
+
+        Args:
+            needle: Normalized search text
+
+        Returns:
+            set[int]: Matching document positions
+        """
+        result: set[int] = set()
+        for value_id in self.matching_values(needle):
+            result.update(self.docs[value_id])
+        return result
+
+
+class IndexData:
+    """
+    Immutable snapshot of the built index.
+
+    Searches read one snapshot; rebuilds swap in a new one atomically.
+    """
+
+    def __init__(self) -> None:
+        """Initialize empty index structures."""
+        self.ids = array("q")
+        self.semester_ids = array("q")
+        self.credits: list[Optional[float]] = []
+
+        self.name = FieldIndex()
+        self.crs_no = FieldIndex()
+        self.teacher = FieldIndex()
+        self.dept = FieldIndex(use_grams=False)
+        self.day_codes = FieldIndex(use_grams=False)
+
+        self.name_ids = array("i")
+        self.crs_no_ids = array("i")
+        self.teacher_ids = array("i")
+
+        self.semesters: dict[int, tuple[int, int]] = {}
+        self.semester_docs: dict[int, list[int]] = {}
+        self.credit_docs: dict[float, list[int]] = {}
+        self.slot_docs: dict[int, list[int]] = {}
+
+        self.facets: Optional[FacetIndex] = None
+
+    @classmethod
+    def from_rows(
+        cls,
+        course_rows: Iterable[Any],
+        semester_rows: Iterable[Any],
+    ) -> "IndexData":
+        """
+        Build index structures from database rows.
+
+        Args:
+            course_rows: Rows of (id, semester_id, crs_no, name, teacher, dept, credits,
+                day_codes, time_slots_lo, time_slots_hi)
+            semester_rows: Rows of (id, acy, sem)
+
+        Returns:
+            IndexData: Built snapshot
+        """
+        data = cls()
+
+        for semester_id, acy, sem in semester_rows:
+            data.semesters[semester_id] = (acy, sem)
+
+        for position, row in enumerate(course_rows):
+            (course_id, semester_id, crs_no, name, teacher, dept, credits, day_codes,
+             slots_lo, slots_hi) = row
+
+            data.ids.append(course_id)
+            data.semester_ids.append(semester_id)
+            data.credits.append(credits)
+
+            data.name_ids.append(data.name.add(name, position))
+            data.crs_no_ids.append(data.crs_no.add(crs_no, position))
+            data.teacher_ids.append(data.teacher.add(teacher, position))
+            data.dept.add(dept, position)
+            data.day_codes.add(day_codes, position)
+
+            data.semester_docs.setdefault(semester_id, []).append(position)
+            if credits is not None:
+                data.credit_docs.setdefault(credits, []).append(position)
+            data.slot_docs.setdefault(join_slots(slots_lo, slots_hi), []).append(position)
+
+        data.facets = FacetIndex.build(data)
+        return data
+
+    def __len__(self) -> int:
+        """Number of indexed courses."""
+        return len(self.ids)
+
+
+def _union(postings: Iterable[Iterable[int]]) -> set[int]:
+    """Union several posting lists into one set."""
+    result: set[int] = set()
+    for posting in postings:
+        result.update(posting)
+    return result
+
+
+class InvertedIndexEngine(SearchEngine):
+    """
+    Search engine backed by an in-memory inverted index.
+
+    Example:
+        >>> engine = InvertedIndexEngine()
+        >>> await engine.build(session)
+        >>> ids, total = engine.search(query="資料結構", acy=[113], limit=20)
+    """
+
+    name = "inverted_index"
+
+    def __init__(self) -> None:
+        """Initialize an unbuilt engine."""
+        self._data: Optional[IndexData] = None
+        self._generation = 0
+        self._built_generation = -1
+
+    @property
+    def ready(self) -> bool:
+        """Whether a current (non-invalidated) snapshot is available."""
+        return self._data is not None and self._built_generation == self._generation
+
+    def invalidate(self) -> None:
+        """Mark the current snapshot as stale."""
+        self._generation += 1
+
+    async def build(self, session: AsyncSession) -> None:
+        """
+        Build the index from the database.
+
+        Only the indexed columns are selected; the CPU-bound build runs in a
+        worker thread so the event loop keeps serving requests.
+
+        Args:
+            session: Database session
+        """
+        generation = self._generation
+        start = time.perf_counter()
+
+        course_result = await session.execute(
+            select(
+                Course.id,
+                Course.semester_id,
+                Course.crs_no,
+                Course.name,
+                Course.teacher,
+                Course.dept,
+                Course.credits,
+                Course.day_codes,
+                Course.time_slots_lo,
+                Course.time_slots_hi,
+            ).order_by(Course.id)
+        )
+        semester_result = await session.execute(
+            select(Semester.id, Semester.acy, Semester.sem)
+        )
+        course_rows = course_result.all()
+        semester_rows = semester_result.all()
+
+        data = await asyncio.to_thread(IndexData.from_rows, course_rows, semester_rows)
+
+        self._data = data
+        self._built_generation = generation
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        logger.info(
+            f"Search index built: {len(data)} courses, "
+            f"{len(data.name.values)} names, {len(data.teacher.values)} teachers, "
+            f"{len(data.name.grams) + len(data.crs_no.grams) + len(data.teacher.grams)} grams "
+            f"({elapsed_ms:.0f}ms)"
+        )
+
+    def search(
+        self,
+        query: Optional[str] = None,
+        crs_no: Optional[str] = None,
+        semester_ids: Optional[list[int]] = None,
+        acy: Optional[list[int]] = None,
+        sem: Optional[list[int]] = None,
+        name: Optional[str] = None,
+        teacher: Optional[str] = None,
+        dept: Optional[list[str]] = None,
+        credits_min: Optional[float] = None,
+        credits_max: Optional[float] = None,
+        exact_credits: Optional[float] = None,
+        day_codes: Optional[list[str]] = None,
+        slots_within: Optional[int] = None,
+        slots_avoid: Optional[int] = None,
+        limit: int = 50,
+        offset: int = 0,
+        sort_by: str = "by_relevance",
+        sort_desc: bool = False,
+        after: Optional[tuple[Any, int]] = None,
+    ) -> tuple[list[int], int]:
+        """
+        Search courses using posting-list intersections.
+
+        Returns:
+            Tuple of (course ids for the requested page, total_count)
+
+        Raises:
+            RuntimeError: If the index has not been built
+        """
+        data = self._snapshot()
+        matched, needle, name_hits = self._match(
+            data,
+            query=query,
+            crs_no=crs_no,
+            semester_ids=semester_ids,
+            acy=acy,
+            sem=sem,
+            name=name,
+            teacher=teacher,
+            dept=dept,
+            credits_min=credits_min,
+            credits_max=credits_max,
+            exact_credits=exact_credits,
+            day_codes=day_codes,
+            slots_within=slots_within,
+            slots_avoid=slots_avoid,
+        )
+
+        total = len(matched)
+        if total == 0 or offset >= total:
+            return [], total
+
+        # Relevance ordering applies to any non-empty query, as in SQL
+        if query and needle is None:
+            needle = normalize(query)
+            name_hits = data.name.match(needle)
+
+        key, reverse = self._sort_key(data, sort_by, sort_desc, needle, name_hits)
+
+        # Seek past the cursor position
+        candidates: Iterable[int] = matched
+        remaining = total
+        if after is not None:
+            candidates = self._seek(data, matched, key, reverse, sort_by, after)
+            remaining = len(candidates)
+
+        page = self._top(candidates, key, reverse, offset + limit, remaining)[offset:offset + limit]
+
+        ids = data.ids
+        return [ids[position] for position in page], total
+
+    def facet_counts(
+        self,
+        fields: list[str],
+        limit: int = 20,
+        **filters: Any,
+    ) -> dict[str, list[dict[str, Any]]]:
+        """
+        Count facet values over the courses matching the filters.
+
+        Returns:
+            Dict of field -> buckets ordered by count
+
+        Raises:
+            RuntimeError: If the index has not been built
+        """
+        data = self._snapshot()
+        matched, _, _ = self._match(data, **filters)
+        everything = isinstance(matched, range)
+        return data.facets.counts(data, fields, None if everything else matched, limit)
+
+    def _snapshot(self) -> IndexData:
+        """Get the current index snapshot."""
+        data = self._data
+        if data is None:
+            raise RuntimeError("Search index has not been built")
+        return data
+
+    @staticmethod
+    def _match(
+        data: IndexData,
+        query: Optional[str] = None,
+        crs_no: Optional[str] = None,
+        semester_ids: Optional[list[int]] = None,
+        acy: Optional[list[int]] = None,
+        sem: Optional[list[int]] = None,
+        name: Optional[str] = None,
+        teacher: Optional[str] = None,
+        dept: Optional[list[str]] = None,
+        credits_min: Optional[float] = None,
+        credits_max: Optional[float] = None,
+        exact_credits: Optional[float] = None,
+        day_codes: Optional[list[str]] = None,
+        slots_within: Optional[int] = None,
+        slots_avoid: Optional[int] = None,
+    ) -> tuple[Any, Optional[str], set[int]]:
+        """
+        Resolve the filters to the set of matching document positions.
+
+        Returns:
+            Tuple of (matching positions as a set, or a range when there are
+            no filters; normalized query or None; positions whose name
+            matched the query)
+        """
+        filters: list[Iterable[int]] = []
+        needle: Optional[str] = None
+        name_hits: set[int] = set()
+
+        # Full-text query: name, course number, teacher or department
+        if query and query.strip():
+            needle = normalize(query)
+            name_hits = data.name.match(needle)
+            hits = set(name_hits)
+            hits |= data.crs_no.match(needle)
+            hits |= data.teacher.match(needle)
+            hits |= data.dept.match(needle)
+            filters.append(hits)
+
+        if crs_no:
+            filters.append(data.crs_no.match(normalize(crs_no)))
+
+        # Semester filters only apply when they match known semesters,
+        # mirroring the SQL path
+        if semester_ids:
+            if any(semester_id in data.semesters for semester_id in semester_ids):
+                filters.append(_union(data.semester_docs.get(sid, ()) for sid in semester_ids))
+
+        if acy or sem:
+            matching = [
+                semester_id
+                for semester_id, (semester_acy, semester_sem) in data.semesters.items()
+                if (not acy or semester_acy in acy) and (not sem or semester_sem in sem)
+            ]
+            if matching:
+                filters.append(_union(data.semester_docs.get(sid, ()) for sid in matching))
+
+        if name:
+            filters.append(data.name.match(normalize(name)))
+
+        if teacher:
+            filters.append(data.teacher.match(normalize(teacher)))
+
+        if dept:
+            filters.append(_union(data.dept.match(normalize(d)) for d in dept))
+
+        if exact_credits is not None:
+            filters.append(data.credit_docs.get(exact_credits, ()))
+        elif credits_min is not None or credits_max is not None:
+            filters.append(_union(
+                positions
+                for value, positions in data.credit_docs.items()
+                if (credits_min is None or value >= credits_min)
+                and (credits_max is None or value <= credits_max)
+            ))
+
+        if day_codes:
+            filters.append(_union(data.day_codes.match(normalize(day)) for day in day_codes))
+
+        # Time slots: test each distinct bitmask once
+        if slots_within is not None:
+            filters.append(_union(
+                positions for mask, positions in data.slot_docs.items()
+                if mask and not mask & ~slots_within
+            ))
+
+        if slots_avoid is not None:
+            filters.append(_union(
+                positions for mask, positions in data.slot_docs.items()
+                if not mask & slots_avoid
+            ))
+
+        # Intersect posting lists, smallest first
+        matched: Iterable[int]
+        if filters:
+            filters.sort(key=len)
+            result = set(filters[0])
+            for posting in filters[1:]:
+                if not result:
+                    break
+                result.intersection_update(posting)
+            matched = result
+        else:
+            matched = range(len(data))
+
+        return matched, needle, name_hits
+
+    @staticmethod
+    def _sort_key(
+        data: IndexData,
+        sort_by: str,
+        sort_desc: bool,
+        needle: Optional[str],
+        name_hits: set[int],
+    ) -> tuple[Optional[Callable[[int], Any]], bool]:
+        """
+        Build a sort key matching ``SearchService._apply_sorting``.
+
+        NULL values sort first in ascending order, as in SQLite. Every key
+        ends with the course id so ordering is deterministic.
+
+        Returns:
+            Tuple of (key function or None for id order, reverse)
+        """
+        ids = data.ids
+
+        if sort_by == "by_name":
+            names, name_ids = data.name.values, data.name_ids
+            return (lambda p: (names[name_ids[p]], ids[p])), sort_desc
+
+        if sort_by == "by_credits":
+            credits = data.credits
+            return (lambda p: (
+                credits[p] is not None,
+                credits[p] if credits[p] is not None else 0.0,
+                ids[p],
+            )), sort_desc
+
+        if sort_by == "by_teacher":
+            teachers, teacher_ids = data.teacher.values, data.teacher_ids
+            return (lambda p: (
+                teacher_ids[p] >= 0,
+                teachers[teacher_ids[p]] if teacher_ids[p] >= 0 else "",
+                ids[p],
+            )), sort_desc
+
+        if sort_by == "by_semester":
+            semester_ids = data.semester_ids
+            return (lambda p: (semester_ids[p], ids[p])), sort_desc
+
+        if sort_by == "by_relevance" and needle is not None:
+            names, name_ids = data.name.values, data.name_ids
+            crs_lowered, crs_no_ids = data.crs_no.lowered, data.crs_no_ids
+            return (lambda p: (
+                p not in name_hits,
+                needle not in crs_lowered[crs_no_ids[p]],
+                names[name_ids[p]],
+                ids[p],
+            )), False
+
+        # Default: course id order (positions are built in id order)
+        return None, sort_desc
+
+    @staticmethod
+    def _seek(
+        data: IndexData,
+        positions: Iterable[int],
+        key: Optional[Callable[[int], Any]],
+        reverse: bool,
+        sort_by: str,
+        after: tuple[Any, int],
+    ) -> list[int]:
+        """
+        Keep positions that sort after a keyset cursor.
+
+        The cursor is converted to the same tuple layout as ``_sort_key``.
+
+        Returns:
+            list[int]: Positions after the cursor
+        """
+        value, row_id = after
+        ids = data.ids
+
+        if key is None:
+            if reverse:
+                return [p for p in positions if ids[p] < row_id]
+            return [p for p in positions if ids[p] > row_id]
+
+        if sort_by in ("by_credits", "by_teacher"):
+            empty = 0.0 if sort_by == "by_credits" else ""
+            bound = (value is not None, value if value is not None else empty, row_id)
+        else:
+            bound = (value, row_id)
+
+        if reverse:
+            return [p for p in positions if key(p) < bound]
+        return [p for p in positions if key(p) > bound]
+
+    @staticmethod
+    def _top(
+        positions: Iterable[int],
+        key: Optional[Callable[[int], Any]],
+        reverse: bool,
+        count: int,
+        total: int,
+    ) -> list[int]:
+        """
+        Return the first ``count`` positions in sort order.
+
+        Uses a heap selection when only a small prefix of a large result is
+        needed, and a full sort otherwise.
+        """
+        if count * 4 < total:
+            if reverse:
+                return heapq.nlargest(count, positions, key=key)
+            return heapq.nsmallest(count, positions, key=key)
+        return sorted(positions, key=key, reverse=reverse)
@@ -0,0 +1,160 @@
+"""
+Text tokenization for the in-memory search engines.
+
+Course names and teacher names mix Traditional Chinese with English, so text
+is split into runs of the same script before grams are extracted:
+
+- Latin letters and digits are grouped into words and broken into trigrams
+- CJK characters are indexed as bigrams plus single characters
+
+Grams never span two runs. Because of that, any text containing a query as a
+substring also contains every gram of that query, so intersecting gram
+postings always yields a superset of the true ``ILIKE '%q%'`` matches.
+"""
+
+from typing import Iterator, Optional
+
+# Run classes
+SEPARATOR = 0
+WORD = 1
+CJK = 2
+
+# Gram sizes per run class
+WORD_GRAM_SIZE = 3
+CJK_GRAM_SIZE = 2
+
+
+def is_cjk(char: str) -> bool:
+    """
+    Check whether a character belongs to a CJK script.
+
+    Covers CJK ideographs, compatibility ideographs, Bopomofo, kana and Hangul.
+
+    Args:
+        char: Single character
+
+    Returns:
+        bool: True if the character is CJK
+    """
+    code = ord(char)
+    return (
+        0x3400 <= code <= 0x9FFF
+        or 0xF900 <= code <= 0xFAFF
+        or 0x3040 <= code <= 0x30FF
+        or 0x3100 <= code <= 0x312F
+        or 0xAC00 <= code <= 0xD7AF
+        or 0x20000 <= code <= 0x2FA1F
+    )
+
+
+def char_class(char: str) -> int:
+    """
+    Classify a character as separator, word character or CJK character.
+
+    Args:
+        char: Single character
+
+    Returns:
+        int: One of SEPARATOR, WORD or CJK
+    """
+    if is_cjk(char):
+        return CJK
+    if char.isalnum():
+        return WORD
+    return SEPARATOR
+
+
+def normalize(text: Optional[str]) -> str:
+    """
+    Normalize text for matching.
+
+    Only case folding is applied so that matches stay identical to the
+    case-insensitive ``ILIKE`` comparison used by the SQL search path.
+
+    Args:
+        text: Raw text (may be None)
+
+    Returns:
+        str: Lowercased text, or an empty string for None
+    """
+    return text.lower() if text else ""
+
+
+def iter_runs(text: str) -> Iterator[tuple[int, str]]:
+    """
+    Split normalized text into runs of the same character class.
+
+    Separator runs are skipped.
+
+    Args:
+        text: Normalized text
+
+    Yields:
+        Tuples of (run_class, run_text)
+    """
+    run_start = 0
+    run_class = SEPARATOR
+
+    for index, char in enumerate(text):
+        current = char_class(char)
+        if current != run_class:
+            if run_class != SEPARATOR:
+                yield run_class, text[run_start:index]
+            run_start = index
+            run_class = current
+
+    if run_class != SEPARATOR and run_start < len(text):
+        yield run_class, text[run_start:]
+
+
+def text_grams(text: str) -> set[str]:
+    """
+    Extract all index grams from normalized document text.
+
+    Args:
+        text: Normalized text
+
+    Returns:
+        set[str]: Grams to store in the posting lists
+    """
+    grams: set[str] = set()
+
+    for run_class, run in iter_runs(text):
+        if run_class == CJK:
+            grams.update(run)
+            for i in range(len(run) - CJK_GRAM_SIZE + 1):
+                grams.add(run[i:i + CJK_GRAM_SIZE])
+        else:
+            for i in range(len(run) - WORD_GRAM_SIZE + 1):
+                grams.add(run[i:i + WORD_GRAM_SIZE])
+
+    return grams
+
+
+def query_grams(text: str) -> set[str]:
+    """
+    Extract the grams a query must match.
+
+    Single CJK characters are looked up as unigrams. Latin words shorter
+    than a trigram yield no grams, so callers must fall back to scanning
+    for such queries.
+
+    Args:
+        text: Normalized query text
+
+    Returns:
+        set[str]: Grams every matching document must contain
+    """
+    grams: set[str] = set()
+
+    for run_class, run in iter_runs(text):
+        if run_class == CJK:
+            if len(run) < CJK_GRAM_SIZE:
+                grams.add(run)
+            for i in range(len(run) - CJK_GRAM_SIZE + 1):
+                grams.add(run[i:i + CJK_GRAM_SIZE])
+        else:
+            for i in range(len(run) - WORD_GRAM_SIZE + 1):
+                grams.add(run[i:i + WORD_GRAM_SIZE])
+
+    return grams
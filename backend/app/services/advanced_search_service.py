@@ -14,12 +14,17 @@ from sqlalchemy.orm import joinedload
 
 from app.models.course import Course
 from app.models.semester import Semester
+from app.schemas.course import course_to_dict
+from app.search.fts import courses_fts, fts_available, fts_match, fts_rank, is_fts_query
 from app.utils.cache import cache
 from app.utils.exceptions import DatabaseError
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Columns matched by search_with_suggestions
+SUGGESTION_COLUMNS = ("name", "crs_no", "teacher")
+
 
 class AdvancedSearchService:
     """
@@ -42,7 +47,7 @@ class AdvancedSearchService:
         keywords: Optional[list[str]] = None,
         limit: int = 200,
         offset: int = 0,
-    ) -> tuple[list[Course], int]:
+    ) -> tuple[list[dict[str, Any]], int]:
         """
         Advanced filtering with multiple criteria.
 
@@ -56,7 +61,7 @@ class AdvancedSearchService:
             offset: Result offset
 
         Returns:
-            Tuple of (courses, total_count)
+            Tuple of (course dicts as built by ``course_to_dict``, total_count)
         """
         try:
             filters = []
@@ -125,13 +130,13 @@ class AdvancedSearchService:
             logger.info(
                 f"Advanced filter: {len(courses)} results (total: {total})"
             )
-            return courses, total
+            return [course_to_dict(course) for course in courses], total
 
         except Exception as e:
             logger.error(f"Advanced filter error: {e}")
             raise DatabaseError(f"Failed to perform advanced filter: {str(e)}")
 
-    @cache(ttl_seconds=3600)
+    @cache(ttl_seconds=3600, stale_ttl_seconds=600)
     async def get_statistics(
         self,
         acy: Optional[int] = None,
@@ -235,15 +240,25 @@ class AdvancedSearchService:
             if not query or not query.strip():
                 return {"results": [], "suggestions": []}
 
-            # Search for exact matches
-            search_pattern = f"%{query}%"
-            stmt = select(Course).options(joinedload(Course.semester)).where(
-                or_(
-                    Course.name.ilike(search_pattern),
-                    Course.crs_no.ilike(search_pattern),
-                    Course.teacher.ilike(search_pattern),
+            if is_fts_query(query) and await fts_available(self.session):
+                # Rank matches with bm25() from the FTS index
+                stmt = (
+                    select(Course)
+                    .join(courses_fts, courses_fts.c.rowid == Course.id)
+                    .options(joinedload(Course.semester))
+                    .where(fts_match(query, SUGGESTION_COLUMNS))
+                    .order_by(fts_rank(), Course.id)
+                )
+            else:
+                # Search for exact matches
+                search_pattern = f"%{query}%"
+                stmt = select(Course).options(joinedload(Course.semester)).where(
+                    or_(
+                        Course.name.ilike(search_pattern),
+                        Course.crs_no.ilike(search_pattern),
+                        Course.teacher.ilike(search_pattern),
+                    )
                 )
-            )
             stmt = stmt.limit(limit)
 
             result = await self.session.execute(stmt)
@@ -254,7 +269,7 @@ class AdvancedSearchService:
             for course in courses[:20]:
                 if query.lower() in course.name.lower():
                     suggestions.add(course.name)
-                if query.lower() in course.teacher.lower():
+                if course.teacher and query.lower() in course.teacher.lower():
                     suggestions.add(course.teacher)
 
             return {
@@ -14,15 +14,23 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import course as course_db
 from app.models.course import Course
+from app.search.autocomplete import record_course_change
+from app.search.engine import invalidate_search_engine
+from app.utils.cache import bump_data_version
 from app.utils.exceptions import (
     CourseNotFound,
     DatabaseError,
     InvalidQueryParameter,
 )
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.snapshots import invalidate_snapshots
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Sort order of list_courses, recorded in its cursors
+LIST_SORT_KEY = "crs_no:asc"
+
 
 class CourseService:
     """
@@ -54,6 +62,7 @@ class CourseService:
         q: Optional[str] = None,
         limit: int = 200,
         offset: int = 0,
+        cursor: Optional[str] = None,
     ) -> list[Course]:
         """
         Retrieve courses with optional filtering and pagination.
@@ -69,12 +78,13 @@ class CourseService:
             q: Search query for course name or number
             limit: Maximum number of results (default: 200, max: 1000)
             offset: Number of results to skip (default: 0)
+            cursor: Keyset cursor from a previous page (see ``next_cursor``)
 
         Returns:
             List of course records matching the filters
 
         Raises:
-            InvalidQueryParameter: If parameters are invalid
+            InvalidQueryParameter: If parameters or the cursor are invalid
             DatabaseError: If the database operation fails
 
         Example:
@@ -84,6 +94,7 @@ class CourseService:
         """
         # Validate parameters
         self._validate_list_params(acy, sem, limit, offset)
+        after = decode_cursor(cursor, LIST_SORT_KEY) if cursor else None
 
         logger.info(
             f"Listing courses: acy={acy}, sem={sem}, dept={dept}, "
@@ -100,6 +111,7 @@ class CourseService:
                 q=q,
                 limit=limit,
                 offset=offset,
+                after=after,
             )
             logger.info(f"Successfully retrieved {len(courses)} courses")
             return courses
@@ -107,6 +119,23 @@ class CourseService:
             logger.error(f"Failed to list courses: {e}")
             raise
 
+    @staticmethod
+    def next_cursor(courses: list[Course], limit: int) -> Optional[str]:
+        """
+        Build the cursor for the page after a ``list_courses`` result.
+
+        Args:
+            courses: Courses of the current page
+            limit: Page size requested
+
+        Returns:
+            Cursor token, or None when this is the last page
+        """
+        if not courses or len(courses) < limit:
+            return None
+        last = courses[-1]
+        return encode_cursor(LIST_SORT_KEY, last.crs_no, last.id)
+
     async def get_course_detail(self, course_id: int) -> dict[str, Any]:
         """
         Retrieve detailed information for a specific course.
@@ -335,6 +364,10 @@ class CourseService:
                 classroom=classroom,
                 details=details,
             )
+            invalidate_search_engine()
+            invalidate_snapshots()
+            record_course_change(added=(name, teacher, dept), course_id=course.id)
+            await bump_data_version()
             logger.info(f"Successfully created course: id={course.id}")
             return course
         except DatabaseError as e:
@@ -391,6 +424,9 @@ class CourseService:
 
         logger.info(f"Updating course {course_id}")
         try:
+            current = await course_db.get_course(self.session, course_id)
+            previous = (current.name, current.teacher, current.dept)
+
             course = await course_db.update_course(
                 session=self.session,
                 course_id=course_id,
@@ -402,6 +438,13 @@ class CourseService:
                 classroom=classroom,
                 details=details,
             )
+            invalidate_search_engine()
+            invalidate_snapshots()
+            record_course_change(
+                added=(course.name, course.teacher, course.dept),
+                removed=previous,
+            )
+            await bump_data_version()
             logger.info(f"Successfully updated course {course_id}")
             return course
         except CourseNotFound as e:
@@ -429,7 +472,14 @@ class CourseService:
         """
         logger.info(f"Deleting course {course_id}")
         try:
+            current = await course_db.get_course(self.session, course_id)
+            previous = (current.name, current.teacher, current.dept)
+
             await course_db.delete_course(self.session, course_id)
+            invalidate_search_engine()
+            invalidate_snapshots()
+            record_course_change(removed=previous)
+            await bump_data_version()
             logger.info(f"Successfully deleted course {course_id}")
         except CourseNotFound as e:
             logger.warning(f"Course not found for deletion: {course_id}")
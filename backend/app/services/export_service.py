@@ -0,0 +1,185 @@
+"""
+Course export service module.
+
+Streams full course dumps (a whole semester or any filter set) as NDJSON or
+CSV. Courses are read from a server-side cursor in batches and each batch
+is encoded and handed to the response as soon as it arrives, so memory use
+stays flat regardless of the size of the export and the first bytes are
+sent after the first batch rather than after the whole result.
+"""
+
+import csv
+import io
+import logging
+from enum import Enum
+from typing import AsyncIterator, Optional
+
+import orjson
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import course as course_db
+from app.schemas.course import serialize_courses
+from app.services.semester_service import SemesterService
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Columns of the CSV export, in order (same keys as CourseResponse)
+CSV_COLUMNS = (
+    "id", "acy", "sem", "crs_no", "name", "teacher", "credits", "dept",
+    "time", "classroom", "syllabus", "syllabus_zh",
+    "syllabus_url_zh", "syllabus_url_en", "details",
+)
+
+
+class ExportFormat(str, Enum):
+    """Supported export formats."""
+
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+    @property
+    def media_type(self) -> str:
+        """Content type of the export."""
+        if self is ExportFormat.CSV:
+            return "text/csv; charset=utf-8"
+        return "application/x-ndjson"
+
+
+class ExportService:
+    """
+    Service for streaming course exports.
+
+    Attributes:
+        session: AsyncSession for database operations; it must stay open
+            until the stream is exhausted
+    """
+
+    def __init__(self, session: AsyncSession):
+        """
+        Initialize ExportService.
+
+        Args:
+            session: Database session for performing operations
+        """
+        self.session = session
+
+    async def stream_courses(
+        self,
+        export_format: ExportFormat,
+        acy: Optional[int] = None,
+        sem: Optional[int] = None,
+        dept: Optional[str] = None,
+        teacher: Optional[str] = None,
+        q: Optional[str] = None,
+        batch_size: int = 500,
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream every matching course in the requested format.
+
+        NDJSON rows have the ``CourseResponse`` fields with ``details``
+        parsed; CSV rows keep ``details`` as the stored JSON string and start
+        with a header line (and a UTF-8 BOM so spreadsheet programs detect
+        the encoding of Chinese names).
+
+        Args:
+            export_format: NDJSON or CSV
+            acy: Filter by academic year (exact match)
+            sem: Filter by semester number (exact match)
+            dept: Filter by department code (partial match)
+            teacher: Filter by teacher name (partial match)
+            q: Search query for course name or number
+            batch_size: Rows fetched and encoded per chunk
+
+        Yields:
+            bytes: Encoded chunk of rows
+
+        Raises:
+            DatabaseError: If the query fails
+
+        Example:
+            >>> service = ExportService(session)
+            >>> async for chunk in service.stream_courses(ExportFormat.NDJSON, acy=113, sem=1):
+            ...     sink.write(chunk)
+        """
+        logger.info(
+            f"Exporting courses as {export_format.value} "
+            f"(filters: acy={acy}, sem={sem}, dept={dept}, teacher={teacher}, q={q})"
+        )
+        semester_service = SemesterService(self.session)
+        semester_map = await semester_service.get_semester_map()
+
+        if export_format is ExportFormat.CSV:
+            yield ("\ufeff" + ",".join(CSV_COLUMNS) + "\r\n").encode("utf-8")
+
+        exported = 0
+        async for batch in course_db.stream_courses(
+            self.session, acy=acy, sem=sem, dept=dept, teacher=teacher, q=q,
+            batch_size=batch_size,
+        ):
+            batch_semesters = {course.semester_id for course in batch}
+            if not semester_map.keys() >= batch_semesters:
+                semester_map = await semester_service.get_semester_map(batch_semesters)
+            rows = serialize_courses(batch, semester_map)
+            if export_format is ExportFormat.CSV:
+                yield self._encode_csv(rows, [course.details for course in batch])
+            else:
+                yield b"".join(
+                    orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE) for row in rows
+                )
+            exported += len(rows)
+
+        logger.info(f"Exported {exported} courses as {export_format.value}")
+
+    async def list_courses(
+        self,
+        acy: Optional[int] = None,
+        sem: Optional[int] = None,
+        dept: Optional[str] = None,
+        teacher: Optional[str] = None,
+        q: Optional[str] = None,
+        semester_map: Optional[dict[int, tuple[int, int]]] = None,
+    ) -> list[dict]:
+        """
+        Read every matching course into a list of response dicts.
+
+        This is what a semester snapshot contains; it is used to build
+        snapshots and to answer when no current snapshot exists.
+
+        Args:
+            acy: Filter by academic year (exact match)
+            sem: Filter by semester number (exact match)
+            dept: Filter by department code (partial match)
+            teacher: Filter by teacher name (partial match)
+            q: Search query for course name or number
+            semester_map: Semester ID -> (acy, sem) (default: the cached
+                semester table)
+
+        Returns:
+            List of ``CourseResponse``-shaped dicts ordered by course number
+
+        Raises:
+            DatabaseError: If the query fails
+        """
+        semester_service = SemesterService(self.session)
+        if semester_map is None:
+            semester_map = await semester_service.get_semester_map()
+        rows = []
+        async for batch in course_db.stream_courses(
+            self.session, acy=acy, sem=sem, dept=dept, teacher=teacher, q=q
+        ):
+            batch_semesters = {course.semester_id for course in batch}
+            if not semester_map.keys() >= batch_semesters:
+                semester_map = await semester_service.get_semester_map(batch_semesters)
+            rows.extend(serialize_courses(batch, semester_map))
+        return rows
+
+    @staticmethod
+    def _encode_csv(rows: list[dict], details: list[Optional[str]]) -> bytes:
+        """Encode serialized rows as CSV lines, with the raw details strings."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row, raw_details in zip(rows, details):
+            row["details"] = raw_details
+            writer.writerow([row[column] for column in CSV_COLUMNS])
+        return buffer.getvalue().encode("utf-8")
@@ -9,12 +9,23 @@ from typing import Any, Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.database import schedule as schedule_db
-from app.models.course import Course
+from app.database.semester import get_semester_by_acy_sem
+from app.models.course import Course, syllabus_urls
 from app.models.schedule import Schedule, ScheduleCourse
 from app.schemas.course import CourseResponse
 from app.schemas.schedule import ScheduleCourseResponse
-from app.utils.exceptions import DatabaseError, ScheduleNotFound
+from app.utils.exceptions import (
+    DatabaseError,
+    InvalidQueryParameter,
+    ScheduleConflict,
+    ScheduleNotFound,
+    SemesterNotFound,
+)
+from app.utils.time_slots import find_conflicts, format_slots, slot_days
+from app.utils.timetable_solver import generate_timetables
+from app.utils.workers import run_in_worker
 
 logger = logging.getLogger(__name__)
 
@@ -69,11 +80,13 @@ class ScheduleService:
             self.session, schedule_id, include_courses=include_courses
         )
 
-        response = self._build_schedule_response(schedule)
-
-        if include_courses:
-            response["schedule_courses"] = await self._build_schedule_courses_response(schedule)
+        if not include_courses:
+            return self._build_schedule_response(
+                schedule, await schedule_db.get_schedule_totals(self.session, schedule_id)
+            )
 
+        response = self._build_schedule_response(schedule)
+        response["schedule_courses"] = self._build_schedule_courses_response(schedule)
         return response
 
     async def get_user_schedules(
@@ -82,6 +95,8 @@ class ScheduleService:
         """
         Get all schedules for a user.
 
+        Totals are aggregated in the same query as the schedules.
+
         Args:
             user_id: User identifier
             acy: Optional filter by academic year
@@ -93,11 +108,14 @@ class ScheduleService:
         Raises:
             DatabaseError: If retrieval fails
         """
-        schedules = await schedule_db.get_user_schedules(
+        summaries = await schedule_db.get_user_schedule_summaries(
             self.session, user_id, acy=acy, sem=sem
         )
 
-        return [self._build_schedule_response(schedule) for schedule in schedules]
+        return [
+            self._build_schedule_response(schedule, (total_credits, total_courses))
+            for schedule, total_credits, total_courses in summaries
+        ]
 
     async def update_schedule(self, schedule_id: int, name: str) -> dict[str, Any]:
         """
@@ -116,7 +134,9 @@ class ScheduleService:
         """
         schedule = await schedule_db.update_schedule(self.session, schedule_id, name=name)
 
-        return self._build_schedule_response(schedule)
+        return self._build_schedule_response(
+            schedule, await schedule_db.get_schedule_totals(self.session, schedule_id)
+        )
 
     async def delete_schedule(self, schedule_id: int) -> None:
         """
@@ -138,6 +158,7 @@ class ScheduleService:
         course_id: int,
         color: Optional[str] = None,
         notes: Optional[str] = None,
+        reject_on_conflict: bool = False,
     ) -> dict[str, Any]:
         """
         Add a course to a schedule.
@@ -147,27 +168,67 @@ class ScheduleService:
             course_id: Course ID
             color: Optional display color
             notes: Optional notes
+            reject_on_conflict: Refuse courses sharing a time slot with the schedule
 
         Returns:
             Schedule course details
 
         Raises:
             ScheduleNotFound: If schedule doesn't exist
+            ScheduleConflict: If rejecting conflicts and the course clashes
             DatabaseError: If course doesn't exist or add fails
         """
+        if reject_on_conflict:
+            fit = await self.check_fit(schedule_id, [course_id])
+            if fit["conflicts"]:
+                conflict = fit["conflicts"][0]
+                raise ScheduleConflict(
+                    message=f"Course {course_id} conflicts with schedule {schedule_id}",
+                    course_id=course_id,
+                    conflicting_course_ids=conflict["conflicting_course_ids"],
+                    slots=conflict["slots"],
+                )
+
         schedule_course = await schedule_db.add_course_to_schedule(
             self.session, schedule_id, course_id, color=color, notes=notes
         )
 
-        # Reload with relationships
-        schedule = await schedule_db.get_schedule(self.session, schedule_id, include_courses=True)
+        # Reload only this course with its relationships
+        schedule_course = await schedule_db.get_schedule_course(self.session, schedule_course.id)
+        return self._build_single_schedule_course_response(schedule_course)
+
+    async def batch_update_courses(
+        self,
+        schedule_id: int,
+        add: list[dict[str, Any]],
+        remove: list[int],
+        reject_on_conflict: bool = False,
+    ) -> dict[str, Any]:
+        """
+        Add and remove many courses of a schedule in one transaction.
+
+        Args:
+            schedule_id: Schedule ID
+            add: Courses to add (course_id with optional color and notes)
+            remove: Course IDs to remove (applied first)
+            reject_on_conflict: Skip added courses that clash
 
-        # Find the specific schedule_course with relationships loaded
-        for sc in schedule.schedule_courses:
-            if sc.id == schedule_course.id:
-                return await self._build_single_schedule_course_response(sc)
+        Returns:
+            Dict with the added/removed counts and per-item results
 
-        raise DatabaseError("Failed to reload schedule course after creation")
+        Raises:
+            ScheduleNotFound: If schedule doesn't exist
+            DatabaseError: If the update fails
+        """
+        results = await schedule_db.batch_update_schedule_courses(
+            self.session, schedule_id, add, remove, reject_on_conflict=reject_on_conflict
+        )
+        return {
+            "schedule_id": schedule_id,
+            "added": sum(1 for result in results if result["status"] == "added"),
+            "removed": sum(1 for result in results if result["status"] == "removed"),
+            "results": results,
+        }
 
     async def remove_course(self, schedule_id: int, course_id: int) -> None:
         """
@@ -211,38 +272,252 @@ class ScheduleService:
             self.session, schedule_id, course_id, color=color, notes=notes
         )
 
-        # Reload with relationships
-        schedule = await schedule_db.get_schedule(self.session, schedule_id, include_courses=True)
-
-        # Find the specific schedule_course with relationships loaded
-        for sc in schedule.schedule_courses:
-            if sc.id == schedule_course.id:
-                return await self._build_single_schedule_course_response(sc)
-
-        raise DatabaseError("Failed to reload schedule course after update")
-
-    def _build_schedule_response(self, schedule: Schedule) -> dict[str, Any]:
-        """Build schedule response dict with metadata."""
-        # Calculate total credits and courses
-        # Only access relationships if they are already loaded (not in lazy state)
-        total_credits = 0.0
-        total_courses = 0
-
-        try:
-            # Check if schedule_courses is loaded (not in lazy state)
-            if hasattr(schedule, "schedule_courses"):
-                # Access without triggering lazy load
-                schedule_courses = schedule.__dict__.get("schedule_courses")
-                if schedule_courses is not None and len(schedule_courses) > 0:
-                    total_courses = len(schedule_courses)
-                    for sc in schedule_courses:
-                        # Check if course is loaded
-                        course = sc.__dict__.get("course")
-                        if course is not None and hasattr(course, "credits") and course.credits:
-                            total_credits += course.credits
-        except Exception as e:
-            # If any error accessing relationships, just skip calculation
-            logger.debug(f"Could not calculate totals for schedule {schedule.id}: {e}")
+        # Reload only this course with its relationships
+        schedule_course = await schedule_db.get_schedule_course(self.session, schedule_course.id)
+        return self._build_single_schedule_course_response(schedule_course)
+
+    async def get_occupied_slots(self, schedule_id: int) -> int:
+        """
+        Get the time slots taken by a schedule's courses.
+
+        Args:
+            schedule_id: Schedule ID
+
+        Returns:
+            int: Time-slot bitmask (see app.utils.time_slots)
+
+        Raises:
+            ScheduleNotFound: If schedule doesn't exist
+            DatabaseError: If retrieval fails
+        """
+        occupied = 0
+        for mask in (await schedule_db.get_schedule_course_slots(self.session, schedule_id)).values():
+            occupied |= mask
+        return occupied
+
+    async def get_conflicts(self, schedule_id: int) -> dict[str, Any]:
+        """
+        Find time clashes between the courses of a schedule.
+
+        Every pair of scheduled courses is compared with one AND of their
+        time-slot bitmasks.
+
+        Args:
+            schedule_id: Schedule ID
+
+        Returns:
+            Dict with the occupied slots and each clashing pair with its
+            shared slots (as NYCU time codes)
+
+        Raises:
+            ScheduleNotFound: If schedule doesn't exist
+            DatabaseError: If retrieval fails
+        """
+        course_slots = await schedule_db.get_schedule_course_slots(self.session, schedule_id)
+
+        occupied = 0
+        for mask in course_slots.values():
+            occupied |= mask
+
+        conflicts = [
+            {"course_ids": [first_id, second_id], "slots": format_slots(shared)}
+            for first_id, second_id, shared in find_conflicts(course_slots)
+        ]
+        return {
+            "schedule_id": schedule_id,
+            "has_conflicts": bool(conflicts),
+            "occupied_slots": format_slots(occupied),
+            "conflicts": conflicts,
+        }
+
+    async def check_fit(self, schedule_id: int, course_ids: list[int]) -> dict[str, Any]:
+        """
+        Check which candidate courses fit a schedule without a time clash.
+
+        The schedule's slots are combined into one bitmask, so each candidate
+        costs one AND; the clashing scheduled courses are only looked up for
+        candidates that do not fit. Courses without a schedule always fit,
+        and a course already in the schedule is compared with the others.
+
+        Args:
+            schedule_id: Schedule ID
+            course_ids: Candidate course IDs
+
+        Returns:
+            Dict with the fitting IDs, the conflicting IDs with their clashing
+            slots and scheduled courses, and the IDs that do not exist
+
+        Raises:
+            ScheduleNotFound: If schedule doesn't exist
+            DatabaseError: If retrieval fails
+        """
+        scheduled = await schedule_db.get_schedule_course_slots(self.session, schedule_id)
+        candidates = await schedule_db.get_course_slots(self.session, course_ids)
+
+        occupied = 0
+        for mask in scheduled.values():
+            occupied |= mask
+
+        fits: list[int] = []
+        conflicts: list[dict[str, Any]] = []
+        not_found: list[int] = []
+        for course_id in dict.fromkeys(course_ids):
+            mask = candidates.get(course_id)
+            if mask is None:
+                not_found.append(course_id)
+                continue
+
+            taken = occupied
+            if course_id in scheduled:
+                taken = 0
+                for other_id, other_mask in scheduled.items():
+                    if other_id != course_id:
+                        taken |= other_mask
+
+            clash = mask & taken
+            if not clash:
+                fits.append(course_id)
+                continue
+            conflicts.append({
+                "course_id": course_id,
+                "slots": format_slots(clash),
+                "conflicting_course_ids": [
+                    other_id for other_id, other_mask in scheduled.items()
+                    if other_id != course_id and other_mask & mask
+                ],
+            })
+
+        logger.info(
+            f"Checked {len(course_ids)} candidates against schedule {schedule_id}: "
+            f"{len(fits)} fit, {len(conflicts)} conflict"
+        )
+        return {
+            "schedule_id": schedule_id,
+            "fits": fits,
+            "conflicts": conflicts,
+            "not_found": not_found,
+        }
+
+    async def generate_schedules(
+        self,
+        acy: int,
+        sem: int,
+        required: list[str],
+        candidates: Optional[list[str]] = None,
+        min_credits: Optional[float] = None,
+        max_credits: Optional[float] = None,
+        blocked_slots: int = 0,
+        limit: int = 10,
+        time_budget_ms: Optional[int] = None,
+    ) -> dict[str, Any]:
+        """
+        Generate conflict-free timetables from course numbers.
+
+        Every course of the semester sharing a number is an alternative
+        section. The search (app.utils.timetable_solver) runs in the worker
+        pool and stops after the time budget with the best timetables found.
+
+        Args:
+            acy: Academic year
+            sem: Semester
+            required: Course numbers that every timetable must include
+            candidates: Course numbers that may be added
+            min_credits: Minimum total credits
+            max_credits: Maximum total credits
+            blocked_slots: Time-slot bitmask that must stay free
+            limit: Maximum number of timetables
+            time_budget_ms: Search time limit (capped by SOLVER_TIME_BUDGET_MS)
+
+        Returns:
+            Dict with the timetables (best first), unknown candidate numbers,
+            required numbers that only meet in blocked slots, and search stats
+
+        Raises:
+            SemesterNotFound: If the semester doesn't exist
+            InvalidQueryParameter: If a required course number doesn't exist
+            DatabaseError: If retrieval fails
+        """
+        semester = await get_semester_by_acy_sem(self.session, acy, sem)
+        if semester is None:
+            raise SemesterNotFound(acy=acy, sem=sem)
+
+        required = list(dict.fromkeys(required))
+        candidates = [crs_no for crs_no in dict.fromkeys(candidates or []) if crs_no not in required]
+        sections = await schedule_db.get_course_sections(self.session, semester.id, required + candidates)
+
+        missing = [crs_no for crs_no in required if crs_no not in sections]
+        if missing:
+            raise InvalidQueryParameter(
+                message="Unknown required course numbers",
+                parameter_name="required",
+                parameter_value=", ".join(missing),
+            )
+        found = [crs_no for crs_no in candidates if crs_no in sections]
+
+        budget_ms = min(time_budget_ms or settings.SOLVER_TIME_BUDGET_MS, settings.SOLVER_TIME_BUDGET_MS)
+        result = await run_in_worker(
+            generate_timetables,
+            [sections[crs_no] for crs_no in required],
+            [sections[crs_no] for crs_no in found],
+            blocked_slots,
+            min_credits,
+            max_credits,
+            limit,
+            budget_ms / 1000,
+        )
+
+        crs_no_by_id = {
+            course_id: crs_no
+            for crs_no, course_sections in sections.items()
+            for course_id, _, _ in course_sections
+        }
+        logger.info(
+            f"Generated {len(result.timetables)} timetables for {acy}-{sem} "
+            f"({len(required)} required, {len(found)} candidates, {result.explored} nodes"
+            f"{', timed out' if result.timed_out else ''})"
+        )
+        return {
+            "schedules": [
+                {
+                    "course_ids": list(course_ids),
+                    "crs_nos": [crs_no_by_id[course_id] for course_id in course_ids],
+                    "total_credits": credits,
+                    "days": slot_days(slots),
+                    "slots": format_slots(slots),
+                }
+                for course_ids, credits, slots in result.timetables
+            ],
+            "not_found": [crs_no for crs_no in candidates if crs_no not in sections],
+            "unschedulable": [required[index] for index in result.unschedulable],
+            "explored": result.explored,
+            "timed_out": result.timed_out,
+        }
+
+    def _build_schedule_response(
+        self, schedule: Schedule, totals: Optional[tuple[float, int]] = None
+    ) -> dict[str, Any]:
+        """
+        Build schedule response dict with metadata.
+
+        Args:
+            schedule: Schedule
+            totals: (total credits, total courses) aggregated in SQL; computed
+                from the loaded courses when omitted
+
+        Returns:
+            Schedule details
+        """
+        if totals is not None:
+            total_credits, total_courses = totals
+        else:
+            # Only use the courses if they are already loaded (no lazy load)
+            schedule_courses = schedule.__dict__.get("schedule_courses") or []
+            total_courses = len(schedule_courses)
+            total_credits = 0.0
+            for sc in schedule_courses:
+                course = sc.__dict__.get("course")
+                if course is not None and course.credits:
+                    total_credits += course.credits
 
         return {
             "id": schedule.id,
@@ -256,32 +531,18 @@ class ScheduleService:
             "total_courses": total_courses,
         }
 
-    async def _build_schedule_courses_response(
-        self, schedule: Schedule
-    ) -> list[dict[str, Any]]:
+    def _build_schedule_courses_response(self, schedule: Schedule) -> list[dict[str, Any]]:
         """Build list of schedule courses with full course details."""
-        result = []
+        return [self._build_single_schedule_course_response(sc) for sc in schedule.schedule_courses]
 
-        for sc in schedule.schedule_courses:
-            result.append(await self._build_single_schedule_course_response(sc))
-
-        return result
-
-    async def _build_single_schedule_course_response(
-        self, sc: ScheduleCourse
-    ) -> dict[str, Any]:
+    def _build_single_schedule_course_response(self, sc: ScheduleCourse) -> dict[str, Any]:
         """Build single schedule course response."""
         course = sc.course
 
         # Build course response with syllabus URLs
-        acy = course.semester.acy if course.semester else 0
-        sem = course.semester.sem if course.semester else 0
-
-        syllabus_url_zh = None
-        syllabus_url_en = None
-        if course.semester and course.crs_no:
-            syllabus_url_zh = f"https://timetable.nycu.edu.tw/?r=main/crsoutline&Acy={acy}&Sem={sem}&CrsNo={course.crs_no}&lang=zh-tw"
-            syllabus_url_en = f"https://timetable.nycu.edu.tw/?r=main/crsoutline&Acy={acy}&Sem={sem}&CrsNo={course.crs_no}&lang=en"
+        acy = course.acy or 0
+        sem = course.sem or 0
+        syllabus_url_zh, syllabus_url_en = syllabus_urls(acy, sem, course.crs_no)
 
         course_response = {
             "id": course.id,
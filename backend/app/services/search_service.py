@@ -2,26 +2,45 @@
 Advanced Search Service Module.
 
 Optimized for searching 70,239+ course records with:
-- Indexed database queries
+- In-memory inverted index (falls back to indexed database queries)
 - Result caching
-- Full-text search scoring
+- SQLite FTS5 relevance ranking with bm25()
+- Facet counts from per-value bitmaps
+- In-memory prefix index for autocomplete
 - Connection pooling
 """
 
 import logging
+from collections import Counter
 from typing import Any, Optional
 
 from sqlalchemy import and_, func, or_, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
 from app.models.course import Course
 from app.models.semester import Semester
+from app.schemas.course import course_to_dict
+from app.search.autocomplete import get_autocomplete_index
+from app.search.engine import SearchEngine, get_search_engine
+from app.search.facets import day_letters, top_buckets
+from app.search.fts import courses_fts, fts_available, fts_match, fts_rank, is_fts_query
 from app.utils.cache import cache
-from app.utils.exceptions import DatabaseError
+from app.utils.exceptions import DatabaseError, InvalidQueryParameter
+from app.utils.pagination import decode_cursor, encode_cursor, keyset_predicate
+from app.utils.time_slots import ALL_SLOTS, split_slots
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Sort fields with a keyset column: sort_by -> (column, nullable)
+SORT_COLUMNS = {
+    "by_name": (Course.name, False),
+    "by_credits": (Course.credits, True),
+    "by_teacher": (Course.teacher, True),
+    "by_semester": (Course.semester_id, False),
+}
+
 
 class SearchService:
     """
@@ -43,7 +62,7 @@ class SearchService:
         """
         self.session = session
 
-    @cache(ttl_seconds=300)  # Cache for 5 minutes
+    @cache(ttl_seconds=300, stale_ttl_seconds=60)  # Cache for 5 minutes
     async def advanced_search(
         self,
         query: Optional[str] = None,
@@ -58,11 +77,14 @@ class SearchService:
         credits_max: Optional[float] = None,
         exact_credits: Optional[float] = None,
         day_codes: Optional[list[str]] = None,
+        slots_within: Optional[int] = None,
+        slots_avoid: Optional[int] = None,
         limit: int = 50,
         offset: int = 0,
         sort_by: str = "by_relevance",
         sort_desc: bool = False,
-    ) -> tuple[list[Course], int]:
+        cursor: Optional[str] = None,
+    ) -> tuple[list[dict[str, Any]], int]:
         """
         Perform advanced course search with multiple filters.
 
@@ -79,129 +101,513 @@ class SearchService:
             credits_max: Maximum credits
             exact_credits: Exact credit value
             day_codes: List of day codes
+            slots_within: Time-slot bitmask courses must meet entirely within
+                (courses without a schedule do not match)
+            slots_avoid: Time-slot bitmask courses must not meet in
             limit: Maximum results
             offset: Result offset for pagination
             sort_by: Sort field (by_name, by_credits, by_teacher, by_relevance, by_semester)
             sort_desc: Sort in descending order
+            cursor: Keyset cursor from a previous page (see ``next_cursor``)
 
         Returns:
-            Tuple of (courses, total_count)
+            Tuple of (course dicts as built by ``course_to_dict``, total_count)
 
         Raises:
+            InvalidQueryParameter: If the cursor is invalid for this request
             DatabaseError: If search operation fails
         """
-        try:
-            filters = []
-
-            # Full-text search across multiple fields
-            if query and query.strip():
-                search_pattern = f"%{query}%"
-                query_filter = or_(
-                    Course.name.ilike(search_pattern),
-                    Course.crs_no.ilike(search_pattern),
-                    Course.teacher.ilike(search_pattern),
-                    Course.dept.ilike(search_pattern),
+        after = None
+        if cursor:
+            if sort_by == "by_relevance" and query:
+                raise InvalidQueryParameter(
+                    message="Cursor pagination is not available for relevance-ranked queries, use offset",
+                    parameter_name="cursor",
                 )
-                filters.append(query_filter)
+            after = decode_cursor(cursor, self.cursor_sort_key(sort_by, sort_desc))
 
-            # Course number filter
-            if crs_no:
-                filters.append(Course.crs_no.ilike(f"%{crs_no}%"))
+        try:
+            criteria = {
+                "query": query,
+                "crs_no": crs_no,
+                "semester_ids": semester_ids,
+                "acy": acy,
+                "sem": sem,
+                "name": name,
+                "teacher": teacher,
+                "dept": dept,
+                "credits_min": credits_min,
+                "credits_max": credits_max,
+                "exact_credits": exact_credits,
+                "day_codes": day_codes,
+                "slots_within": slots_within,
+                "slots_avoid": slots_avoid,
+                "limit": limit,
+                "offset": offset,
+                "sort_by": sort_by,
+                "sort_desc": sort_desc,
+                "after": after,
+            }
 
-            # Semester ID filter (requires join with semesters table)
-            if semester_ids:
-                # Query semester table to get acy, sem pairs
-                sem_stmt = select(Semester.acy, Semester.sem).where(
-                    Semester.id.in_(semester_ids)
+            engine = get_search_engine()
+            if (
+                sort_by == "by_relevance"
+                and is_fts_query(query)
+                and await fts_available(self.session)
+            ):
+                filter_criteria = {
+                    key: value for key, value in criteria.items()
+                    if key not in ("query", "limit", "offset", "sort_by", "sort_desc", "after")
+                }
+                courses, total = await self._search_with_fts(
+                    query, limit=limit, offset=offset, **filter_criteria
                 )
-                sem_result = await self.session.execute(sem_stmt)
-                sem_pairs = sem_result.all()
-
-                if sem_pairs:
-                    # semester_ids directly filter the Course.semester_id
-                    filters.append(Course.semester_id.in_(semester_ids))
-
-            # Academic year and semester filters require join with semesters table
-            # We'll handle this by converting to semester_ids
-            if acy or sem:
-                # Build query to get matching semester IDs
-                sem_filters = []
-                if acy:
-                    sem_filters.append(Semester.acy.in_(acy))
-                if sem:
-                    sem_filters.append(Semester.sem.in_(sem))
-
-                sem_stmt = select(Semester.id).where(and_(*sem_filters))
-                sem_result = await self.session.execute(sem_stmt)
-                matching_semester_ids = [row[0] for row in sem_result.all()]
-
-                if matching_semester_ids:
-                    filters.append(Course.semester_id.in_(matching_semester_ids))
-
-            # Course name filter
-            if name:
-                filters.append(Course.name.ilike(f"%{name}%"))
-
-            # Teacher filter
-            if teacher:
-                filters.append(Course.teacher.ilike(f"%{teacher}%"))
-
-            # Department filter (multiple departments)
-            if dept:
-                dept_filters = [Course.dept.ilike(f"%{d}%") for d in dept]
-                filters.append(or_(*dept_filters))
-
-            # Credits filters
-            if exact_credits is not None:
-                filters.append(Course.credits == exact_credits)
+                engine_name = "fts"
+            elif engine is not None:
+                courses, total = await self._search_with_engine(engine, **criteria)
+                engine_name = engine.name
             else:
-                if credits_min is not None:
-                    filters.append(Course.credits >= credits_min)
-                if credits_max is not None:
-                    filters.append(Course.credits <= credits_max)
-
-            # Day codes filter (partial match in day_codes field)
-            if day_codes:
-                day_filters = [
-                    Course.day_codes.ilike(f"%{day}%") for day in day_codes
-                ]
-                filters.append(or_(*day_filters))
-
-            # Build base query
-            stmt = select(Course)
-            if filters:
-                stmt = stmt.where(and_(*filters))
-
-            # Get total count before pagination
-            count_stmt = select(func.count()).select_from(Course)
-            if filters:
-                count_stmt = count_stmt.where(and_(*filters))
-
-            total = await self.session.scalar(count_stmt) or 0
-
-            # Apply sorting
-            stmt = self._apply_sorting(stmt, sort_by, sort_desc, query)
-
-            # Apply pagination
-            stmt = stmt.offset(offset).limit(limit)
-
-            # Execute query with timeout
-            # Note: SQLite doesn't support native query timeout, but we can add this
-            # at the connection level in production
-            result = await self.session.execute(stmt)
-            courses = list(result.scalars().all())
+                courses, total = await self._search_with_sql(**criteria)
+                engine_name = "sql"
 
             logger.info(
                 f"Search executed: {len(courses)} results (total: {total}), "
-                f"offset: {offset}, limit: {limit}"
+                f"offset: {offset}, limit: {limit}, engine: {engine_name}"
             )
 
-            return courses, total
+            return [course_to_dict(course) for course in courses], total
 
         except Exception as e:
             logger.error(f"Advanced search failed: {e}", exc_info=True)
             raise DatabaseError(f"Search operation failed: {str(e)}")
 
+    async def _search_with_engine(
+        self,
+        engine: SearchEngine,
+        **criteria: Any,
+    ) -> tuple[list[Course], int]:
+        """
+        Search using an in-process engine.
+
+        The engine resolves filters, ordering and the exact total in memory;
+        only the rows of the requested page are loaded from the database.
+
+        Args:
+            engine: Ready search engine
+            **criteria: Search criteria as accepted by advanced_search
+
+        Returns:
+            Tuple of (courses, total_count)
+        """
+        course_ids, total = engine.search(**criteria)
+        if not course_ids:
+            return [], total
+
+        stmt = (
+            select(Course)
+            .options(joinedload(Course.semester))
+            .where(Course.id.in_(course_ids))
+        )
+        result = await self.session.execute(stmt)
+        courses_by_id = {course.id: course for course in result.scalars().all()}
+
+        # Preserve engine ordering; skip rows deleted since the index was built
+        courses = [courses_by_id[cid] for cid in course_ids if cid in courses_by_id]
+        return courses, total
+
+    async def _search_with_sql(
+        self,
+        query: Optional[str] = None,
+        crs_no: Optional[str] = None,
+        semester_ids: Optional[list[int]] = None,
+        acy: Optional[list[int]] = None,
+        sem: Optional[list[int]] = None,
+        name: Optional[str] = None,
+        teacher: Optional[str] = None,
+        dept: Optional[list[str]] = None,
+        credits_min: Optional[float] = None,
+        credits_max: Optional[float] = None,
+        exact_credits: Optional[float] = None,
+        day_codes: Optional[list[str]] = None,
+        slots_within: Optional[int] = None,
+        slots_avoid: Optional[int] = None,
+        limit: int = 50,
+        offset: int = 0,
+        sort_by: str = "by_relevance",
+        sort_desc: bool = False,
+        after: Optional[tuple[Any, int]] = None,
+    ) -> tuple[list[Course], int]:
+        """
+        Search with ILIKE predicates and a separate count query.
+
+        Used when no in-process engine is ready. The total ignores ``after``
+        so it always reflects every match.
+
+        Returns:
+            Tuple of (courses, total_count)
+        """
+        filters = await self._build_filters(
+            query=query,
+            crs_no=crs_no,
+            semester_ids=semester_ids,
+            acy=acy,
+            sem=sem,
+            name=name,
+            teacher=teacher,
+            dept=dept,
+            credits_min=credits_min,
+            credits_max=credits_max,
+            exact_credits=exact_credits,
+            day_codes=day_codes,
+            slots_within=slots_within,
+            slots_avoid=slots_avoid,
+        )
+
+        # Build base query
+        stmt = select(Course).options(joinedload(Course.semester))
+        if filters:
+            stmt = stmt.where(and_(*filters))
+
+        # Get total count before pagination
+        count_stmt = select(func.count()).select_from(Course)
+        if filters:
+            count_stmt = count_stmt.where(and_(*filters))
+
+        total = await self.session.scalar(count_stmt) or 0
+
+        # Seek past the cursor position
+        if after is not None:
+            sort_col, nullable = SORT_COLUMNS.get(sort_by, (None, False))
+            stmt = stmt.where(
+                keyset_predicate(sort_col, Course.id, after, sort_desc, nullable)
+            )
+
+        # Apply sorting
+        stmt = self._apply_sorting(stmt, sort_by, sort_desc, query)
+
+        # Apply pagination
+        stmt = stmt.offset(offset).limit(limit)
+
+        # Execute query with timeout
+        # Note: SQLite doesn't support native query timeout, but we can add this
+        # at the connection level in production
+        result = await self.session.execute(stmt)
+        courses = list(result.scalars().all())
+
+        return courses, total
+
+    async def _search_with_fts(
+        self,
+        query: str,
+        limit: int = 50,
+        offset: int = 0,
+        **filter_criteria: Any,
+    ) -> tuple[list[Course], int]:
+        """
+        Search by relevance using the FTS5 index ranked with bm25().
+
+        The query is matched against the same columns as the ILIKE path;
+        all other filters are applied as regular predicates.
+
+        Args:
+            query: Search query (at least three characters)
+            limit: Maximum results
+            offset: Result offset for pagination
+            **filter_criteria: Remaining filters as accepted by advanced_search
+
+        Returns:
+            Tuple of (courses, total_count)
+        """
+        filters = await self._build_filters(**filter_criteria)
+        filters.append(fts_match(query))
+
+        count_stmt = (
+            select(func.count())
+            .select_from(Course)
+            .join(courses_fts, courses_fts.c.rowid == Course.id)
+            .where(and_(*filters))
+        )
+        total = await self.session.scalar(count_stmt) or 0
+        if total == 0 or offset >= total:
+            return [], total
+
+        stmt = (
+            select(Course)
+            .join(courses_fts, courses_fts.c.rowid == Course.id)
+            .options(joinedload(Course.semester))
+            .where(and_(*filters))
+            .order_by(fts_rank(), Course.id)
+            .offset(offset)
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all()), total
+
+    async def _build_filters(
+        self,
+        query: Optional[str] = None,
+        crs_no: Optional[str] = None,
+        semester_ids: Optional[list[int]] = None,
+        acy: Optional[list[int]] = None,
+        sem: Optional[list[int]] = None,
+        name: Optional[str] = None,
+        teacher: Optional[str] = None,
+        dept: Optional[list[str]] = None,
+        credits_min: Optional[float] = None,
+        credits_max: Optional[float] = None,
+        exact_credits: Optional[float] = None,
+        day_codes: Optional[list[str]] = None,
+        slots_within: Optional[int] = None,
+        slots_avoid: Optional[int] = None,
+    ) -> list:
+        """
+        Build WHERE predicates for the search criteria.
+
+        Returns:
+            List of SQLAlchemy boolean clauses
+        """
+        filters = []
+
+        # Full-text search across multiple fields
+        if query and query.strip():
+            search_pattern = f"%{query}%"
+            query_filter = or_(
+                Course.name.ilike(search_pattern),
+                Course.crs_no.ilike(search_pattern),
+                Course.teacher.ilike(search_pattern),
+                Course.dept.ilike(search_pattern),
+            )
+            filters.append(query_filter)
+
+        # Course number filter
+        if crs_no:
+            filters.append(Course.crs_no.ilike(f"%{crs_no}%"))
+
+        # Semester ID filter (requires join with semesters table)
+        if semester_ids:
+            # Query semester table to get acy, sem pairs
+            sem_stmt = select(Semester.acy, Semester.sem).where(
+                Semester.id.in_(semester_ids)
+            )
+            sem_result = await self.session.execute(sem_stmt)
+            sem_pairs = sem_result.all()
+
+            if sem_pairs:
+                # semester_ids directly filter the Course.semester_id
+                filters.append(Course.semester_id.in_(semester_ids))
+
+        # Academic year and semester filters require join with semesters table
+        # We'll handle this by converting to semester_ids
+        if acy or sem:
+            # Build query to get matching semester IDs
+            sem_filters = []
+            if acy:
+                sem_filters.append(Semester.acy.in_(acy))
+            if sem:
+                sem_filters.append(Semester.sem.in_(sem))
+
+            sem_stmt = select(Semester.id).where(and_(*sem_filters))
+            sem_result = await self.session.execute(sem_stmt)
+            matching_semester_ids = [row[0] for row in sem_result.all()]
+
+            if matching_semester_ids:
+                filters.append(Course.semester_id.in_(matching_semester_ids))
+
+        # Course name filter
+        if name:
+            filters.append(Course.name.ilike(f"%{name}%"))
+
+        # Teacher filter
+        if teacher:
+            filters.append(Course.teacher.ilike(f"%{teacher}%"))
+
+        # Department filter (multiple departments)
+        if dept:
+            dept_filters = [Course.dept.ilike(f"%{d}%") for d in dept]
+            filters.append(or_(*dept_filters))
+
+        # Credits filters
+        if exact_credits is not None:
+            filters.append(Course.credits == exact_credits)
+        else:
+            if credits_min is not None:
+                filters.append(Course.credits >= credits_min)
+            if credits_max is not None:
+                filters.append(Course.credits <= credits_max)
+
+        # Day codes filter (partial match in day_codes field)
+        if day_codes:
+            day_filters = [
+                Course.day_codes.ilike(f"%{day}%") for day in day_codes
+            ]
+            filters.append(or_(*day_filters))
+
+        # Time-slot filters: bitwise tests on the stored bitmask halves
+        if slots_within is not None:
+            blocked_lo, blocked_hi = split_slots(ALL_SLOTS & ~slots_within)
+            filters.append(Course.time_slots_lo.bitwise_and(blocked_lo) == 0)
+            filters.append(Course.time_slots_hi.bitwise_and(blocked_hi) == 0)
+            filters.append(or_(Course.time_slots_lo != 0, Course.time_slots_hi != 0))
+
+        if slots_avoid is not None:
+            avoid_lo, avoid_hi = split_slots(slots_avoid)
+            filters.append(Course.time_slots_lo.bitwise_and(avoid_lo) == 0)
+            filters.append(Course.time_slots_hi.bitwise_and(avoid_hi) == 0)
+
+        return filters
+
+    @cache(ttl_seconds=300, stale_ttl_seconds=60)  # Cache for 5 minutes
+    async def facet_counts(
+        self,
+        facets: list[str],
+        facet_limit: int = 20,
+        query: Optional[str] = None,
+        crs_no: Optional[str] = None,
+        semester_ids: Optional[list[int]] = None,
+        acy: Optional[list[int]] = None,
+        sem: Optional[list[int]] = None,
+        name: Optional[str] = None,
+        teacher: Optional[str] = None,
+        dept: Optional[list[str]] = None,
+        credits_min: Optional[float] = None,
+        credits_max: Optional[float] = None,
+        exact_credits: Optional[float] = None,
+        day_codes: Optional[list[str]] = None,
+        slots_within: Optional[int] = None,
+        slots_avoid: Optional[int] = None,
+    ) -> dict[str, list[dict[str, Any]]]:
+        """
+        Count facet values over every course matching the filters.
+
+        Counts do not depend on sorting or pagination and are cached
+        separately from result pages. The in-memory engine answers from its
+        per-value bitmaps in one pass; without it one GROUP BY query runs
+        per facet.
+
+        Args:
+            facets: Facet fields (see ``app.search.facets.FACET_FIELDS``)
+            facet_limit: Maximum number of buckets per facet
+            query: Full-text search query
+            (remaining filters as in ``advanced_search``)
+
+        Returns:
+            Dict of facet field -> [{"value": ..., "count": ...}] ordered by
+            count, then value
+
+        Raises:
+            DatabaseError: If the counts cannot be computed
+        """
+        filters = {
+            "query": query,
+            "crs_no": crs_no,
+            "semester_ids": semester_ids,
+            "acy": acy,
+            "sem": sem,
+            "name": name,
+            "teacher": teacher,
+            "dept": dept,
+            "credits_min": credits_min,
+            "credits_max": credits_max,
+            "exact_credits": exact_credits,
+            "day_codes": day_codes,
+            "slots_within": slots_within,
+            "slots_avoid": slots_avoid,
+        }
+
+        try:
+            engine = get_search_engine()
+            if engine is not None:
+                return engine.facet_counts(facets, facet_limit, **filters)
+            return await self._facet_counts_with_sql(facets, facet_limit, **filters)
+        except Exception as e:
+            logger.error(f"Facet counting failed: {e}", exc_info=True)
+            raise DatabaseError(f"Facet counting failed: {str(e)}")
+
+    async def _facet_counts_with_sql(
+        self,
+        facets: list[str],
+        facet_limit: int,
+        **criteria: Any,
+    ) -> dict[str, list[dict[str, Any]]]:
+        """
+        Count facet values with one GROUP BY query per facet.
+
+        Used when no in-process engine is ready.
+
+        Returns:
+            Dict of facet field -> buckets
+        """
+        filters = await self._build_filters(**criteria)
+        result = {}
+
+        for field in facets:
+            if field in ("acy", "sem"):
+                column = getattr(Semester, field)
+                stmt = (
+                    select(column, func.count())
+                    .select_from(Course)
+                    .join(Semester, Course.semester_id == Semester.id)
+                )
+            else:
+                column = getattr(Course, field)
+                stmt = select(column, func.count()).where(column.is_not(None))
+            rows = (await self.session.execute(stmt.where(*filters).group_by(column))).all()
+
+            counts = Counter()
+            if field == "day_codes":
+                for value, count in rows:
+                    for letter in day_letters(value):
+                        counts[letter] += count
+            else:
+                counts.update(dict(rows))
+            result[field] = top_buckets(counts, facet_limit)
+
+        return result
+
+    @staticmethod
+    def cursor_sort_key(sort_by: str, sort_desc: bool) -> str:
+        """
+        Identify a sort order for cursor validation.
+
+        Args:
+            sort_by: Sort field
+            sort_desc: Sort in descending order
+
+        Returns:
+            str: Sort order identifier stored in cursors
+        """
+        return f"{sort_by}:{'desc' if sort_desc else 'asc'}"
+
+    @classmethod
+    def next_cursor(
+        cls,
+        courses: list[dict[str, Any]],
+        limit: int,
+        sort_by: str,
+        sort_desc: bool,
+        query: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Build the cursor for the page after ``courses``.
+
+        Args:
+            courses: Course dicts of the current page
+            limit: Page size requested
+            sort_by: Sort field
+            sort_desc: Sort in descending order
+            query: Search query (relevance-ranked queries have no cursor)
+
+        Returns:
+            Cursor token, or None when this is the last page
+        """
+        if len(courses) < limit or not courses or (sort_by == "by_relevance" and query):
+            return None
+
+        last = courses[-1]
+        sort_col, _ = SORT_COLUMNS.get(sort_by, (None, False))
+        value = last[sort_col.key] if sort_col is not None else None
+        return encode_cursor(cls.cursor_sort_key(sort_by, sort_desc), value, last["id"])
+
     def _apply_sorting(
         self,
         stmt,
@@ -230,9 +636,9 @@ class SearchService:
         elif sort_by == "by_semester":
             # Sort by semester_id (which corresponds to chronological order)
             if sort_desc:
-                return stmt.order_by(Course.semester_id.desc())
+                return stmt.order_by(Course.semester_id.desc(), Course.id.desc())
             else:
-                return stmt.order_by(Course.semester_id.asc())
+                return stmt.order_by(Course.semester_id.asc(), Course.id.asc())
         elif sort_by == "by_relevance" and query:
             # Simple relevance scoring: prioritize exact matches in name
             # For production, consider using full-text search extensions
@@ -240,24 +646,27 @@ class SearchService:
                 return stmt.order_by(
                     Course.name.ilike(f"%{query}%").desc(),
                     Course.crs_no.ilike(f"%{query}%").desc(),
-                    Course.name.asc()
+                    Course.name.asc(),
+                    Course.id.asc(),
                 )
             else:
                 return stmt.order_by(
                     Course.name.ilike(f"%{query}%").desc(),
                     Course.crs_no.ilike(f"%{query}%").desc(),
-                    Course.name.asc()
+                    Course.name.asc(),
+                    Course.id.asc(),
                 )
         else:
             # Default: sort by ID
-            order_col = Course.id
+            return stmt.order_by(Course.id.desc() if sort_desc else Course.id.asc())
 
+        # Course id breaks ties so pagination is deterministic
         if sort_desc:
-            return stmt.order_by(order_col.desc())
+            return stmt.order_by(order_col.desc(), Course.id.desc())
         else:
-            return stmt.order_by(order_col.asc())
+            return stmt.order_by(order_col.asc(), Course.id.asc())
 
-    @cache(ttl_seconds=3600)  # Cache for 1 hour
+    @cache(ttl_seconds=3600, stale_ttl_seconds=600)  # Cache for 1 hour
     async def get_department_stats(
         self,
         limit: int = 20,
@@ -326,16 +735,18 @@ class SearchService:
             logger.error(f"Failed to get department stats: {e}", exc_info=True)
             raise DatabaseError(f"Department statistics query failed: {str(e)}")
 
-    @cache(ttl_seconds=600)  # Cache for 10 minutes
     async def get_autocomplete_suggestions(
         self,
         query: str,
         limit: int = 10,
-    ) -> list[dict[str, str]]:
+    ) -> list[dict[str, Any]]:
         """
         Get autocomplete suggestions for search queries.
 
-        Searches across course names, teachers, and departments.
+        Searches across course names, teachers, and departments. The
+        in-memory completion index matches prefixes of words, CJK
+        characters and (when available) pinyin/Zhuyin, ranked by how many
+        courses carry each value; without it, ILIKE queries are used.
 
         Args:
             query: Query string for autocomplete
@@ -347,10 +758,40 @@ class SearchService:
         Raises:
             DatabaseError: If query fails
         """
-        try:
-            if not query or not query.strip():
-                return []
+        if not query or not query.strip():
+            return []
+
+        index = get_autocomplete_index()
+        if index is not None:
+            return [
+                {"type": suggestion_type, "value": value, "match": query, "count": count}
+                for suggestion_type, value, count in index.complete(query, limit)
+            ]
+
+        return await self._autocomplete_with_sql(query, limit)
+
+    @cache(ttl_seconds=600)  # Cache for 10 minutes
+    async def _autocomplete_with_sql(
+        self,
+        query: str,
+        limit: int = 10,
+    ) -> list[dict[str, str]]:
+        """
+        Get autocomplete suggestions with ILIKE queries.
+
+        Used when the completion index has not been built.
 
+        Args:
+            query: Query string for autocomplete
+            limit: Maximum suggestions to return
+
+        Returns:
+            List of suggestion dictionaries
+
+        Raises:
+            DatabaseError: If query fails
+        """
+        try:
             suggestions = []
             search_pattern = f"%{query}%"
 
@@ -7,17 +7,20 @@ validation, error handling, and business rules.
 """
 
 import logging
-from typing import Optional
+from typing import Iterable, Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import semester as semester_db
 from app.models.semester import Semester
+from app.search.engine import invalidate_search_engine
+from app.utils.cache import bump_data_version, cache
 from app.utils.exceptions import (
     DatabaseError,
     InvalidQueryParameter,
     SemesterNotFound,
 )
+from app.utils.snapshots import invalidate_snapshots
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -70,6 +73,57 @@ class SemesterService:
             logger.error(f"Failed to list semesters: {e}")
             raise
 
+    @cache(ttl_seconds=3600)  # Cache for 1 hour; semester writes bump the data version
+    async def get_semester_table(self) -> list[list[int]]:
+        """
+        Retrieve every semester as compact [id, acy, sem] rows.
+
+        Returns:
+            List of [id, acy, sem] rows
+
+        Raises:
+            DatabaseError: If the query fails
+        """
+        return await self._read_semester_table()
+
+    async def _read_semester_table(self) -> list[list[int]]:
+        """Read the [id, acy, sem] rows from the database, bypassing the cache."""
+        semesters = await semester_db.get_all_semesters(self.session)
+        return [[semester.id, semester.acy, semester.sem] for semester in semesters]
+
+    async def get_semester_map(
+        self, semester_ids: Optional[Iterable[int]] = None
+    ) -> dict[int, tuple[int, int]]:
+        """
+        Map semester IDs to (acy, sem) from the cached semester table.
+
+        Used by bulk serializers so that courses never need their semester
+        relationship loaded. If the cached table lacks any of
+        ``semester_ids`` (a semester added since it was cached, e.g. by an
+        import script), the table is read again from the database.
+
+        Args:
+            semester_ids: Semester IDs the map must cover
+
+        Returns:
+            Dict of semester ID -> (acy, sem)
+
+        Raises:
+            DatabaseError: If the query fails
+
+        Example:
+            >>> semester_map = await SemesterService(session).get_semester_map()
+            >>> semester_map[1]
+            (113, 1)
+        """
+        table = await self.get_semester_table()
+        semester_map = {semester_id: (acy, sem) for semester_id, acy, sem in table}
+        if semester_ids is not None and not semester_map.keys() >= set(semester_ids):
+            logger.info("Cached semester table is missing semesters; reading it again")
+            table = await self._read_semester_table()
+            semester_map = {semester_id: (acy, sem) for semester_id, acy, sem in table}
+        return semester_map
+
     async def get_semester_detail(self, semester_id: int) -> Semester:
         """
         Retrieve details for a specific semester.
@@ -180,6 +234,7 @@ class SemesterService:
 
         try:
             semester = await semester_db.create_semester(self.session, acy, sem)
+            await bump_data_version()
             logger.info(
                 f"Successfully created semester: id={semester.id}, acy={acy}, sem={sem}"
             )
@@ -225,6 +280,7 @@ class SemesterService:
                 self.session, acy, sem
             )
             if created:
+                await bump_data_version()
                 logger.info(f"Created new semester: id={semester.id}")
             else:
                 logger.info(f"Using existing semester: id={semester.id}")
@@ -271,6 +327,9 @@ class SemesterService:
             semester = await semester_db.update_semester(
                 self.session, semester_id, acy=acy, sem=sem
             )
+            invalidate_search_engine()
+            invalidate_snapshots()
+            await bump_data_version()
             logger.info(f"Successfully updated semester {semester_id}")
             return semester
         except SemesterNotFound as e:
@@ -301,6 +360,9 @@ class SemesterService:
         logger.info(f"Deleting semester {semester_id}")
         try:
             await semester_db.delete_semester(self.session, semester_id)
+            invalidate_search_engine()
+            invalidate_snapshots()
+            await bump_data_version()
             logger.info(f"Successfully deleted semester {semester_id}")
         except SemesterNotFound as e:
             logger.warning(f"Semester not found for deletion: {semester_id}")
@@ -2,114 +2,683 @@
 Cache utilities for course platform.
 
 Provides caching decorators and cache management for performance optimization.
+
+Results are stored serialized (ORJSON, or msgpack when configured) under
+typed keys built from the function's qualified name, its bound arguments and
+the data version. Entries live in a pluggable backend (see
+``app.utils.cache_backends``): by default a process-wide ``LRUCache``
+bounded both by entry count and by approximate byte size, swept for expired
+entries by a background task; with ``CACHE_BACKEND=resp`` a Redis-compatible
+server shared by every replica, which also shares the data version so that
+an invalidation on one replica reaches all of them.
+
+Every bump also rewrites ``DATA_VERSION_FILE``, which lets other processes
+on the host (other workers, the import scripts) signal a change without a
+shared server: a process that sees the file change advances its own data
+version, so its cache keys move on together with ``get_data_etag``, the weak
+ETag PerformanceMiddleware uses to answer conditional GETs with 304.
 """
 
+import asyncio
 import functools
 import hashlib
-import json
+import inspect
 import logging
+import os
+import struct
+import time
+from datetime import date, datetime
+from enum import Enum
 from typing import Any, Callable, Optional
 
+import orjson
+from pydantic import BaseModel
+
+from app.config import settings
+from app.utils.cache_backends import (  # noqa: F401 - re-exported
+    DEFAULT_NAMESPACE,
+    CacheBackend,
+    CacheStats,
+    LRUCache,
+    MemoryBackend,
+    create_cache_backend,
+    estimate_size,
+)
+from app.utils.exceptions import CacheBackendError
+
+try:
+    import msgpack
+except ImportError:  # optional, only needed for CACHE_SERIALIZER=msgpack
+    msgpack = None
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Simple in-memory cache (for development)
-# In production, this would use Redis
-_memory_cache: dict[str, tuple[Any, float]] = {}
+# Bump when the shape of cached results changes
+CACHE_SCHEMA_VERSION = 1
+
+# How long one replica may hold the claim on a background refresh
+REFRESH_LOCK_SECONDS = 30
+
+# Stored entry header: value codec and the time until which it is fresh
+_ENTRY_HEADER = struct.Struct("!Bd")
+_CODEC_ORJSON = 0
+_CODEC_MSGPACK = 1
+
+
+def _select_codec() -> int:
+    """Pick the value codec from CACHE_SERIALIZER."""
+    if settings.CACHE_SERIALIZER == "msgpack":
+        if msgpack is not None:
+            return _CODEC_MSGPACK
+        logger.warning("CACHE_SERIALIZER is 'msgpack' but msgpack is not installed; using orjson")
+    elif settings.CACHE_SERIALIZER != "orjson":
+        logger.warning(f"Unknown CACHE_SERIALIZER '{settings.CACHE_SERIALIZER}'; using orjson")
+    return _CODEC_ORJSON
+
+
+# Codec used for new entries (entries of either codec can be read)
+_codec = _select_codec()
+
+# Process-local entry store, also backing the memory backend
+_memory_cache = LRUCache(
+    max_entries=settings.CACHE_MAX_ENTRIES,
+    max_bytes=settings.CACHE_MAX_BYTES,
+)
+
+# Store used by the @cache decorator (replaced by configure_cache_backend)
+_backend: CacheBackend = MemoryBackend(_memory_cache)
+
+# Background expiry sweep
+_sweeper_task: Optional[asyncio.Task] = None
+
+# Incremented whenever course data changes (part of every cache key)
+_data_version = 0
+
+# DATA_VERSION_FILE marker this process last saw (None until first read)
+_data_marker: Optional[str] = None
+
+# Computations in progress per cache key (single-flight)
+_inflight: dict[str, asyncio.Future] = {}
+
+# Keys with a scheduled stale-while-revalidate refresh, and their tasks
+_refreshing: set[str] = set()
+_refresh_tasks: set[asyncio.Task] = set()
+
+
+def get_cache() -> LRUCache:
+    """Get the process-wide in-memory cache instance."""
+    return _memory_cache
+
 
+def get_cache_backend() -> CacheBackend:
+    """Get the backend used by the @cache decorator."""
+    return _backend
 
-def generate_cache_key(*args, **kwargs) -> str:
+
+def set_cache_backend(backend: CacheBackend) -> CacheBackend:
+    """
+    Replace the backend used by the @cache decorator.
+
+    Args:
+        backend: New backend
+
+    Returns:
+        CacheBackend: Previous backend (not closed)
+    """
+    global _backend
+    previous, _backend = _backend, backend
+    return previous
+
+
+async def configure_cache_backend() -> CacheBackend:
+    """
+    Set up the backend selected by CACHE_BACKEND.
+
+    Falls back to the in-memory backend when the shared cache cannot be
+    reached, so the application still starts.
+
+    Returns:
+        CacheBackend: Backend now in use
+    """
+    backend = await create_cache_backend(
+        settings.CACHE_BACKEND,
+        settings.CACHE_URL,
+        _memory_cache,
+        prefix=settings.CACHE_KEY_PREFIX,
+    )
+    set_cache_backend(backend)
+    return backend
+
+
+async def close_cache_backend() -> None:
+    """Close the current backend and return to the in-memory backend."""
+    backend = set_cache_backend(MemoryBackend(_memory_cache))
+    await backend.close()
+
+
+def _normalize_key_part(value: Any) -> Any:
     """
-    Generate a cache key from function arguments.
+    Convert an argument into a canonical JSON-compatible form.
 
     Args:
+        value: Argument value
+
+    Returns:
+        JSON-compatible value that is equal for equal arguments
+
+    Raises:
+        TypeError: If the value has no stable representation
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, Enum):
+        return _normalize_key_part(value.value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (list, tuple)):
+        return [_normalize_key_part(item) for item in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted((_normalize_key_part(item) for item in value), key=repr)
+    if isinstance(value, dict):
+        return {str(key): _normalize_key_part(item) for key, item in value.items()}
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Cannot build a cache key from {type(value).__name__}")
+
+
+def generate_cache_key(func: Callable, *args, **kwargs) -> str:
+    """
+    Generate a cache key for a function call.
+
+    Arguments are bound to the function signature with defaults applied, so
+    positional and keyword calls of the same arguments share a key. The key
+    covers the function's qualified name, ``CACHE_SCHEMA_VERSION`` and the
+    current data version; ``self``/``cls`` is excluded so results are shared
+    across per-request service instances.
+
+    Args:
+        func: Decorated function
         *args: Positional arguments
         **kwargs: Keyword arguments
 
     Returns:
-        str: Hash-based cache key
+        str: Key of the form ``"<qualname>:<32 hex digits>"``
+
+    Raises:
+        TypeError: If an argument cannot be represented in a key
+    """
+    return _cache_key(func, inspect.signature(func), args, kwargs)
+
+
+def _cache_key(func: Callable, signature: inspect.Signature, args: tuple, kwargs: dict) -> str:
+    """Build the key of ``generate_cache_key`` with the function's signature already computed."""
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+
+    arguments = [
+        [name, _normalize_key_part(value)]
+        for name, value in bound.arguments.items()
+        if name not in ("self", "cls")
+    ]
+    payload = orjson.dumps(
+        [func.__qualname__, CACHE_SCHEMA_VERSION, _data_version, arguments],
+        option=orjson.OPT_SORT_KEYS,
+    )
+    digest = hashlib.blake2b(payload, digest_size=16).hexdigest()
+    return f"{func.__qualname__}:{digest}"
+
+
+def get_data_version() -> int:
+    """Get the data version included in cache keys."""
+    return _data_version
+
+
+def sync_data_version() -> int:
+    """
+    Get the data version after adopting changes recorded by other processes.
+
+    Checks DATA_VERSION_FILE (one ``stat`` call, as every cached call does),
+    so a change made by an import script or another worker on this host is
+    seen. Versions published by other replicas through a shared backend are
+    adopted on cache lookups.
+
+    Returns:
+        int: Current data version
+    """
+    _sync_data_marker()
+    return _data_version
+
+
+def _adopt_data_version(version: int) -> None:
+    """Switch to a data version published by another replica."""
+    global _data_version
+    if version != _data_version:
+        logger.info(f"Cache data version {_data_version} -> {version} (shared)")
+        _data_version = version
+
+
+async def bump_data_version() -> int:
+    """
+    Invalidate every cached result after course data changes.
+
+    Entries keyed with older versions are never read again and age out of
+    the cache. With a shared backend the new version is published to every
+    replica.
+
+    Returns:
+        int: New data version
     """
-    key_parts = []
+    global _data_version
+    try:
+        _data_version = await _backend.bump_version(_data_version)
+    except CacheBackendError as e:
+        logger.warning(f"Could not publish data version bump: {e}")
+        _data_version += 1
+    _touch_data_version_file()
+    _sync_data_marker()
+    logger.info(f"Cache data version bumped to {_data_version}")
+    return _data_version
 
-    # Add positional args (skip self/cls)
-    for arg in args[1:]:  # Skip first arg (self/cls)
-        if isinstance(arg, (str, int, float, bool)):
-            key_parts.append(str(arg))
-        elif isinstance(arg, (list, tuple)):
-            key_parts.append(json.dumps(arg, default=str))
-        elif isinstance(arg, dict):
-            key_parts.append(json.dumps(arg, default=str, sort_keys=True))
 
-    # Add keyword args
-    for k in sorted(kwargs.keys()):
-        v = kwargs[k]
-        if isinstance(v, (str, int, float, bool)):
-            key_parts.append(f"{k}={v}")
-        elif isinstance(v, (list, tuple)):
-            key_parts.append(f"{k}={json.dumps(v, default=str)}")
-        elif isinstance(v, dict):
-            key_parts.append(f"{k}={json.dumps(v, default=str, sort_keys=True)}")
+async def publish_data_change() -> int:
+    """
+    Bump the data version from a script that changed course data.
+
+    Uses the backend selected by CACHE_BACKEND, so a shared version reaches
+    every replica; the rewritten DATA_VERSION_FILE reaches servers on this
+    host either way.
+
+    Returns:
+        int: New data version
+
+    Example:
+        >>> stats = await import_courses(session, courses)
+        >>> await publish_data_change()
+    """
+    await configure_cache_backend()
+    try:
+        return await bump_data_version()
+    finally:
+        await close_cache_backend()
+
+
+def _touch_data_version_file() -> None:
+    """Rewrite DATA_VERSION_FILE, giving it a new inode and modification time."""
+    path = settings.DATA_VERSION_FILE
+    temporary = f"{path}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(temporary, "w") as file:
+            file.write(f"{time.time_ns()}\n")
+        os.replace(temporary, path)
+    except OSError as e:
+        logger.warning(f"Could not write data version file {path}: {e}")
 
-    key_string = "|".join(key_parts)
-    return hashlib.md5(key_string.encode()).hexdigest()
 
+def _read_data_marker() -> str:
+    """Identify the current DATA_VERSION_FILE by modification time and inode."""
+    try:
+        marker = os.stat(settings.DATA_VERSION_FILE)
+    except OSError:
+        return "0"
+    return f"{marker.st_mtime_ns:x}.{marker.st_ino:x}"
 
-def cache(ttl_seconds: int = 300):
+
+def _sync_data_marker() -> str:
+    """
+    Adopt a data change another process recorded in DATA_VERSION_FILE.
+
+    The data version is advanced locally (not published, and the file is
+    not rewritten), so cached results of the previous data are no longer
+    read in this process.
+
+    Returns:
+        str: Current marker
+    """
+    global _data_marker, _data_version
+    marker = _read_data_marker()
+    if marker != _data_marker:
+        if _data_marker is not None:
+            _data_version += 1
+            logger.info(f"Cache data version -> {_data_version} (data version file changed)")
+        _data_marker = marker
+    return marker
+
+
+def get_data_marker() -> str:
+    """
+    Identify the last data change recorded in DATA_VERSION_FILE.
+
+    Unlike the data version, which each process counts on its own, the
+    marker is the same in every process on the host, so it can be stored
+    with files built from the data (see ``app.utils.snapshots``).
+
+    Returns:
+        str: Marker of the file's current contents ("0" if it does not exist)
+    """
+    return _sync_data_marker()
+
+
+def get_data_etag() -> str:
+    """
+    Get the weak ETag of responses derived from course data.
+
+    Changes whenever the data version is bumped, in this process or through
+    DATA_VERSION_FILE in another one, and with the API version, so a deploy
+    that changes response shapes does not produce false 304s. Both parts
+    also key the cached results, so a response is never built from results
+    older than its ETag.
+
+    Returns:
+        str: Weak ETag such as W/"0.1.0-1-17f3a9c2e4b1d000.2b1e4-3"
+
+    Example:
+        >>> get_data_etag().startswith('W/"')
+        True
+    """
+    marker = _sync_data_marker()
+    return f'W/"{settings.API_VERSION}-{CACHE_SCHEMA_VERSION}-{marker}-{_data_version}"'
+
+
+def _msgpack_default(value: Any) -> Any:
+    """Convert values msgpack cannot pack the same way ORJSON would."""
+    return orjson.loads(orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS))
+
+
+def _encode_entry(value: Any, fresh_until: float) -> bytes:
+    """Serialize a result with its freshness timestamp for storage."""
+    if _codec == _CODEC_MSGPACK:
+        payload = msgpack.packb(value, default=_msgpack_default)
+    else:
+        payload = orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    return _ENTRY_HEADER.pack(_codec, fresh_until) + payload
+
+
+def _decode_entry(entry: bytes) -> Optional[tuple[float, Any]]:
+    """
+    Deserialize a stored entry.
+
+    Returns:
+        Tuple of (fresh until, value), or None if the entry cannot be read
+        (e.g. written by a replica using a codec not installed here)
+    """
+    try:
+        codec, fresh_until = _ENTRY_HEADER.unpack_from(entry)
+        payload = memoryview(entry)[_ENTRY_HEADER.size:]
+        if codec == _CODEC_ORJSON:
+            return fresh_until, orjson.loads(payload)
+        if codec == _CODEC_MSGPACK and msgpack is not None:
+            return fresh_until, msgpack.unpackb(payload, strict_map_key=False)
+    except (struct.error, ValueError) as e:
+        logger.debug(f"Ignoring unreadable cache entry: {e}")
+    return None
+
+
+async def _load(
+    key: str,
+    func: Callable,
+    namespace: str,
+    ttl_seconds: float,
+    stale_ttl_seconds: float,
+    args: tuple,
+    kwargs: dict,
+) -> bytes:
+    """
+    Compute and store a result, coalescing concurrent calls for the same key.
+
+    The first caller runs the function; every concurrent caller awaits the
+    same future. If the computing caller is cancelled, a waiter takes over.
+    A failure to store the result is logged and does not fail the call.
+
+    Returns:
+        bytes: Stored entry
+    """
+    while True:
+        inflight = _inflight.get(key)
+        if inflight is None:
+            break
+        _backend.record(namespace, "coalesced")
+        try:
+            return await asyncio.shield(inflight)
+        except asyncio.CancelledError:
+            if not inflight.cancelled():
+                raise  # this caller was cancelled, not the computation
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        result = await func(*args, **kwargs)
+        backend = _backend
+        entry = _encode_entry(result, backend.now() + ttl_seconds)
+        try:
+            await backend.set(key, entry, ttl_seconds + stale_ttl_seconds, namespace)
+            logger.debug(f"Cached result for {namespace} (TTL: {ttl_seconds}s)")
+        except CacheBackendError as e:
+            logger.warning(f"Could not cache result for {namespace}: {e}")
+        future.set_result(entry)
+        return entry
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        future.exception()  # waiters re-raise it; avoid "never retrieved" warnings
+        raise
+    finally:
+        if _inflight.get(key) is future:
+            del _inflight[key]
+
+
+async def _refresh(
+    key: str,
+    func: Callable,
+    namespace: str,
+    ttl_seconds: float,
+    stale_ttl_seconds: float,
+    args: tuple,
+    kwargs: dict,
+) -> None:
+    """
+    Recompute a stale entry in the background.
+
+    The service instance is rebuilt on a new database session because the
+    request that found the stale entry (and its session) may already be
+    finished. Only the replica that claims the key refreshes it; the others
+    keep serving the stale value until the new one is stored.
+    """
+    from app.database.session import async_session
+
+    backend = _backend
+    try:
+        if not await backend.try_lock(key, REFRESH_LOCK_SECONDS):
+            return
+        try:
+            async with async_session() as session:
+                owner = type(args[0])(session)
+                await _load(key, func, namespace, ttl_seconds, stale_ttl_seconds, (owner, *args[1:]), kwargs)
+            backend.record(namespace, "refreshes")
+        finally:
+            await backend.unlock(key)
+    except Exception as e:
+        logger.warning(f"Background refresh of {namespace} failed: {e}")
+    finally:
+        _refreshing.discard(key)
+
+
+def _schedule_refresh(
+    key: str,
+    func: Callable,
+    namespace: str,
+    ttl_seconds: float,
+    stale_ttl_seconds: float,
+    args: tuple,
+    kwargs: dict,
+) -> bool:
+    """
+    Start one background refresh for a stale key.
+
+    Returns:
+        bool: False if the call cannot be refreshed in the background
+    """
+    if key in _refreshing or key in _inflight:
+        return True
+    if not args or not hasattr(args[0], "session"):
+        return False
+
+    _refreshing.add(key)
+    task = asyncio.get_running_loop().create_task(
+        _refresh(key, func, namespace, ttl_seconds, stale_ttl_seconds, args, kwargs)
+    )
+    _refresh_tasks.add(task)
+    task.add_done_callback(_refresh_tasks.discard)
+    return True
+
+
+def cache(ttl_seconds: int = 300, stale_ttl_seconds: int = 0):
     """
     Caching decorator for async functions.
 
+    Results are stored serialized and decoded on every call, so callers
+    always receive plain JSON types (tuples become lists, models become
+    dicts) whether or not the value came from the cache. Decorated functions
+    must therefore return JSON-serializable data, not ORM objects.
+
+    Concurrent misses for the same key share one computation. With
+    ``stale_ttl_seconds``, an expired value is still served for that long
+    while a single background task recomputes it; this requires a service
+    method whose class is constructed from a ``session``.
+
+    If the cache backend fails, the function is called uncached.
+
     Args:
         ttl_seconds: Time to live in seconds (default: 5 minutes)
+        stale_ttl_seconds: How long an expired value may be served while
+            refreshing (default: 0, disabled)
 
     Returns:
         Decorator function
     """
     def decorator(func: Callable) -> Callable:
+        namespace = func.__qualname__
+        signature = inspect.signature(func)
+
         @functools.wraps(func)
         async def wrapper(*args, **kwargs):
-            cache_key = generate_cache_key(*args, **kwargs)
+            backend = _backend
+            _sync_data_marker()
+            try:
+                version = _data_version
+                cache_key = _cache_key(func, signature, args, kwargs)
+            except TypeError as e:
+                logger.warning(f"Not caching {namespace}: {e}")
+                return await func(*args, **kwargs)
 
-            # Check cache
-            if cache_key in _memory_cache:
-                cached_value, expiry_time = _memory_cache[cache_key]
-                import time
-                if time.time() < expiry_time:
-                    logger.debug(f"Cache hit for {func.__name__}")
-                    return cached_value
-                else:
-                    # Remove expired entry
-                    del _memory_cache[cache_key]
+            stale_ttl = stale_ttl_seconds if settings.CACHE_STALE_WHILE_REVALIDATE else 0
 
-            # Call function
-            result = await func(*args, **kwargs)
+            # Check cache (and pick up version bumps from other replicas)
+            try:
+                shared_version, entry = await backend.fetch(cache_key, namespace, version)
+                if shared_version is not None and shared_version != version:
+                    _adopt_data_version(shared_version)
+                    cache_key = _cache_key(func, signature, args, kwargs)
+                    _, entry = await backend.fetch(cache_key, namespace, shared_version)
+            except CacheBackendError as e:
+                logger.warning(f"Cache lookup for {namespace} failed: {e}")
+                return await func(*args, **kwargs)
 
-            # Store in cache
-            import time
-            _memory_cache[cache_key] = (result, time.time() + ttl_seconds)
-            logger.debug(f"Cached result for {func.__name__} (TTL: {ttl_seconds}s)")
+            cached = _decode_entry(entry) if entry is not None else None
+            if cached is not None:
+                fresh_until, value = cached
+                if fresh_until > backend.now():
+                    logger.debug(f"Cache hit for {func.__name__}")
+                    return value
+                if _schedule_refresh(
+                    cache_key, func, namespace, ttl_seconds, stale_ttl, args, kwargs
+                ):
+                    backend.record(namespace, "stale_hits")
+                    logger.debug(f"Serving stale {func.__name__} while refreshing")
+                    return value
 
-            return result
+            entry = await _load(cache_key, func, namespace, ttl_seconds, stale_ttl, args, kwargs)
+            return _decode_entry(entry)[1]
 
         return wrapper
     return decorator
 
 
-def clear_cache():
-    """Clear all cached entries."""
-    global _memory_cache
-    _memory_cache.clear()
-    logger.info("Cache cleared")
+async def clear_cache() -> int:
+    """
+    Clear all cached entries.
+
+    Returns:
+        int: Number of entries removed
+    """
+    removed = await _backend.clear()
+    logger.info(f"Cache cleared ({removed} entries)")
+    return removed
 
 
-def clear_cache_pattern(pattern: str):
+async def clear_cache_pattern(pattern: str) -> int:
     """
     Clear cache entries matching a pattern.
 
     Args:
         pattern: Pattern to match in cache keys
+
+    Returns:
+        int: Number of entries removed
+    """
+    removed = await _backend.delete_pattern(pattern)
+    logger.info(f"Cleared {removed} cache entries matching '{pattern}'")
+    return removed
+
+
+def get_cache_stats() -> dict[str, Any]:
+    """
+    Get usage statistics of the cache backend.
+
+    Returns:
+        Dict with the backend name, totals and per-namespace counters
     """
-    global _memory_cache
-    keys_to_delete = [k for k in _memory_cache.keys() if pattern in k]
-    for key in keys_to_delete:
-        del _memory_cache[key]
-    logger.info(f"Cleared {len(keys_to_delete)} cache entries matching '{pattern}'")
+    return _backend.stats()
+
+
+async def _sweep_loop(interval_seconds: float) -> None:
+    """Periodically remove expired cache entries."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            removed = _backend.sweep()
+            if removed:
+                logger.debug(f"Cache sweep removed {removed} expired entries")
+        except Exception as e:
+            logger.warning(f"Cache sweep failed: {e}")
+
+
+def start_cache_sweeper(interval_seconds: Optional[float] = None) -> None:
+    """
+    Start the background expiry sweep (idempotent).
+
+    Args:
+        interval_seconds: Sweep interval (defaults to CACHE_SWEEP_INTERVAL_SECONDS)
+    """
+    global _sweeper_task
+    if _sweeper_task is not None and not _sweeper_task.done():
+        return
+    interval = interval_seconds or settings.CACHE_SWEEP_INTERVAL_SECONDS
+    _sweeper_task = asyncio.get_running_loop().create_task(_sweep_loop(interval))
+    logger.info(f"Cache sweeper started (interval: {interval}s)")
+
+
+async def stop_cache_sweeper() -> None:
+    """Stop the background expiry sweep."""
+    global _sweeper_task
+    if _sweeper_task is None:
+        return
+    _sweeper_task.cancel()
+    try:
+        await _sweeper_task
+    except asyncio.CancelledError:
+        pass
+    _sweeper_task = None
@@ -0,0 +1,772 @@
+"""
+Storage backends for the result cache.
+
+``MemoryBackend`` keeps entries in a process-wide ``LRUCache`` bounded by
+entry count and approximate byte size. ``RESPBackend`` stores them on a
+Redis-compatible server so that every backend replica shares one cache and
+one data version: a version bump on any replica invalidates cached results
+on all of them.
+
+Backends store opaque byte strings; encoding values and building keys is
+left to ``app.utils.cache``. Hit, miss and eviction counters are tracked
+per namespace (the decorated function's qualified name) in each process.
+"""
+
+import logging
+import sys
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, fields
+from typing import Any, Iterable, Optional
+
+from app.utils.exceptions import CacheBackendError
+from app.utils.resp import RESPClient, RESPReplyError
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Namespace used for entries stored outside the decorator
+DEFAULT_NAMESPACE = "default"
+
+
+@dataclass
+class CacheStats:
+    """
+    Counters for one cache namespace.
+
+    Attributes:
+        hits: Lookups answered from the cache
+        misses: Lookups that found no live entry
+        sets: Entries stored
+        evictions: Entries removed to respect the size limits
+        expirations: Entries removed because their TTL passed
+        coalesced: Misses that awaited an in-flight computation instead of running it
+        stale_hits: Hits served from an expired entry while it was refreshed
+        refreshes: Background refreshes completed
+        entries: Entries currently stored
+        bytes: Approximate size of the stored entries
+    """
+
+    hits: int = 0
+    misses: int = 0
+    sets: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    coalesced: int = 0
+    stale_hits: int = 0
+    refreshes: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @classmethod
+    def combine(cls, namespaces: Iterable["CacheStats"]) -> "CacheStats":
+        """
+        Sum the event counters of several namespaces.
+
+        ``entries`` and ``bytes`` are left at zero for the caller to fill in.
+
+        Args:
+            namespaces: Counters to add up
+
+        Returns:
+            CacheStats: Totals
+        """
+        totals = cls()
+        for stats in namespaces:
+            for name in _EVENT_COUNTERS:
+                setattr(totals, name, getattr(totals, name) + getattr(stats, name))
+        return totals
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert counters to a JSON-serializable dict."""
+        data = asdict(self)
+        data["hit_rate"] = round(self.hit_rate, 4)
+        return data
+
+
+# Counters summed across namespaces (entries/bytes describe current contents)
+_EVENT_COUNTERS = tuple(f.name for f in fields(CacheStats) if f.name not in ("entries", "bytes"))
+
+
+@dataclass
+class _CacheEntry:
+    """A stored value with its expiry time, size and namespace."""
+
+    value: Any
+    expires_at: float
+    size: int
+    namespace: str
+
+
+def estimate_size(value: Any, _seen: Optional[set[int]] = None) -> int:
+    """
+    Estimate the memory footprint of a cached value in bytes.
+
+    Follows containers and object attributes recursively, counting each
+    object once. The result is approximate but grows with the real size,
+    which is all the byte limit needs.
+
+    Args:
+        value: Value to measure
+
+    Returns:
+        int: Approximate size in bytes
+    """
+    if _seen is None:
+        _seen = set()
+    if id(value) in _seen:
+        return 0
+    _seen.add(id(value))
+
+    size = sys.getsizeof(value)
+
+    if isinstance(value, (str, bytes, bytearray, int, float, bool)) or value is None:
+        return size
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += estimate_size(key, _seen) + estimate_size(item, _seen)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += estimate_size(item, _seen)
+    elif hasattr(value, "__dict__"):
+        for key, item in vars(value).items():
+            # Skip SQLAlchemy bookkeeping, which is shared with the session
+            if not key.startswith("_sa_"):
+                size += estimate_size(item, _seen)
+
+    return size
+
+
+class LRUCache:
+    """
+    In-memory TTL cache bounded by entry count and approximate byte size.
+
+    Example:
+        >>> lru = LRUCache(max_entries=1000, max_bytes=16 * 1024 * 1024)
+        >>> lru.set("key", {"a": 1}, ttl_seconds=60, namespace="stats")
+        >>> found, value = lru.get("key", namespace="stats")
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_entries: Maximum number of entries kept
+            max_bytes: Maximum approximate total size of entries in bytes
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self._bytes = 0
+        self._stats: dict[str, CacheStats] = {}
+
+    def __len__(self) -> int:
+        """Number of stored entries (including not yet swept expired ones)."""
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        """Whether a live entry exists for the key (does not touch LRU order)."""
+        entry = self._entries.get(key)
+        return entry is not None and entry.expires_at > time.monotonic()
+
+    @property
+    def total_bytes(self) -> int:
+        """Approximate size of all stored entries in bytes."""
+        return self._bytes
+
+    def _namespace_stats(self, namespace: str) -> CacheStats:
+        """Get (or create) the counters for a namespace."""
+        stats = self._stats.get(namespace)
+        if stats is None:
+            stats = self._stats[namespace] = CacheStats()
+        return stats
+
+    def _remove(self, key: str) -> _CacheEntry:
+        """Remove an entry and update size accounting."""
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+        stats = self._namespace_stats(entry.namespace)
+        stats.entries -= 1
+        stats.bytes -= entry.size
+        return entry
+
+    def get(self, key: str, namespace: str = DEFAULT_NAMESPACE) -> tuple[bool, Any]:
+        """
+        Look up a live entry and mark it as recently used.
+
+        Args:
+            key: Cache key
+            namespace: Namespace counted for the lookup
+
+        Returns:
+            Tuple of (found, value); value is None when not found
+        """
+        stats = self._namespace_stats(namespace)
+        entry = self._entries.get(key)
+
+        if entry is None:
+            stats.misses += 1
+            return False, None
+
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self._namespace_stats(entry.namespace).expirations += 1
+            stats.misses += 1
+            return False, None
+
+        self._entries.move_to_end(key)
+        stats.hits += 1
+        return True, entry.value
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl_seconds: float,
+        namespace: str = DEFAULT_NAMESPACE,
+        size: Optional[int] = None,
+    ) -> bool:
+        """
+        Store a value, evicting least recently used entries as needed.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl_seconds: Time to live in seconds
+            namespace: Namespace the entry belongs to
+            size: Size in bytes if already known (estimated otherwise)
+
+        Returns:
+            bool: False if the value alone exceeds the byte limit and was not stored
+        """
+        if size is None:
+            size = estimate_size(value)
+
+        if key in self._entries:
+            self._remove(key)
+
+        if size > self.max_bytes:
+            logger.debug(f"Not caching {namespace} entry of {size} bytes (limit {self.max_bytes})")
+            return False
+
+        self._entries[key] = _CacheEntry(value, time.monotonic() + ttl_seconds, size, namespace)
+        self._bytes += size
+        stats = self._namespace_stats(namespace)
+        stats.sets += 1
+        stats.entries += 1
+        stats.bytes += size
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+            evicted_stats = self._namespace_stats(evicted.namespace)
+            evicted_stats.entries -= 1
+            evicted_stats.bytes -= evicted.size
+            evicted_stats.evictions += 1
+
+        return True
+
+    def delete(self, key: str) -> bool:
+        """
+        Remove an entry.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            bool: True if an entry was removed
+        """
+        if key not in self._entries:
+            return False
+        self._remove(key)
+        return True
+
+    def clear(self) -> int:
+        """
+        Remove all entries (counters are kept).
+
+        Returns:
+            int: Number of entries removed
+        """
+        count = len(self._entries)
+        self._entries.clear()
+        self._bytes = 0
+        for stats in self._stats.values():
+            stats.entries = 0
+            stats.bytes = 0
+        return count
+
+    def keys(self) -> list[str]:
+        """Snapshot of stored keys, least recently used first."""
+        return list(self._entries)
+
+    def sweep(self) -> int:
+        """
+        Remove all expired entries.
+
+        Returns:
+            int: Number of entries removed
+        """
+        now = time.monotonic()
+        expired = [key for key, entry in self._entries.items() if entry.expires_at <= now]
+        for key in expired:
+            entry = self._remove(key)
+            self._namespace_stats(entry.namespace).expirations += 1
+        return len(expired)
+
+    def record(self, namespace: str, counter: str) -> None:
+        """
+        Increment a namespace counter tracked outside lookups.
+
+        Args:
+            namespace: Namespace to count for
+            counter: CacheStats field name (e.g. "coalesced")
+        """
+        stats = self._namespace_stats(namespace)
+        setattr(stats, counter, getattr(stats, counter) + 1)
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Summarize cache usage.
+
+        Returns:
+            Dict with totals, limits and per-namespace counters
+        """
+        totals = CacheStats.combine(self._stats.values())
+        totals.entries = len(self._entries)
+        totals.bytes = self._bytes
+
+        return {
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "totals": totals.to_dict(),
+            "namespaces": {
+                namespace: stats.to_dict()
+                for namespace, stats in sorted(self._stats.items())
+            },
+        }
+
+
+class CacheBackend(ABC):
+    """
+    Interface of a result cache store.
+
+    Values are byte strings. Every backend counts lookups per namespace so
+    that ``stats()`` reports the same fields regardless of where entries
+    live.
+    """
+
+    #: Backend name reported in statistics
+    name: str = "abstract"
+
+    def now(self) -> float:
+        """
+        Current time on the clock used for freshness timestamps.
+
+        Returns:
+            float: Seconds on a clock every reader of the backend shares
+        """
+        return time.time()
+
+    @abstractmethod
+    async def fetch(
+        self, key: str, namespace: str, version: int
+    ) -> tuple[Optional[int], Optional[bytes]]:
+        """
+        Look up a value together with the shared data version.
+
+        Args:
+            key: Cache key (built for ``version``)
+            namespace: Namespace counted for the lookup
+            version: Data version the caller built the key with
+
+        Returns:
+            Tuple of (shared data version or None if the backend has none,
+            value or None). When the shared version differs from
+            ``version`` the value is None and no lookup is counted; the
+            caller should rebuild its key for the shared version.
+        """
+
+    @abstractmethod
+    async def get_many(self, keys: list[str], namespace: str = DEFAULT_NAMESPACE) -> list[Optional[bytes]]:
+        """
+        Look up several values at once.
+
+        Args:
+            keys: Cache keys
+            namespace: Namespace counted for the lookups
+
+        Returns:
+            Values in key order (None where missing)
+        """
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl_seconds: float, namespace: str = DEFAULT_NAMESPACE) -> bool:
+        """
+        Store a value.
+
+        Args:
+            key: Cache key
+            value: Serialized value
+            ttl_seconds: Time to live in seconds
+            namespace: Namespace the entry belongs to
+
+        Returns:
+            bool: False if the value was not stored
+        """
+
+    @abstractmethod
+    async def delete_pattern(self, pattern: str) -> int:
+        """
+        Remove entries whose key contains a substring.
+
+        Args:
+            pattern: Substring to match in cache keys
+
+        Returns:
+            int: Number of entries removed
+        """
+
+    @abstractmethod
+    async def clear(self) -> int:
+        """
+        Remove all entries (the data version is kept).
+
+        Returns:
+            int: Number of entries removed
+        """
+
+    @abstractmethod
+    async def bump_version(self, current: int) -> int:
+        """
+        Advance the data version.
+
+        Args:
+            current: Version the caller is using
+
+        Returns:
+            int: New version
+        """
+
+    async def try_lock(self, key: str, ttl_seconds: float) -> bool:
+        """
+        Claim exclusive work on a key (e.g. a background refresh).
+
+        Args:
+            key: Cache key
+            ttl_seconds: Time after which the claim lapses
+
+        Returns:
+            bool: True if this caller holds the claim
+        """
+        return True
+
+    async def unlock(self, key: str) -> None:
+        """
+        Release a claim taken with ``try_lock``.
+
+        Args:
+            key: Cache key
+        """
+
+    def sweep(self) -> int:
+        """
+        Remove expired entries the store does not expire by itself.
+
+        Returns:
+            int: Number of entries removed
+        """
+        return 0
+
+    @abstractmethod
+    def record(self, namespace: str, counter: str) -> None:
+        """
+        Increment a namespace counter.
+
+        Args:
+            namespace: Namespace to count for
+            counter: CacheStats field name (e.g. "coalesced")
+        """
+
+    @abstractmethod
+    def stats(self) -> dict[str, Any]:
+        """
+        Summarize cache usage.
+
+        Returns:
+            Dict with the backend name, totals and per-namespace counters
+        """
+
+    async def close(self) -> None:
+        """Release connections held by the backend."""
+
+
+class MemoryBackend(CacheBackend):
+    """
+    Process-local backend on top of an ``LRUCache``.
+
+    The data version lives only in this process, so ``fetch`` never reports
+    a shared version.
+    """
+
+    name = "memory"
+
+    def __init__(self, lru: LRUCache):
+        """
+        Initialize the backend.
+
+        Args:
+            lru: Cache holding the entries
+        """
+        self.lru = lru
+
+    def now(self) -> float:
+        """Current monotonic time (entries never leave the process)."""
+        return time.monotonic()
+
+    async def fetch(
+        self, key: str, namespace: str, version: int
+    ) -> tuple[Optional[int], Optional[bytes]]:
+        """Look up a value; there is no shared version."""
+        found, value = self.lru.get(key, namespace)
+        return None, value if found else None
+
+    async def get_many(self, keys: list[str], namespace: str = DEFAULT_NAMESPACE) -> list[Optional[bytes]]:
+        """Look up several values."""
+        return [self.lru.get(key, namespace)[1] for key in keys]
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float, namespace: str = DEFAULT_NAMESPACE) -> bool:
+        """Store a value, evicting least recently used entries as needed."""
+        return self.lru.set(key, value, ttl_seconds, namespace, size=len(value))
+
+    async def delete_pattern(self, pattern: str) -> int:
+        """Remove entries whose key contains a substring."""
+        keys = [key for key in self.lru.keys() if pattern in key]
+        for key in keys:
+            self.lru.delete(key)
+        return len(keys)
+
+    async def clear(self) -> int:
+        """Remove all entries."""
+        return self.lru.clear()
+
+    async def bump_version(self, current: int) -> int:
+        """Advance the process-local data version."""
+        return current + 1
+
+    def sweep(self) -> int:
+        """Remove expired entries."""
+        return self.lru.sweep()
+
+    def record(self, namespace: str, counter: str) -> None:
+        """Increment a namespace counter."""
+        self.lru.record(namespace, counter)
+
+    def stats(self) -> dict[str, Any]:
+        """Summarize cache usage."""
+        return {"backend": self.name, **self.lru.stats()}
+
+
+class RESPBackend(CacheBackend):
+    """
+    Shared backend on a Redis-compatible server.
+
+    Layout under the key prefix:
+
+    - ``<prefix>data:<key>``: cached values, expired by the server
+    - ``<prefix>version``: shared data version (``INCR`` on every bump)
+    - ``<prefix>lock:<key>``: short-lived refresh claims (``SET NX``)
+
+    Lookups read the value and the shared version with one ``MGET``, so a
+    bump on another replica is noticed on the very next lookup without an
+    extra round trip. The version key has no TTL; configure the server with
+    a ``volatile-*`` eviction policy so that it is never evicted.
+
+    Example:
+        >>> backend = RESPBackend(RESPClient.from_url("redis://cache:6379/0"))
+        >>> await backend.set("k", b"v", ttl_seconds=60)
+        >>> await backend.get_many(["k", "missing"])
+        [b'v', None]
+    """
+
+    name = "resp"
+
+    # Keys fetched per MGET and deleted per UNLINK
+    BATCH_SIZE = 500
+
+    def __init__(self, client: RESPClient, prefix: str = "nycu:cache:"):
+        """
+        Initialize the backend.
+
+        Args:
+            client: Client connected (lazily) to the server
+            prefix: Prefix of every key written by this application
+        """
+        self.client = client
+        self.prefix = prefix
+        self.version_key = f"{prefix}version"
+        self._stats: dict[str, CacheStats] = {}
+
+    def _data_key(self, key: str) -> str:
+        """Server key holding a cached value."""
+        return f"{self.prefix}data:{key}"
+
+    def _namespace_stats(self, namespace: str) -> CacheStats:
+        """Get (or create) the counters for a namespace."""
+        stats = self._stats.get(namespace)
+        if stats is None:
+            stats = self._stats[namespace] = CacheStats()
+        return stats
+
+    def _count_lookup(self, namespace: str, value: Optional[bytes]) -> None:
+        """Count a lookup as hit or miss."""
+        stats = self._namespace_stats(namespace)
+        if value is None:
+            stats.misses += 1
+        else:
+            stats.hits += 1
+
+    async def ping(self) -> None:
+        """
+        Check that the server is reachable.
+
+        Raises:
+            CacheBackendError: If it is not
+        """
+        await self.client.execute("PING")
+
+    async def fetch(
+        self, key: str, namespace: str, version: int
+    ) -> tuple[Optional[int], Optional[bytes]]:
+        """Look up a value and the shared version in one round trip."""
+        raw_version, value = await self.client.execute("MGET", self.version_key, self._data_key(key))
+        shared = int(raw_version) if raw_version is not None else 0
+        if shared != version:
+            return shared, None
+        self._count_lookup(namespace, value)
+        return shared, value
+
+    async def get_many(self, keys: list[str], namespace: str = DEFAULT_NAMESPACE) -> list[Optional[bytes]]:
+        """Look up several values with pipelined MGET batches."""
+        batches = [
+            ("MGET", *(self._data_key(key) for key in keys[start:start + self.BATCH_SIZE]))
+            for start in range(0, len(keys), self.BATCH_SIZE)
+        ]
+        values = []
+        for reply in await self.client.pipeline(batches):
+            if isinstance(reply, RESPReplyError):
+                raise reply
+            values.extend(reply)
+        for value in values:
+            self._count_lookup(namespace, value)
+        return values
+
+    async def set(self, key: str, value: bytes, ttl_seconds: float, namespace: str = DEFAULT_NAMESPACE) -> bool:
+        """Store a value with a server-side expiry."""
+        ttl_ms = max(1, int(ttl_seconds * 1000))
+        await self.client.execute("SET", self._data_key(key), value, "PX", ttl_ms)
+        self._namespace_stats(namespace).sets += 1
+        return True
+
+    async def _delete_matching(self, match: str) -> int:
+        """Remove every key matching a glob pattern using SCAN and UNLINK."""
+        removed = 0
+        cursor = b"0"
+        while True:
+            cursor, keys = await self.client.execute(
+                "SCAN", cursor, "MATCH", match, "COUNT", self.BATCH_SIZE
+            )
+            if keys:
+                removed += await self.client.execute("UNLINK", *keys)
+            if cursor in (b"0", "0"):
+                return removed
+
+    async def delete_pattern(self, pattern: str) -> int:
+        """Remove entries whose key contains a substring."""
+        escaped = "".join(f"\\{char}" if char in "*?[]\\" else char for char in pattern)
+        return await self._delete_matching(f"{self._data_key('')}*{escaped}*")
+
+    async def clear(self) -> int:
+        """Remove all entries written under the prefix (the version is kept)."""
+        return await self._delete_matching(f"{self._data_key('')}*")
+
+    async def bump_version(self, current: int) -> int:
+        """Increment the shared version."""
+        return await self.client.execute("INCR", self.version_key)
+
+    async def try_lock(self, key: str, ttl_seconds: float) -> bool:
+        """Claim a key across replicas with SET NX."""
+        ttl_ms = max(1, int(ttl_seconds * 1000))
+        reply = await self.client.execute("SET", f"{self.prefix}lock:{key}", b"1", "NX", "PX", ttl_ms)
+        return reply == "OK"
+
+    async def unlock(self, key: str) -> None:
+        """Release a refresh claim."""
+        await self.client.execute("DEL", f"{self.prefix}lock:{key}")
+
+    def record(self, namespace: str, counter: str) -> None:
+        """Increment a namespace counter."""
+        stats = self._namespace_stats(namespace)
+        setattr(stats, counter, getattr(stats, counter) + 1)
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Summarize cache usage of this process.
+
+        Entry counts and sizes live on the server and are not reported.
+        """
+        return {
+            "backend": self.name,
+            "server": f"{self.client.host}:{self.client.port}/{self.client.db}",
+            "prefix": self.prefix,
+            "totals": CacheStats.combine(self._stats.values()).to_dict(),
+            "namespaces": {
+                namespace: stats.to_dict()
+                for namespace, stats in sorted(self._stats.items())
+            },
+        }
+
+    async def close(self) -> None:
+        """Close the server connection."""
+        await self.client.close()
+
+
+async def create_cache_backend(
+    backend: str, url: Optional[str], lru: LRUCache, prefix: str = "nycu:cache:"
+) -> CacheBackend:
+    """
+    Create the configured backend, falling back to memory when unavailable.
+
+    Args:
+        backend: "memory" or "resp"
+        url: Server URL for the "resp" backend
+        lru: Cache used by the memory backend
+        prefix: Key prefix for the "resp" backend
+
+    Returns:
+        CacheBackend: Ready backend
+    """
+    if backend == "resp":
+        if not url:
+            logger.error("CACHE_BACKEND is 'resp' but CACHE_URL is not set; using memory cache")
+            return MemoryBackend(lru)
+        try:
+            resp_backend = RESPBackend(RESPClient.from_url(url), prefix=prefix)
+            await resp_backend.ping()
+            logger.info(f"Using shared cache at {resp_backend.client.host}:{resp_backend.client.port}")
+            return resp_backend
+        except CacheBackendError as e:
+            logger.error(f"Shared cache unavailable ({e}); using memory cache")
+            return MemoryBackend(lru)
+
+    if backend != "memory":
+        logger.warning(f"Unknown CACHE_BACKEND '{backend}'; using memory cache")
+    return MemoryBackend(lru)
@@ -0,0 +1,199 @@
+"""
+Response body compression with a cache of compressed bodies.
+
+Large JSON responses (course lists of several hundred KB) are mostly the
+same from one request to the next, so compressing them on every request
+wastes CPU. ``CompressedBodyCache`` keeps compressed bodies keyed by a hash
+of the body and the encoding, so each distinct body is compressed once per
+encoding. Hashing a body is roughly ten times cheaper than gzip-compressing
+it, and unlike a key such as the ETag it can never return bytes of a
+different body.
+
+Encodings are negotiated from ``Accept-Encoding`` in order of preference:
+``br`` (needs ``brotli``), ``zstd`` (needs ``zstandard``) and ``gzip``.
+Bodies of at least ``COMPRESSION_THREAD_MIN_BYTES`` are compressed in a
+worker thread so the event loop keeps serving other requests.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Any, Optional
+
+from app.config import settings
+from app.utils.snapshots import parse_accept_encoding
+
+try:
+    import brotli
+except ImportError:  # optional, enables Content-Encoding: br
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional, enables Content-Encoding: zstd
+    zstandard = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Compression settings per encoding; bodies are cached, so brotli and zstd
+# use levels that trade some CPU for noticeably smaller responses
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 6
+ZSTD_LEVEL = 10
+
+# Available encodings, in order of preference
+ENCODINGS = tuple(
+    encoding for encoding, available in (
+        ("br", brotli is not None),
+        ("zstd", zstandard is not None),
+        ("gzip", True),
+    )
+    if available
+)
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Pick the preferred encoding the client accepts.
+
+    Args:
+        accept_encoding: Accept-Encoding request header
+
+    Returns:
+        "br", "zstd", "gzip", or None for an uncompressed response
+
+    Example:
+        >>> choose_encoding("gzip, deflate")
+        'gzip'
+    """
+    if not accept_encoding:
+        return None
+    accepted = parse_accept_encoding(accept_encoding)
+    for encoding in ENCODINGS:
+        if encoding in accepted:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str, gzip_level: int = GZIP_LEVEL) -> bytes:
+    """
+    Compress a body.
+
+    Args:
+        body: Uncompressed body
+        encoding: "br", "zstd" or "gzip"
+        gzip_level: Gzip compression level (1-9)
+
+    Returns:
+        bytes: Compressed body
+
+    Raises:
+        ValueError: If the encoding is not available
+    """
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    if encoding == "zstd" and zstandard is not None:
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(body)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+class CompressedBodyCache:
+    """
+    LRU cache of compressed bodies, bounded by total size.
+
+    Attributes:
+        max_bytes: Maximum total size of the cached bodies
+        hits: Lookups answered from the cache
+        misses: Lookups that compressed the body
+    """
+
+    def __init__(self, max_bytes: int, thread_min_bytes: int = 64 * 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Maximum total size of the cached bodies (0 disables caching)
+            thread_min_bytes: Smallest body compressed in a worker thread
+        """
+        self.max_bytes = max_bytes
+        self.thread_min_bytes = thread_min_bytes
+        self.hits = 0
+        self.misses = 0
+        self._bodies: OrderedDict[tuple[str, str], bytes] = OrderedDict()
+        self._bytes = 0
+
+    async def get(self, body: bytes, encoding: str, gzip_level: int = GZIP_LEVEL) -> bytes:
+        """
+        Get a body compressed with an encoding, compressing it on a miss.
+
+        Args:
+            body: Uncompressed body
+            encoding: "br", "zstd" or "gzip"
+            gzip_level: Gzip compression level (1-9)
+
+        Returns:
+            bytes: Compressed body
+        """
+        key = (hashlib.blake2b(body, digest_size=16).hexdigest(), encoding)
+        compressed = self._bodies.get(key)
+        if compressed is not None:
+            self._bodies.move_to_end(key)
+            self.hits += 1
+            return compressed
+
+        self.misses += 1
+        if len(body) >= self.thread_min_bytes:
+            compressed = await asyncio.to_thread(compress, body, encoding, gzip_level)
+        else:
+            compressed = compress(body, encoding, gzip_level)
+        self._store(key, compressed)
+        return compressed
+
+    def _store(self, key: tuple[str, str], compressed: bytes) -> None:
+        """Add a compressed body, evicting the least recently used ones."""
+        if len(compressed) > self.max_bytes:
+            return
+        previous = self._bodies.pop(key, None)
+        if previous is not None:
+            self._bytes -= len(previous)
+        self._bodies[key] = compressed
+        self._bytes += len(compressed)
+        while self._bytes > self.max_bytes:
+            _, evicted = self._bodies.popitem(last=False)
+            self._bytes -= len(evicted)
+
+    def clear(self) -> None:
+        """Remove every cached body."""
+        self._bodies.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Summarize cache usage.
+
+        Returns:
+            Dict with entry count, size, limits and hit/miss counters
+        """
+        return {
+            "entries": len(self._bodies),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "encodings": list(ENCODINGS),
+        }
+
+
+_body_cache = CompressedBodyCache(
+    settings.COMPRESSION_CACHE_MAX_BYTES, settings.COMPRESSION_THREAD_MIN_BYTES
+)
+
+
+def get_compressed_body_cache() -> CompressedBodyCache:
+    """Get the process-wide compressed body cache."""
+    return _body_cache
@@ -159,6 +159,51 @@ class ScheduleNotFound(Exception):
         return self.message
 
 
+class ScheduleConflict(Exception):
+    """
+    Exception raised when a course clashes with courses already in a schedule.
+
+    This exception should be raised when:
+    - A course is added with conflict rejection enabled and shares a time
+      slot with a scheduled course
+
+    Attributes:
+        message: Human-readable error message
+        course_id: ID of the course that could not be added
+        conflicting_course_ids: IDs of the scheduled courses it clashes with
+        slots: Clashing time slots as NYCU time codes (e.g. "M34")
+    """
+
+    def __init__(
+        self,
+        message: str = "Course conflicts with the schedule",
+        course_id: int | None = None,
+        conflicting_course_ids: list[int] | None = None,
+        slots: str = "",
+    ):
+        """
+        Initialize ScheduleConflict exception.
+
+        Args:
+            message: Error message to display
+            course_id: ID of the course that could not be added
+            conflicting_course_ids: IDs of the clashing scheduled courses
+            slots: Clashing time slots as NYCU time codes
+        """
+        self.message = message
+        self.course_id = course_id
+        self.conflicting_course_ids = conflicting_course_ids or []
+        self.slots = slots
+        super().__init__(self.message)
+
+    def __str__(self) -> str:
+        """String representation of the exception."""
+        if self.conflicting_course_ids:
+            ids = ", ".join(str(course_id) for course_id in self.conflicting_course_ids)
+            return f"{self.message}: courses {ids} at {self.slots}"
+        return self.message
+
+
 class DatabaseError(Exception):
     """
     Exception raised when a database operation fails.
@@ -195,3 +240,40 @@ class DatabaseError(Exception):
         if self.original_error:
             return f"{self.message}: {str(self.original_error)}"
         return self.message
+
+
+class CacheBackendError(Exception):
+    """
+    Exception raised when the shared cache backend cannot be used.
+
+    This exception should be raised when:
+    - The cache server cannot be reached or stops responding
+    - The cache server replies with an error
+    - A cache server URL is invalid
+
+    Attributes:
+        message: Human-readable error message
+        original_error: Optional original exception that was caught
+    """
+
+    def __init__(
+        self,
+        message: str = "Cache backend operation failed",
+        original_error: Exception | None = None,
+    ):
+        """
+        Initialize CacheBackendError exception.
+
+        Args:
+            message: Error message to display
+            original_error: Optional original exception that caused this error
+        """
+        self.message = message
+        self.original_error = original_error
+        super().__init__(self.message)
+
+    def __str__(self) -> str:
+        """String representation of the exception."""
+        if self.original_error:
+            return f"{self.message}: {str(self.original_error)}"
+        return self.message
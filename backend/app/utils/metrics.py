@@ -0,0 +1,343 @@
+"""
+Prometheus metrics registry.
+
+A minimal, dependency-free implementation of counters, gauges and
+histograms rendered in the Prometheus text exposition format (served by
+``GET /metrics``). Updating a metric is a dict lookup and an addition, so
+the request middleware (``app.middleware.metrics``) stays in the
+microsecond range.
+
+Values that already live elsewhere, such as the cache counters, are not
+copied on every event: their metric is given a ``collect`` callback that
+reads them when the endpoint is scraped.
+
+Example:
+    >>> HTTP_REQUESTS.labels("GET", "/api/semesters/", "200").inc()
+    >>> "http_requests_total{" in render_metrics()
+    True
+"""
+
+import logging
+from bisect import bisect_left
+from typing import Any, Callable, Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Content type of the text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Histogram bucket upper bounds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# Cache counters exported per namespace (CacheStats field -> "result" label)
+CACHE_RESULTS = {
+    "hits": "hit",
+    "misses": "miss",
+    "stale_hits": "stale_hit",
+    "coalesced": "coalesced",
+}
+
+LabelValues = tuple[str, ...]
+
+_metrics: list["_Metric"] = []
+
+
+class _Value:
+    """Value of one counter or gauge label set."""
+
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Add to the value."""
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        """Subtract from the value."""
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        """Replace the value."""
+        self.value = value
+
+
+class _HistogramValue:
+    """Buckets of one histogram label set (per-bucket, made cumulative on render)."""
+
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Add an observation."""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+
+class _Metric:
+    """
+    A named metric with zero or more labels.
+
+    Attributes:
+        name: Metric name
+        documentation: HELP text
+        labelnames: Label names, in the order label values are given
+    """
+
+    kind = "untyped"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        collect: Optional[Callable[[], dict[LabelValues, float]]] = None,
+    ) -> None:
+        """
+        Create and register the metric.
+
+        Args:
+            name: Metric name
+            documentation: HELP text
+            labelnames: Label names
+            collect: Callback returning the current value of every label set,
+                called on each scrape instead of tracking updates
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._collect = collect
+        self._children: dict[LabelValues, Any] = {}
+        if not labelnames and collect is None:
+            self.labels()  # exported as 0 before the first update
+        _metrics.append(self)
+
+    def _new_child(self) -> Any:
+        return _Value()
+
+    def labels(self, *values: str) -> Any:
+        """
+        Get the value of a label set, creating it on first use.
+
+        Args:
+            *values: Label values, one per label name
+
+        Returns:
+            Child with inc()/dec()/set() (observe() for histograms)
+
+        Raises:
+            ValueError: If the number of values does not match the labels
+        """
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            child = self._children[values] = self._new_child()
+        return child
+
+    def _label_text(self, values: LabelValues, extra: str = "") -> str:
+        pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, values)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def _samples(self) -> Iterator[str]:
+        if self._collect is not None:
+            try:
+                values = self._collect()
+            except Exception as e:
+                logger.warning(f"Collecting {self.name} failed: {e}")
+                return
+            items = list(values.items())
+        else:
+            items = [(labels, child.value) for labels, child in self._children.items()]
+        for labels, value in sorted(items):
+            yield f"{self.name}{self._label_text(labels)} {_format_value(value)}"
+
+    def render(self) -> list[str]:
+        """Render the metric in the text exposition format."""
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+            *self._samples(),
+        ]
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increment the counter of a metric without labels."""
+        self.labels().inc(amount)
+
+
+class Gauge(_Metric):
+    """Value that goes up and down."""
+
+    kind = "gauge"
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increment the gauge of a metric without labels."""
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        """Decrement the gauge of a metric without labels."""
+        self.labels().dec(amount)
+
+    def set(self, value: float) -> None:
+        """Set the gauge of a metric without labels."""
+        self.labels().set(value)
+
+
+class Histogram(_Metric):
+    """Distribution of observations over fixed buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        """
+        Create and register the histogram.
+
+        Args:
+            name: Metric name
+            documentation: HELP text
+            labelnames: Label names
+            buckets: Sorted bucket upper bounds (+Inf is added)
+        """
+        self.buckets = tuple(buckets)
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self) -> _HistogramValue:
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float) -> None:
+        """Observe a value on a metric without labels."""
+        self.labels().observe(value)
+
+    def _samples(self) -> Iterator[str]:
+        bounds = [f'le="{_format_value(bound)}"' for bound in self.buckets] + ['le="+Inf"']
+        for labels, child in sorted(self._children.items()):
+            cumulative = 0
+            for bound, count in zip(bounds, child.counts):
+                cumulative += count
+                yield f"{self.name}_bucket{self._label_text(labels, bound)} {cumulative}"
+            yield f"{self.name}_sum{self._label_text(labels)} {_format_value(child.sum)}"
+            yield f"{self.name}_count{self._label_text(labels)} {cumulative}"
+
+
+def _escape(value: str) -> str:
+    """Escape a label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value (integers without a trailing .0)."""
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+def _cache_counters() -> dict[LabelValues, float]:
+    """Read the per-namespace cache counters."""
+    from app.utils.cache import get_cache_stats
+
+    samples: dict[LabelValues, float] = {}
+    for namespace, counters in get_cache_stats().get("namespaces", {}).items():
+        for field_name, result in CACHE_RESULTS.items():
+            samples[(namespace, result)] = counters.get(field_name, 0)
+    return samples
+
+
+def _compression_counters() -> dict[LabelValues, float]:
+    """Read the compressed body cache counters."""
+    from app.utils.compression import get_compressed_body_cache
+
+    stats = get_compressed_body_cache().stats()
+    return {("hit",): stats["hits"], ("miss",): stats["misses"]}
+
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests handled", ("method", "route", "status")
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ("method", "route"), LATENCY_BUCKETS
+)
+HTTP_RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes", "HTTP response body size", ("method", "route"), SIZE_BUCKETS
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "HTTP requests being handled"
+)
+CACHE_REQUESTS = Counter(
+    "cache_requests_total", "Cached function lookups by result", ("function", "result"),
+    collect=_cache_counters,
+)
+COMPRESSION_CACHE_REQUESTS = Counter(
+    "compression_cache_requests_total", "Compressed response body lookups by result", ("result",),
+    collect=_compression_counters,
+)
+DB_POOL_CHECKOUTS = Counter(
+    "db_pool_checkouts_total", "Database connections checked out of the pool"
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_connections_checked_out", "Database connections currently checked out"
+)
+RATE_LIMIT_REJECTIONS = Counter(
+    "rate_limit_rejections_total", "Requests rejected by the rate limiter"
+)
+
+
+def render_metrics() -> str:
+    """
+    Render every registered metric.
+
+    Returns:
+        str: Text exposition format body
+    """
+    lines: list[str] = []
+    for metric in _metrics:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+    """Count a pool checkout."""
+    DB_POOL_CHECKOUTS.inc()
+    DB_POOL_CHECKED_OUT.inc()
+
+
+def _on_checkin(dbapi_connection, connection_record) -> None:
+    """Count a connection returned to the pool."""
+    DB_POOL_CHECKED_OUT.dec()
+
+
+def instrument_pool(engine: AsyncEngine | Engine) -> None:
+    """
+    Track the connection pool of an engine in the pool metrics (idempotent).
+
+    Args:
+        engine: Async or sync SQLAlchemy engine
+    """
+    sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+    if not event.contains(sync_engine, "checkout", _on_checkout):
+        event.listen(sync_engine, "checkout", _on_checkout)
+        event.listen(sync_engine, "checkin", _on_checkin)
@@ -0,0 +1,122 @@
+"""
+Keyset (cursor) pagination helpers.
+
+A cursor is an opaque, URL-safe token holding the sort order it was issued
+for together with the sort value and id of the last row of a page. The next
+page seeks past that row with an indexed ``(sort_col, id) > (value, id)``
+predicate instead of skipping ``OFFSET`` rows, so deep pages cost the same as
+the first one.
+
+NULL handling follows SQLite ordering: NULLs sort first in ascending order
+and last in descending order.
+"""
+
+import base64
+import binascii
+from typing import Any, Optional
+
+import orjson
+from sqlalchemy import and_, or_, tuple_
+
+from app.utils.exceptions import InvalidQueryParameter
+
+
+def encode_cursor(sort_key: str, value: Any, row_id: int) -> str:
+    """
+    Encode the position after a row as an opaque cursor.
+
+    Args:
+        sort_key: Identifier of the sort order (e.g. "by_name:asc")
+        value: Sort column value of the last row (None for id order)
+        row_id: Id of the last row
+
+    Returns:
+        str: URL-safe cursor token
+    """
+    payload = orjson.dumps([sort_key, value, row_id])
+    return base64.urlsafe_b64encode(payload).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str, sort_key: str) -> tuple[Any, int]:
+    """
+    Decode a cursor issued for the given sort order.
+
+    Args:
+        cursor: Cursor token from a previous response
+        sort_key: Identifier of the current sort order
+
+    Returns:
+        Tuple of (sort value, row id)
+
+    Raises:
+        InvalidQueryParameter: If the cursor is malformed or was issued for
+            a different sort order
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        issued_for, value, row_id = orjson.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, orjson.JSONDecodeError, ValueError, TypeError):
+        raise InvalidQueryParameter(
+            message="Malformed pagination cursor",
+            parameter_name="cursor",
+            parameter_value=cursor,
+        )
+
+    if issued_for != sort_key or not isinstance(row_id, int):
+        raise InvalidQueryParameter(
+            message="Pagination cursor does not match the requested sort order",
+            parameter_name="cursor",
+            parameter_value=cursor,
+        )
+    if value is not None and not isinstance(value, (str, int, float)):
+        raise InvalidQueryParameter(
+            message="Malformed pagination cursor",
+            parameter_name="cursor",
+            parameter_value=cursor,
+        )
+
+    return value, row_id
+
+
+def keyset_predicate(
+    sort_col: Optional[Any],
+    id_col: Any,
+    after: tuple[Any, int],
+    descending: bool = False,
+    nullable: bool = False,
+):
+    """
+    Build the WHERE clause selecting rows after a cursor position.
+
+    Args:
+        sort_col: Sort column, or None when ordering by id only
+        id_col: Unique id column used as tiebreaker
+        after: Tuple of (sort value, id) of the last row already returned
+        descending: Whether the order is descending
+        nullable: Whether the sort column may contain NULLs
+
+    Returns:
+        SQLAlchemy boolean clause
+    """
+    value, row_id = after
+
+    if sort_col is None:
+        return id_col < row_id if descending else id_col > row_id
+
+    if not nullable:
+        if descending:
+            return tuple_(sort_col, id_col) < tuple_(value, row_id)
+        return tuple_(sort_col, id_col) > tuple_(value, row_id)
+
+    if value is None:
+        null_tail = and_(sort_col.is_(None), id_col < row_id if descending else id_col > row_id)
+        # Ascending: NULLs come first, so every non-NULL row is still ahead
+        return null_tail if descending else or_(null_tail, sort_col.is_not(None))
+
+    if descending:
+        return or_(
+            sort_col < value,
+            and_(sort_col == value, id_col < row_id),
+            sort_col.is_(None),
+        )
+    return or_(sort_col > value, and_(sort_col == value, id_col > row_id))
@@ -0,0 +1,417 @@
+"""
+Request rate limiting.
+
+Limits are enforced with a sliding window counter: each client has a count
+for the current fixed window and one for the previous window, and the
+previous count is weighted by how much of it still overlaps the sliding
+window. This approximates a true sliding log with two numbers per client.
+
+Requests carry a cost (see ``route_cost``) so that expensive endpoints use
+up the budget faster than cheap ones.
+
+Two stores are available:
+
+- ``MemoryRateLimiter``: per-process state in ``__slots__`` objects, kept in
+  LRU order so idle clients are evicted and the number of tracked clients
+  is bounded (a crawler rotating IPs cannot grow it without limit)
+- ``RESPRateLimiter``: counters on a Redis-compatible server, shared by
+  every worker and replica so the configured limit holds globally; if the
+  server is unreachable it falls back to a local limiter
+
+The limiter selected by ``RATE_LIMIT_BACKEND`` is set up at startup with
+``configure_rate_limiter``; the middleware reads it with
+``get_rate_limiter``.
+"""
+
+import logging
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from app.config import settings
+from app.utils.exceptions import CacheBackendError
+from app.utils.resp import RESPClient, RESPReplyError
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Idle clients examined for eviction per request
+EVICTION_BATCH = 8
+
+
+@dataclass
+class RateLimitResult:
+    """
+    Outcome of a rate limit check.
+
+    Attributes:
+        allowed: Whether the request may proceed
+        limit: Budget per window
+        remaining: Budget left in the sliding window after this request
+        reset_after: Seconds until the current fixed window ends
+        retry_after: Seconds until a rejected request would be allowed (0 if allowed)
+    """
+
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: float
+    retry_after: float = 0.0
+
+
+def _sliding_count(previous: float, current: float, elapsed_fraction: float) -> float:
+    """Weighted request count of the sliding window."""
+    return previous * (1.0 - elapsed_fraction) + current
+
+
+def _retry_after(
+    previous: float, current: float, cost: float, limit: int, elapsed_fraction: float, window: float
+) -> float:
+    """
+    Seconds until a request of the given cost fits in the sliding window.
+
+    Args:
+        previous: Count of the previous fixed window
+        current: Count of the current fixed window
+        cost: Cost of the rejected request
+        limit: Budget per window
+        elapsed_fraction: Part of the current window already elapsed (0-1)
+        window: Window length in seconds
+
+    Returns:
+        float: Wait in seconds
+    """
+    if current + cost > limit:
+        # Only after this window ends does the current count start to decay
+        needed = 1.0 - (limit - cost) / current if current else 0.0
+        return (1.0 - elapsed_fraction + min(max(needed, 0.0), 1.0)) * window
+    needed = 1.0 - (limit - current - cost) / previous
+    return max(needed - elapsed_fraction, 0.0) * window
+
+
+def _check(
+    previous: float, current: float, cost: float, limit: int, elapsed_fraction: float, window: float
+) -> RateLimitResult:
+    """Decide a request from the window counts (current excludes this request)."""
+    reset_after = (1.0 - elapsed_fraction) * window
+    count = _sliding_count(previous, current, elapsed_fraction)
+    if count + cost <= limit:
+        return RateLimitResult(True, limit, int(limit - count - cost), reset_after)
+    return RateLimitResult(
+        False, limit, 0, reset_after,
+        _retry_after(previous, current, cost, limit, elapsed_fraction, window),
+    )
+
+
+class RateLimiter(ABC):
+    """
+    Interface of a rate limit store.
+
+    Attributes:
+        limit: Budget (total request cost) per client per window
+        window_seconds: Window length in seconds
+    """
+
+    name = "base"
+
+    def __init__(self, limit: int, window_seconds: float):
+        """
+        Initialize the limiter.
+
+        Args:
+            limit: Budget per client per window
+            window_seconds: Window length in seconds
+        """
+        self.limit = limit
+        self.window_seconds = window_seconds
+
+    @abstractmethod
+    async def hit(self, key: str, cost: int = 1) -> RateLimitResult:
+        """
+        Count a request and decide whether it is allowed.
+
+        Rejected requests do not use up budget.
+
+        Args:
+            key: Client key (IP address)
+            cost: Request cost
+
+        Returns:
+            RateLimitResult: Decision and header values
+        """
+
+    async def close(self) -> None:
+        """Release connections held by the limiter."""
+
+
+class _ClientWindow:
+    """Window counts of one client."""
+
+    __slots__ = ("window", "previous", "current")
+
+    def __init__(self, window: int):
+        self.window = window
+        self.previous = 0
+        self.current = 0
+
+
+class MemoryRateLimiter(RateLimiter):
+    """
+    Process-local sliding window limiter.
+
+    Clients are kept in LRU order. Each request evicts a few clients from
+    the cold end whose windows have expired (their state equals that of an
+    unknown client), and the least recently seen are dropped beyond
+    ``max_keys``.
+
+    Example:
+        >>> limiter = MemoryRateLimiter(limit=2, window_seconds=10)
+        >>> [(await limiter.hit("1.2.3.4")).allowed for _ in range(3)]
+        [True, True, False]
+    """
+
+    name = "memory"
+
+    def __init__(self, limit: int, window_seconds: float, max_keys: int = 100_000):
+        """
+        Initialize the limiter.
+
+        Args:
+            limit: Budget per client per window
+            window_seconds: Window length in seconds
+            max_keys: Maximum number of clients tracked
+        """
+        super().__init__(limit, window_seconds)
+        self.max_keys = max_keys
+        self._clients: OrderedDict[str, _ClientWindow] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Number of clients tracked."""
+        return len(self._clients)
+
+    def check(self, key: str, cost: int = 1, now: Optional[float] = None) -> RateLimitResult:
+        """
+        Synchronous ``hit``.
+
+        Args:
+            key: Client key
+            cost: Request cost
+            now: Current time (defaults to time.time())
+
+        Returns:
+            RateLimitResult: Decision and header values
+        """
+        now = time.time() if now is None else now
+        window, offset = divmod(now, self.window_seconds)
+        window = int(window)
+
+        state = self._clients.get(key)
+        if state is None:
+            state = self._clients[key] = _ClientWindow(window)
+        else:
+            self._clients.move_to_end(key)
+            if state.window != window:
+                state.previous = state.current if state.window == window - 1 else 0
+                state.current = 0
+                state.window = window
+
+        result = _check(
+            state.previous, state.current, cost, self.limit, offset / self.window_seconds, self.window_seconds
+        )
+        if result.allowed:
+            state.current += cost
+
+        self._evict(window)
+        return result
+
+    async def hit(self, key: str, cost: int = 1) -> RateLimitResult:
+        """Count a request and decide whether it is allowed."""
+        return self.check(key, cost)
+
+    def _evict(self, window: int) -> None:
+        """Drop idle clients and keep the number of clients within max_keys."""
+        clients = self._clients
+        for _ in range(EVICTION_BATCH):
+            if not clients:
+                break
+            oldest = next(iter(clients.values()))
+            if oldest.window >= window - 1:
+                break
+            clients.popitem(last=False)
+        while len(clients) > self.max_keys:
+            clients.popitem(last=False)
+
+
+class RESPRateLimiter(RateLimiter):
+    """
+    Sliding window limiter on a Redis-compatible server.
+
+    Each client has one counter key per fixed window
+    (``<prefix><client>:<window>``) that the server expires after two
+    windows. A check is one pipelined round trip (``INCRBY`` the current
+    counter, ``EXPIRE`` it, ``GET`` the previous one); a rejected request
+    gives its cost back with ``DECRBY``. While the server is unreachable,
+    requests are checked by a local ``MemoryRateLimiter`` instead.
+    """
+
+    name = "resp"
+
+    def __init__(
+        self,
+        client: RESPClient,
+        limit: int,
+        window_seconds: float,
+        prefix: str = "nycu:ratelimit:",
+        fallback: Optional[MemoryRateLimiter] = None,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            client: Server client
+            limit: Budget per client per window
+            window_seconds: Window length in seconds
+            prefix: Key prefix
+            fallback: Local limiter used while the server is unreachable
+        """
+        super().__init__(limit, window_seconds)
+        self.client = client
+        self.prefix = prefix
+        self.fallback = MemoryRateLimiter(limit, window_seconds) if fallback is None else fallback
+
+    async def hit(self, key: str, cost: int = 1) -> RateLimitResult:
+        """Count a request and decide whether it is allowed."""
+        now = time.time()
+        window, offset = divmod(now, self.window_seconds)
+        window = int(window)
+        current_key = f"{self.prefix}{key}:{window}"
+        ttl = max(int(math.ceil(self.window_seconds * 2)), 1)
+
+        try:
+            current, _, previous = await self.client.pipeline([
+                ("INCRBY", current_key, cost),
+                ("EXPIRE", current_key, ttl),
+                ("GET", f"{self.prefix}{key}:{window - 1}"),
+            ])
+            if isinstance(current, RESPReplyError):
+                raise current
+            previous = int(previous) if previous is not None and not isinstance(previous, RESPReplyError) else 0
+
+            result = _check(
+                previous, current - cost, cost, self.limit, offset / self.window_seconds, self.window_seconds
+            )
+            if not result.allowed:
+                await self.client.execute("DECRBY", current_key, cost)
+            return result
+        except CacheBackendError as e:
+            logger.warning(f"Shared rate limiter unavailable ({e}); limiting locally")
+            return self.fallback.check(key, cost, now)
+
+    async def close(self) -> None:
+        """Close the server connection."""
+        await self.client.close()
+
+
+async def create_rate_limiter(
+    backend: str,
+    url: Optional[str],
+    limit: int,
+    window_seconds: float,
+    max_keys: int = 100_000,
+    prefix: str = "nycu:ratelimit:",
+) -> RateLimiter:
+    """
+    Create the configured limiter, falling back to memory when unavailable.
+
+    Args:
+        backend: "memory" or "resp"
+        url: Server URL for the "resp" backend
+        limit: Budget per client per window
+        window_seconds: Window length in seconds
+        max_keys: Maximum number of clients tracked in memory
+        prefix: Key prefix for the "resp" backend
+
+    Returns:
+        RateLimiter: Ready limiter
+    """
+    memory = MemoryRateLimiter(limit, window_seconds, max_keys)
+    if backend == "resp":
+        if not url:
+            logger.error("RATE_LIMIT_BACKEND is 'resp' but no server URL is set; limiting per process")
+            return memory
+        limiter = RESPRateLimiter(RESPClient.from_url(url), limit, window_seconds, prefix, fallback=memory)
+        try:
+            await limiter.client.execute("PING")
+            logger.info(f"Using shared rate limiter at {limiter.client.host}:{limiter.client.port}")
+            return limiter
+        except CacheBackendError as e:
+            logger.error(f"Shared rate limiter unavailable ({e}); limiting per process")
+            await limiter.close()
+            return memory
+
+    if backend != "memory":
+        logger.warning(f"Unknown RATE_LIMIT_BACKEND '{backend}'; limiting per process")
+    return memory
+
+
+def route_cost(path: str, costs: Optional[dict[str, int]] = None) -> int:
+    """
+    Get the cost of a request path (longest matching prefix, default 1).
+
+    Args:
+        path: Request path
+        costs: Cost per path prefix (defaults to RATE_LIMIT_ROUTE_COSTS)
+
+    Returns:
+        int: Request cost
+
+    Example:
+        >>> route_cost("/api/courses/search", {"/api/courses/search": 3})
+        3
+    """
+    costs = settings.RATE_LIMIT_ROUTE_COSTS if costs is None else costs
+    best_length, cost = -1, 1
+    for prefix, prefix_cost in costs.items():
+        if len(prefix) > best_length and path.startswith(prefix):
+            best_length, cost = len(prefix), prefix_cost
+    return cost
+
+
+_limiter: RateLimiter = MemoryRateLimiter(
+    settings.RATE_LIMIT_REQUESTS, settings.RATE_LIMIT_WINDOW_SECONDS, settings.RATE_LIMIT_MAX_CLIENTS
+)
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Get the process-wide rate limiter."""
+    return _limiter
+
+
+async def configure_rate_limiter() -> RateLimiter:
+    """
+    Set up the limiter selected by RATE_LIMIT_BACKEND.
+
+    Returns:
+        RateLimiter: Limiter now in use
+    """
+    global _limiter
+    _limiter = await create_rate_limiter(
+        settings.RATE_LIMIT_BACKEND,
+        settings.RATE_LIMIT_URL or settings.CACHE_URL,
+        settings.RATE_LIMIT_REQUESTS,
+        settings.RATE_LIMIT_WINDOW_SECONDS,
+        settings.RATE_LIMIT_MAX_CLIENTS,
+    )
+    return _limiter
+
+
+async def close_rate_limiter() -> None:
+    """Close the current limiter and return to a per-process one."""
+    global _limiter
+    limiter, _limiter = _limiter, MemoryRateLimiter(
+        settings.RATE_LIMIT_REQUESTS, settings.RATE_LIMIT_WINDOW_SECONDS, settings.RATE_LIMIT_MAX_CLIENTS
+    )
+    await limiter.close()
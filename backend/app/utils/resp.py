@@ -0,0 +1,318 @@
+"""
+Minimal asyncio client for the Redis serialization protocol (RESP2).
+
+Implements only what the shared cache backend needs: commands, pipelines,
+``AUTH``/``SELECT`` on connect and reconnection after failures. It speaks to
+any RESP-compatible server (Redis, Valkey, KeyDB, Dragonfly) without an
+extra dependency.
+
+Commands issued concurrently share one connection and are pipelined: each
+request is written immediately and replies are matched to callers in order
+by a background reader task, so callers never wait for each other's round
+trips.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Optional, Sequence, Union
+from urllib.parse import unquote, urlparse
+
+from app.utils.exceptions import CacheBackendError
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Value types accepted as command arguments
+Arg = Union[bytes, str, int, float]
+
+
+class RESPReplyError(CacheBackendError):
+    """Error reply (``-ERR ...``) returned by the server for one command."""
+
+
+def encode_command(args: Sequence[Arg]) -> bytes:
+    """
+    Encode a command as a RESP array of bulk strings.
+
+    Args:
+        args: Command name followed by its arguments
+
+    Returns:
+        bytes: Wire representation of the command
+
+    Example:
+        >>> encode_command(["GET", "key"])
+        b'*2\\r\\n$3\\r\\nGET\\r\\n$3\\r\\nkey\\r\\n'
+    """
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if isinstance(arg, str):
+            arg = arg.encode("utf-8")
+        elif isinstance(arg, (int, float)):
+            arg = repr(arg).encode("ascii")
+        parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(parts)
+
+
+async def read_reply(reader: asyncio.StreamReader) -> Any:
+    """
+    Read one reply from the stream.
+
+    Error replies are returned (not raised) as ``RESPReplyError`` so that
+    one failed command does not break the replies of a pipeline.
+
+    Args:
+        reader: Stream connected to the server
+
+    Returns:
+        str, int, bytes, None, list or RESPReplyError
+
+    Raises:
+        ConnectionError: If the server closed the connection
+        ValueError: If the reply is not valid RESP
+    """
+    line = await reader.readline()
+    if not line.endswith(b"\r\n"):
+        raise ConnectionError("Connection closed by cache server")
+
+    prefix, body = line[:1], line[1:-2]
+    if prefix == b"+":
+        return body.decode("utf-8")
+    if prefix == b"-":
+        return RESPReplyError(body.decode("utf-8", errors="replace"))
+    if prefix == b":":
+        return int(body)
+    if prefix == b"$":
+        length = int(body)
+        if length < 0:
+            return None
+        return (await reader.readexactly(length + 2))[:-2]
+    if prefix == b"*":
+        length = int(body)
+        if length < 0:
+            return None
+        return [await read_reply(reader) for _ in range(length)]
+    raise ValueError(f"Unexpected RESP reply prefix {prefix!r}")
+
+
+class RESPClient:
+    """
+    Pipelining client for a single RESP server connection.
+
+    The connection is opened lazily and re-opened on the next command after
+    any failure.
+
+    Example:
+        >>> client = RESPClient.from_url("redis://:secret@localhost:6379/0")
+        >>> await client.execute("SET", "key", b"value", "PX", 60000)
+        'OK'
+        >>> await client.pipeline([("GET", "key"), ("INCR", "counter")])
+        [b'value', 1]
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 6379,
+        db: int = 0,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        timeout: float = 1.0,
+    ):
+        """
+        Initialize a client (no connection is made yet).
+
+        Args:
+            host: Server host name
+            port: Server port
+            db: Database number selected after connecting
+            username: ACL user name (Redis 6+)
+            password: Password sent with AUTH
+            timeout: Seconds to wait for a connection or reply
+        """
+        self.host = host
+        self.port = port
+        self.db = db
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._pending: deque[asyncio.Future] = deque()
+        self._connect_lock = asyncio.Lock()
+
+    @classmethod
+    def from_url(cls, url: str, timeout: float = 1.0) -> "RESPClient":
+        """
+        Create a client from a ``redis://[user:password@]host[:port][/db]`` URL.
+
+        Args:
+            url: Server URL
+            timeout: Seconds to wait for a connection or reply
+
+        Returns:
+            RESPClient: Unconnected client
+
+        Raises:
+            CacheBackendError: If the URL scheme or database number is invalid
+        """
+        parsed = urlparse(url)
+        if parsed.scheme != "redis":
+            raise CacheBackendError(f"Unsupported cache URL scheme '{parsed.scheme}'")
+
+        path = parsed.path.lstrip("/")
+        try:
+            db = int(path) if path else 0
+        except ValueError:
+            raise CacheBackendError(f"Invalid cache database number '{path}'")
+
+        return cls(
+            host=parsed.hostname or "localhost",
+            port=parsed.port or 6379,
+            db=db,
+            username=unquote(parsed.username) if parsed.username else None,
+            password=unquote(parsed.password) if parsed.password else None,
+            timeout=timeout,
+        )
+
+    @property
+    def connected(self) -> bool:
+        """Whether a connection is currently open."""
+        return self._writer is not None and not self._writer.is_closing()
+
+    async def _connect(self) -> None:
+        """Open the connection, authenticate and select the database."""
+        async with self._connect_lock:
+            if self.connected:
+                return
+            try:
+                reader, writer = await asyncio.wait_for(
+                    asyncio.open_connection(self.host, self.port), self.timeout
+                )
+                setup = []
+                if self.password is not None:
+                    auth = ["AUTH", self.username, self.password] if self.username else ["AUTH", self.password]
+                    setup.append(auth)
+                if self.db:
+                    setup.append(["SELECT", self.db])
+                if setup:
+                    writer.write(b"".join(encode_command(command) for command in setup))
+                    await writer.drain()
+                    for _ in setup:
+                        reply = await asyncio.wait_for(read_reply(reader), self.timeout)
+                        if isinstance(reply, RESPReplyError):
+                            writer.close()
+                            raise reply
+            except (OSError, asyncio.TimeoutError, ValueError) as e:
+                raise CacheBackendError(
+                    f"Cannot connect to cache server {self.host}:{self.port}", e
+                )
+
+            self._reader, self._writer = reader, writer
+            self._reader_task = asyncio.get_running_loop().create_task(self._read_loop(reader))
+            logger.info(f"Connected to cache server {self.host}:{self.port}/{self.db}")
+
+    async def _read_loop(self, reader: asyncio.StreamReader) -> None:
+        """Resolve pending commands with replies in the order they arrive."""
+        try:
+            while True:
+                reply = await read_reply(reader)
+                future = self._pending.popleft()
+                if not future.done():
+                    future.set_result(reply)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._disconnect(CacheBackendError("Lost connection to cache server", e))
+
+    def _disconnect(self, error: Exception) -> None:
+        """Close the connection and fail every command still waiting for a reply."""
+        if self._writer is not None:
+            self._writer.close()
+        if self._reader_task is not None and self._reader_task is not asyncio.current_task():
+            self._reader_task.cancel()
+        self._reader = self._writer = self._reader_task = None
+
+        while self._pending:
+            future = self._pending.popleft()
+            if not future.done():
+                future.set_exception(error)
+                future.exception()  # may have no waiter left; avoid "never retrieved" warnings
+
+    async def _send(self, commands: Sequence[Sequence[Arg]]) -> list[Any]:
+        """Write commands in one batch and wait for all their replies."""
+        if not self.connected:
+            await self._connect()
+
+        loop = asyncio.get_running_loop()
+        futures = [loop.create_future() for _ in commands]
+        # Queue and write without yielding so replies stay in command order
+        self._pending.extend(futures)
+        self._writer.write(b"".join(encode_command(command) for command in commands))
+
+        try:
+            await asyncio.wait_for(self._writer.drain(), self.timeout)
+            return await asyncio.wait_for(asyncio.gather(*futures), self.timeout)
+        except asyncio.TimeoutError as e:
+            # Replies may still arrive later and would be matched to the wrong
+            # commands, so the connection cannot be reused
+            error = CacheBackendError(f"Cache server {self.host}:{self.port} timed out", e)
+            self._disconnect(error)
+            raise error
+        except (OSError, RuntimeError) as e:
+            error = CacheBackendError("Lost connection to cache server", e)
+            self._disconnect(error)
+            raise error
+
+    async def execute(self, *args: Arg) -> Any:
+        """
+        Run one command.
+
+        Args:
+            *args: Command name followed by its arguments
+
+        Returns:
+            Decoded reply (str, int, bytes, None or list)
+
+        Raises:
+            CacheBackendError: If the server is unreachable or replies with an error
+        """
+        (reply,) = await self._send([args])
+        if isinstance(reply, RESPReplyError):
+            raise reply
+        return reply
+
+    async def pipeline(self, commands: Sequence[Sequence[Arg]]) -> list[Any]:
+        """
+        Run several commands in one round trip.
+
+        Args:
+            commands: Commands, each a sequence of name and arguments
+
+        Returns:
+            List of replies in command order; failed commands are returned
+            as ``RESPReplyError`` instances instead of being raised
+
+        Raises:
+            CacheBackendError: If the server is unreachable
+        """
+        if not commands:
+            return []
+        return await self._send(commands)
+
+    async def close(self) -> None:
+        """Close the connection (a later command reconnects)."""
+        writer, task = self._writer, self._reader_task
+        self._disconnect(CacheBackendError("Cache client closed"))
+        if task is not None:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        if writer is not None:
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
@@ -0,0 +1,403 @@
+"""
+Precomputed per-semester course list snapshots.
+
+Semester course lists only change when the import scripts run, so the full
+list of every semester is rendered once, at import time, into static files:
+
+- ``<acy>-<sem>.<hash>.json``: the same JSON array as
+  ``GET /api/courses/?acy=<acy>&sem=<sem>`` with no limit
+- ``.json.gz`` (gzip level 9) and, with ``brotli`` installed, ``.json.br``
+  (quality 11) variants of it
+- ``manifest.json``: per semester, the content hash (used as ETag), course
+  count and file names, the data version file marker at build time (see
+  ``app.utils.cache.get_data_marker``), and a ``stale`` flag set when data
+  changes after the build
+
+File names include the content hash, so a rebuild never changes a file a
+running server may be sending; files of the previous build are kept until
+the next one. ``SnapshotStore`` reloads the manifest when it changes and
+hands the route everything needed to answer with a 304 or a file response
+without touching the database. Snapshots are only served while the data
+version file still has the marker recorded at build time, so any data
+change that is published (by the services or by an import script) makes
+every process fall back to the database until the next build. Writes
+through the services also mark the manifest stale.
+
+Usage:
+    python scripts/build_snapshots.py
+"""
+
+import asyncio
+import gzip
+import hashlib
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+import orjson
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.utils.cache import get_data_marker
+
+try:
+    import brotli
+except ImportError:  # optional, enables the .br variant
+    brotli = None
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Name of the manifest file in the snapshot directory
+MANIFEST_FILE = "manifest.json"
+
+# Content-Encoding -> file suffix, in order of preference
+ENCODING_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+
+@dataclass(frozen=True)
+class SemesterSnapshot:
+    """
+    Snapshot files of one semester.
+
+    Attributes:
+        acy: Academic year
+        sem: Semester number
+        content_hash: Hash of the uncompressed JSON body
+        courses: Number of courses in the snapshot
+        files: Content-Encoding ("identity", "gzip", "br") -> file path
+    """
+
+    acy: int
+    sem: int
+    content_hash: str
+    courses: int
+    files: dict[str, Path] = field(default_factory=dict)
+
+    def etag(self, encoding: str) -> str:
+        """
+        Get the strong ETag of one encoded representation.
+
+        Args:
+            encoding: Content-Encoding of the representation
+
+        Returns:
+            str: Quoted ETag value
+        """
+        if encoding == "identity":
+            return f'"{self.content_hash}"'
+        return f'"{self.content_hash}-{encoding}"'
+
+    def choose_encoding(self, accept_encoding: Optional[str]) -> str:
+        """
+        Pick the smallest representation the client accepts.
+
+        Args:
+            accept_encoding: Accept-Encoding request header
+
+        Returns:
+            str: "br", "gzip" or "identity"
+        """
+        accepted = parse_accept_encoding(accept_encoding)
+        for encoding in ENCODING_SUFFIXES:
+            if encoding in self.files and encoding in accepted:
+                return encoding
+        return "identity"
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """
+        Check an If-None-Match header against this snapshot.
+
+        Every encoding of the same content matches, so a client that switched
+        Accept-Encoding still gets a 304 (weak comparison, RFC 9110 13.1.2).
+
+        Args:
+            if_none_match: If-None-Match request header
+
+        Returns:
+            bool: True if the client's copy is current
+        """
+        if not if_none_match:
+            return False
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag == "*":
+                return True
+            tag = tag.removeprefix("W/").strip('"')
+            if tag.split("-", 1)[0] == self.content_hash:
+                return True
+        return False
+
+
+def parse_accept_encoding(header: Optional[str]) -> set[str]:
+    """
+    Get the content codings an Accept-Encoding header allows.
+
+    Args:
+        header: Accept-Encoding header value
+
+    Returns:
+        set[str]: Lower-case codings with a non-zero quality
+    """
+    accepted = set()
+    for part in (header or "").split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = params.strip().lower()
+        if quality.startswith("q=") and quality[2:].strip() in ("0", "0.0", "0.00", "0.000"):
+            continue
+        accepted.add(coding)
+    if "*" in accepted:
+        accepted.update(ENCODING_SUFFIXES)
+    return accepted
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Write a file under a temporary name and rename it into place."""
+    temp_path = path.with_name(f".{path.name}.tmp")
+    temp_path.write_bytes(data)
+    os.replace(temp_path, path)
+
+
+def _encode_variants(body: bytes) -> dict[str, bytes]:
+    """Compress a snapshot body with every available encoding."""
+    variants = {"identity": body, "gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants["br"] = brotli.compress(body, quality=11)
+    return variants
+
+
+async def build_snapshots(session: AsyncSession, directory: Optional[Path] = None) -> dict[str, Any]:
+    """
+    Render every semester's course list into snapshot files.
+
+    Semesters whose content hash is unchanged keep their existing files.
+    Files referenced by neither the new nor the previous manifest are
+    removed.
+
+    Args:
+        session: Database session
+        directory: Output directory (default: ``settings.SNAPSHOT_DIR``)
+
+    Returns:
+        Dict with the new manifest's semesters and the build time
+
+    Raises:
+        DatabaseError: If reading courses fails
+
+    Example:
+        >>> manifest = await build_snapshots(session)
+        >>> manifest["semesters"]["113-1"]["courses"]
+        8123
+    """
+    from app.database import semester as semester_db
+    from app.services.export_service import ExportService
+
+    start = time.perf_counter()
+    # Read first: a change published during the build leaves it outdated
+    data_marker = get_data_marker()
+    directory = Path(directory or settings.SNAPSHOT_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    manifest_path = directory / MANIFEST_FILE
+    previous = {}
+    if manifest_path.exists():
+        previous = orjson.loads(manifest_path.read_bytes()).get("semesters", {})
+
+    # Read semesters directly: the import that triggers a build bypasses the cache
+    semesters = await semester_db.get_all_semesters(session)
+    semester_map = {semester.id: (semester.acy, semester.sem) for semester in semesters}
+    service = ExportService(session)
+
+    entries: dict[str, Any] = {}
+    for semester in semesters:
+        key = f"{semester.acy}-{semester.sem}"
+        rows = await service.list_courses(
+            acy=semester.acy, sem=semester.sem, semester_map=semester_map
+        )
+        body = orjson.dumps(rows)
+        content_hash = hashlib.sha256(body).hexdigest()[:32]
+
+        old = previous.get(key)
+        if (
+            old
+            and old["hash"] == content_hash
+            and all((directory / name).exists() for name in old["files"].values())
+            and (brotli is None or "br" in old["files"])
+        ):
+            entries[key] = old
+            continue
+
+        variants = await asyncio.to_thread(_encode_variants, body)
+        files, sizes = {}, {}
+        for encoding, data in variants.items():
+            name = f"{key}.{content_hash}.json{ENCODING_SUFFIXES.get(encoding, '')}"
+            await asyncio.to_thread(_write_atomic, directory / name, data)
+            files[encoding] = name
+            sizes[encoding] = len(data)
+        entries[key] = {
+            "acy": semester.acy,
+            "sem": semester.sem,
+            "hash": content_hash,
+            "courses": len(rows),
+            "files": files,
+            "sizes": sizes,
+        }
+        logger.info(
+            f"Snapshot {key}: {len(rows)} courses, "
+            + ", ".join(f"{encoding} {size} bytes" for encoding, size in sizes.items())
+        )
+
+    manifest = {"built_at": int(time.time()), "data_marker": data_marker, "semesters": entries}
+    _write_atomic(manifest_path, orjson.dumps(manifest, option=orjson.OPT_INDENT_2))
+
+    # Keep the previous build's files for requests that are still sending them
+    keep = {MANIFEST_FILE}
+    for entry in list(previous.values()) + list(entries.values()):
+        keep.update(entry["files"].values())
+    for path in directory.glob("*.json*"):
+        if path.name not in keep:
+            path.unlink(missing_ok=True)
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    logger.info(f"Built snapshots for {len(entries)} semesters in {directory} ({elapsed_ms:.0f}ms)")
+    return manifest
+
+
+class SnapshotStore:
+    """
+    Read side of the snapshot directory.
+
+    The manifest is re-read whenever it is replaced, so a rebuild (by the
+    import script or the admin endpoint) or an invalidation is picked up by
+    every running process without a restart.
+
+    Example:
+        >>> store = SnapshotStore(Path("snapshots"))
+        >>> snapshot = store.get(113, 1)
+        >>> snapshot.files["gzip"]
+        PosixPath('snapshots/113-1.3f2a....json.gz')
+    """
+
+    def __init__(self, directory: Path):
+        """
+        Initialize a store (the manifest is read on first use).
+
+        Args:
+            directory: Snapshot directory
+        """
+        self.directory = Path(directory)
+        self._manifest_marker: Optional[tuple[int, int]] = None
+        self._snapshots: dict[tuple[int, int], SemesterSnapshot] = {}
+        self._stale = False
+        self._data_marker: Optional[str] = None
+
+    def _reload(self, marker: tuple[int, int]) -> None:
+        """Load the manifest identified by ``marker`` (modification time, inode)."""
+        try:
+            manifest = orjson.loads((self.directory / MANIFEST_FILE).read_bytes())
+        except (OSError, orjson.JSONDecodeError) as e:
+            logger.warning(f"Cannot read snapshot manifest in {self.directory}: {e}")
+            self._snapshots = {}
+            self._stale = False
+            self._data_marker = None
+        else:
+            self._stale = bool(manifest.get("stale"))
+            self._data_marker = manifest.get("data_marker")
+            self._snapshots = {
+                (entry["acy"], entry["sem"]): SemesterSnapshot(
+                    acy=entry["acy"],
+                    sem=entry["sem"],
+                    content_hash=entry["hash"],
+                    courses=entry["courses"],
+                    files={
+                        encoding: self.directory / name
+                        for encoding, name in entry["files"].items()
+                    },
+                )
+                for entry in manifest.get("semesters", {}).values()
+            }
+            logger.info(
+                f"Loaded snapshot manifest with {len(self._snapshots)} semesters"
+                + (" (stale)" if self._stale else "")
+            )
+        self._manifest_marker = marker
+
+    def get(self, acy: int, sem: int) -> Optional[SemesterSnapshot]:
+        """
+        Get the current snapshot of a semester.
+
+        Args:
+            acy: Academic year
+            sem: Semester number
+
+        Returns:
+            The snapshot, or None if there is none, it was invalidated or
+            the data changed since it was built
+        """
+        try:
+            stat = (self.directory / MANIFEST_FILE).stat()
+        except OSError:
+            return None
+        # The manifest is replaced by rename, so the inode changes on every write
+        marker = (stat.st_mtime_ns, stat.st_ino)
+        if marker != self._manifest_marker:
+            self._reload(marker)
+        if self._stale or self._data_marker != get_data_marker():
+            return None
+        return self._snapshots.get((acy, sem))
+
+    def invalidate(self) -> None:
+        """
+        Stop serving snapshots until the next rebuild after a data change.
+
+        Marks the manifest stale on disk, so that every process reading
+        this directory stops serving them, not only this one.
+        """
+        manifest_path = self.directory / MANIFEST_FILE
+        try:
+            manifest = orjson.loads(manifest_path.read_bytes())
+        except FileNotFoundError:
+            return
+        except (OSError, orjson.JSONDecodeError) as e:
+            logger.warning(f"Cannot read snapshot manifest in {self.directory}: {e}")
+            return
+        if manifest.get("stale"):
+            return
+
+        manifest["stale"] = True
+        manifest["invalidated_at"] = int(time.time())
+        try:
+            _write_atomic(manifest_path, orjson.dumps(manifest, option=orjson.OPT_INDENT_2))
+        except OSError as e:
+            logger.warning(f"Cannot mark snapshots in {self.directory} stale: {e}")
+            return
+        self._stale = True
+        logger.info(f"Marked snapshots in {self.directory} stale until the next build")
+
+
+# Store of this process, created on first use
+_store: Optional[SnapshotStore] = None
+
+
+def get_snapshot_store() -> SnapshotStore:
+    """Get the snapshot store for ``settings.SNAPSHOT_DIR``."""
+    global _store
+    if _store is None:
+        _store = SnapshotStore(Path(settings.SNAPSHOT_DIR))
+    return _store
+
+
+def invalidate_snapshots() -> None:
+    """
+    Mark snapshots as outdated after a course or semester write.
+
+    Listings fall back to the database in every process until snapshots
+    are rebuilt.
+    """
+    get_snapshot_store().invalidate()
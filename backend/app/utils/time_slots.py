@@ -0,0 +1,212 @@
+"""
+Course time-slot bitmasks.
+
+NYCU time codes list a day letter followed by its periods, e.g. ``W56R8``
+(Wednesday periods 5-6, Thursday period 8), optionally followed by a
+classroom (``T56-ED203``, ``M34EC022``) and separated by commas when a
+course meets in several rooms. Each (day, period) pair maps to one bit of a
+7 x 16 = 112-bit mask:
+
+    bit = day_index * 16 + period_index
+
+with days ``MTWRFSU`` and periods ``yz1234n56789abcd``. Masks make slot
+filters and conflict checks single bitwise operations instead of string
+scans.
+
+SQLite integers are 64-bit, so a mask is stored in two columns of 56 bits
+each (``time_slots_lo`` / ``time_slots_hi``); both halves stay non-negative.
+"""
+
+import re
+from typing import Iterable, Optional
+
+# Day letters in week order (Monday first)
+DAY_CODES = "MTWRFSU"
+
+# Period codes in time order (y/z mornings, n noon, a-d evenings)
+PERIOD_CODES = "yz1234n56789abcd"
+
+# Bits per stored column; two columns hold the full 112-bit mask
+SLOT_WORD_BITS = 56
+SLOT_WORD_MASK = (1 << SLOT_WORD_BITS) - 1
+
+# All periods of one day
+DAY_MASK = (1 << len(PERIOD_CODES)) - 1
+
+# Mask with every slot of the week set
+ALL_SLOTS = (1 << (len(DAY_CODES) * len(PERIOD_CODES))) - 1
+
+# Trailing classroom code (building letters + room number), as in the import
+CLASSROOM_PATTERN = re.compile(r"[A-Z]{2}\d{3,4}$")
+
+
+def parse_time_codes(codes: Optional[str], whole_days: bool = False) -> int:
+    """
+    Decode NYCU time codes into a slot bitmask.
+
+    Parsing of each comma-separated part stops at the first character that
+    is neither a day nor a period code (the classroom); a trailing
+    classroom code such as ``TW101``, whose letters could pass for days,
+    is removed first.
+
+    Args:
+        codes: Time codes such as ``"W56R8"`` or ``"M34-EC022,R5-EC115"``
+        whole_days: Treat a day letter without periods as the whole day
+            (used for filter input such as ``"F"``)
+
+    Returns:
+        int: Slot bitmask (0 when nothing could be decoded)
+
+    Example:
+        >>> bin(parse_time_codes("M12"))
+        '0b1100'
+        >>> parse_time_codes("W56R8") == slot_bit("W", "5") | slot_bit("W", "6") | slot_bit("R", "8")
+        True
+    """
+    mask = 0
+    for part in (codes or "").split(","):
+        part = part.split("-", 1)[0].strip()
+        part = CLASSROOM_PATTERN.sub("", part)
+
+        day: Optional[int] = None
+        day_has_periods = False
+        for char in part:
+            if char in DAY_CODES:
+                if whole_days and day is not None and not day_has_periods:
+                    mask |= DAY_MASK << (day * len(PERIOD_CODES))
+                day = DAY_CODES.index(char)
+                day_has_periods = False
+            elif char in PERIOD_CODES and day is not None:
+                mask |= 1 << (day * len(PERIOD_CODES) + PERIOD_CODES.index(char))
+                day_has_periods = True
+            elif not char.isspace():
+                break
+        if whole_days and day is not None and not day_has_periods:
+            mask |= DAY_MASK << (day * len(PERIOD_CODES))
+
+    return mask
+
+
+def parse_slot_filter(codes: Optional[Iterable[str]]) -> Optional[int]:
+    """
+    Combine filter slot codes into one mask.
+
+    Args:
+        codes: Time codes; a bare day letter selects the whole day
+
+    Returns:
+        Slot bitmask, or None when no codes are given
+
+    Raises:
+        ValueError: If a code does not select any slot
+    """
+    if not codes:
+        return None
+    mask = 0
+    for code in codes:
+        slots = parse_time_codes(code, whole_days=True)
+        if not slots:
+            raise ValueError(f"Invalid time code: {code!r}")
+        mask |= slots
+    return mask
+
+
+def slot_bit(day: str, period: str) -> int:
+    """
+    Get the bit of one (day, period) slot.
+
+    Args:
+        day: Day letter (``MTWRFSU``)
+        period: Period code (``yz1234n56789abcd``)
+
+    Returns:
+        int: Single-bit mask
+    """
+    return 1 << (DAY_CODES.index(day) * len(PERIOD_CODES) + PERIOD_CODES.index(period))
+
+
+def slot_days(mask: int) -> str:
+    """
+    Get the day letters with at least one slot set.
+
+    Args:
+        mask: Slot bitmask
+
+    Returns:
+        str: Day letters in week order, e.g. ``"WR"``
+    """
+    return "".join(
+        day for index, day in enumerate(DAY_CODES)
+        if (mask >> (index * len(PERIOD_CODES))) & DAY_MASK
+    )
+
+
+def format_slots(mask: int) -> str:
+    """
+    Encode a slot bitmask back into NYCU time codes.
+
+    Args:
+        mask: Slot bitmask
+
+    Returns:
+        str: Time codes, e.g. ``"W56R8"``
+    """
+    parts = []
+    for index, day in enumerate(DAY_CODES):
+        day_bits = (mask >> (index * len(PERIOD_CODES))) & DAY_MASK
+        if day_bits:
+            parts.append(day + "".join(
+                period for bit, period in enumerate(PERIOD_CODES) if day_bits >> bit & 1
+            ))
+    return "".join(parts)
+
+
+def split_slots(mask: int) -> tuple[int, int]:
+    """
+    Split a slot bitmask into its stored (low, high) columns.
+
+    Args:
+        mask: Slot bitmask
+
+    Returns:
+        Tuple of (time_slots_lo, time_slots_hi)
+    """
+    return mask & SLOT_WORD_MASK, mask >> SLOT_WORD_BITS
+
+
+def join_slots(low: Optional[int], high: Optional[int]) -> int:
+    """
+    Combine the stored (low, high) columns into a slot bitmask.
+
+    Args:
+        low: time_slots_lo value
+        high: time_slots_hi value
+
+    Returns:
+        int: Slot bitmask
+    """
+    return (low or 0) | ((high or 0) << SLOT_WORD_BITS)
+
+
+def find_conflicts(course_slots: dict[int, int]) -> list[tuple[int, int, int]]:
+    """
+    Find every pair of courses sharing a time slot.
+
+    Args:
+        course_slots: Course ID -> slot bitmask
+
+    Returns:
+        List of (course ID, course ID, shared slot bitmask), in input order
+
+    Example:
+        >>> find_conflicts({1: parse_time_codes("M34"), 2: parse_time_codes("M4T5")})
+        [(1, 2, 32)]
+    """
+    items = [(course_id, mask) for course_id, mask in course_slots.items() if mask]
+    conflicts = []
+    for index, (first_id, first_mask) in enumerate(items):
+        for second_id, second_mask in items[index + 1:]:
+            shared = first_mask & second_mask
+            if shared:
+                conflicts.append((first_id, second_id, shared))
+    return conflicts
@@ -0,0 +1,202 @@
+"""
+Timetable generator.
+
+Searches for conflict-free combinations of courses given as groups of
+alternative sections (every row sharing a course number). Each section is a
+``(course_id, slots, credits)`` tuple whose ``slots`` is the time-slot
+bitmask from ``app.utils.time_slots``, so a clash test is one AND.
+
+The search is a depth-first backtracking over the groups: one section of
+every required group, then at most one section of every candidate group.
+Branches are cut when a section clashes with the slots taken so far, when
+the credits would exceed the maximum, when the remaining candidates cannot
+reach the minimum, and when they cannot beat the worst of the best
+timetables kept. A time budget bounds the search; the best timetables found
+until then are returned.
+
+The module only depends on the standard library and plain tuples so it can
+run in a worker process (see ``app.utils.workers``).
+"""
+
+import heapq
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+# A section: (course_id, slots, credits)
+Section = tuple[int, int, float]
+
+# Search nodes between two checks of the time budget
+DEADLINE_CHECK_INTERVAL = 512
+
+# Number of periods per day in a slot bitmask (see app.utils.time_slots)
+PERIODS_PER_DAY = 16
+DAY_MASK = (1 << PERIODS_PER_DAY) - 1
+DAYS_PER_WEEK = 7
+
+
+@dataclass
+class SolverResult:
+    """
+    Outcome of a timetable search.
+
+    Attributes:
+        timetables: Best timetables first, each a (course IDs, credits, slots) tuple
+        explored: Number of search nodes visited
+        timed_out: Whether the time budget ran out before the search finished
+        unschedulable: Indexes of required groups with no section outside the blocked slots
+    """
+
+    timetables: list[tuple[tuple[int, ...], float, int]] = field(default_factory=list)
+    explored: int = 0
+    timed_out: bool = False
+    unschedulable: list[int] = field(default_factory=list)
+
+
+class _BudgetExceeded(Exception):
+    """Raised inside the search when the time budget runs out."""
+
+
+def count_days(slots: int) -> int:
+    """
+    Count the days with at least one slot set.
+
+    Args:
+        slots: Time-slot bitmask
+
+    Returns:
+        int: Number of days (0-7)
+    """
+    return sum(
+        1 for day in range(DAYS_PER_WEEK)
+        if (slots >> (day * PERIODS_PER_DAY)) & DAY_MASK
+    )
+
+
+def generate_timetables(
+    required: list[list[Section]],
+    candidates: list[list[Section]],
+    blocked_slots: int = 0,
+    min_credits: Optional[float] = None,
+    max_credits: Optional[float] = None,
+    limit: int = 10,
+    time_budget: float = 2.0,
+) -> SolverResult:
+    """
+    Find the best conflict-free timetables.
+
+    Timetables are ranked by total credits (highest first), then by the
+    number of days with classes (fewest first); a timetable is a leaf of the
+    search, so each combination is produced once.
+
+    Args:
+        required: Groups of which exactly one section must be taken
+        candidates: Groups of which at most one section may be taken
+        blocked_slots: Slots that must stay free
+        min_credits: Minimum total credits
+        max_credits: Maximum total credits
+        limit: Maximum number of timetables to return
+        time_budget: Search time limit in seconds
+
+    Returns:
+        SolverResult: Best timetables and search statistics
+
+    Example:
+        >>> m34, t56 = (1, 0b1100, 2.0), (2, 0b1100 << 16, 3.0)
+        >>> generate_timetables([[m34]], [[t56]]).timetables[0][0]
+        (1, 2)
+    """
+    result = SolverResult()
+
+    # Sections meeting in blocked slots can never be taken
+    required = [[s for s in group if not s[1] & blocked_slots] for group in required]
+    candidates = [[s for s in group if not s[1] & blocked_slots] for group in candidates]
+    candidates = [group for group in candidates if group]
+    result.unschedulable = [index for index, group in enumerate(required) if not group]
+    if result.unschedulable or limit < 1:
+        return result
+
+    # Few alternatives first narrows the search early; high-credit candidates
+    # first finds good timetables (and a tight bound) early
+    required.sort(key=len)
+    for group in candidates:
+        group.sort(key=lambda section: -section[2])
+    candidates.sort(key=lambda group: -group[0][2])
+
+    # Most credits the candidates from index i onwards can add
+    remaining = [0.0] * (len(candidates) + 1)
+    for index in range(len(candidates) - 1, -1, -1):
+        remaining[index] = remaining[index + 1] + candidates[index][0][2]
+
+    ceiling = max_credits if max_credits is not None else float("inf")
+    floor = min_credits if min_credits is not None else 0.0
+    deadline = time.perf_counter() + time_budget
+
+    # Min-heap of (credits, -days, -sequence, course IDs, slots): the root is
+    # the worst timetable kept, the latest found among equals
+    best: list[tuple[float, int, int, tuple[int, ...], int]] = []
+    chosen: list[int] = []
+    explored = 0
+
+    def visit() -> None:
+        nonlocal explored
+        explored += 1
+        if explored % DEADLINE_CHECK_INTERVAL == 0 and time.perf_counter() > deadline:
+            raise _BudgetExceeded
+
+    def keep(credits: float, slots: int) -> None:
+        taken = slots & ~blocked_slots
+        entry = (credits, -count_days(taken), -explored, tuple(sorted(chosen)), taken)
+        if len(best) < limit:
+            heapq.heappush(best, entry)
+        elif entry[:2] > best[0][:2]:
+            heapq.heapreplace(best, entry)
+
+    def search_candidates(index: int, slots: int, credits: float) -> None:
+        visit()
+        if credits + remaining[index] < floor:
+            return
+        if len(best) == limit:
+            # Days only grow as courses are added, so a tie on credits cannot
+            # win either once as many days are taken as the worst kept has
+            bound = min(credits + remaining[index], ceiling)
+            if bound < best[0][0] or (
+                bound == best[0][0] and count_days(slots & ~blocked_slots) >= -best[0][1]
+            ):
+                return
+        if index == len(candidates):
+            keep(credits, slots)
+            return
+
+        for course_id, section_slots, section_credits in candidates[index]:
+            if section_slots & slots or credits + section_credits > ceiling:
+                continue
+            chosen.append(course_id)
+            search_candidates(index + 1, slots | section_slots, credits + section_credits)
+            chosen.pop()
+        search_candidates(index + 1, slots, credits)
+
+    def search_required(index: int, slots: int, credits: float) -> None:
+        visit()
+        if index == len(required):
+            search_candidates(0, slots, credits)
+            return
+
+        for course_id, section_slots, section_credits in required[index]:
+            if section_slots & slots or credits + section_credits > ceiling:
+                continue
+            chosen.append(course_id)
+            search_required(index + 1, slots | section_slots, credits + section_credits)
+            chosen.pop()
+
+    try:
+        search_required(0, blocked_slots, 0.0)
+    except _BudgetExceeded:
+        result.timed_out = True
+
+    result.explored = explored
+    result.timetables = [
+        (course_ids, credits, slots)
+        for credits, _, _, course_ids, slots in sorted(best, reverse=True)
+    ]
+    return result
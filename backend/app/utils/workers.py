@@ -0,0 +1,91 @@
+"""
+Worker process pool for CPU-bound request work.
+
+Pure-Python work such as the timetable search holds the GIL, so running it
+in a thread would still stall every other request. The pool runs it in
+separate processes; ``run_in_worker`` awaits the result without blocking
+the event loop.
+
+Workers are started with ``spawn`` so they do not inherit the event loop,
+database connections or other threads of the server process. Functions
+and arguments must be picklable (module-level functions, plain data).
+With ``SOLVER_WORKERS=0``, or before ``start_worker_pool``, work runs in a
+thread instead.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional, TypeVar
+
+from app.config import settings
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def start_worker_pool(workers: Optional[int] = None) -> None:
+    """
+    Start the worker process pool (idempotent).
+
+    Args:
+        workers: Number of processes (defaults to SOLVER_WORKERS; 0 disables the pool)
+    """
+    global _pool
+    if _pool is not None:
+        return
+    count = settings.SOLVER_WORKERS if workers is None else workers
+    if count <= 0:
+        logger.info("Worker pool disabled; CPU-bound work runs in threads")
+        return
+    _pool = ProcessPoolExecutor(max_workers=count, mp_context=multiprocessing.get_context("spawn"))
+    # Start the processes now rather than on the first request
+    for _ in range(count):
+        _pool.submit(int)
+    logger.info(f"Worker pool started ({count} processes)")
+
+
+async def stop_worker_pool() -> None:
+    """Stop the worker process pool, cancelling queued work."""
+    global _pool
+    if _pool is None:
+        return
+    pool, _pool = _pool, None
+    await asyncio.to_thread(pool.shutdown, wait=True, cancel_futures=True)
+    logger.info("Worker pool stopped")
+
+
+async def run_in_worker(func: Callable[..., T], *args: Any) -> T:
+    """
+    Run a function in the worker pool.
+
+    A pool whose process died is replaced, and the call is retried in a
+    thread so the request still gets an answer.
+
+    Args:
+        func: Picklable module-level function
+        *args: Picklable positional arguments
+
+    Returns:
+        The function's return value
+    """
+    global _pool
+    pool = _pool
+    if pool is None:
+        return await asyncio.to_thread(func, *args)
+
+    try:
+        return await asyncio.get_running_loop().run_in_executor(pool, func, *args)
+    except BrokenProcessPool as e:
+        logger.error(f"Worker pool broken, restarting: {e}")
+        if _pool is pool:
+            _pool = None
+            pool.shutdown(wait=False, cancel_futures=True)
+            start_worker_pool()
+        return await asyncio.to_thread(func, *args)
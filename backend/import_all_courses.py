@@ -7,6 +7,7 @@ Imports ALL courses from raw_data_all_semesters.json
 從 raw_data_all_semesters.json 匯入所有課程
 """
 import json
+import subprocess
 import sys
 import asyncio
 from pathlib import Path
@@ -19,6 +20,7 @@ sys.path.insert(0, '/home/thc1006/dev/nycu_course_platform')
 from backend.app.database.session import async_session, engine
 from backend.app.models.course import Course
 from backend.app.models.semester import Semester
+from backend.app.utils.cache import publish_data_change
 from sqlalchemy import and_, select
 
 
@@ -224,10 +226,11 @@ async def import_courses():
                                 teacher=(course_data.get('teacher') or '').strip() or None,
                                 credits=course_data.get('credits'),
                                 dept=(course_data.get('dept') or '').strip() or None,
-                                time_codes=(course_data.get('time') or '').strip() or None,
                                 classroom_codes=(course_data.get('classroom') or '').strip() or None,
                                 details=course_data.get('details')
                             )
+                            # Also derives the time-slot bitmask and day codes
+                            course.set_time_codes((course_data.get('time') or '').strip() or None)
 
                             db.add(course)
                             imported += 1
@@ -261,6 +264,10 @@ async def import_courses():
         print(f"  📈 Success rate: {(imported/total_courses*100):.1f}%")
         print(f"{'='*80}")
 
+        # Every course was replaced: invalidate cached results and ETags of running servers
+        await publish_data_change()
+        print("✅ Data version bumped")
+
         # Verification
         print("\n🔍 Verification: Checking database...")
         async with async_session() as db:
@@ -306,6 +313,15 @@ if __name__ == '__main__':
 
     asyncio.run(import_courses())
 
+    # Rebuild the static per-semester course list snapshots
+    print("\n📦 Building semester snapshots...")
+    snapshot_script = Path(__file__).parent / 'scripts' / 'build_snapshots.py'
+    result = subprocess.run([sys.executable, str(snapshot_script)], cwd=Path(__file__).parent)
+    if result.returncode == 0:
+        print("✅ Semester snapshots built")
+    else:
+        print("❌ Snapshot build failed; run scripts/build_snapshots.py manually")
+
     elapsed = (datetime.now() - start_time).total_seconds()
     print(f"\n⏱️  Total time: {elapsed:.1f} seconds ({elapsed/60:.1f} minutes)")
     print("=" * 80)
@@ -16,6 +16,7 @@ sys.path.insert(0, '/home/thc1006/dev/nycu_course_platform')
 from backend.app.database.session import async_session, engine
 from backend.app.models.course import Course
 from backend.app.models.semester import Semester
+from backend.app.utils.cache import publish_data_change
 from sqlalchemy import and_, select
 
 
@@ -123,10 +124,11 @@ async def import_courses():
                                 teacher=course_data.get('teacher', '').strip() or None,
                                 credits=course_data.get('credits'),
                                 dept=course_data.get('dept', '').strip() or None,
-                                time_codes=course_data.get('time', '').strip() or None,
                                 classroom_codes=course_data.get('classroom', '').strip() or None,
                                 details=course_data.get('details')
                             )
+                            # Also derives the time-slot bitmask and day codes
+                            course.set_time_codes(course_data.get('time', '').strip() or None)
 
                             db.add(course)
                             imported += 1
@@ -159,6 +161,11 @@ async def import_courses():
         print(f"     - Errors: {errors}")
         print(f"{'='*80}")
 
+        # Invalidate cached results and ETags of running servers
+        if imported or semesters_created:
+            await publish_data_change()
+            print("✅ Data version bumped")
+
         # Verify import
         print("\n🔍 Verification: Checking database...")
         async with async_session() as db:
@@ -15,6 +15,7 @@ sys.path.insert(0, '/home/thc1006/dev/nycu_course_platform')
 from backend.app.database.session import async_session, engine, init_db
 from backend.app.models.course import Course
 from backend.app.models.semester import Semester  # Import Semester to fix relationship
+from backend.app.utils.time_slots import parse_time_codes, slot_days, split_slots
 from sqlalchemy import select
 
 
@@ -163,6 +164,12 @@ async def migrate_time_classroom():
                         course.time_codes = time_str if time_str else None
                         course.classroom_codes = classroom_str if classroom_str else None
 
+                        # Keep the slot bitmask of the raw codes for time filters
+                        slots = parse_time_codes(time_classroom)
+                        course.time_slots_lo, course.time_slots_hi = split_slots(slots)
+                        if slots and not course.day_codes:
+                            course.day_codes = slot_days(slots)
+
                         db.add(course)
                         updated += 1
 
@@ -0,0 +1,65 @@
+"""
+Time-Slot Backfill Tool.
+
+Adds the ``time_slots_lo`` / ``time_slots_hi`` columns (and their index) to
+an existing ``courses`` table and fills them by decoding each course's NYCU
+time codes (see ``app.utils.time_slots``). Courses without day codes get
+them derived from the slots as well.
+
+The server does the same on startup when it adds the columns (see
+``app.database.migrations``), on SQLite and PostgreSQL alike; new imports
+fill the columns themselves. Run this by hand to recompute the slots of
+every course. It is safe to run again.
+
+Usage:
+    python scripts/backfill_time_slots.py
+"""
+
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database.migrations import backfill_time_slots, upgrade_schema  # noqa: E402
+from app.database.session import engine  # noqa: E402
+from app.utils.cache import publish_data_change  # noqa: E402
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+async def main() -> int:
+    """Main backfill execution."""
+    start = time.perf_counter()
+
+    try:
+        await upgrade_schema(engine)
+        updated, with_slots = await backfill_time_slots(engine)
+    except Exception as e:
+        logger.error(f"Time-slot backfill failed: {e}")
+        return 1
+    finally:
+        await engine.dispose()
+
+    # Invalidate cached results and ETags of running servers
+    await publish_data_change()
+
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    logger.info(
+        f"Backfilled time slots of {updated} courses "
+        f"({with_slots} with a schedule) in {elapsed_ms:.0f}ms"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    exit_code = asyncio.run(main())
+    sys.exit(exit_code)
@@ -0,0 +1,182 @@
+"""
+Middleware Stack Benchmark Tool.
+
+Measures requests per second on ``GET /api/semesters/`` through two
+middleware stacks in front of the same routes:
+
+- ``before``: the previous stack of GZipMiddleware, CacheControlMiddleware,
+  PerformanceMonitoringMiddleware and RateLimitMiddleware, three of them
+  ``BaseHTTPMiddleware`` subclasses
+- ``after``: the fused pure ASGI ``PerformanceMiddleware``
+
+Requests are sent in-process through httpx's ASGI transport by concurrent
+clients, so the numbers compare middleware overhead rather than network
+or server settings. Rate limits are raised so that no request is rejected,
+and per-request log lines are silenced for both stacks.
+
+Usage:
+    python scripts/benchmark_middleware.py
+    python scripts/benchmark_middleware.py --requests 5000 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+# Add parent directory for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from fastapi.responses import ORJSONResponse  # noqa: E402
+from starlette.middleware.gzip import GZipMiddleware  # noqa: E402
+
+from app.middleware.performance import (  # noqa: E402
+    CacheControlMiddleware,
+    PerformanceMiddleware,
+    PerformanceMonitoringMiddleware,
+    RateLimitMiddleware,
+)
+from app.routes import semesters  # noqa: E402
+from app.utils.rate_limit import MemoryRateLimiter  # noqa: E402
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+for noisy_logger in ("app.middleware.performance", "httpx"):
+    logging.getLogger(noisy_logger).setLevel(logging.WARNING)
+
+ENDPOINT = "/api/semesters/"
+
+# High enough that the benchmark is never rate limited
+UNLIMITED = 10**9
+
+
+def build_app(stack: str) -> FastAPI:
+    """
+    Build an app serving the semester routes behind one middleware stack.
+
+    Args:
+        stack: "before" or "after"
+
+    Returns:
+        FastAPI: Application
+    """
+    app = FastAPI(default_response_class=ORJSONResponse)
+    app.include_router(semesters.router, prefix="/api/semesters")
+
+    if stack == "before":
+        app.add_middleware(GZipMiddleware, minimum_size=1000, compresslevel=6)
+        app.add_middleware(CacheControlMiddleware, default_max_age=300)
+        app.add_middleware(PerformanceMonitoringMiddleware, slow_request_threshold_ms=1000.0)
+        app.add_middleware(RateLimitMiddleware, rate_limiter=MemoryRateLimiter(UNLIMITED, 60))
+    else:
+        app.add_middleware(
+            PerformanceMiddleware,
+            rate_limiter=MemoryRateLimiter(UNLIMITED, 60),
+            slow_request_threshold_ms=1000.0,
+            default_max_age=300,
+            minimum_size=1000,
+            compresslevel=6,
+        )
+    return app
+
+
+async def run_stack(stack: str, requests: int, concurrency: int) -> dict[str, Any]:
+    """
+    Send requests through one stack.
+
+    Args:
+        stack: "before" or "after"
+        requests: Total number of requests
+        concurrency: Number of concurrent clients
+
+    Returns:
+        Dict with requests/sec, latency percentiles and one (decoded) response
+    """
+    transport = httpx.ASGITransport(app=build_app(stack))
+    latencies: list[float] = []
+    remaining = requests
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        warmup = await client.get(ENDPOINT, headers={"Accept-Encoding": "gzip"})
+        warmup.raise_for_status()
+
+        async def worker() -> None:
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                start = time.perf_counter()
+                response = await client.get(ENDPOINT, headers={"Accept-Encoding": "gzip"})
+                latencies.append((time.perf_counter() - start) * 1000)
+                response.raise_for_status()
+
+        start_time = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start_time
+
+    latencies.sort()
+    return {
+        "requests_per_second": len(latencies) / elapsed,
+        "median_ms": statistics.median(latencies),
+        "p95_ms": latencies[int(len(latencies) * 0.95)],
+        "body": warmup.content,
+        "headers": warmup.headers,
+    }
+
+
+async def main() -> int:
+    """Main benchmark execution."""
+    parser = argparse.ArgumentParser(description="Benchmark the performance middleware stacks")
+    parser.add_argument("--requests", type=int, default=3000, help="Requests per stack")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent clients")
+    parser.add_argument("--rounds", type=int, default=3, help="Alternating rounds per stack")
+    args = parser.parse_args()
+
+    logger.info("=" * 70)
+    logger.info(f"Middleware Stack Benchmark: GET {ENDPOINT}")
+    logger.info("=" * 70)
+
+    # Alternate the stacks so warm caches and CPU boosts favour neither
+    runs: dict[str, list[dict[str, Any]]] = {"before": [], "after": []}
+    for _ in range(args.rounds):
+        for stack in runs:
+            runs[stack].append(await run_stack(stack, args.requests, args.concurrency))
+
+    before, after = runs["before"][0], runs["after"][0]
+    if before["body"] != after["body"]:
+        logger.error("Both stacks must return the same body")
+        return 1
+    for header in ("cache-control", "content-encoding", "server-timing", "x-ratelimit-remaining"):
+        if (header in before["headers"]) != (header in after["headers"]):
+            logger.error(f"Header {header} differs between the stacks")
+            return 1
+
+    logger.info(
+        f"{args.requests} requests x {args.rounds} rounds, {args.concurrency} concurrent, "
+        f"{len(after['body'])} byte body (best round)"
+    )
+    logger.info(f"{'stack':<10}{'req/s':>10}{'median ms':>12}{'p95 ms':>10}")
+    best: dict[str, dict[str, Any]] = {}
+    for stack, results in runs.items():
+        best[stack] = max(results, key=lambda result: result["requests_per_second"])
+        logger.info(
+            f"{stack:<10}{best[stack]['requests_per_second']:>10.0f}"
+            f"{best[stack]['median_ms']:>12.2f}{best[stack]['p95_ms']:>10.2f}"
+        )
+    speedup = best["after"]["requests_per_second"] / best["before"]["requests_per_second"]
+    logger.info(f"Speedup: {speedup:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    exit_code = asyncio.run(main())
+    sys.exit(exit_code)
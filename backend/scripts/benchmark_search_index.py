@@ -0,0 +1,154 @@
+"""
+Search Engine Benchmark Tool.
+
+Compares an in-memory search engine (the inverted index or the columnar
+store) against the SQL ``ILIKE`` search path on the configured database. Both paths are called directly on
+``SearchService`` so the result cache does not hide the difference.
+
+Reports p50/p99 latency per query type and checks that both paths return
+identical pages and totals.
+
+Usage:
+    python scripts/benchmark_search_index.py
+    python scripts/benchmark_search_index.py --iterations 200
+    python scripts/benchmark_search_index.py --engine columnar
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+# Add parent directory for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database.session import async_session  # noqa: E402
+from app.search.engine import create_search_engine  # noqa: E402
+from app.services.search_service import SearchService  # noqa: E402
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# Representative queries from the course search UI
+BENCHMARK_CASES: dict[str, dict[str, Any]] = {
+    "chinese_name": {"query": "資料"},
+    "single_char": {"query": "學"},
+    "english_name": {"query": "data"},
+    "course_number": {"query": "cs31"},
+    "teacher": {"teacher": "王"},
+    "semester_filter": {"acy": [113], "sem": [1]},
+    "combined": {"query": "程式", "acy": [113], "dept": ["CS"], "credits_min": 2.0},
+    "sort_by_name": {"query": "系統", "sort_by": "by_name"},
+    "deep_page": {"acy": [113], "offset": 2000},
+    "day_credits": {"day_codes": ["M", "W"], "credits_min": 2.0, "credits_max": 3.0},
+    "sort_by_credits": {"sort_by": "by_credits", "sort_desc": True},
+}
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """
+    Compute a percentile using nearest-rank.
+
+    Args:
+        samples: Latency samples in milliseconds
+        pct: Percentile between 0 and 100
+
+    Returns:
+        float: Percentile value
+    """
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+async def time_path(call, iterations: int) -> list[float]:
+    """
+    Time repeated calls of one search path.
+
+    Args:
+        call: Zero-argument coroutine function
+        iterations: Number of timed runs
+
+    Returns:
+        list[float]: Latencies in milliseconds
+    """
+    await call()  # warm-up
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await call()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+async def main() -> int:
+    """Main benchmark execution."""
+    parser = argparse.ArgumentParser(description="Benchmark in-memory search against SQL")
+    parser.add_argument("--iterations", type=int, default=50, help="Timed runs per query")
+    parser.add_argument(
+        "--engine",
+        choices=["inverted_index", "columnar"],
+        default="inverted_index",
+        help="In-memory engine to compare against SQL",
+    )
+    args = parser.parse_args()
+
+    engine = create_search_engine(args.engine)
+
+    logger.info("=" * 70)
+    logger.info(f"Search Engine Benchmark: {engine.name} vs SQL ILIKE")
+    logger.info("=" * 70)
+
+    async with async_session() as session:
+        start = time.perf_counter()
+        await engine.build(session)
+        logger.info(f"Engine build: {(time.perf_counter() - start) * 1000:.0f}ms")
+
+        service = SearchService(session)
+        mismatches = 0
+
+        logger.info(
+            f"\n{'case':<18}{'total':>8}{'sql p50':>10}{'sql p99':>10}"
+            f"{'eng p50':>10}{'eng p99':>10}{'speedup':>9}  (ms)"
+        )
+        for case_name, criteria in BENCHMARK_CASES.items():
+            params = {"limit": 20, "offset": 0, "sort_by": "by_relevance", "sort_desc": False}
+            params.update(criteria)
+
+            sql_courses, sql_total = await service._search_with_sql(**params)
+            idx_courses, idx_total = await service._search_with_engine(engine, **params)
+            if sql_total != idx_total or [c.id for c in sql_courses] != [c.id for c in idx_courses]:
+                mismatches += 1
+                logger.error(f"{case_name}: results differ (sql={sql_total}, {engine.name}={idx_total})")
+
+            sql_samples = await time_path(lambda: service._search_with_sql(**params), args.iterations)
+            idx_samples = await time_path(
+                lambda: service._search_with_engine(engine, **params), args.iterations
+            )
+
+            sql_p50, idx_p50 = percentile(sql_samples, 50), percentile(idx_samples, 50)
+            logger.info(
+                f"{case_name:<18}{sql_total:>8}"
+                f"{sql_p50:>10.2f}{percentile(sql_samples, 99):>10.2f}"
+                f"{idx_p50:>10.2f}{percentile(idx_samples, 99):>10.2f}"
+                f"{sql_p50 / max(idx_p50, 1e-6):>8.1f}x"
+            )
+
+    if mismatches:
+        logger.error(f"{mismatches} case(s) returned different results")
+        return 1
+
+    logger.info("All cases returned identical results")
+    return 0
+
+
+if __name__ == "__main__":
+    exit_code = asyncio.run(main())
+    sys.exit(exit_code)
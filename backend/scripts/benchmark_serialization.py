@@ -0,0 +1,186 @@
+"""
+Course Serialization Benchmark Tool.
+
+Measures the cost of turning course records into a JSON list response, as
+done by ``GET /api/courses/``, and reports it per 10,000 courses:
+
+- ``before``: the previous path, which read each course's ``semester``
+  relationship, logged two lines per course, built a ``CourseResponse`` per
+  row and let FastAPI validate and serialize the list again
+- ``after``: ``serialize_courses`` with the cached semester map, rendered
+  with orjson
+
+Both paths must produce identical JSON. Log lines of the previous path are
+written to ``os.devnull`` so formatting and I/O are counted without
+flooding the console.
+
+Usage:
+    python scripts/benchmark_serialization.py
+    python scripts/benchmark_serialization.py --limit 10000 --iterations 20
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+# Add parent directory for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import orjson  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy.orm import joinedload  # noqa: E402
+from sqlmodel import select  # noqa: E402
+
+from app.database.session import async_session  # noqa: E402
+from app.models.course import Course  # noqa: E402
+from app.schemas.course import CourseResponse, parse_details, serialize_courses  # noqa: E402
+from app.services.semester_service import SemesterService  # noqa: E402
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# Receives the per-row log lines of the previous path
+legacy_logger = logging.getLogger("benchmark.legacy_serializer")
+legacy_logger.propagate = False
+legacy_logger.setLevel(logging.INFO)
+legacy_logger.addHandler(logging.StreamHandler(open(os.devnull, "w")))
+
+response_adapter = TypeAdapter(list[CourseResponse])
+
+
+def serialize_before(courses: list[Course]) -> bytes:
+    """
+    Serialize courses the way the list endpoint did before the bulk path.
+
+    Args:
+        courses: Course records with their semester loaded
+
+    Returns:
+        bytes: JSON response body
+    """
+    result = []
+    for course in courses:
+        acy = course.semester.acy if course.semester else 0
+        sem = course.semester.sem if course.semester else 0
+        legacy_logger.info(
+            f"Serializing course {course.crs_no}: acy={acy}, sem={sem}, semester={course.semester}"
+        )
+
+        syllabus_url_zh = None
+        syllabus_url_en = None
+        if acy and sem and course.crs_no:
+            syllabus_url_zh = f"https://timetable.nycu.edu.tw/?r=main/crsoutline&Acy={acy}&Sem={sem}&CrsNo={course.crs_no}&lang=zh-tw"
+            syllabus_url_en = f"https://timetable.nycu.edu.tw/?r=main/crsoutline&Acy={acy}&Sem={sem}&CrsNo={course.crs_no}&lang=en"
+            legacy_logger.info(f"Generated syllabus URLs for {course.crs_no}")
+
+        result.append(CourseResponse(
+            id=course.id,
+            acy=acy,
+            sem=sem,
+            crs_no=course.crs_no,
+            name=course.name,
+            teacher=course.teacher,
+            credits=course.credits,
+            dept=course.dept,
+            time=course.time,
+            classroom=course.classroom,
+            syllabus=course.syllabus,
+            syllabus_zh=course.syllabus_zh,
+            syllabus_url_zh=syllabus_url_zh,
+            syllabus_url_en=syllabus_url_en,
+            details=parse_details(course.details),
+        ))
+
+    # FastAPI validates the returned models against response_model again
+    validated = response_adapter.validate_python(result, from_attributes=True)
+    return response_adapter.dump_json(validated)
+
+
+def serialize_after(courses: list[Course], semester_map: dict[int, tuple[int, int]]) -> bytes:
+    """
+    Serialize courses with the bulk path.
+
+    Args:
+        courses: Course records
+        semester_map: Semester ID -> (acy, sem)
+
+    Returns:
+        bytes: JSON response body
+    """
+    return orjson.dumps(serialize_courses(courses, semester_map))
+
+
+def time_path(call, iterations: int) -> float:
+    """
+    Time repeated calls and return the best run.
+
+    Args:
+        call: Zero-argument function
+        iterations: Number of timed runs
+
+    Returns:
+        float: Fastest run in milliseconds
+    """
+    call()  # warm-up
+    best = float("inf")
+    for _ in range(iterations):
+        start = time.perf_counter()
+        call()
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best
+
+
+async def main() -> int:
+    """Main benchmark execution."""
+    parser = argparse.ArgumentParser(description="Benchmark bulk course serialization")
+    parser.add_argument("--limit", type=int, default=10000, help="Courses to serialize")
+    parser.add_argument("--iterations", type=int, default=10, help="Timed runs per path")
+    args = parser.parse_args()
+
+    logger.info("=" * 70)
+    logger.info("Course Serialization Benchmark: per-row path vs bulk path")
+    logger.info("=" * 70)
+
+    async with async_session() as session:
+        result = await session.execute(
+            select(Course).options(joinedload(Course.semester)).order_by(Course.id).limit(args.limit)
+        )
+        courses = list(result.scalars().all())
+        semester_map = await SemesterService(session).get_semester_map()
+
+    if not courses:
+        logger.error("No courses in the database; import or seed data first")
+        return 1
+
+    before_body = serialize_before(courses)
+    after_body = serialize_after(courses, semester_map)
+    if orjson.loads(before_body) != orjson.loads(after_body):
+        logger.error("Both paths must produce identical JSON")
+        return 1
+
+    scale = 10000 / len(courses)
+    results: dict[str, Any] = {
+        "before": time_path(lambda: serialize_before(courses), args.iterations),
+        "after": time_path(lambda: serialize_after(courses, semester_map), args.iterations),
+    }
+
+    logger.info(f"Serialized {len(courses)} courses, best of {args.iterations} runs")
+    logger.info(f"{'path':<10}{'ms/run':>10}{'ms/10k courses':>18}")
+    for name, elapsed in results.items():
+        logger.info(f"{name:<10}{elapsed:>10.1f}{elapsed * scale:>18.1f}")
+    logger.info(f"Speedup: {results['before'] / max(results['after'], 1e-6):.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    exit_code = asyncio.run(main())
+    sys.exit(exit_code)
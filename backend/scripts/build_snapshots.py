@@ -0,0 +1,62 @@
+"""
+Semester Snapshot Build Tool.
+
+Renders every semester's full course list into the static snapshot files
+served by ``GET /api/courses/semester/{acy}/{sem}`` (plain, gzip and, with
+``brotli`` installed, brotli variants plus a manifest of content hashes).
+Run it after importing courses; ``import_all_courses.py`` does so itself.
+Any published data change in between makes servers read those lists from
+the database instead. Running servers pick up the new files without a
+restart.
+
+Usage:
+    python scripts/build_snapshots.py
+    python scripts/build_snapshots.py --output /srv/nycu/snapshots
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+# Add parent directory for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import settings  # noqa: E402
+from app.database.session import async_session, engine  # noqa: E402
+from app.utils.snapshots import build_snapshots  # noqa: E402
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+async def main() -> int:
+    """Main build execution."""
+    parser = argparse.ArgumentParser(description="Build per-semester course list snapshots")
+    parser.add_argument(
+        "--output", type=Path, default=Path(settings.SNAPSHOT_DIR), help="Snapshot directory"
+    )
+    args = parser.parse_args()
+
+    try:
+        async with async_session() as session:
+            manifest = await build_snapshots(session, args.output)
+    except Exception as e:
+        logger.error(f"Snapshot build failed: {e}")
+        return 1
+    finally:
+        await engine.dispose()
+
+    total = sum(entry["courses"] for entry in manifest["semesters"].values())
+    logger.info(f"Snapshots of {len(manifest['semesters'])} semesters ({total} courses) in {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit_code = asyncio.run(main())
+    sys.exit(exit_code)
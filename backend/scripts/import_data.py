@@ -23,6 +23,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from backend.app.database.course import create_course
 from backend.app.database.semester import get_or_create_semester
 from backend.app.database.session import async_session, init_db
+from backend.app.utils.cache import publish_data_change
 from backend.app.utils.exceptions import DatabaseError
 
 # Set up logging
@@ -252,6 +253,10 @@ async def main(json_path: Optional[str] = None) -> int:
         async with async_session() as session:
             stats = await import_courses(session, courses)
 
+        # Invalidate cached results and ETags of running servers
+        if stats["created"] > 0:
+            await publish_data_change()
+
         # Print summary
         logger.info("=" * 70)
         logger.info("Import Summary")
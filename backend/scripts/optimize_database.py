@@ -9,6 +9,7 @@ Run this script to:
 2. Analyze query performance
 3. Optimize database structure
 4. Verify index effectiveness
+5. Create the FTS5 full-text index used for relevance search
 """
 
 import asyncio
@@ -77,7 +78,9 @@ class DatabaseOptimizer:
         - semester_id: For semester filtering
         - credits: For credit filtering
         - day_codes: For schedule filtering
-        - Composite indexes for common query patterns
+        - Composite indexes for common query patterns, including
+          (semester_id, time_slots_lo, time_slots_hi) so time-slot filters
+          read the bitmasks from the index instead of the table
         """
         logger.info("Creating database indexes...")
 
@@ -128,6 +131,11 @@ class DatabaseOptimizer:
                 "CREATE INDEX IF NOT EXISTS idx_courses_semester_teacher "
                 "ON courses(semester_id, teacher)"
             ),
+            (
+                "ix_courses_semester_time_slots",
+                "CREATE INDEX IF NOT EXISTS ix_courses_semester_time_slots "
+                "ON courses(semester_id, time_slots_lo, time_slots_hi)"
+            ),
 
             # Semesters table indexes
             (
@@ -151,6 +159,72 @@ class DatabaseOptimizer:
         self.conn.commit()
         logger.info(f"Successfully created {created_count}/{len(indexes)} indexes")
 
+    def create_fts_index(self):
+        """
+        Create the FTS5 full-text index used for relevance search.
+
+        ``courses_fts`` is an external-content table over ``courses`` using
+        the trigram tokenizer, so Chinese substrings match without word
+        segmentation. Insert, update and delete triggers keep it in sync,
+        and the index is rebuilt from the current table contents.
+
+        Requires SQLite 3.34+ (trigram tokenizer).
+        """
+        logger.info("Creating FTS5 full-text index...")
+
+        columns = "name, crs_no, teacher, dept, syllabus, syllabus_zh"
+        new_values = "new.name, new.crs_no, new.teacher, new.dept, new.syllabus, new.syllabus_zh"
+        old_values = "old.name, old.crs_no, old.teacher, old.dept, old.syllabus, old.syllabus_zh"
+
+        statements = [
+            (
+                "courses_fts",
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS courses_fts USING fts5("
+                f"{columns}, content='courses', content_rowid='id', tokenize='trigram')"
+            ),
+            (
+                "courses_fts_ai",
+                f"CREATE TRIGGER IF NOT EXISTS courses_fts_ai AFTER INSERT ON courses BEGIN "
+                f"INSERT INTO courses_fts(rowid, {columns}) VALUES (new.id, {new_values}); "
+                f"END"
+            ),
+            (
+                "courses_fts_ad",
+                f"CREATE TRIGGER IF NOT EXISTS courses_fts_ad AFTER DELETE ON courses BEGIN "
+                f"INSERT INTO courses_fts(courses_fts, rowid, {columns}) "
+                f"VALUES ('delete', old.id, {old_values}); "
+                f"END"
+            ),
+            (
+                "courses_fts_au",
+                f"CREATE TRIGGER IF NOT EXISTS courses_fts_au AFTER UPDATE ON courses BEGIN "
+                f"INSERT INTO courses_fts(courses_fts, rowid, {columns}) "
+                f"VALUES ('delete', old.id, {old_values}); "
+                f"INSERT INTO courses_fts(rowid, {columns}) VALUES (new.id, {new_values}); "
+                f"END"
+            ),
+            (
+                "rebuild",
+                "INSERT INTO courses_fts(courses_fts) VALUES ('rebuild')"
+            ),
+        ]
+
+        try:
+            for name, sql in statements:
+                start = time.time()
+                self.cursor.execute(sql)
+                elapsed = (time.time() - start) * 1000
+                logger.info(f"  {name}: OK ({elapsed:.2f}ms)")
+            self.conn.commit()
+        except sqlite3.Error as e:
+            self.conn.rollback()
+            logger.error(f"Failed to create FTS index: {e}")
+            return False
+
+        self.cursor.execute("SELECT COUNT(*) FROM courses_fts")
+        logger.info(f"FTS index contains {self.cursor.fetchone()[0]:,} courses")
+        return True
+
     def analyze_database(self):
         """
         Analyze database to update query planner statistics.
@@ -261,6 +335,12 @@ class DatabaseOptimizer:
                 "SELECT * FROM courses WHERE dept IN ('CS', 'ECE') "
                 "AND credits >= 3 AND teacher IS NOT NULL LIMIT 100"
             ),
+            (
+                "FTS relevance search",
+                "SELECT c.id FROM courses c JOIN courses_fts ON courses_fts.rowid = c.id "
+                "WHERE courses_fts MATCH '{name crs_no teacher dept} : \"computer\"' "
+                "ORDER BY bm25(courses_fts, 10.0, 8.0, 5.0, 2.0, 1.0, 1.0) LIMIT 100"
+            ),
             (
                 "Join with semesters",
                 "SELECT c.* FROM courses c JOIN semesters s ON c.semester_id = s.id "
@@ -293,6 +373,10 @@ class DatabaseOptimizer:
         - Journal mode
         - Synchronous mode
         - Temp store
+
+        Only the journal mode persists in the database file; the server
+        applies the full pragma profile to each of its connections (see
+        app.database.engine).
         """
         logger.info("Optimizing connection settings...")
 
@@ -393,6 +477,12 @@ def main():
             logger.info("=" * 70)
             optimizer.create_indexes()
 
+            # Create full-text index
+            logger.info("\n" + "=" * 70)
+            logger.info("Creating Full-Text Index")
+            logger.info("=" * 70)
+            optimizer.create_fts_index()
+
             # Optimize connection settings
             logger.info("\n" + "=" * 70)
             logger.info("Optimizing Connection Settings")
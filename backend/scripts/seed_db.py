@@ -20,6 +20,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from backend.app.database.course import create_course
 from backend.app.database.semester import get_or_create_semester
 from backend.app.database.session import async_session, init_db
+from backend.app.utils.cache import publish_data_change
 from backend.app.utils.exceptions import DatabaseError
 
 # Set up logging
@@ -268,6 +269,10 @@ async def main() -> int:
                 if count > 0:
                     semesters_created += 1
 
+        # Invalidate cached results and ETags of running servers
+        if total_created > 0:
+            await publish_data_change()
+
         # Print summary
         logger.info("=" * 70)
         logger.info("Seeding Summary")
@@ -6,18 +6,24 @@ including database setup, test client, and sample data generation.
 """
 
 import asyncio
-from typing import AsyncGenerator, Generator
+from typing import Any, AsyncGenerator, Awaitable, Callable, Generator, Optional
 
 import pytest
-from httpx import AsyncClient
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlmodel import SQLModel
 
-from backend.app.database.session import get_session
-from backend.app.main import app
-from backend.app.models.course import Course
-from backend.app.models.semester import Semester
+from app.config import settings
+from app.database.session import get_session
+from app.main import app
+from app.models.course import Course
+from app.models.semester import Semester
+from app.utils import rate_limit
+from app.utils.rate_limit import MemoryRateLimiter
+
+# Seed callback of make_database: adds rows through the session (committed afterwards)
+Seed = Callable[[AsyncSession], Awaitable[Any]]
 
 
 @pytest.fixture(scope="session")
@@ -36,6 +42,27 @@ def event_loop() -> Generator:
     loop.close()
 
 
+@pytest.fixture(autouse=True)
+def data_version_file(tmp_path, monkeypatch) -> str:
+    """
+    Point DATA_VERSION_FILE into the test's temporary directory.
+
+    Every data change (``bump_data_version``) rewrites the file, so tests
+    that add, update or delete rows would otherwise write
+    backend/data_version.
+
+    Args:
+        tmp_path: Pytest temporary directory
+        monkeypatch: Pytest monkeypatch fixture
+
+    Returns:
+        str: Path of the isolated data version file
+    """
+    path = str(tmp_path / "data_version")
+    monkeypatch.setattr(settings, "DATA_VERSION_FILE", path)
+    return path
+
+
 @pytest.fixture(scope="function")
 async def test_db() -> AsyncGenerator[AsyncSession, None]:
     """
@@ -80,6 +107,49 @@ async def test_db() -> AsyncGenerator[AsyncSession, None]:
     await engine.dispose()
 
 
+@pytest.fixture
+async def make_database(tmp_path) -> AsyncGenerator[Callable[..., Awaitable[async_sessionmaker]], None]:
+    """
+    Provide a factory of file SQLite databases with every table created.
+
+    A file database (unlike ``test_db``) can be opened by several
+    connections, which the search engines, FTS index and snapshot builder
+    need. Each database is seeded by an optional callback and disposed
+    after the test.
+
+    Args:
+        tmp_path: Pytest temporary directory
+
+    Yields:
+        Async function ``make(seed=None, name="test.db")`` returning a session
+        factory; its engine is ``factory.kw["bind"]``
+
+    Example:
+        >>> async def seed(session):
+        ...     session.add(Semester(acy=113, sem=1))
+        >>> session_factory = await make_database(seed)
+    """
+    engines = []
+
+    async def make(seed: Optional[Seed] = None, name: str = "test.db") -> async_sessionmaker:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / name}")
+        engines.append(engine)
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+
+        session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        if seed is not None:
+            async with session_factory() as session:
+                await seed(session)
+                await session.commit()
+        return session_factory
+
+    yield make
+
+    for engine in engines:
+        await engine.dispose()
+
+
 @pytest.fixture(scope="function")
 async def async_session(test_db: AsyncSession) -> AsyncSession:
     """
@@ -98,15 +168,17 @@ async def async_session(test_db: AsyncSession) -> AsyncSession:
 
 
 @pytest.fixture(scope="function")
-async def app_fixture(test_db: AsyncSession):
+async def app_fixture(test_db: AsyncSession, monkeypatch):
     """
     Create a FastAPI test app instance with dependency overrides.
 
     This fixture overrides the database session dependency to use the
-    test database instead of the production database.
+    test database instead of the production database, and gives each test
+    its own rate limiter so that earlier tests do not use up its budget.
 
     Args:
         test_db: Test database session
+        monkeypatch: Pytest monkeypatch fixture
 
     Returns:
         FastAPI: Configured FastAPI application for testing
@@ -121,6 +193,12 @@ async def app_fixture(test_db: AsyncSession):
         """Override get_session dependency to use test database."""
         yield test_db
 
+    monkeypatch.setattr(
+        rate_limit,
+        "_limiter",
+        MemoryRateLimiter(settings.RATE_LIMIT_REQUESTS, settings.RATE_LIMIT_WINDOW_SECONDS),
+    )
+
     # Override the session dependency
     app.dependency_overrides[get_session] = override_get_session
 
@@ -151,7 +229,7 @@ async def client(app_fixture) -> AsyncGenerator[AsyncClient, None]:
         ...     data = response.json()
         ...     assert len(data) > 0
     """
-    async with AsyncClient(app=app_fixture, base_url="http://test") as ac:
+    async with AsyncClient(transport=ASGITransport(app=app_fixture), base_url="http://test") as ac:
         yield ac
 
 
@@ -193,63 +271,58 @@ async def sample_data(test_db: AsyncSession) -> dict:
     # Create courses for semester 113/1
     courses_113_1 = [
         Course(
-            acy=113,
-            sem=1,
+            semester_id=semester_113_1.id,
             crs_no="CS1001",
             name="Introduction to Computer Science",
             teacher="Dr. Alice Smith",
             credits=3.0,
             dept="CS",
-            time="Mon 10:00-12:00",
-            classroom="A101",
+            time_codes="Mon 10:00-12:00",
+            classroom_codes="A101",
             details='{"capacity": 50, "enrollment": 45}',
         ),
         Course(
-            acy=113,
-            sem=1,
+            semester_id=semester_113_1.id,
             crs_no="CS2002",
             name="Data Structures and Algorithms",
             teacher="Dr. Bob Johnson",
             credits=4.0,
             dept="CS",
-            time="Tue 14:00-16:00",
-            classroom="A102",
+            time_codes="Tue 14:00-16:00",
+            classroom_codes="A102",
             details='{"capacity": 40, "enrollment": 38}',
         ),
         Course(
-            acy=113,
-            sem=1,
+            semester_id=semester_113_1.id,
             crs_no="MATH1001",
             name="Calculus I",
             teacher="Dr. Carol Davis",
             credits=3.0,
             dept="MATH",
-            time="Wed 09:00-11:00",
-            classroom="B201",
+            time_codes="Wed 09:00-11:00",
+            classroom_codes="B201",
             details='{"capacity": 60, "enrollment": 55}',
         ),
         Course(
-            acy=113,
-            sem=1,
+            semester_id=semester_113_1.id,
             crs_no="PHY2001",
             name="Physics I",
             teacher="Dr. David Wilson",
             credits=3.0,
             dept="PHY",
-            time="Thu 13:00-15:00",
-            classroom="C301",
+            time_codes="Thu 13:00-15:00",
+            classroom_codes="C301",
             details='{"capacity": 45, "enrollment": 42}',
         ),
         Course(
-            acy=113,
-            sem=1,
+            semester_id=semester_113_1.id,
             crs_no="EE3001",
             name="Digital Circuit Design",
             teacher="Dr. Eve Martinez",
             credits=3.0,
             dept="EE",
-            time="Fri 10:00-12:00",
-            classroom="D401",
+            time_codes="Fri 10:00-12:00",
+            classroom_codes="D401",
             details='{"capacity": 35, "enrollment": 33}',
         ),
     ]
@@ -257,63 +330,58 @@ async def sample_data(test_db: AsyncSession) -> dict:
     # Create courses for semester 113/2
     courses_113_2 = [
         Course(
-            acy=113,
-            sem=2,
+            semester_id=semester_113_2.id,
             crs_no="CS1002",
             name="Object-Oriented Programming",
             teacher="Dr. Alice Smith",
             credits=3.0,
             dept="CS",
-            time="Mon 14:00-16:00",
-            classroom="A103",
+            time_codes="Mon 14:00-16:00",
+            classroom_codes="A103",
             details='{"capacity": 50, "enrollment": 47}',
         ),
         Course(
-            acy=113,
-            sem=2,
+            semester_id=semester_113_2.id,
             crs_no="CS3003",
             name="Database Systems",
             teacher="Dr. Bob Johnson",
             credits=3.0,
             dept="CS",
-            time="Tue 10:00-12:00",
-            classroom="A104",
+            time_codes="Tue 10:00-12:00",
+            classroom_codes="A104",
             details='{"capacity": 40, "enrollment": 35}',
         ),
         Course(
-            acy=113,
-            sem=2,
+            semester_id=semester_113_2.id,
             crs_no="MATH2002",
             name="Linear Algebra",
             teacher="Dr. Frank Brown",
             credits=3.0,
             dept="MATH",
-            time="Wed 13:00-15:00",
-            classroom="B202",
+            time_codes="Wed 13:00-15:00",
+            classroom_codes="B202",
             details='{"capacity": 55, "enrollment": 50}',
         ),
         Course(
-            acy=113,
-            sem=2,
+            semester_id=semester_113_2.id,
             crs_no="PHY2002",
             name="Physics II",
             teacher="Dr. David Wilson",
             credits=3.0,
             dept="PHY",
-            time="Thu 09:00-11:00",
-            classroom="C302",
+            time_codes="Thu 09:00-11:00",
+            classroom_codes="C302",
             details='{"capacity": 45, "enrollment": 40}',
         ),
         Course(
-            acy=113,
-            sem=2,
+            semester_id=semester_113_2.id,
             crs_no="EE4001",
             name="Embedded Systems",
             teacher="Dr. Grace Lee",
             credits=4.0,
             dept="EE",
-            time="Fri 14:00-17:00",
-            classroom="D402",
+            time_codes="Fri 14:00-17:00",
+            classroom_codes="D402",
             details='{"capacity": 30, "enrollment": 28}',
         ),
     ]
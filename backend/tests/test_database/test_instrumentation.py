@@ -0,0 +1,127 @@
+"""
+Tests for SQL statement instrumentation.
+"""
+
+from typing import AsyncGenerator
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.config import settings
+from app.database import instrumentation
+from app.database.instrumentation import (
+    Histogram,
+    QueryStats,
+    begin_request_stats,
+    end_request_stats,
+    get_query_report,
+    instrument_engine,
+    record_route,
+    redact_parameters,
+    reset_query_stats,
+)
+
+
+async def seed_items(session: AsyncSession) -> None:
+    """Add a small ``item`` table with two rows."""
+    await session.execute(text("CREATE TABLE item (id INTEGER PRIMARY KEY, name TEXT)"))
+    await session.execute(text("INSERT INTO item (name) VALUES ('a'), ('b')"))
+
+
+@pytest.fixture
+async def engine(make_database) -> AsyncGenerator[AsyncEngine, None]:
+    """
+    Provide an instrumented engine on a database with one small table.
+
+    Args:
+        make_database: Seeded database factory from conftest
+    """
+    engine = (await make_database(seed_items)).kw["bind"]
+    instrument_engine(engine)
+    instrument_engine(engine)  # idempotent
+    reset_query_stats()
+    yield engine
+    reset_query_stats()
+
+
+async def test_request_stats_count_statements(engine: AsyncEngine) -> None:
+    """Statements run inside a request are counted; others are not."""
+    stats, token = begin_request_stats("GET /items")
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT name FROM item"))
+            await conn.execute(text("SELECT name FROM item WHERE id = :id"), {"id": 1})
+    finally:
+        end_request_stats(token)
+
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+    assert stats.statements == 2
+    assert 0 < stats.slowest_time <= stats.db_time
+    assert stats.slowest_statement.startswith("SELECT name FROM item")
+    assert instrumentation._request_stats.get() is None
+
+
+def test_redact_parameters() -> None:
+    """Parameters are described by type, for single and many parameter sets."""
+    assert redact_parameters((113, "資料", None)) == "(int, str, NoneType)"
+    assert redact_parameters({"id": 1, "q": "王小明"}) == "{id: int, q: str}"
+    assert redact_parameters([(1, "a"), (2, "b")]) == "2 x (int, str)"
+    assert redact_parameters(None) == "NoneType"
+
+
+def test_server_timing_format() -> None:
+    """The header lists database time, the slowest statement and the total."""
+    stats = QueryStats()
+    assert stats.server_timing(1.5) == 'db;dur=0.00;desc="0 statements", total;dur=1.50'
+
+    stats.record(0.002, "SELECT 1", ())
+    assert stats.server_timing(3.0) == (
+        'db;dur=2.00;desc="1 statement", db-slowest;dur=2.00, total;dur=3.00'
+    )
+
+
+def test_histogram_buckets() -> None:
+    """Values go to the first bucket whose bound they do not exceed."""
+    histogram = Histogram((1, 10))
+    for value in (0.5, 1, 5, 50):
+        histogram.observe(value)
+
+    assert histogram.to_dict() == {
+        "count": 4,
+        "sum": 56.5,
+        "buckets": {"1": 2, "10": 1, "+Inf": 1},
+    }
+
+
+async def test_slow_query_log_and_plans(engine: AsyncEngine, monkeypatch) -> None:
+    """Slow statements are kept up to the log size, slowest first, with plans."""
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 0.0)
+    monkeypatch.setattr(settings, "SLOW_QUERY_LOG_SIZE", 2)
+
+    stats, token = begin_request_stats("GET /items")
+    try:
+        async with engine.connect() as conn:
+            for item_id in (1, 2, 1):
+                await conn.execute(text("SELECT name FROM item WHERE id = :id"), {"id": item_id})
+    finally:
+        end_request_stats(token)
+    record_route("GET /items", 5.0, stats)
+
+    report = await get_query_report(engine)
+
+    slow_queries = report["slow_queries"]
+    assert len(slow_queries) == 2
+    assert slow_queries[0]["duration_ms"] >= slow_queries[1]["duration_ms"]
+    assert all(entry["request"] == "GET /items" for entry in slow_queries)
+    assert any("item" in line for line in slow_queries[0]["plan"])
+    assert slow_queries[0]["parameters"] == "(int)"  # types only, never values
+
+    route = report["routes"]["GET /items"]
+    assert route["statements"]["count"] == 1
+    assert route["statements"]["buckets"]["3"] == 1
+
+    reset_query_stats()
+    assert (await get_query_report())["slow_queries"] == []
@@ -0,0 +1,42 @@
+"""
+Tests for the in-place schema upgrade of existing databases.
+"""
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database.migrations import backfill_time_slots, upgrade_schema
+from app.models.course import Course
+from app.utils.time_slots import parse_time_codes, split_slots
+
+# courses table as created before the time-slot columns existed
+OLD_SCHEMA = [
+    "CREATE TABLE semester (id INTEGER PRIMARY KEY, acy INTEGER NOT NULL, sem INTEGER NOT NULL)",
+    "CREATE TABLE courses (id INTEGER PRIMARY KEY, semester_id INTEGER NOT NULL, crs_no VARCHAR NOT NULL, "
+    "permanent_crs_no VARCHAR, name VARCHAR NOT NULL, credits FLOAT, required VARCHAR, teacher VARCHAR, "
+    "dept VARCHAR, day_codes VARCHAR, time_codes VARCHAR, classroom_codes VARCHAR, url VARCHAR, "
+    "syllabus VARCHAR, syllabus_zh VARCHAR, details VARCHAR)",
+    "INSERT INTO semester (id, acy, sem) VALUES (1, 113, 1)",
+    "INSERT INTO courses (id, semester_id, crs_no, name, time_codes) VALUES (1, 1, 'CS01', '演算法', 'W56R8')",
+]
+
+
+async def test_old_database_is_upgraded_and_backfilled(tmp_path) -> None:
+    """Missing columns are added once, filled, and Course queries work again."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'old.db'}")
+    try:
+        async with engine.begin() as conn:
+            for statement in OLD_SCHEMA:
+                await conn.exec_driver_sql(statement)
+
+        assert await upgrade_schema(engine) == ["courses.time_slots_lo", "courses.time_slots_hi"]
+        assert await upgrade_schema(engine) == []
+        assert await backfill_time_slots(engine) == (1, 1)
+
+        session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with session_factory() as session:
+            course = (await session.execute(select(Course))).scalar_one()
+        assert (course.time_slots_lo, course.time_slots_hi) == split_slots(parse_time_codes("W56R8"))
+        assert course.day_codes == "WR"
+    finally:
+        await engine.dispose()
@@ -0,0 +1,42 @@
+"""
+Tests for the admin API token check and query statistics.
+"""
+
+import pytest
+from fastapi import HTTPException
+
+from app.config import settings
+from app.routes import admin
+from app.routes.admin import query_stats, require_admin_token
+
+
+async def test_admin_api_is_disabled_without_a_token(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Without ADMIN_API_TOKEN every admin request is refused."""
+    monkeypatch.setattr(settings, "ADMIN_API_TOKEN", None)
+    with pytest.raises(HTTPException) as error:
+        await require_admin_token(x_admin_token="anything")
+    assert error.value.status_code == 403
+
+
+async def test_admin_token_must_match(monkeypatch: pytest.MonkeyPatch) -> None:
+    """A configured token must be sent exactly."""
+    monkeypatch.setattr(settings, "ADMIN_API_TOKEN", "secret-token")
+    await require_admin_token(x_admin_token="secret-token")
+    for token in (None, "wrong-token"):
+        with pytest.raises(HTTPException) as error:
+            await require_admin_token(x_admin_token=token)
+        assert error.value.status_code == 401
+
+
+async def test_query_stats_skip_explain_by_default(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Query plans are only captured when explain=true is asked for."""
+    engines = []
+
+    async def fake_report(engine=None) -> dict:
+        engines.append(engine)
+        return {}
+
+    monkeypatch.setattr(admin, "get_query_report", fake_report)
+    await query_stats()
+    await query_stats(explain=True)
+    assert engines == [None, admin.engine]
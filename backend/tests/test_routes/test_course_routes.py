@@ -6,6 +6,8 @@ listing courses with various filters, searching, pagination, and retrieving
 individual course details.
 """
 
+import json
+
 import pytest
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -424,7 +426,7 @@ async def test_get_course(client: AsyncClient, sample_data: dict) -> None:
     assert data["classroom"] == course.classroom, (
         f"Expected classroom={course.classroom}, got {data['classroom']}"
     )
-    assert data["details"] == course.details, (
+    assert data["details"] == json.loads(course.details), (
         f"Expected details={course.details}, got {data['details']}"
     )
 
@@ -512,8 +514,8 @@ async def test_list_courses_invalid_parameters(client: AsyncClient) -> None:
     assert response_sem.status_code == 422, "sem=3 should be rejected"
 
     # Test invalid limit (too large)
-    response_limit = await client.get("/api/courses/?limit=10000")
-    assert response_limit.status_code == 422, "limit=10000 should be rejected"
+    response_limit = await client.get("/api/courses/?limit=10001")
+    assert response_limit.status_code == 422, "limit=10001 should be rejected"
 
     # Test invalid offset (negative)
     response_offset = await client.get("/api/courses/?offset=-1")
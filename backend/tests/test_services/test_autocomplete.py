@@ -0,0 +1,114 @@
+"""
+Tests for the in-memory autocomplete index.
+"""
+
+from pathlib import Path
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import session as session_module
+from app.models.course import Course
+from app.models.semester import Semester
+from app.search import autocomplete
+from app.search.autocomplete import (
+    AutocompleteIndex,
+    build_autocomplete_index,
+    course_entries,
+    get_autocomplete_index,
+    set_autocomplete_index,
+)
+
+
+COUNTS = {
+    ("course", "資料結構"): 12,
+    ("course", "Data Structures"): 4,
+    ("course", "資料庫系統"): 7,
+    ("course", "演算法"): 9,
+    ("teacher", "王小明"): 3,
+    ("teacher", "Dr. Smith"): 5,
+    ("department", "資訊工程學系"): 30,
+}
+
+
+@pytest.mark.parametrize(
+    ("query", "expected"),
+    [
+        ("資", ["資訊工程學系", "資料結構", "資料庫系統"]),
+        ("資料", ["資料結構", "資料庫系統"]),
+        ("結構", ["資料結構"]),
+        ("DATA", ["Data Structures"]),
+        ("struct", ["Data Structures"]),
+        ("smi", ["Dr. Smith"]),
+        ("tructures", []),
+        ("  ", []),
+    ],
+)
+def test_prefix_lookup_ranked_by_course_count(query: str, expected: list[str]) -> None:
+    """Test word, CJK-character and whole-value prefixes, heaviest first."""
+    index = AutocompleteIndex.from_counts(COUNTS)
+
+    assert [value for _, value, _ in index.complete(query, limit=10)] == expected
+
+
+def test_incremental_changes_without_rebuild() -> None:
+    """Test that course writes adjust weights and add new entries."""
+    index = AutocompleteIndex.from_counts(COUNTS)
+
+    for _ in range(4):
+        index.apply(added=course_entries("資料庫系統", None, None))
+    index.apply(added=course_entries("資料探勘", "陳老師", None))
+    index.apply(removed=[("course", "演算法")] * 9)
+
+    assert index.complete("資料", limit=5) == [
+        ("course", "資料結構", 12),
+        ("course", "資料庫系統", 11),
+        ("course", "資料探勘", 1),
+    ]
+    assert index.complete("陳", limit=5) == [("teacher", "陳老師", 1)]
+    assert index.complete("演算", limit=5) == []
+
+
+async def seed_courses(session: AsyncSession) -> None:
+    """Add two courses to one semester."""
+    semester = Semester(acy=113, sem=1)
+    session.add(semester)
+    await session.flush()
+    session.add(Course(semester_id=semester.id, crs_no="CS01", name="資料結構", teacher="王小明"))
+    session.add(Course(semester_id=semester.id, crs_no="CS02", name="演算法", teacher="王小明"))
+
+
+async def test_index_is_refreshed_after_a_change_elsewhere(
+    make_database, data_version_file: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that courses imported by another process are added incrementally."""
+    session_factory = await make_database(seed_courses)
+    monkeypatch.setattr(session_module, "async_session", session_factory)
+    try:
+        async with session_factory() as session:
+            built = await build_autocomplete_index(session)
+        assert get_autocomplete_index().complete("資料", limit=5) == [("course", "資料結構", 1)]
+
+        # An import script adds a course and rewrites the data version file
+        async with session_factory() as session:
+            session.add(Course(semester_id=1, crs_no="CS03", name="資料庫系統"))
+            await session.commit()
+        Path(data_version_file).write_text("1\n")
+
+        assert get_autocomplete_index() is None
+        await autocomplete._rebuild_task
+        index = get_autocomplete_index()
+        assert index is built  # refreshed in place, not rebuilt
+        assert index.max_course_id == 3
+        assert ("course", "資料庫系統", 1) in index.complete("資料", limit=5)
+    finally:
+        set_autocomplete_index(None)
+
+
+@pytest.mark.skipif(autocomplete.lazy_pinyin is None, reason="pypinyin not installed")
+def test_pinyin_and_zhuyin_lookup() -> None:
+    """Test toneless pinyin, initials and Zhuyin lookups."""
+    index = AutocompleteIndex.from_counts(COUNTS)
+
+    for query in ("ziliao", "zi liao", "zljg", "jiegou", "ㄗㄌㄧㄠ"):
+        assert ("course", "資料結構", 12) in index.complete(query, limit=10)
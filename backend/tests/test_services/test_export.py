@@ -0,0 +1,93 @@
+"""
+Tests for the streaming course export.
+"""
+
+import csv
+import io
+from typing import AsyncGenerator
+
+import orjson
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.course import Course
+from app.models.semester import Semester
+from app.services.export_service import CSV_COLUMNS, ExportFormat, ExportService
+from app.utils.cache import clear_cache
+
+
+async def seed_courses(session: AsyncSession) -> None:
+    """Add seven courses: five in 113/1, two in 113/2."""
+    fall, spring = Semester(acy=113, sem=1), Semester(acy=113, sem=2)
+    session.add_all([fall, spring])
+    await session.flush()
+    for number in range(7):
+        session.add(Course(
+            semester_id=fall.id if number < 5 else spring.id,
+            crs_no=f"CS{number:02d}",
+            name=f"課程 {number}",
+            dept="CS",
+            details='{"capacity": 30}' if number == 0 else None,
+        ))
+
+
+@pytest.fixture
+async def export_session(make_database) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Provide a session on a database with seven courses in two semesters.
+
+    Args:
+        make_database: Seeded database factory from conftest
+    """
+    await clear_cache()  # the semester table is cached across databases
+    session_factory = await make_database(seed_courses)
+    async with session_factory() as session:
+        yield session
+    await clear_cache()
+
+
+async def test_ndjson_export_streams_batches(export_session: AsyncSession) -> None:
+    """Test that rows arrive one batch per chunk, filtered and in order."""
+    service = ExportService(export_session)
+
+    chunks = [
+        chunk async for chunk in service.stream_courses(
+            ExportFormat.NDJSON, acy=113, sem=1, batch_size=2
+        )
+    ]
+    rows = [orjson.loads(line) for chunk in chunks for line in chunk.splitlines()]
+
+    assert [len(chunk.splitlines()) for chunk in chunks] == [2, 2, 1]
+    assert [row["crs_no"] for row in rows] == ["CS00", "CS01", "CS02", "CS03", "CS04"]
+    assert rows[0]["details"] == {"capacity": 30}
+    assert rows[0]["syllabus_url_en"].endswith("Acy=113&Sem=1&CrsNo=CS00&lang=en")
+
+
+async def test_csv_export(export_session: AsyncSession) -> None:
+    """Test the CSV header, encoding and raw details column."""
+    service = ExportService(export_session)
+
+    body = b"".join([chunk async for chunk in service.stream_courses(ExportFormat.CSV)])
+    rows = list(csv.reader(io.StringIO(body.decode("utf-8-sig"))))
+
+    assert rows[0] == list(CSV_COLUMNS)
+    assert len(rows) == 8
+    assert rows[1][CSV_COLUMNS.index("name")] == "課程 0"
+    assert rows[1][CSV_COLUMNS.index("details")] == '{"capacity": 30}'
+    assert rows[-1][CSV_COLUMNS.index("sem")] == "2"
+
+
+async def test_semester_added_after_caching_is_resolved(export_session: AsyncSession) -> None:
+    """A semester missing from the cached table is read again, never sent as 0/0."""
+    service = ExportService(export_session)
+    await service.list_courses()  # caches the semester table
+
+    summer = Semester(acy=114, sem=1)
+    export_session.add(summer)
+    await export_session.flush()
+    export_session.add(Course(semester_id=summer.id, crs_no="CS99", name="新課程", dept="CS"))
+    await export_session.commit()
+
+    rows = await service.list_courses(acy=114)
+    assert [(row["acy"], row["sem"]) for row in rows] == [(114, 1)]
+    assert rows[0]["syllabus_url_zh"].endswith("Acy=114&Sem=1&CrsNo=CS99&lang=zh-tw")
@@ -0,0 +1,173 @@
+"""
+Tests for schedule conflict detection and batch course updates.
+"""
+
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import AsyncGenerator, Iterator
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.instrumentation import (
+    QueryStats,
+    begin_request_stats,
+    end_request_stats,
+    instrument_engine,
+)
+from app.models.course import Course
+from app.models.schedule import Schedule, ScheduleCourse
+from app.models.semester import Semester
+from app.services.schedule_service import ScheduleService
+from app.utils.exceptions import ScheduleConflict, ScheduleNotFound
+
+# Course time codes; course IDs are assigned 1.. in this order
+TIME_CODES = ["M34-EC115", "T56-ED203", "M4W1-EC022", "R78", None]
+
+
+async def seed_schedules(session: AsyncSession) -> None:
+    """Add five courses (course N has N credits) and two schedules of user "u1"."""
+    semester = Semester(acy=113, sem=1)
+    session.add(semester)
+    await session.flush()
+    for number, time_codes in enumerate(TIME_CODES):
+        course = Course(
+            semester_id=semester.id, crs_no=f"CS{number:02d}", name=f"課程 {number}", credits=number + 1
+        )
+        course.set_time_codes(time_codes)
+        session.add(course)
+    now = datetime.now(timezone.utc)
+    schedule = Schedule(name="我的課表", acy=113, sem=1, user_id="u1", created_at=now, updated_at=now)
+    session.add(schedule)
+    await session.flush()
+    session.add(Schedule(name="備案", acy=113, sem=1, user_id="u1", created_at=now, updated_at=now))
+    session.add_all([
+        ScheduleCourse(schedule_id=schedule.id, course_id=1, added_at=now),
+        ScheduleCourse(schedule_id=schedule.id, course_id=2, added_at=now),
+    ])
+
+
+@pytest.fixture
+async def schedule_session(make_database) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Provide a session on a database with five courses (course N has N credits),
+    schedule 1 holding courses 1 and 2 and an empty schedule 2, both of user "u1".
+
+    Args:
+        make_database: Seeded database factory from conftest
+    """
+    session_factory = await make_database(seed_schedules)
+    async with session_factory() as session:
+        yield session
+
+
+@contextmanager
+def count_statements(session: AsyncSession) -> Iterator[QueryStats]:
+    """Count the SQL statements executed on the session's engine, as for a request."""
+    instrument_engine(session.bind)
+    stats, token = begin_request_stats("test")
+    try:
+        yield stats
+    finally:
+        end_request_stats(token)
+
+
+async def test_get_conflicts(schedule_session: AsyncSession) -> None:
+    """Test clash detection between scheduled courses."""
+    service = ScheduleService(schedule_session)
+
+    result = await service.get_conflicts(1)
+    assert result["has_conflicts"] is False
+    assert result["occupied_slots"] == "M34T56"
+
+    schedule_session.add(ScheduleCourse(schedule_id=1, course_id=3, added_at=datetime.now(timezone.utc)))
+    await schedule_session.commit()
+
+    result = await service.get_conflicts(1)
+    assert result["has_conflicts"] is True
+    assert result["conflicts"] == [{"course_ids": [1, 3], "slots": "M4"}]
+
+    with pytest.raises(ScheduleNotFound):
+        await service.get_conflicts(99)
+
+
+async def test_check_fit(schedule_session: AsyncSession) -> None:
+    """Test sorting candidates into fitting, clashing and unknown courses."""
+    service = ScheduleService(schedule_session)
+
+    result = await service.check_fit(1, [1, 3, 4, 5, 99])
+
+    assert result["fits"] == [1, 4, 5]
+    assert result["conflicts"] == [
+        {"course_id": 3, "slots": "M4", "conflicting_course_ids": [1]},
+    ]
+    assert result["not_found"] == [99]
+
+
+async def test_add_course_rejects_conflict(schedule_session: AsyncSession) -> None:
+    """Test that conflict rejection refuses a clashing course."""
+    service = ScheduleService(schedule_session)
+
+    with pytest.raises(ScheduleConflict) as excinfo:
+        await service.add_course(1, 3, reject_on_conflict=True)
+    assert excinfo.value.conflicting_course_ids == [1]
+    assert excinfo.value.slots == "M4"
+    assert (await service.get_conflicts(1))["has_conflicts"] is False
+
+
+async def test_batch_update_reports_skipped_items(schedule_session: AsyncSession) -> None:
+    """Test that items which cannot be applied are reported without writing."""
+    service = ScheduleService(schedule_session)
+
+    result = await service.batch_update_courses(
+        1,
+        add=[{"course_id": 3}, {"course_id": 2}, {"course_id": 99}],
+        remove=[5],
+        reject_on_conflict=True,
+    )
+
+    assert (result["added"], result["removed"]) == (0, 0)
+    assert [(item["course_id"], item["action"], item["status"]) for item in result["results"]] == [
+        (5, "remove", "not_in_schedule"),
+        (3, "add", "conflict"),
+        (2, "add", "duplicate"),
+        (99, "add", "not_found"),
+    ]
+    assert (await service.get_conflicts(1))["occupied_slots"] == "M34T56"
+
+    with pytest.raises(ScheduleNotFound):
+        await service.batch_update_courses(99, add=[], remove=[1])
+
+
+async def test_schedule_reads_use_fixed_statement_count(schedule_session: AsyncSession) -> None:
+    """Test that schedule reads do not issue a query per course or schedule."""
+    service = ScheduleService(schedule_session)
+
+    with count_statements(schedule_session) as stats:
+        detail = await service.get_schedule(1, include_courses=True)
+    assert stats.statements == 2  # schedule, then its courses with course and semester
+    assert (detail["total_credits"], detail["total_courses"]) == (3.0, 2)
+    assert detail["schedule_courses"][1]["course"]["syllabus_url_en"].endswith(
+        "Acy=113&Sem=1&CrsNo=CS01&lang=en"
+    )
+
+    now = datetime.now(timezone.utc)
+    schedule_session.add_all([
+        ScheduleCourse(schedule_id=1, course_id=4, added_at=now),
+        ScheduleCourse(schedule_id=1, course_id=5, added_at=now),
+    ])
+    await schedule_session.commit()
+    schedule_session.expunge_all()
+
+    with count_statements(schedule_session) as stats:
+        detail = await service.get_schedule(1, include_courses=True)
+    assert stats.statements == 2
+    assert (detail["total_credits"], detail["total_courses"]) == (12.0, 4)
+
+    with count_statements(schedule_session) as stats:
+        schedules = await service.get_user_schedules("u1")
+    assert stats.statements == 1
+    assert sorted((s["id"], s["total_credits"], s["total_courses"]) for s in schedules) == [
+        (1, 12.0, 4),
+        (2, 0.0, 0),
+    ]
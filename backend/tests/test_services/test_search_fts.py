@@ -0,0 +1,129 @@
+"""
+Tests for the SQLite FTS5 relevance search path.
+
+The FTS index is created with ``DatabaseOptimizer.create_fts_index`` and must
+match the same courses as the ILIKE path while its triggers keep it in sync
+with inserts, updates and deletes.
+"""
+
+from typing import AsyncGenerator
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.course import Course
+from app.models.semester import Semester
+from app.search.fts import reset_fts_cache
+from app.services.search_service import SearchService
+from scripts.optimize_database import DatabaseOptimizer
+
+
+COURSES = [
+    # (crs_no, name, teacher, dept, syllabus)
+    ("CS3101", "資料結構", "王小明", "CS", None),
+    ("CS3102", "演算法", "李大華", "CS", "資料結構的進階應用"),
+    ("EE2001", "Data Structures Lab", "Dr. Smith", "EE", None),
+    ("CS4001", "Machine Learning", None, "CS", "data structures review"),
+    ("CS3103", "資料結構與演算法", "李大華", "CS", None),
+]
+
+
+async def seed_courses(session: AsyncSession) -> None:
+    """Add the sample courses to one semester."""
+    semester = Semester(acy=113, sem=1)
+    session.add(semester)
+    await session.flush()
+    for crs_no, name, teacher, dept, syllabus in COURSES:
+        session.add(Course(
+            semester_id=semester.id,
+            crs_no=crs_no,
+            name=name,
+            teacher=teacher,
+            dept=dept,
+            syllabus=syllabus,
+        ))
+
+
+@pytest.fixture
+async def fts_session(make_database) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Provide a session on a database with sample courses and the FTS index.
+
+    Args:
+        make_database: Seeded database factory from conftest
+    """
+    session_factory = await make_database(seed_courses)
+
+    optimizer = DatabaseOptimizer(session_factory.kw["bind"].url.database)
+    optimizer.connect()
+    assert optimizer.create_fts_index()
+    optimizer.close()
+
+    reset_fts_cache()
+    async with session_factory() as session:
+        yield session
+    reset_fts_cache()
+
+
+@pytest.mark.parametrize("query", ["資料結構", "data str", "李大華", "cs31", "演算法"])
+async def test_fts_matches_sql(fts_session: AsyncSession, query: str) -> None:
+    """
+    Test that the FTS path returns the same courses as the ILIKE path.
+
+    Args:
+        fts_session: Session with sample courses and FTS index
+        query: Search query
+    """
+    service = SearchService(fts_session)
+
+    fts_courses, fts_total = await service._search_with_fts(query)
+    sql_courses, sql_total = await service._search_with_sql(query=query)
+
+    assert fts_total == sql_total
+    assert sorted(c.id for c in fts_courses) == sorted(c.id for c in sql_courses)
+
+
+async def test_fts_ranks_name_matches_first(fts_session: AsyncSession) -> None:
+    """
+    Test that bm25 ranking puts course name matches ahead of other columns.
+
+    Args:
+        fts_session: Session with sample courses and FTS index
+    """
+    service = SearchService(fts_session)
+
+    courses, total = await service._search_with_fts("李大華")
+
+    assert total == 2
+    assert all(course.teacher == "李大華" for course in courses)
+
+    courses, _ = await service._search_with_fts("資料結構")
+    assert courses[0].name == "資料結構"
+
+
+async def test_fts_triggers_track_changes(fts_session: AsyncSession) -> None:
+    """
+    Test that inserts, updates and deletes are reflected in the FTS index.
+
+    Args:
+        fts_session: Session with sample courses and FTS index
+    """
+    service = SearchService(fts_session)
+
+    course = Course(semester_id=1, crs_no="CS5001", name="作業系統", teacher="陳老師", dept="CS")
+    fts_session.add(course)
+    await fts_session.commit()
+    _, total = await service._search_with_fts("作業系統")
+    assert total == 1
+
+    course.name = "計算機網路"
+    await fts_session.commit()
+    _, total = await service._search_with_fts("作業系統")
+    assert total == 0
+    _, total = await service._search_with_fts("計算機網路")
+    assert total == 1
+
+    await fts_session.delete(course)
+    await fts_session.commit()
+    _, total = await service._search_with_fts("計算機網路")
+    assert total == 0
@@ -0,0 +1,249 @@
+"""
+Tests for the in-memory search engines.
+
+Every engine must return exactly the same pages and totals as the SQL
+``ILIKE`` search path for every supported filter and sort order.
+"""
+
+from pathlib import Path
+from typing import AsyncGenerator
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import session as session_module
+from app.models.course import Course
+from app.models.semester import Semester
+from app.schemas.course import course_to_dict
+from app.search.facets import FACET_FIELDS
+from app.search import engine as engine_module
+from app.search.columnar import ColumnarEngine, np
+from app.search.engine import build_search_engine, get_search_engine, set_search_engine
+from app.search.inverted_index import InvertedIndexEngine
+from app.services.search_service import SearchService
+from app.utils.pagination import decode_cursor
+from app.utils.time_slots import parse_slot_filter
+
+
+ENGINES = [
+    pytest.param(InvertedIndexEngine, id="inverted_index"),
+    pytest.param(
+        ColumnarEngine,
+        id="columnar",
+        marks=pytest.mark.skipif(np is None, reason="numpy is not installed"),
+    ),
+]
+
+COURSES = [
+    # (semester index, crs_no, name, teacher, dept, credits, day_codes, time_codes)
+    (0, "CS3101", "資料結構", "王小明", "CS", 3.0, "M", "M34-ED203"),
+    (0, "CS3102", "演算法", "李大華", "CS", 3.0, "T", "T56"),
+    (0, "EE2001", "Data Structures Lab", "Dr. Smith", "EE", 1.0, "W", "W12EC022"),
+    (1, "CS3101", "資料結構", "王小明", "CS", 3.0, "M", "M34"),
+    (1, "MA1001", "微積分(一)", None, "MATH", 4.0, None, None),
+    (1, "CS4001", "Machine Learning", "Dr. Chen", "CS", None, "RF", "R78F1"),
+    (2, "LN1001", "英文(一) English", "Ms. Lee", "LANG", 2.0, "F", "F56"),
+    (2, "CS3103", "資料庫系統", "李大華", "CS", 3.0, "W", "W34-EC115,W5-EC116"),
+]
+
+CASES = [
+    {},
+    {"query": "資料"},
+    {"query": "結"},
+    {"query": "data"},
+    {"query": "cs31"},
+    {"query": "李大華", "acy": [113]},
+    {"query": "cs", "sort_by": "by_relevance"},
+    {"name": "structures", "teacher": "smith"},
+    {"dept": ["CS", "LANG"], "sort_by": "by_credits", "sort_desc": True},
+    {"credits_min": 2.0, "credits_max": 3.0, "sort_by": "by_teacher"},
+    {"exact_credits": 3.0, "sort_by": "by_name", "limit": 2, "offset": 1},
+    {"day_codes": ["W", "F"], "sort_by": "by_semester", "sort_desc": True},
+    {"acy": [999]},
+    {"semester_ids": [2], "sem": [1]},
+    {"crs_no": "ma", "query": "   "},
+    {"slots_within": parse_slot_filter(["M1234", "T"])},
+    {"slots_within": parse_slot_filter(["W", "R78F"]), "sort_by": "by_name"},
+    {"slots_avoid": parse_slot_filter(["W4", "F"]), "dept": ["CS"]},
+    {"slots_avoid": parse_slot_filter(["M"]), "slots_within": parse_slot_filter(["M", "W"])},
+]
+
+
+async def seed_courses(session: AsyncSession) -> None:
+    """Add the sample courses to three semesters."""
+    semesters = [Semester(acy=113, sem=1), Semester(acy=113, sem=2), Semester(acy=114, sem=1)]
+    session.add_all(semesters)
+    await session.flush()
+
+    for index, crs_no, name, teacher, dept, credits, day_codes, time_codes in COURSES:
+        course = Course(
+            semester_id=semesters[index].id,
+            crs_no=crs_no,
+            name=name,
+            teacher=teacher,
+            dept=dept,
+            credits=credits,
+            day_codes=day_codes,
+        )
+        course.set_time_codes(time_codes)
+        session.add(course)
+
+
+@pytest.fixture
+async def search_session(make_database) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Provide a session on a file database populated with sample courses.
+
+    Args:
+        make_database: Seeded database factory from conftest
+    """
+    session_factory = await make_database(seed_courses)
+    async with session_factory() as session:
+        yield session
+
+
+@pytest.fixture(params=ENGINES)
+def make_engine(request):
+    """Provide a factory for each in-process search engine."""
+    return request.param
+
+
+@pytest.mark.parametrize("criteria", CASES)
+async def test_index_matches_sql(search_session: AsyncSession, make_engine, criteria: dict) -> None:
+    """
+    Test that index results match the SQL search path.
+
+    Args:
+        search_session: Session with sample courses
+        make_engine: Search engine factory
+        criteria: Search criteria passed to both paths
+    """
+    engine = make_engine()
+    await engine.build(search_session)
+    service = SearchService(search_session)
+
+    params = {"limit": 50, "offset": 0, "sort_by": "by_relevance", "sort_desc": False, **criteria}
+    sql_courses, sql_total = await service._search_with_sql(**params)
+    index_courses, index_total = await service._search_with_engine(engine, **params)
+
+    assert index_total == sql_total
+    assert [c.id for c in index_courses] == [c.id for c in sql_courses]
+
+
+@pytest.mark.parametrize("criteria", CASES)
+async def test_index_facets_match_sql(search_session: AsyncSession, make_engine, criteria: dict) -> None:
+    """
+    Test that engine facet counts match GROUP BY counts for the same filters.
+
+    Args:
+        search_session: Session with sample courses
+        make_engine: Search engine factory
+        criteria: Search criteria (paging and sorting are ignored)
+    """
+    engine = make_engine()
+    await engine.build(search_session)
+    service = SearchService(search_session)
+
+    filters = {
+        key: value for key, value in criteria.items()
+        if key not in ("limit", "offset", "sort_by", "sort_desc")
+    }
+    sql_facets = await service._facet_counts_with_sql(list(FACET_FIELDS), 3, **filters)
+    index_facets = engine.facet_counts(list(FACET_FIELDS), 3, **filters)
+
+    assert index_facets == sql_facets
+
+
+async def test_invalidate_marks_engine_stale(search_session: AsyncSession, make_engine) -> None:
+    """
+    Test that invalidation makes the engine unavailable until rebuilt.
+
+    Args:
+        search_session: Session with sample courses
+        make_engine: Search engine factory
+    """
+    engine = make_engine()
+    assert not engine.ready
+
+    await engine.build(search_session)
+    assert engine.ready
+
+    engine.invalidate()
+    assert not engine.ready
+
+    await engine.build(search_session)
+    assert engine.ready
+
+
+@pytest.mark.parametrize("sort_by", ["by_name", "by_credits", "by_teacher", "by_semester", "by_relevance"])
+@pytest.mark.parametrize("sort_desc", [False, True])
+async def test_cursor_pages_match_offset(
+    search_session: AsyncSession, make_engine, sort_by: str, sort_desc: bool
+) -> None:
+    """
+    Test that walking cursor pages yields the same order as one full page.
+
+    Covers nullable sort columns on both the engine and SQL paths.
+
+    Args:
+        search_session: Session with sample courses
+        make_engine: Search engine factory
+        sort_by: Sort field
+        sort_desc: Sort in descending order
+    """
+    engine = make_engine()
+    await engine.build(search_session)
+    service = SearchService(search_session)
+    params = {"sort_by": sort_by, "sort_desc": sort_desc}
+
+    expected, _ = await service._search_with_sql(limit=50, **params)
+
+    for search in (
+        service._search_with_sql,
+        lambda **kw: service._search_with_engine(engine, **kw),
+    ):
+        seen = []
+        after = None
+        while True:
+            courses, total = await search(limit=3, after=after, **params)
+            assert total == len(COURSES)
+            seen.extend(courses)
+            cursor = service.next_cursor([course_to_dict(c) for c in courses], 3, sort_by, sort_desc)
+            if cursor is None:
+                break
+            after = decode_cursor(cursor, service.cursor_sort_key(sort_by, sort_desc))
+
+        assert [c.id for c in seen] == [c.id for c in expected]
+
+
+async def test_engine_is_rebuilt_after_a_change_elsewhere(
+    make_database, data_version_file: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """
+    Test that a data change made by another process retires the active engine.
+
+    Args:
+        make_database: Seeded database factory from conftest
+        data_version_file: Isolated DATA_VERSION_FILE from conftest
+        monkeypatch: Pytest monkeypatch fixture
+    """
+    session_factory = await make_database(seed_courses)
+    monkeypatch.setattr(settings, "SEARCH_ENGINE", "inverted_index")
+    monkeypatch.setattr(session_module, "async_session", session_factory)
+    try:
+        async with session_factory() as session:
+            await build_search_engine(session)
+        assert get_search_engine().search(query="作業系統")[1] == 0
+
+        # An import script adds a course and rewrites the data version file
+        async with session_factory() as session:
+            session.add(Course(semester_id=1, crs_no="CS5001", name="作業系統"))
+            await session.commit()
+        Path(data_version_file).write_text("1\n")
+
+        assert get_search_engine() is None
+        await engine_module._rebuild_task
+        assert get_search_engine().search(query="作業系統")[1] == 1
+    finally:
+        set_search_engine(None)
@@ -0,0 +1,7 @@
+"""
+Utility Tests Package
+
+Contains tests for shared utilities such as caching and pagination.
+"""
+
+__all__ = []
@@ -0,0 +1,230 @@
+"""
+Tests for the bounded result cache.
+
+Covers LRU eviction by entry count and byte size, TTL expiry and sweeping,
+per-namespace statistics, cache keys and the ``@cache`` decorator including
+request coalescing and stale-while-revalidate.
+"""
+
+import asyncio
+import time
+from enum import Enum
+from typing import Optional
+
+import pytest
+from pydantic import BaseModel
+
+from app.config import settings
+from app.utils import cache as cache_module
+from app.utils.cache import (
+    LRUCache,
+    bump_data_version,
+    cache,
+    clear_cache,
+    generate_cache_key,
+    get_cache_stats,
+    get_data_etag,
+)
+
+
+class Sort(str, Enum):
+    """Sample enum argument."""
+
+    BY_NAME = "by_name"
+
+
+class Filters(BaseModel):
+    """Sample model argument."""
+
+    dept: list[str]
+    credits: Optional[float] = None
+
+
+class Service:
+    """Sample service with two methods taking the same arguments."""
+
+    def __init__(self, session: object):
+        self.session = session
+
+    async def search(self, query: str, sort: Sort = Sort.BY_NAME, filters: Optional[Filters] = None):
+        return query
+
+    async def stats(self, query: str, sort: Sort = Sort.BY_NAME, filters: Optional[Filters] = None):
+        return query
+
+
+def test_evicts_least_recently_used_entry() -> None:
+    """Test that the oldest untouched entry is evicted at the entry limit."""
+    lru = LRUCache(max_entries=2, max_bytes=1 << 20)
+    lru.set("a", 1, ttl_seconds=60)
+    lru.set("b", 2, ttl_seconds=60)
+    assert lru.get("a") == (True, 1)  # "b" is now least recently used
+
+    lru.set("c", 3, ttl_seconds=60)
+
+    assert "a" in lru and "c" in lru
+    assert "b" not in lru
+    assert lru.stats()["totals"]["evictions"] == 1
+
+
+def test_respects_byte_limit() -> None:
+    """Test that entries are evicted until the byte limit holds."""
+    lru = LRUCache(max_entries=100, max_bytes=250)
+    lru.set("a", b"x", ttl_seconds=60, size=100)
+    lru.set("b", b"x", ttl_seconds=60, size=100)
+    lru.set("c", b"x", ttl_seconds=60, size=100)
+
+    assert lru.total_bytes == 200
+    assert lru.keys() == ["b", "c"]
+
+    # Values larger than the whole cache are not stored
+    assert not lru.set("huge", b"x", ttl_seconds=60, size=1000)
+    assert "huge" not in lru
+
+
+def test_sweep_removes_expired_entries(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that expired entries are removed without being read."""
+    lru = LRUCache(max_entries=10, max_bytes=1 << 20)
+    lru.set("short", "v", ttl_seconds=1, namespace="ns")
+    lru.set("long", "v", ttl_seconds=60, namespace="ns")
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 5)
+
+    assert lru.sweep() == 1
+    assert lru.keys() == ["long"]
+    stats = lru.stats()["namespaces"]["ns"]
+    assert stats["expirations"] == 1
+    assert stats["entries"] == 1
+
+
+async def test_decorator_counts_hits_per_namespace() -> None:
+    """Test that the decorator caches results and records hits and misses."""
+    await clear_cache()
+    calls = []
+
+    class Service:
+        @cache(ttl_seconds=60)
+        async def compute(self, value: int) -> int:
+            calls.append(value)
+            return value * 2
+
+    service = Service()
+    assert await service.compute(value=21) == 42
+    assert await service.compute(value=21) == 42
+
+    assert calls == [21]
+    stats = get_cache_stats()["namespaces"][Service.compute.__qualname__]
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    await clear_cache()
+
+
+async def test_cache_key_is_stable_and_namespaced() -> None:
+    """Test that keys ignore the instance and call style but not the function."""
+    filters = Filters(dept=["CS"])
+    key = generate_cache_key(Service.search, Service(1), "data", filters=filters)
+
+    assert key.startswith("Service.search:")
+    assert key == generate_cache_key(
+        Service.search, Service(2), query="data", sort="by_name", filters=Filters(dept=["CS"])
+    )
+    assert key != generate_cache_key(Service.stats, Service(1), "data", filters=filters)
+    assert key != generate_cache_key(Service.search, Service(1), "data", filters=None)
+
+    await bump_data_version()
+    assert key != generate_cache_key(Service.search, Service(1), "data", filters=filters)
+
+    with pytest.raises(TypeError):
+        generate_cache_key(Service.search, Service(1), object())
+
+
+async def test_data_version_file_change_invalidates_results(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """A change recorded by another process moves the cache keys along with the ETag."""
+    marker = tmp_path / "data_version"
+    monkeypatch.setattr(settings, "DATA_VERSION_FILE", str(marker))
+    calls = []
+
+    class Service:
+        @cache(ttl_seconds=60)
+        async def compute(self, value: int) -> int:
+            calls.append(value)
+            return len(calls)
+
+    service = Service()
+    etag = get_data_etag()
+    assert await service.compute(value=1) == 1
+    assert await service.compute(value=1) == 1
+
+    marker.write_text("written by an import script\n")
+    assert await service.compute(value=1) == 2
+    assert get_data_etag() != etag
+    await clear_cache()
+
+
+async def test_decorator_returns_serialized_results() -> None:
+    """Test that cached and fresh results are both plain JSON data."""
+    await clear_cache()
+
+    class Stats:
+        @cache(ttl_seconds=60)
+        async def compute(self) -> tuple[list[int], int]:
+            return [1, 2], 2
+
+    first = await Stats().compute()
+    second = await Stats().compute()
+
+    assert first == second == [[1, 2], 2]
+    await clear_cache()
+
+
+async def test_concurrent_misses_share_one_computation() -> None:
+    """Test that concurrent callers of an uncached key run the function once."""
+    await clear_cache()
+    calls = []
+    release = asyncio.Event()
+
+    class Stats:
+        @cache(ttl_seconds=60)
+        async def compute(self) -> dict:
+            calls.append(1)
+            await release.wait()
+            return {"total": 42}
+
+    tasks = [asyncio.create_task(Stats().compute()) for _ in range(10)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks)
+
+    assert len(calls) == 1
+    assert results == [{"total": 42}] * 10
+    assert get_cache_stats()["namespaces"][Stats.compute.__qualname__]["coalesced"] == 9
+    await clear_cache()
+
+
+async def test_stale_value_served_while_refreshing(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that an expired value is served once while a refresh recomputes it."""
+    await clear_cache()
+    versions = iter([1, 2])
+
+    class Stats:
+        def __init__(self, session: object):
+            self.session = session
+
+        @cache(ttl_seconds=10, stale_ttl_seconds=60)
+        async def compute(self) -> int:
+            return next(versions)
+
+    assert await Stats(None).compute() == 1
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 20)
+
+    assert await Stats(None).compute() == 1  # stale, refresh scheduled
+    await asyncio.gather(*cache_module._refresh_tasks)
+    assert await Stats(None).compute() == 2
+
+    stats = get_cache_stats()["namespaces"][Stats.compute.__qualname__]
+    assert stats["stale_hits"] == 1
+    assert stats["refreshes"] == 1
+    await clear_cache()
@@ -0,0 +1,205 @@
+"""
+Tests for the shared (RESP) cache backend.
+
+Runs against a small in-process stand-in server that implements the
+commands the backend uses, so no Redis installation is needed.
+"""
+
+import asyncio
+import fnmatch
+import time
+from typing import AsyncGenerator
+
+import pytest
+
+from app.utils.cache import (
+    cache,
+    get_cache_stats,
+    get_data_version,
+    set_cache_backend,
+)
+from app.utils.cache_backends import RESPBackend
+from app.utils.resp import RESPClient, encode_command, read_reply
+
+
+class StandInServer:
+    """In-memory server speaking enough RESP2 for the cache backend and rate limiter."""
+
+    def __init__(self):
+        self.data: dict[bytes, tuple[bytes, float]] = {}
+        self.commands: list[bytes] = []
+        self.server: asyncio.AbstractServer | None = None
+
+    @property
+    def port(self) -> int:
+        return self.server.sockets[0].getsockname()[1]
+
+    async def start(self) -> None:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+
+    async def stop(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    def _get(self, key: bytes) -> bytes | None:
+        value, expires_at = self.data.get(key, (None, 0.0))
+        if value is not None and expires_at and expires_at <= time.monotonic():
+            del self.data[key]
+            return None
+        return value
+
+    def _run(self, name: bytes, args: list[bytes]):
+        if name in (b"PING", b"SELECT", b"AUTH"):
+            return "PONG" if name == b"PING" else "OK"
+        if name == b"GET":
+            return self._get(args[0])
+        if name == b"MGET":
+            return [self._get(key) for key in args]
+        if name == b"SET":
+            key, value, options = args[0], args[1], [arg.upper() for arg in args[2:]]
+            if b"NX" in options and self._get(key) is not None:
+                return None
+            expires_at = 0.0
+            if b"PX" in options:
+                expires_at = time.monotonic() + int(args[2 + options.index(b"PX") + 1]) / 1000
+            self.data[key] = (value, expires_at)
+            return "OK"
+        if name == b"INCR":
+            value = int(self._get(args[0]) or 0) + 1
+            self.data[args[0]] = (str(value).encode(), 0.0)
+            return value
+        if name in (b"INCRBY", b"DECRBY"):
+            step = int(args[1]) if name == b"INCRBY" else -int(args[1])
+            value = int(self._get(args[0]) or 0) + step
+            self.data[args[0]] = (str(value).encode(), self.data.get(args[0], (None, 0.0))[1])
+            return value
+        if name == b"EXPIRE":
+            value = self._get(args[0])
+            if value is None:
+                return 0
+            self.data[args[0]] = (value, time.monotonic() + int(args[1]))
+            return 1
+        if name in (b"DEL", b"UNLINK"):
+            return sum(self.data.pop(key, None) is not None for key in args)
+        if name == b"SCAN":
+            pattern = args[args.index(b"MATCH") + 1].decode()
+            keys = [key for key in list(self.data) if fnmatch.fnmatchcase(key.decode(), pattern)]
+            return [b"0", keys]
+        return ValueError(f"unknown command {name!r}")
+
+    @staticmethod
+    def _encode(reply) -> bytes:
+        if reply is None:
+            return b"$-1\r\n"
+        if isinstance(reply, ValueError):
+            return f"-ERR {reply}\r\n".encode()
+        if isinstance(reply, str):
+            return f"+{reply}\r\n".encode()
+        if isinstance(reply, int):
+            return f":{reply}\r\n".encode()
+        if isinstance(reply, bytes):
+            return b"$%d\r\n%s\r\n" % (len(reply), reply)
+        return b"*%d\r\n" % len(reply) + b"".join(StandInServer._encode(item) for item in reply)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                command = await read_reply(reader)
+                name = command[0].upper()
+                self.commands.append(name)
+                writer.write(self._encode(self._run(name, command[1:])))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            writer.close()
+
+
+@pytest.fixture
+async def server() -> AsyncGenerator[StandInServer, None]:
+    """Provide a running stand-in server."""
+    server = StandInServer()
+    await server.start()
+    yield server
+    await server.stop()
+
+
+def make_backend(server: StandInServer) -> RESPBackend:
+    """Create a backend (one "replica") connected to the stand-in server."""
+    return RESPBackend(RESPClient.from_url(f"redis://:secret@127.0.0.1:{server.port}/1"), prefix="test:")
+
+
+def test_encode_command() -> None:
+    """Test the wire format of a command."""
+    assert encode_command(["SET", "k", b"v", "PX", 500]) == (
+        b"*5\r\n$3\r\nSET\r\n$1\r\nk\r\n$1\r\nv\r\n$2\r\nPX\r\n$3\r\n500\r\n"
+    )
+
+
+async def test_pipelined_multi_get_and_clear(server: StandInServer) -> None:
+    """Test storing, batch reading, pattern deletes and clearing entries."""
+    backend = make_backend(server)
+    backend.BATCH_SIZE = 2
+
+    await backend.set("Stats.compute:a", b"1", ttl_seconds=60)
+    await backend.set("Stats.compute:b", b"2", ttl_seconds=60)
+    await backend.set("Other.compute:c", b"3", ttl_seconds=60)
+    await backend.bump_version(0)
+
+    assert await backend.get_many(
+        ["Stats.compute:a", "missing", "Stats.compute:b", "Other.compute:c"]
+    ) == [b"1", None, b"2", b"3"]
+    assert server.commands.count(b"MGET") == 2
+
+    assert await backend.delete_pattern("Stats.") == 2
+    assert await backend.clear() == 1
+    assert list(server.data) == [b"test:version"]  # version survives a clear
+    await backend.close()
+
+
+async def test_version_bump_reaches_other_replicas(server: StandInServer) -> None:
+    """Test that a bump on one replica invalidates results cached by another."""
+    replica_a, replica_b = make_backend(server), make_backend(server)
+    previous = set_cache_backend(replica_a)
+    calls = []
+
+    class Stats:
+        @cache(ttl_seconds=60)
+        async def compute(self) -> dict:
+            calls.append(1)
+            return {"total": len(calls)}
+
+    try:
+        assert await Stats().compute() == {"total": 1}
+        assert await Stats().compute() == {"total": 1}
+
+        shared = await replica_b.bump_version(get_data_version())
+
+        assert await Stats().compute() == {"total": 2}
+        assert get_data_version() == shared
+        assert len(calls) == 2
+
+        stats = get_cache_stats()
+        assert stats["backend"] == "resp"
+        assert stats["namespaces"][Stats.compute.__qualname__]["hits"] == 1
+    finally:
+        set_cache_backend(previous)
+        await replica_a.close()
+        await replica_b.close()
+
+
+async def test_unreachable_server_falls_back_to_uncached(server: StandInServer) -> None:
+    """Test that decorated functions still work when the cache server is down."""
+    backend = make_backend(server)
+    await server.stop()
+    previous = set_cache_backend(backend)
+
+    class Stats:
+        @cache(ttl_seconds=60)
+        async def compute(self) -> list[int]:
+            return [1, 2]
+
+    try:
+        assert await Stats().compute() == [1, 2]
+    finally:
+        set_cache_backend(previous)
+        await backend.close()
+        await server.start()
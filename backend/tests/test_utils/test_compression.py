@@ -0,0 +1,55 @@
+"""
+Tests for response compression and the compressed body cache.
+"""
+
+import gzip
+
+import pytest
+
+from app.utils.compression import ENCODINGS, CompressedBodyCache, choose_encoding, compress
+
+BODY = b'{"courses": [' + b'{"name": "Calculus"},' * 500 + b"]}"
+
+
+def test_choose_encoding_respects_accept_encoding() -> None:
+    """The preferred available encoding is picked; q=0 refuses one."""
+    assert choose_encoding(None) is None
+    assert choose_encoding("identity") is None
+    assert choose_encoding("gzip, deflate") == "gzip"
+    assert choose_encoding("gzip;q=0") is None
+    assert choose_encoding("gzip, br, zstd") == ENCODINGS[0]
+
+
+async def test_cache_compresses_each_body_once() -> None:
+    """A repeated body is served from the cache; a changed body never is."""
+    cache = CompressedBodyCache(max_bytes=1024 * 1024)
+    first = await cache.get(BODY, "gzip")
+    second = await cache.get(BODY, "gzip")
+    changed = await cache.get(BODY.replace(b"Calculus", b"Calculux"), "gzip")
+    assert first is second
+    assert gzip.decompress(changed) != BODY
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+async def test_cache_is_bounded_by_size() -> None:
+    """Least recently used bodies are evicted past max_bytes."""
+    size = len(compress(BODY, "gzip"))
+    cache = CompressedBodyCache(max_bytes=size * 5 // 2, thread_min_bytes=0)
+    for version in range(3):
+        await cache.get(BODY + b" " * version, "gzip")
+
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["bytes"] <= stats["max_bytes"]
+
+
+@pytest.mark.parametrize("module, encoding", [("brotli", "br"), ("zstandard", "zstd")])
+def test_optional_encodings_round_trip(module: str, encoding: str) -> None:
+    """Brotli and zstd bodies decompress to the original when installed."""
+    codec = pytest.importorskip(module)
+    compressed = compress(BODY, encoding)
+    if encoding == "br":
+        assert codec.decompress(compressed) == BODY
+    else:
+        assert codec.ZstdDecompressor().decompress(compressed) == BODY
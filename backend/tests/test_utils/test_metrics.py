@@ -0,0 +1,67 @@
+"""
+Tests for the Prometheus metrics registry and request metrics middleware.
+"""
+
+import pytest
+
+from app.middleware.metrics import MetricsMiddleware, route_template
+from app.utils.metrics import HTTP_REQUESTS, Counter, Histogram, render_metrics
+
+
+def test_render_counter_and_histogram() -> None:
+    """Histogram buckets are cumulative and label values are escaped."""
+    counter = Counter("test_events_total", "Events", ("kind",))
+    counter.labels('say "hi"').inc()
+    counter.labels('say "hi"').inc(2)
+    histogram = Histogram("test_latency_seconds", "Latency", ("route",), buckets=(0.1, 1))
+    for value in (0.05, 0.1, 0.5, 3):
+        histogram.labels("/a").observe(value)
+
+    lines = render_metrics().splitlines()
+
+    assert "# TYPE test_events_total counter" in lines
+    assert 'test_events_total{kind="say \\"hi\\""} 3' in lines
+    assert 'test_latency_seconds_bucket{route="/a",le="0.1"} 2' in lines
+    assert 'test_latency_seconds_bucket{route="/a",le="1"} 3' in lines
+    assert 'test_latency_seconds_bucket{route="/a",le="+Inf"} 4' in lines
+    assert 'test_latency_seconds_sum{route="/a"} 3.65' in lines
+    assert 'test_latency_seconds_count{route="/a"} 4' in lines
+
+
+def test_labels_must_match() -> None:
+    """A label set of the wrong length is rejected."""
+    counter = Counter("test_checked_total", "Checked", ("a", "b"))
+    with pytest.raises(ValueError):
+        counter.labels("only-one")
+
+
+def test_route_template_restores_prefix() -> None:
+    """Router-relative templates get the URL prefix back."""
+    class Route:
+        path = "/{course_id}"
+
+    assert route_template({"path": "/api/courses/42", "route": Route()}) == "/api/courses/{course_id}"
+    assert route_template({"path": "/nope"}) == "unmatched"
+
+
+async def test_middleware_records_requests() -> None:
+    """Status, route and response size are recorded once the response is sent."""
+    class Route:
+        path = "/"
+
+    async def app(scope, receive, send) -> None:
+        scope["route"] = Route()
+        await send({"type": "http.response.start", "status": 201, "headers": []})
+        await send({"type": "http.response.body", "body": b"hello"})
+
+    sent = []
+
+    async def send(message) -> None:
+        sent.append(message)
+
+    middleware = MetricsMiddleware(app)
+    await middleware({"type": "http", "method": "POST", "path": "/api/test-metrics/"}, None, send)
+
+    assert len(sent) == 2
+    assert HTTP_REQUESTS.labels("POST", "/api/test-metrics/", "201").value == 1
+    assert 'http_response_size_bytes_sum{method="POST",route="/api/test-metrics/"} 5' in render_metrics()
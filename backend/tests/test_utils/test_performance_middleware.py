@@ -0,0 +1,124 @@
+"""
+Tests for the fused performance middleware.
+"""
+
+import gzip
+
+import httpx
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+
+from app.middleware.performance import PerformanceMiddleware
+from app.utils.cache import bump_data_version
+from app.utils.rate_limit import MemoryRateLimiter
+
+LARGE_BODY = "課程 " * 2000
+
+# Requests that reached the large route
+large_calls: list[str] = []
+
+
+async def large(request) -> PlainTextResponse:
+    large_calls.append(request.url.path)
+    return PlainTextResponse(LARGE_BODY)
+
+
+async def small(request) -> PlainTextResponse:
+    return PlainTextResponse("ok")
+
+
+async def stream(request) -> StreamingResponse:
+    async def chunks():
+        for index in range(3):
+            yield f"chunk {index} ".encode() * 100
+
+    return StreamingResponse(chunks(), media_type="text/plain")
+
+
+def make_client(**options) -> httpx.AsyncClient:
+    """Create a client for a small app behind PerformanceMiddleware."""
+    options.setdefault("rate_limiter", MemoryRateLimiter(limit=100, window_seconds=60))
+    app = Starlette(routes=[
+        Route("/api/semesters/large", large),
+        Route("/small", small, methods=["GET", "POST"]),
+        Route("/stream", stream),
+    ])
+    app.add_middleware(PerformanceMiddleware, **options)
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+async def test_large_response_is_compressed_with_headers() -> None:
+    """Large bodies are gzipped and get timing, rate limit and cache headers."""
+    async with make_client() as client:
+        response = await client.get("/api/semesters/large", headers={"Accept-Encoding": "gzip"})
+
+    assert response.text == LARGE_BODY
+    assert response.headers["content-encoding"] == "gzip"
+    assert int(response.headers["content-length"]) < len(LARGE_BODY.encode())
+    assert response.headers["cache-control"] == "public, max-age=3600"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["server-timing"].startswith("db;dur=")
+    assert "x-process-time" in response.headers
+    assert "x-ratelimit-remaining" in response.headers
+
+
+async def test_small_and_uncompressed_responses() -> None:
+    """Small bodies, non-GET requests and clients without gzip are left alone."""
+    async with make_client() as client:
+        small_response = await client.get("/small", headers={"Accept-Encoding": "gzip"})
+        post_response = await client.post("/small")
+        identity = await client.get("/api/semesters/large", headers={"Accept-Encoding": "identity"})
+
+    assert "content-encoding" not in small_response.headers
+    assert small_response.headers["cache-control"] == "public, max-age=300"
+    assert "cache-control" not in post_response.headers
+    assert "content-encoding" not in identity.headers
+    assert identity.text == LARGE_BODY
+
+
+async def test_streaming_response_stays_streamed() -> None:
+    """Streamed bodies are compressed chunk by chunk without a length."""
+    async with make_client() as client:
+        async with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+            raw = b"".join([chunk async for chunk in response.aiter_raw()])
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    expected = "".join(f"chunk {index} " * 100 for index in range(3))
+    assert gzip.decompress(raw).decode() == expected
+
+
+async def test_rate_limit_rejects_after_burst() -> None:
+    """Requests beyond the burst get 429 with Retry-After."""
+    async with make_client(rate_limiter=MemoryRateLimiter(limit=2, window_seconds=60)) as client:
+        statuses = [(await client.get("/small")).status_code for _ in range(3)]
+        rejected = await client.get("/small")
+
+    assert statuses == [200, 200, 429]
+    assert rejected.json()["detail"] == "Rate limit exceeded"
+    assert int(rejected.headers["retry-after"]) >= 0
+
+
+async def test_conditional_get_skips_the_route_until_data_changes() -> None:
+    """A current If-None-Match gets 304 without running the route; a data bump ends that."""
+    large_calls.clear()
+    async with make_client() as client:
+        first = await client.get("/api/semesters/large")
+        etag = first.headers["etag"]
+        not_modified = await client.get("/api/semesters/large", headers={"If-None-Match": etag})
+        await bump_data_version()
+        changed = await client.get("/api/semesters/large", headers={"If-None-Match": etag})
+        other = await client.get("/small")
+        unknown = await client.get("/api/semesters/missing", headers={"If-None-Match": changed.headers["etag"]})
+
+    assert etag.startswith('W/"')
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+    assert not_modified.headers["cache-control"] == "public, max-age=3600"
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert len(large_calls) == 2
+    assert "etag" not in other.headers
+    assert unknown.status_code == 404
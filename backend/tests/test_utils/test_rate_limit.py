@@ -0,0 +1,73 @@
+"""
+Tests for the sliding window rate limiters.
+"""
+
+from app.utils.rate_limit import MemoryRateLimiter, RESPRateLimiter, route_cost
+from app.utils.resp import RESPClient
+from tests.test_utils.test_cache_backends import StandInServer, server  # noqa: F401 - fixture
+
+
+def test_sliding_window_weights_previous_window() -> None:
+    """Half-way through a window, half of the previous window still counts."""
+    limiter = MemoryRateLimiter(limit=10, window_seconds=10)
+    allowed = [limiter.check("a", now=5.0).allowed for _ in range(11)]
+    assert allowed == [True] * 10 + [False]
+
+    rejected = limiter.check("a", now=5.0)
+    assert rejected.retry_after > 0
+    assert rejected.remaining == 0
+
+    # Window 1 at 50%: 10 * 0.5 = 5 requests of budget left
+    allowed = [limiter.check("a", now=15.0).allowed for _ in range(6)]
+    assert allowed == [True] * 5 + [False]
+
+
+def test_costs_use_budget_and_rejections_do_not() -> None:
+    """Costly requests use more budget; rejected ones are not counted."""
+    limiter = MemoryRateLimiter(limit=5, window_seconds=60)
+    assert limiter.check("a", cost=3, now=0.0).remaining == 2
+    assert not limiter.check("a", cost=3, now=0.0).allowed
+    assert limiter.check("a", cost=2, now=0.0).allowed
+
+    costs = {"/api/courses": 2, "/api/courses/search": 5}
+    assert route_cost("/api/courses/search", costs) == 5
+    assert route_cost("/api/courses/1", costs) == 2
+    assert route_cost("/api/semesters/", costs) == 1
+
+
+def test_idle_and_excess_clients_are_evicted() -> None:
+    """Clients idle for a full window are dropped, and at most max_keys are kept."""
+    limiter = MemoryRateLimiter(limit=5, window_seconds=10, max_keys=3)
+    for index in range(5):
+        limiter.check(f"10.0.0.{index}", now=1.0)
+    assert len(limiter) == 3
+
+    limiter.check("10.0.0.9", now=100.0)
+    assert len(limiter) == 1
+
+
+async def test_resp_limiter_is_shared_between_replicas(server: StandInServer) -> None:  # noqa: F811
+    """Two limiters on one server enforce a single budget."""
+    url = f"redis://127.0.0.1:{server.port}/0"
+    replicas = [RESPRateLimiter(RESPClient.from_url(url), limit=3, window_seconds=60, prefix="rl:") for _ in range(2)]
+    try:
+        results = [await replicas[index % 2].hit("1.2.3.4") for index in range(4)]
+        assert [result.allowed for result in results] == [True, True, True, False]
+        assert [result.remaining for result in results[:3]] == [2, 1, 0]
+        assert (await replicas[0].hit("5.6.7.8")).allowed
+    finally:
+        for replica in replicas:
+            await replica.close()
+
+
+async def test_resp_limiter_falls_back_when_unreachable(server: StandInServer) -> None:  # noqa: F811
+    """Without the server, requests are limited locally instead of failing."""
+    port = server.port
+    await server.stop()
+    limiter = RESPRateLimiter(RESPClient.from_url(f"redis://127.0.0.1:{port}/0"), limit=1, window_seconds=60)
+    try:
+        assert (await limiter.hit("1.2.3.4")).allowed
+        assert not (await limiter.hit("1.2.3.4")).allowed
+    finally:
+        await limiter.close()
+    await server.start()
@@ -0,0 +1,107 @@
+"""
+Tests for the per-semester course list snapshots.
+"""
+
+import gzip
+from pathlib import Path
+from typing import AsyncGenerator
+
+import orjson
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.course import Course
+from app.models.semester import Semester
+from app.utils.snapshots import SemesterSnapshot, SnapshotStore, build_snapshots
+
+
+async def seed_courses(session: AsyncSession) -> None:
+    """Add three courses to 113/1 and one to 113/2."""
+    fall, spring = Semester(acy=113, sem=1), Semester(acy=113, sem=2)
+    session.add_all([fall, spring])
+    await session.flush()
+    for number in range(3):
+        session.add(Course(semester_id=fall.id, crs_no=f"B{number}", name=f"課程 {number}"))
+    session.add(Course(semester_id=spring.id, crs_no="A0", name="Spring"))
+
+
+@pytest.fixture
+async def session(make_database) -> AsyncGenerator[AsyncSession, None]:
+    """Provide a session on a database with courses in two semesters."""
+    session_factory = await make_database(seed_courses)
+    async with session_factory() as session:
+        yield session
+
+
+def test_encoding_negotiation_and_etags() -> None:
+    """Test Accept-Encoding selection and If-None-Match matching."""
+    snapshot = SemesterSnapshot(
+        acy=113, sem=1, content_hash="abc123", courses=1,
+        files={"identity": Path("a.json"), "gzip": Path("a.json.gz")},
+    )
+
+    assert snapshot.choose_encoding("gzip, deflate, br") == "gzip"  # no .br file
+    assert snapshot.choose_encoding("gzip;q=0, br") == "identity"
+    assert snapshot.choose_encoding(None) == "identity"
+    assert snapshot.etag("gzip") == '"abc123-gzip"'
+
+    assert snapshot.matches('"abc123"')
+    assert snapshot.matches('W/"other", "abc123-br"')
+    assert snapshot.matches("*")
+    assert not snapshot.matches('"abc124-gzip"')
+    assert not snapshot.matches(None)
+
+
+async def test_build_and_serve_from_manifest(session: AsyncSession, tmp_path: Path) -> None:
+    """Test that built files hold the semester list and are found by the store."""
+    directory = tmp_path / "snapshots"
+    manifest = await build_snapshots(session, directory)
+    store = SnapshotStore(directory)
+
+    snapshot = store.get(113, 1)
+    assert snapshot.courses == 3
+    assert snapshot.content_hash == manifest["semesters"]["113-1"]["hash"]
+
+    rows = orjson.loads(gzip.decompress(snapshot.files["gzip"].read_bytes()))
+    assert [row["crs_no"] for row in rows] == ["B0", "B1", "B2"]
+    assert snapshot.files["identity"].read_bytes() == orjson.dumps(rows)
+    assert store.get(113, 2).courses == 1
+    assert store.get(112, 1) is None
+
+    # Unchanged content keeps its files; invalidation lasts until a rebuild
+    store.invalidate()
+    assert store.get(113, 1) is None
+    rebuilt = await build_snapshots(session, directory)
+    assert rebuilt["semesters"]["113-1"]["files"] == manifest["semesters"]["113-1"]["files"]
+
+
+async def test_invalidation_reaches_every_store(session: AsyncSession, tmp_path: Path) -> None:
+    """Test that a write in one process stops the others serving snapshots too."""
+    directory = tmp_path / "snapshots"
+    await build_snapshots(session, directory)
+    writer, reader = SnapshotStore(directory), SnapshotStore(directory)
+    assert reader.get(113, 1) is not None
+
+    writer.invalidate()
+    assert reader.get(113, 1) is None
+    assert SnapshotStore(directory).get(113, 1) is None  # a process started later
+
+    await build_snapshots(session, directory)
+    assert reader.get(113, 1) is not None
+    assert writer.get(113, 1) is not None
+
+
+async def test_published_data_change_retires_snapshots(
+    session: AsyncSession, tmp_path: Path, data_version_file: str
+) -> None:
+    """Test that a change published by an import script stops snapshot serving."""
+    directory = tmp_path / "snapshots"
+    await build_snapshots(session, directory)
+    store = SnapshotStore(directory)
+    assert store.get(113, 1) is not None
+
+    Path(data_version_file).write_text("1\n")  # as publish_data_change does
+    assert store.get(113, 1) is None
+
+    await build_snapshots(session, directory)
+    assert store.get(113, 1) is not None
@@ -0,0 +1,57 @@
+"""
+Tests for the course time-slot bitmasks.
+"""
+
+import pytest
+
+from app.utils.time_slots import (
+    ALL_SLOTS,
+    format_slots,
+    join_slots,
+    parse_slot_filter,
+    parse_time_codes,
+    slot_bit,
+    slot_days,
+    split_slots,
+)
+
+
+@pytest.mark.parametrize(
+    "codes, expected",
+    [
+        ("W56R8", "W56R8"),
+        ("M34-", "M34"),
+        ("T56ED203", "T56"),
+        ("F78EC022", "F78"),
+        ("M56-EC114,R3-EC115", "M56R3"),
+        ("Tyzn-ED102", "Tyzn"),
+        ("Uabcd", "Uabcd"),
+        ("星期一 3-4節", ""),
+        ("-", ""),
+        (None, ""),
+    ],
+)
+def test_parse_time_codes(codes, expected) -> None:
+    """Test decoding NYCU time codes, classrooms included."""
+    assert format_slots(parse_time_codes(codes)) == expected
+
+
+def test_masks_split_into_stored_columns() -> None:
+    """Test that every slot survives the two 56-bit columns."""
+    mask = parse_time_codes("MyWdUd")
+    low, high = split_slots(mask)
+
+    assert 0 <= low < 2 ** 56 and 0 <= high < 2 ** 56
+    assert join_slots(low, high) == mask
+    assert split_slots(ALL_SLOTS) == (2 ** 56 - 1, 2 ** 56 - 1)
+    assert slot_days(mask) == "MWU"
+    assert mask & slot_bit("W", "d")
+
+
+def test_slot_filter_input() -> None:
+    """Test filter codes: bare days select the whole day, junk is rejected."""
+    assert format_slots(parse_slot_filter(["F", "M12"])) == "M12Fyz1234n56789abcd"
+    assert parse_slot_filter(None) is None
+
+    with pytest.raises(ValueError):
+        parse_slot_filter(["X9"])
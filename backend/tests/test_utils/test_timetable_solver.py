@@ -0,0 +1,74 @@
+"""
+Tests for the timetable generator.
+"""
+
+import itertools
+
+from app.utils.time_slots import parse_slot_filter, parse_time_codes
+from app.utils.timetable_solver import count_days, generate_timetables
+
+
+def section(course_id: int, codes: str, credits: float) -> tuple[int, int, float]:
+    """Build a solver section from time codes."""
+    return course_id, parse_time_codes(codes), credits
+
+
+def test_ranking_and_constraints() -> None:
+    """Test section choice, credit bounds, blocked slots and the ranking."""
+    required = [[section(1, "M34", 3)], [section(2, "T34", 3), section(3, "W34", 3)]]
+    candidates = [
+        [section(4, "M4", 2)],  # clashes with course 1
+        [section(5, "T12", 2)],
+        [section(6, "F12", 3)],
+        [section(7, "W56", 3)],
+    ]
+
+    result = generate_timetables(
+        required, candidates, blocked_slots=parse_slot_filter(["F"]), max_credits=11, limit=3
+    )
+
+    assert not result.timed_out
+    assert [timetable[:2] for timetable in result.timetables] == [
+        ((1, 2, 5, 7), 11.0),  # M, T, W
+        ((1, 3, 5, 7), 11.0),  # M, T, W as well; found later
+        ((1, 3, 7), 9.0),  # M, W
+    ]
+    assert count_days(result.timetables[2][2]) == 2
+
+    assert generate_timetables(required, candidates, min_credits=20).timetables == []
+    assert generate_timetables([[section(1, "F1", 3)]], [], blocked_slots=parse_slot_filter(["F"])).unschedulable == [0]
+
+
+def test_matches_exhaustive_search() -> None:
+    """Test that pruning keeps the best timetables of a brute-force search."""
+    codes = ["M12", "M34", "T12", "M2T1", "W56", "R78", "W6", "F34", "T2R7"]
+    groups = [[section(index, code, 1 + index % 3)] for index, code in enumerate(codes)]
+
+    expected = []
+    for size in range(len(groups) + 1):
+        for combo in itertools.combinations(groups, size):
+            slots = [group[0][1] for group in combo]
+            if any(a & b for a, b in itertools.combinations(slots, 2)):
+                continue
+            credits = sum(group[0][2] for group in combo)
+            if 5 <= credits <= 9:
+                mask = 0
+                for slot in slots:
+                    mask |= slot
+                expected.append((credits, count_days(mask)))
+    expected.sort(key=lambda item: (-item[0], item[1]))
+
+    result = generate_timetables([], groups, min_credits=5, max_credits=9, limit=8)
+
+    assert [(credits, count_days(slots)) for _, credits, slots in result.timetables] == expected[:8]
+
+
+def test_time_budget() -> None:
+    """Test that an exhausted budget returns the timetables found so far."""
+    groups = [[section(index, "M1", 1)] for index in range(200)]
+    groups += [[section(1000 + index, day + "1", 1)] for index, day in enumerate("TWRFSU")]
+
+    result = generate_timetables([], groups, limit=1, time_budget=0)
+
+    assert result.timed_out
+    assert len(result.timetables) == 1